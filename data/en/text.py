@@ -24,6 +24,10 @@ STR_LANGUAGE = "Language"
 STR_CHOOSE_LANGUAGE = "Choose Language"
 STR_MOVE_SPEED_ = "Move speed :"
 STR_SCREEN_MODE_ = "Screen mode :"
+STR_FAST_FORWARD_ = "Fast-forward AI :"
+STR_GROUP_MOVES_ = "Group AI moves :"
+STR_ON = "On"
+STR_OFF = "Off"
 STR_NORMAL = "Normal"
 STR_FAST = "Fast"
 STR_SLOW = "Slow"
@@ -24,6 +24,10 @@ STR_LANGUAGE = "语言"
 STR_CHOOSE_LANGUAGE = "选择语言"
 STR_MOVE_SPEED_ = "移动速度："
 STR_SCREEN_MODE_ = "屏幕模式："
+STR_FAST_FORWARD_ = "AI快进："
+STR_GROUP_MOVES_ = "AI集体移动："
+STR_ON = "开"
+STR_OFF = "关"
 STR_NORMAL = "正常"
 STR_FAST = "快速"
 STR_SLOW = "慢速"
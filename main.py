@@ -7,20 +7,63 @@ and let the main loop running.
 The pygame events are caught here and delegated to the start screen.
 """
 
+from typing import Optional
+
 import pygame
 import pygamepopup
 
+from src.constants import BLACK, FRAME_RATE
+from src.gui import fonts
 from src.gui.tools import show_fps
 from src.services.scene_manager import SceneManager, QuitActionKind
 
 
+def process_frame(
+    game_controller: SceneManager,
+    screen: pygame.Surface,
+    clock: pygame.time.Clock,
+    fps_rect: Optional[pygame.Rect],
+) -> tuple[QuitActionKind, pygame.Rect]:
+    """
+    Run a single iteration of the game and update the window with the new frame.
+    After a frame in which the active scene drew the whole screen, the screen is cleared
+    and the active scene is asked to draw all of it again,
+    since it may only draw the parts that changed at the next frame.
+
+    Keyword arguments:
+    controller -- the scene manager acting as the main controller of the game
+    screen -- the screen on which the current frame rate is displayed
+    clock -- the clock regulating the maximum frame rate of the game
+    fps_rect -- the part of the screen on which the frame rate was displayed at the previous frame
+
+    Returns:
+    whether quit, restart or continue, and the part of the screen on which the frame rate is displayed
+    """
+    if game_controller.dirty_rects is None:
+        screen.fill(BLACK)
+        game_controller.invalidate(screen.get_rect())
+    else:
+        # Erase the previous frame rate, the scene draws again what was beneath it
+        screen.fill(BLACK, fps_rect)
+        game_controller.invalidate(fps_rect)
+    action: QuitActionKind = game_controller.process_game_iteration()
+    fps_rect = show_fps(screen, clock, fonts.fonts["FPS_FONT"])
+    if game_controller.dirty_rects is None:
+        pygame.display.update()
+    else:
+        pygame.display.update(game_controller.dirty_rects + [fps_rect])
+    return action, fps_rect
+
+
 def main_loop(
     game_controller: SceneManager, screen: pygame.Surface, clock: pygame.time.Clock
 ) -> QuitActionKind:
     """
     Run the game until a quit request happened.
     Pygame events are catch and delegated to the scene manager.
-    The state and display of the active scene are updated at each iteration.
+    The state and display of the active scene are updated at each iteration,
+    only the parts of the screen drawn by the active scene are updated on the window
+    when it does not draw the whole screen.
 
     Keyword arguments:
     controller -- the scene manager acting as the main controller of the game
@@ -31,11 +74,9 @@ def main_loop(
     whether quit or restart
     """
     action: QuitActionKind = QuitActionKind.CONTINUE
+    fps_rect: Optional[pygame.Rect] = None
     while action == QuitActionKind.CONTINUE:
-        screen.fill(BLACK)
-        action = game_controller.process_game_iteration()
-        show_fps(screen, clock, fonts.fonts["FPS_FONT"])
-        pygame.display.update()
+        action, fps_rect = process_frame(game_controller, screen, clock, fps_rect)
         clock.tick(FRAME_RATE)
     return action
 
@@ -46,13 +87,8 @@ if __name__ == "__main__":
     import platform
     import subprocess
 
-    from src.constants import (
-        MAIN_WIN_WIDTH,
-        MAIN_WIN_HEIGHT,
-        BLACK,
-        FRAME_RATE,
-    )
-    from src.gui import constant_sprites, fonts
+    from src.constants import MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT
+    from src.gui import constant_sprites
     from src.services.language import STR_GAME_TITLE
     from src.game_entities.movable import Movable
     from src.game_entities.character import Character
@@ -4,7 +4,6 @@ Defines Building class, an entity that can be visited by the player
 
 from __future__ import annotations
 
-import os
 from typing import Optional
 
 import pygame
@@ -16,6 +15,7 @@ from src.game_entities.entity import Entity
 from src.gui.fonts import fonts
 from src.gui.position import Position
 from src.services.language import *
+from src.services.sound_manager import load_sound, play_sound
 
 
 class Building(Entity):
@@ -57,18 +57,10 @@ class Building(Entity):
         super().__init__(name, position, sprite if sprite else sprite_link)
         self.sprite_link: str = sprite_link
         self.interaction: dict[str, any] = interaction
-        self.door_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "door.ogg")
-        )
-        self.talk_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "talking.ogg")
-        )
-        self.gold_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "trade.ogg")
-        )
-        self.inventory_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "inventory.ogg")
-        )
+        self.door_sfx: Optional[pygame.mixer.Sound] = load_sound("door.ogg")
+        self.talk_sfx: Optional[pygame.mixer.Sound] = load_sound("talking.ogg")
+        self.gold_sfx: Optional[pygame.mixer.Sound] = load_sound("trade.ogg")
+        self.inventory_sfx: Optional[pygame.mixer.Sound] = load_sound("inventory.ogg")
 
     def interact(self, actor: Character) -> list[list[BoxElement]]:
         """
@@ -87,16 +79,16 @@ class Building(Entity):
         entries: list[list[BoxElement]] = []
 
         if not self.interaction:
-            pygame.mixer.Sound.play(self.door_sfx)
+            play_sound(self.door_sfx)
             entries.append(
                 [TextElement(STR_THIS_HOUSE_SEEMS_CLOSED, font=fonts["ITEM_DESC_FONT"])]
             )
         else:
-            pygame.mixer.Sound.play(self.talk_sfx)
+            play_sound(self.talk_sfx)
             for talk in self.interaction["talks"]:
                 entries.append([TextElement(talk, font=fonts["ITEM_DESC_FONT"])])
             if "gold" in self.interaction and self.interaction["gold"] > 0:
-                pygame.mixer.Sound.play(self.gold_sfx)
+                play_sound(self.gold_sfx)
                 actor.gold += self.interaction["gold"]
                 earn_text: str = f_YOU_RECEIVED_NUMBER_GOLD(self.interaction["gold"])
                 entries.append(
@@ -107,7 +99,7 @@ class Building(Entity):
                     ]
                 )
             if "item" in self.interaction and self.interaction["item"]:
-                pygame.mixer.Sound.play(self.inventory_sfx)
+                play_sound(self.inventory_sfx)
                 actor.set_item(self.interaction["item"])
                 earn_text: str = f_YOU_RECEIVED_ITEM(self.interaction["item"])
                 entries.append(
@@ -128,6 +120,22 @@ class Building(Entity):
         """
         self.interaction = None
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the building that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.interaction
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the building back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        entity_state, self.interaction = state
+        super().restore(entity_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the building in XML format.
@@ -24,6 +24,7 @@ from src.game_entities.weapon import Weapon
 from src.gui.fonts import fonts
 from src.gui.position import Position
 from src.services.language import *
+from src.services.random_manager import RandomSubsystem, get_random_generator
 
 
 class Character(Movable):
@@ -160,6 +161,15 @@ class Character(Movable):
         for equipment in self.equipments:
             equipment.display(screen, self.position, True)
 
+    def get_display_signature(self) -> tuple:
+        """
+        Return everything deciding how the character and its equipment are drawn,
+        as a comparable value.
+        """
+        return super().get_display_signature() + tuple(
+            id(equipment.equipped_sprite) for equipment in self.equipments
+        )
+
     def lvl_up(self) -> None:
         """
         Handle the up of the level by one.
@@ -169,13 +179,19 @@ class Character(Movable):
         self.stats_up()
 
     # TODO : refactor part of this code in Shield class
-    def parried(self) -> bool:
+    def parried(self, random_generator: Optional[random.Random] = None) -> bool:
         """
         Compute and return whether the character parried the ongoing attack or not.
+
+        Keyword arguments:
+        random_generator -- the generator drawing the parry chance,
+        the combat stream of the active level if it is not given
         """
+        if random_generator is None:
+            random_generator = get_random_generator(RandomSubsystem.COMBAT)
         for equipment in self.equipments:
             if isinstance(equipment, Shield):
-                parried: bool = random.randint(1, 100) <= equipment.parry
+                parried: bool = random_generator.randint(1, 100) <= equipment.parry
                 if parried:
                     if equipment.used() <= 0:
                         self.remove_equipment(equipment)
@@ -219,24 +235,30 @@ class Character(Movable):
                 self.remove_equipment(weapon)
         return damage
 
-    def stats_up(self, nb_lvl: int = 1) -> None:
+    def stats_up(
+        self, nb_lvl: int = 1, random_generator: Optional[random.Random] = None
+    ) -> None:
         """
         Compute the increasing of each statistics for each level up.
 
         Keyword arguments:
         nb_lvl -- the number of levels earned
+        random_generator -- the generator drawing the increases,
+        the growth stream of the active level if it is not given
         """
+        if random_generator is None:
+            random_generator = get_random_generator(RandomSubsystem.GROWTH)
         for _ in range(nb_lvl):
-            hp_increased: int = random.choice(
+            hp_increased: int = random_generator.choice(
                 self.classes_data[self.classes[0]]["stats_up"]["hp"]
             )
-            self.defense += random.choice(
+            self.defense += random_generator.choice(
                 self.classes_data[self.classes[0]]["stats_up"]["def"]
             )
-            self.resistance += random.choice(
+            self.resistance += random_generator.choice(
                 self.classes_data[self.classes[0]]["stats_up"]["res"]
             )
-            self.strength += random.choice(
+            self.strength += random_generator.choice(
                 self.classes_data[self.classes[0]]["stats_up"]["str"]
             )
             self.hit_points_max += hp_increased
@@ -433,6 +455,31 @@ class Character(Movable):
                     best_candidate = item
         self.items.remove(best_candidate)
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the character that can change during a level, as an immutable value.
+        """
+        return (
+            super().snapshot(),
+            tuple((equipment, equipment.snapshot()) for equipment in self.equipments),
+            self.gold,
+            self.join_team,
+        )
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the character back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        movable_state, equipments, self.gold, self.join_team = state
+        super().restore(movable_state)
+        self.equipments = []
+        for equipment, equipment_state in equipments:
+            equipment.restore(equipment_state)
+            self.equipments.append(equipment)
+
     def save(self, tree_name: etree.Element) -> etree.Element:
         """
         Save the current state of the character in XML format.
@@ -5,7 +5,6 @@ or items.
 
 from __future__ import annotations
 
-import os
 import random
 from typing import Sequence, Optional
 
@@ -16,8 +15,8 @@ from src.constants import TILE_SIZE
 from src.game_entities.entity import Entity
 from src.game_entities.item import Item
 from src.gui.position import Position
-
-random.seed()
+from src.services.random_manager import RandomSubsystem, get_random_generator
+from src.services.sound_manager import load_sound, play_sound
 
 
 class Chest(Entity):
@@ -63,12 +62,13 @@ class Chest(Entity):
         self.item: Item = Chest.determine_item(potential_items)
         self.opened: bool = False
         self.pick_lock_initiated: bool = False
-        self.chest_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "chest.ogg")
-        )
+        self.chest_sfx: Optional[pygame.mixer.Sound] = load_sound("chest.ogg")
 
     @staticmethod
-    def determine_item(potential_items: Sequence[tuple[Item, float]]) -> Item:
+    def determine_item(
+        potential_items: Sequence[tuple[Item, float]],
+        random_generator: Optional[random.Random] = None,
+    ) -> Item:
         """
         Determine randomly which item will be contained by the chest
 
@@ -77,14 +77,18 @@ class Chest(Entity):
         Keyword arguments:
         potential_items -- a sequence of potential items that could be in the chest with
         their probability to be the one selected
+        random_generator -- the generator selecting the item,
+        the chests stream of the active level if it is not given
         """
+        if random_generator is None:
+            random_generator = get_random_generator(RandomSubsystem.CHESTS)
         bag: list[Item] = []
         # probability : between 0.1 and 1
         for item, probability in potential_items:
             times = int(probability * 100)
             bag += [item] * times
 
-        return random.choice(bag)
+        return random_generator.choice(bag)
 
     def open(self) -> Optional[Item]:
         """
@@ -98,10 +102,26 @@ class Chest(Entity):
         if not self.opened:
             self.sprite = self.sprite_open
             self.opened = True
-            pygame.mixer.Sound.play(self.chest_sfx)
+            play_sound(self.chest_sfx)
             return self.item
         return None
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the chest that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.opened, self.pick_lock_initiated
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the chest back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        entity_state, self.opened, self.pick_lock_initiated = state
+        super().restore(entity_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the chest in XML format.
@@ -3,13 +3,13 @@ Defines Consumable class, an item that can be consumed by an entity and that mig
 """
 
 from __future__ import annotations
-import os
-from typing import Sequence, List
+from typing import Sequence, List, Optional
 
 import pygame
 
 from src.game_entities.effect import Effect
 from src.game_entities.item import Item
+from src.services.sound_manager import load_sound, play_sound
 
 
 class Consumable(Item):
@@ -39,9 +39,7 @@ class Consumable(Item):
     ) -> None:
         super().__init__(name, sprite, description, price)
         self.effects: Sequence[Effect] = effects
-        self.drink_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "potion.ogg")
-        )
+        self.drink_sfx: Optional[pygame.mixer.Sound] = load_sound("potion.ogg")
 
     def use(self, entity: Movable) -> tuple[bool, Sequence[str]]:  # NOQA
         """
@@ -63,6 +61,6 @@ class Consumable(Item):
             if sub_success:
                 success = True
         if success:
-            pygame.mixer.Sound.play(self.drink_sfx)
+            play_sound(self.drink_sfx)
             entity.remove_item(self)
         return success, messages
@@ -2,16 +2,16 @@
 Defines Destroyable class, an entity that could be destroyed.
 """
 
-import os
 from enum import Enum
-from typing import Union, Sequence
+from typing import Union, Sequence, Optional
 
 import pygame
 from lxml import etree
 
 from src.game_entities.entity import Entity
-from src.gui.constant_sprites import constant_sprites
+from src.gui.constant_sprites import constant_sprites, get_damage_bar
 from src.gui.position import Position
+from src.services.sound_manager import load_sound, play_sound
 
 
 class DamageKind(Enum):
@@ -59,9 +59,7 @@ class Destroyable(Entity):
         self.hit_points: int = hit_points
         self.defense: int = defense
         self.resistance: int = resistance
-        self.attack_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "attack.ogg")
-        )
+        self.attack_sfx: Optional[pygame.mixer.Sound] = load_sound("attack.ogg")
 
     def display_hit_points(self, screen: pygame.Surface) -> None:
         """
@@ -72,27 +70,32 @@ class Destroyable(Entity):
         screen -- the screen on which the bar should be drawn
         """
         if self.hit_points != self.hit_points_max:
-            damage_bar = constant_sprites["lightly_damaged"]
+            damage_tier = "lightly_damaged"
             if self.hit_points < self.hit_points_max * 0.1:
-                damage_bar = constant_sprites["almost_dead"]
+                damage_tier = "almost_dead"
             elif self.hit_points < self.hit_points_max * 0.25:
-                damage_bar = constant_sprites["severely_damaged"]
+                damage_tier = "severely_damaged"
             elif self.hit_points < self.hit_points_max * 0.5:
-                damage_bar = constant_sprites["heavily_damaged"]
+                damage_tier = "heavily_damaged"
             elif self.hit_points < self.hit_points_max * 0.75:
-                damage_bar = constant_sprites["moderately_damaged"]
-            damage_bar = pygame.transform.scale(
-                damage_bar,
-                (
-                    int(
-                        damage_bar.get_width() * (self.hit_points / self.hit_points_max)
-                    ),
-                    damage_bar.get_height(),
+                damage_tier = "moderately_damaged"
+            damage_bar = get_damage_bar(
+                damage_tier,
+                int(
+                    constant_sprites[damage_tier].get_width()
+                    * (self.hit_points / self.hit_points_max)
                 ),
             )
             screen.blit(constant_sprites["hp_bar"], self.position)
             screen.blit(damage_bar, self.position)
 
+    def get_display_signature(self) -> tuple:
+        """
+        Return everything deciding how the destroyable entity and its hit points bar are drawn,
+        as a comparable value.
+        """
+        return super().get_display_signature() + (self.hit_points, self.hit_points_max)
+
     def attacked(
         self, entity: Entity, damage: int, kind: DamageKind, allies: Sequence[Entity]
     ) -> int:
@@ -114,7 +117,7 @@ class Destroyable(Entity):
             real_damage = damage - self.resistance
         elif kind is DamageKind.PHYSICAL:
             real_damage = damage - self.defense
-            pygame.mixer.Sound.play(self.attack_sfx)
+            play_sound(self.attack_sfx)
         else:
             print(f"Error : Invalid kind of attack : {kind}")
             raise SystemError
@@ -147,6 +150,35 @@ class Destroyable(Entity):
         self.hit_points += hp_recovered
         return hp_recovered
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the destroyable entity that can change during a level,
+        as an immutable value.
+        """
+        return (
+            super().snapshot(),
+            self.hit_points,
+            self.hit_points_max,
+            self.defense,
+            self.resistance,
+        )
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the destroyable entity back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        (
+            entity_state,
+            self.hit_points,
+            self.hit_points_max,
+            self.defense,
+            self.resistance,
+        ) = state
+        super().restore(entity_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the destroyable entity in XML format.
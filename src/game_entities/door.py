@@ -37,6 +37,22 @@ class Door(Entity):
         self.sprite_name: str = sprite_link
         self.pick_lock_initiated: bool = pick_lock_initiated
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the door that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.pick_lock_initiated
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the door back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        entity_state, self.pick_lock_initiated = state
+        super().restore(entity_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the door in XML format.
@@ -2,13 +2,16 @@
 Defines Entity class, the base class of all game objects that could be display on the level map.
 """
 
+from __future__ import annotations
+
 import re
-from typing import Union
+from typing import Union, Callable, Optional
 
 import pygame
 
 from src.constants import TILE_SIZE
 from src.gui.position import Position
+from src.gui.tools import load_tile_sprite
 from src.services.language import *
 
 
@@ -28,21 +31,40 @@ class Entity:
     position -- the current position of the entity on screen
     sprite -- the pygame Surface corresponding to the appearance of the entity on screen, it should
     match the size of a tile
+    position_observer -- the callback notified with the entity and its previous position
+    each time the entity changes of position, if there is any
     """
 
     def __init__(
         self, name: str, position: Position, sprite: Union[str, pygame.Surface]
     ) -> None:
+        self.position_observer: Optional[Callable[[Entity, Position], None]] = None
         self.name: str = name
-        self.position: Position = position
+        self._position: Position = position
         self.sprite: pygame.Surface = (
-            sprite
-            if isinstance(sprite, pygame.Surface)
-            else pygame.transform.scale(
-                pygame.image.load(sprite).convert_alpha(), (TILE_SIZE, TILE_SIZE)
-            )
+            sprite if isinstance(sprite, pygame.Surface) else load_tile_sprite(sprite)
         )
 
+    @property
+    def position(self) -> Position:
+        """
+        Return the current position of the entity on screen.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, new_position: Position) -> None:
+        """
+        Set the position of the entity and notify the position observer if there is any.
+
+        Keyword arguments:
+        new_position -- the new position of the entity
+        """
+        previous_position: Position = self._position
+        self._position = new_position
+        if self.position_observer is not None:
+            self.position_observer(self, previous_position)
+
     def display(self, screen: pygame.Surface) -> None:
         """
         Display the entity on the given screen.
@@ -58,6 +80,13 @@ class Entity:
         """
         return self.sprite.get_rect(topleft=self.position)
 
+    def get_display_signature(self) -> tuple:
+        """
+        Return everything deciding how the entity is drawn, as a comparable value,
+        so that it only has to be drawn again when this value changes.
+        """
+        return tuple(self.position), id(self.sprite)
+
     def __str__(self) -> str:
         """
         Return the formatted text version of the entity based on its name,
@@ -81,6 +110,25 @@ class Entity:
         """
         return self.get_rect().collidepoint(position)
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the entity that can change during a level, as an immutable value.
+        The objects composing the state, like the sprite, are shared rather than copied.
+        """
+        return self._position, self.sprite
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the entity back to the one returned by snapshot.
+        The position observer is only notified if the entity changed of position.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        position, self.sprite = state
+        if position != self._position:
+            self.position = position
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the entity in XML format.
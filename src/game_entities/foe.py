@@ -4,7 +4,7 @@ Defines Foe class, a hostile entity which targets players and allies.
 
 from __future__ import annotations
 
-import random as rd
+import random
 from enum import Enum, auto
 from typing import Union, Sequence, Optional
 
@@ -16,6 +16,7 @@ from src.game_entities.item import Item
 from src.game_entities.movable import Movable
 from src.gui.position import Position
 from src.services.language import *
+from src.services.random_manager import RandomSubsystem, get_random_generator
 
 
 class Keyword(Enum):
@@ -106,30 +107,44 @@ class Foe(Movable):
         self.keywords: Sequence[Keyword] = [] if keywords is None else keywords
         self.target_of_mission: Optional[str] = target_of_mission
 
-    def stats_up(self, levels_earned: int = 1) -> None:
+    def stats_up(
+        self, levels_earned: int = 1, random_generator: Optional[random.Random] = None
+    ) -> None:
         """
         Randomly upgrade each stat for each level earned by the foe
 
         Keyword arguments:
         levels_earned -- the number of times the stats should be upgraded
+        random_generator -- the generator drawing the upgrades,
+        the growth stream of the active level if it is not given
         """
+        if random_generator is None:
+            random_generator = get_random_generator(RandomSubsystem.GROWTH)
         grow_rates: dict[str, Sequence[int]] = Foe.grow_rates[self.name]
         for _ in range(levels_earned):
-            self.hit_points_max += rd.choice(grow_rates["hp"])
-            self.defense += rd.choice(grow_rates["def"])
-            self.resistance += rd.choice(grow_rates["res"])
-            self.strength += rd.choice(grow_rates["str"])
+            self.hit_points_max += random_generator.choice(grow_rates["hp"])
+            self.defense += random_generator.choice(grow_rates["def"])
+            self.resistance += random_generator.choice(grow_rates["res"])
+            self.strength += random_generator.choice(grow_rates["str"])
             self.xp_gain = int(self.xp_gain * 1.1)
 
-    def roll_for_loot(self) -> Sequence[Item]:
+    def roll_for_loot(
+        self, random_generator: Optional[random.Random] = None
+    ) -> Sequence[Item]:
         """
         Roll the list of items that would be loot by the entity killing the foe
 
         Return the loot list
+
+        Keyword arguments:
+        random_generator -- the generator rolling the loot,
+        the loot stream of the active level if it is not given
         """
+        if random_generator is None:
+            random_generator = get_random_generator(RandomSubsystem.LOOT)
         loot: list[Item] = []
         for item, probability in self.potential_loot:
-            if rd.random() < probability:
+            if random_generator.random() < probability:
                 loot.append(item)
         return loot
 
@@ -154,6 +169,22 @@ class Foe(Movable):
         """
         return ", ".join([str(reach) for reach in self.reach])
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the foe that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.xp_gain
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the foe back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        movable_state, self.xp_gain = state
+        super().restore(movable_state)
+
     def save(self, tree_name) -> etree.Element:
         """
         Save the current state of the foe in XML format.
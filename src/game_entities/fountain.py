@@ -91,6 +91,22 @@ class Fountain(Entity):
         if self.times == 0:
             self.sprite = self.sprite_empty
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the fountain that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.times
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the fountain back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        entity_state, self.times = state
+        super().restore(entity_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the fountain in XML format.
@@ -56,6 +56,21 @@ class Item:
     def __eq__(self, item: Item) -> bool:
         return self.name == item.name
 
+    def snapshot(self) -> any:
+        """
+        Return the current state of the item that can change during a level, as an immutable value.
+        """
+        return self.resell_price
+
+    def restore(self, state: any) -> None:
+        """
+        Set the state of the item back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        self.resell_price = state
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the item in XML format.
@@ -138,6 +138,22 @@ class Mission:
         elif self.type is MissionType.TURN_LIMIT:
             self.ended = turns <= self.turn_limit
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current progress of the mission, as an immutable value.
+        """
+        return self.ended, tuple(self.succeeded_chars)
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the progress of the mission back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the progress that should be restored
+        """
+        self.ended, succeeded_chars = state
+        self.succeeded_chars = list(succeeded_chars)
+
     def display(self, screen: pygame.Surface) -> None:
         """
         Display the objective tiles on the given screen.
@@ -5,9 +5,8 @@ different classes handling the management of entities that can move, only living
 
 from __future__ import annotations
 
-import os
 from enum import IntEnum, auto, Enum
-from typing import Union, Sequence, Optional
+from typing import TYPE_CHECKING, Union, Sequence, Optional
 
 import pygame
 from lxml import etree
@@ -20,7 +19,12 @@ from src.game_entities.entity import Entity
 from src.game_entities.item import Item
 from src.game_entities.skill import SkillNature, Skill
 from src.gui.position import Position
+from src.gui.tools import load_tile_sprite
 from src.services.language import TRANSLATIONS
+from src.services.sound_manager import load_sound, play_sound
+
+if TYPE_CHECKING:
+    from src.services.influence_map import InfluenceMap
 
 TIMER = 60
 NB_ITEMS_MAX = 8
@@ -50,6 +54,9 @@ class EntityStrategy(Enum):
     SEMI_ACTIVE = auto()
     # Entity always move to get closer to opponents
     ACTIVE = auto()
+    # Entity looks several actions ahead to choose its move, decided by the tactical search of the turn planner,
+    # and behaves like an active entity otherwise
+    TACTICAL = auto()
     # Entity is controlled by a human player
     MANUAL = auto()
 
@@ -148,11 +155,9 @@ class Movable(Destroyable):
         self.state: EntityState = EntityState.HAVE_TO_ACT
         self.target: Optional[Entity] = None
         if complementary_sprite_link:
-            complementary_sprite: pygame.Surface = pygame.transform.scale(
-                pygame.image.load(complementary_sprite_link).convert_alpha(),
-                (TILE_SIZE, TILE_SIZE),
-            )
-            self.sprite.blit(complementary_sprite, (0, 0))
+            # The base sprite may be shared with other entities
+            self.sprite = self.sprite.copy()
+            self.sprite.blit(load_tile_sprite(complementary_sprite_link), (0, 0))
 
         self._attack_kind: DamageKind = (
             DamageKind[attack_kind] if attack_kind is not None else None
@@ -160,18 +165,12 @@ class Movable(Destroyable):
         self.strategy: EntityStrategy = EntityStrategy[strategy]
         self.skills: Sequence[Skill] = skills
 
-        self.walk_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "walk.ogg")
-        )
-        self.skeleton_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "skeleton_walk.ogg")
-        )
-        self.necrophage_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "necro_walk.ogg")
-        )
-        self.centaur_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "cent_walk.ogg")
+        self.walk_sfx: Optional[pygame.mixer.Sound] = load_sound("walk.ogg")
+        self.skeleton_sfx: Optional[pygame.mixer.Sound] = load_sound(
+            "skeleton_walk.ogg"
         )
+        self.necrophage_sfx: Optional[pygame.mixer.Sound] = load_sound("necro_walk.ogg")
+        self.centaur_sfx: Optional[pygame.mixer.Sound] = load_sound("cent_walk.ogg")
 
     def display(self, screen: pygame.Surface) -> None:
         """
@@ -185,6 +184,13 @@ class Movable(Destroyable):
         if self.state in range(EntityState.ON_MOVE, EntityState.HAVE_TO_ATTACK + 1):
             screen.blit(Movable.SELECTED_DISPLAY, self.position)
 
+    def get_display_signature(self) -> tuple:
+        """
+        Return everything deciding how the movable entity and its active indicator are drawn,
+        as a comparable value.
+        """
+        return super().get_display_signature() + (self.state,)
+
     @property
     def attack_kind(self) -> DamageKind:
         """
@@ -282,16 +288,16 @@ class Movable(Destroyable):
         #  but rather according to specific attribute like the race
         if self.strategy == EntityStrategy.MANUAL:
             if self.name == "chrisemon":
-                pygame.mixer.Sound.play(self.centaur_sfx)
+                play_sound(self.centaur_sfx)
             else:
-                pygame.mixer.Sound.play(self.walk_sfx)
+                play_sound(self.walk_sfx)
         elif self.target is not None:
             if self.name == "skeleton":
-                pygame.mixer.Sound.play(self.skeleton_sfx)
+                play_sound(self.skeleton_sfx)
             elif self.name == "necrophage":
-                pygame.mixer.Sound.play(self.necrophage_sfx)
+                play_sound(self.necrophage_sfx)
             elif self.name == "assassin":
-                pygame.mixer.Sound.play(self.walk_sfx)
+                play_sound(self.walk_sfx)
 
     def get_formatted_alterations(self) -> str:
         """
@@ -461,6 +467,16 @@ class Movable(Destroyable):
         if not self.on_move:
             self.state = EntityState.HAVE_TO_ATTACK
 
+    def finish_move(self) -> None:
+        """
+        Move the entity straight to the end of its current movement, without waiting for the timer.
+        """
+        if self.on_move:
+            self.position = self.on_move[-1]
+            self.on_move = []
+        self._timer = TIMER
+        self.state = EntityState.HAVE_TO_ATTACK
+
     def can_attack(self) -> bool:
         """
         Return whether the entity can attack or not
@@ -472,7 +488,12 @@ class Movable(Destroyable):
         return True
 
     def act(
-        self, possible_moves: dict[Position, int], targets: dict[Entity, int]
+        self,
+        possible_moves: dict[Position, int],
+        targets: Sequence[Entity],
+        nearest_target: Optional[Entity] = None,
+        route: Optional[Sequence[Position]] = None,
+        influence_map: Optional[InfluenceMap] = None,
     ) -> Optional[Position]:
         """
         Determine what action should be done by the entity controlled by AI.
@@ -483,20 +504,29 @@ class Movable(Destroyable):
         Keyword arguments:
         possible_moves -- the collection of tiles that could be reached by the entity
         with their associated distance from the entity
-        targets -- the collection of entities that could be attacked with their associated distance from the entity
+        targets -- the ordered sequence of entities that could be attacked
+        nearest_target -- the target that is the nearest from the entity by walking distance if it has been computed
+        route -- the shortest path toward a tile from which the nearest target could be attacked if it has been computed
+        influence_map -- the influence map of the side of the entity if it is up to date with the targets
         """
         if self.state is EntityState.HAVE_TO_ACT:
-            return self.determine_move(possible_moves, targets)
+            return self.determine_move(
+                possible_moves, targets, nearest_target, route, influence_map
+            )
         if self.state is EntityState.ON_MOVE:
             self.move()
         elif self.state is EntityState.HAVE_TO_ATTACK:
-            attack = self.determine_attack(targets)
+            attack = self.determine_attack(targets, influence_map)
             if self.can_attack() and attack:
                 return attack
             self.end_turn()
         return None
 
-    def determine_attack(self, targets: Sequence[Entity]) -> Optional[Position]:
+    def determine_attack(
+        self,
+        targets: Sequence[Entity],
+        influence_map: Optional[InfluenceMap] = None,
+    ) -> Optional[Position]:
         """
         Determine which entity should be attacked by the entity controlled by AI.
 
@@ -504,7 +534,15 @@ class Movable(Destroyable):
 
         Keyword arguments:
         targets -- the sequence of entities that could be attacked
+        influence_map -- the influence map of the side of the entity, used to look up
+        the targets around the entity instead of scanning all of them if it is given
         """
+        if influence_map is not None:
+            targets_in_reach = influence_map.get_targets_in_reach(self.position, self.reach)
+            if self.target and any(target is self.target for target in targets_in_reach):
+                return self.target.position
+            return targets_in_reach[-1].position if targets_in_reach else None
+
         temporary_attack: Optional[Position] = None
         for distance in self.reach:
             for target in targets:
@@ -519,7 +557,12 @@ class Movable(Destroyable):
         return temporary_attack
 
     def determine_move(
-        self, possible_moves: dict[Position, int], targets: dict[Entity, int]
+        self,
+        possible_moves: dict[Position, int],
+        targets: Sequence[Entity],
+        nearest_target: Optional[Entity] = None,
+        route: Optional[Sequence[Position]] = None,
+        influence_map: Optional[InfluenceMap] = None,
     ) -> Position:
         """
         Determine which movement should be selected by the entity controlled by AI.
@@ -530,11 +573,25 @@ class Movable(Destroyable):
         Keyword arguments:
         possible_moves -- the collection of tiles that could be reached by the entity
         with their associated distance from the entity
-        targets -- the collection of entities that could be attacked with their associated distance from the entity
+        targets -- the ordered sequence of entities that could be attacked
+        nearest_target -- the target that is the nearest from the entity by walking distance,
+        required by the active strategy, the tactical strategy falling back on the nearest one
+        as the crow flies
+        route -- the shortest path toward a tile from which the nearest target could be attacked,
+        followed as far as possible by the active strategy if it is given
+        influence_map -- the influence map of the side of the entity, used to find a move
+        next to a target instead of scanning all of them if it is given
         """
         self.target: Optional[Position] = None
-        if self.strategy is EntityStrategy.SEMI_ACTIVE:
-            for target, dist in targets.items():
+        if self.strategy is EntityStrategy.SEMI_ACTIVE and influence_map is not None:
+            move_next_to_target = influence_map.find_move_next_to_target(
+                list(possible_moves), self.reach
+            )
+            if move_next_to_target is not None:
+                move, self.target = move_next_to_target
+                return move
+        elif self.strategy is EntityStrategy.SEMI_ACTIVE:
+            for target in targets:
                 for distance in self.reach:
                     for move in possible_moves:
                         # Try to find move next to one target
@@ -545,9 +602,26 @@ class Movable(Destroyable):
                         ):
                             self.target = target
                             return move
-        elif self.strategy is EntityStrategy.ACTIVE:
+        if self.strategy is EntityStrategy.TACTICAL and nearest_target is None and targets:
+            # Without the tactical search of the turn planner, the entity behaves like an active one
+            nearest_target = min(
+                targets,
+                key=lambda target: abs(target.position[0] - self.position[0])
+                + abs(target.position[1] - self.position[1]),
+            )
+        if (
+            self.strategy in (EntityStrategy.ACTIVE, EntityStrategy.TACTICAL)
+            and nearest_target is not None
+        ):
             # Targets the nearest opponent
-            self.target = min(targets.keys(), key=(lambda k: targets[k]))
+            self.target = nearest_target
+            if route is not None:
+                # Go as far as possible along the path to the target
+                for move in reversed(route):
+                    if tuple(move) in possible_moves:
+                        return move
+                if not route:
+                    return self.position
             best_move = self.position
             min_dist = INITIAL_MAX
             for distance in self.reach:
@@ -582,6 +656,59 @@ class Movable(Destroyable):
         for alteration in self.alterations:
             alteration.increment()
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the movable entity that can change during a level,
+        as an immutable value.
+        Alterations and items are shared with the entity, only their own changing values are captured.
+        """
+        return (
+            super().snapshot(),
+            self.state,
+            tuple(self.on_move),
+            self._timer,
+            self.target,
+            self._max_moves,
+            self.strength,
+            self.lvl,
+            self.experience,
+            self.experience_to_lvl_up,
+            tuple((alteration, alteration.time) for alteration in self.alterations),
+            tuple((item, item.snapshot()) for item in self.items),
+        )
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the movable entity back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        (
+            destroyable_state,
+            self.state,
+            on_move,
+            self._timer,
+            self.target,
+            self._max_moves,
+            self.strength,
+            self.lvl,
+            self.experience,
+            self.experience_to_lvl_up,
+            alterations,
+            items,
+        ) = state
+        super().restore(destroyable_state)
+        self.on_move = list(on_move)
+        self.alterations = []
+        for alteration, time in alterations:
+            alteration.time = time
+            self.alterations.append(alteration)
+        self.items = []
+        for item, item_state in items:
+            item.restore(item_state)
+            self.items.append(item)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the movable entity in XML format.
@@ -215,6 +215,13 @@ class Player(Character):
             if not self.on_move:
                 self.state = PlayerState.WAITING_POST_ACTION
 
+    def finish_move(self) -> None:
+        """
+        Move the player straight to the end of its current movement, without waiting for the timer.
+        """
+        Character.finish_move(self)
+        self.state = PlayerState.WAITING_POST_ACTION
+
     def cancel_move(self) -> bool:
         """
         Try to cancel the last move action of the player.
@@ -318,6 +325,28 @@ class Player(Character):
         """Handle the selection of a target for an attack"""
         self.state = PlayerState.WAITING_TARGET
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the player that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self._selected, self.old_position, self.current_action
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the player back to the one returned by snapshot.
+        The equipment is greyed out again if the turn of the player was finished.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        character_state, self._selected, self.old_position, self.current_action = state
+        super().restore(character_state)
+        for equipment in self.equipments:
+            if self.turn_is_finished():
+                equipment.set_grey()
+            else:
+                equipment.unset_grey()
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the player in XML format.
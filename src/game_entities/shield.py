@@ -78,6 +78,22 @@ class Shield(Equipment):
         )
         return self.durability
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the shield that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.durability
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the shield back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        item_state, self.durability = state
+        super().restore(item_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the shield in XML format.
@@ -4,11 +4,10 @@ Defines Shop class, a Building in which a player character can buy or sell stuff
 
 from __future__ import annotations
 
-import os
 from copy import copy
 from typing import Optional
 
-import pygame.mixer
+import pygame
 from lxml import etree
 from pygamepopup.components import BoxElement, Button, TextElement, InfoBox
 
@@ -19,6 +18,7 @@ from src.gui.fonts import fonts
 from src.gui.position import Position
 from src.services.language import *
 from src.services import menu_creator_manager
+from src.services.sound_manager import load_sound, play_sound
 
 
 class Shop(Building):
@@ -37,7 +37,7 @@ class Shop(Building):
     Attributes:
     current_visitor -- the reference to the current character visiting the shop
     stock -- the data structure containing all the available items to be bought with their associated quantity
-    menu -- the shop menu displaying all the items that could be bought
+    menu -- the shop menu displaying all the items that could be bought, built at the first visit
     gold_sfx -- the sound that should be started when an item is sold or bought
     """
 
@@ -58,12 +58,9 @@ class Shop(Building):
         self.current_visitor: Optional[Character] = None
         self.stock: list[dict[str, any]] = stock
         self.interaction: dict[str, any] = interaction
-        self.menu: InfoBox = menu_creator_manager.create_shop_menu(
-            Shop.interaction_callback, self.stock, 0
-        )
-        self.gold_sfx: pygame.mixer.Sound = pygame.mixer.Sound(
-            os.path.join("sound_fx", "trade.ogg")
-        )
+        # The menu is built when the shop is visited for the first time
+        self.menu: Optional[InfoBox] = None
+        self.gold_sfx: Optional[pygame.mixer.Sound] = load_sound("trade.ogg")
 
     def get_item_entry(self, item: Item) -> Optional[dict[str, any]]:
         """
@@ -108,7 +105,7 @@ class Shop(Building):
 
         if self.interaction:
             for talk in self.interaction["talks"]:
-                pygame.mixer.Sound.play(self.talk_sfx)
+                play_sound(self.talk_sfx)
                 grid_element.append([TextElement(talk, font=fonts["ITEM_DESC_FONT"])])
 
         return grid_element
@@ -126,7 +123,7 @@ class Shop(Building):
         """
         if self.current_visitor.gold >= item.price:
             if len(self.current_visitor.items) < self.current_visitor.nb_items_max:
-                pygame.mixer.Sound.play(self.gold_sfx)
+                play_sound(self.gold_sfx)
 
                 self.current_visitor.gold -= item.price
                 self.current_visitor.set_item(copy(item))
@@ -163,6 +160,30 @@ class Shop(Building):
             return True, STR_THE_ITEM_HAS_BEEN_SOLD
         return False, STR_THIS_ITEM_CANT_BE_SOLD
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the shop that can change during a level, as an immutable value.
+        """
+        return (
+            super().snapshot(),
+            tuple((entry, entry["quantity"]) for entry in self.stock),
+            self.current_visitor,
+        )
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the shop back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        building_state, stock, self.current_visitor = state
+        super().restore(building_state)
+        self.stock = []
+        for entry, quantity in stock:
+            entry["quantity"] = quantity
+            self.stock.append(entry)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the shop in XML format.
@@ -5,17 +5,21 @@ Defines Weapon class, specific equipment with which an entity can attack.
 from __future__ import annotations
 
 import random
-from typing import Sequence
+from typing import TYPE_CHECKING, Optional, Sequence
 
 from lxml import etree
 
-from src.game_entities.destroyable import DamageKind
+from src.game_entities.destroyable import DamageKind, Destroyable
 from src.game_entities.effect import Effect
 from src.game_entities.equipment import Equipment
 from src.game_entities.foe import Keyword
 from src.game_entities.skill import SkillNature
 from src.gui.tools import distance
 from src.services.language import TRANSLATIONS
+from src.services.random_manager import RandomSubsystem, get_random_generator
+
+if TYPE_CHECKING:
+    from src.game_entities.character import Character
 
 
 class Weapon(Equipment):
@@ -129,7 +133,10 @@ class Weapon(Equipment):
         return self.durability
 
     def apply_effects(
-        self, user: Character, target: Destroyable  # NOQA
+        self,
+        user: Character,
+        target: Destroyable,
+        random_generator: Optional[random.Random] = None,
     ) -> Sequence[Effect]:
         """
         Check if some effects from the list of possible effects are triggered after the use of the weapon
@@ -139,7 +146,11 @@ class Weapon(Equipment):
         Keyword arguments:
         user -- the bearer of the weapon
         target -- the target of the ongoing attack
+        random_generator -- the generator drawing the chance of each effect,
+        the effects stream of the active level if it is not given
         """
+        if random_generator is None:
+            random_generator = get_random_generator(RandomSubsystem.EFFECTS)
         # Try to trigger one or more effects
         effects = []
         for effect in self.effects:
@@ -151,10 +162,26 @@ class Weapon(Equipment):
                 ):
                     probability += skill.power
 
-            if random.randint(0, 100) < probability:
+            if random_generator.randint(0, 100) < probability:
                 effects.append(effect["effect"])
         return effects
 
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of the weapon that can change during a level, as an immutable value.
+        """
+        return super().snapshot(), self.durability
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the state of the weapon back to the one returned by snapshot.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        item_state, self.durability = state
+        super().restore(item_state)
+
     def save(self, tree_name: str) -> etree.Element:
         """
         Save the current state of the weapon in XML format.
@@ -4,6 +4,8 @@ The init_constant_sprites function should be called at the beginning of the appl
 after pygame initialization and after the initialization of at least one pygame window.
 """
 
+from typing import Optional
+
 import pygame
 
 from src.gui.fonts import fonts
@@ -36,6 +38,8 @@ ALMOST_DEAD_SPRITE = "imgs/dungeon_crawl/misc/damage_meter_almost_dead.png"
 HP_BAR_SPRITE = "imgs/dungeon_crawl/misc/damage_meter_sample.png"
 
 constant_sprites = {}
+# Damage bars already cut to a given width, by damage tier and width
+_damage_bars: dict[tuple[str, int], pygame.Surface] = {}
 
 
 def init_constant_sprites() -> None:
@@ -128,3 +132,25 @@ def init_constant_sprites() -> None:
     constant_sprites["hp_bar"] = pygame.transform.scale(
         pygame.image.load(HP_BAR_SPRITE).convert_alpha(), (TILE_SIZE, TILE_SIZE)
     )
+    _damage_bars.clear()
+
+
+def get_damage_bar(damage_tier: str, width: int) -> pygame.Surface:
+    """
+    Return the damage bar sprite of the given tier scaled to the given width.
+    Each bar is only scaled once and then shared, since the widths of the bars
+    of damaged entities never exceed the size of a tile, there are few of them.
+
+    Keyword arguments:
+    damage_tier -- the name of the constant sprite of the damage bar, like "lightly_damaged"
+    width -- the width in pixels the bar should have
+    """
+    key: tuple[str, int] = (damage_tier, width)
+    damage_bar: Optional[pygame.Surface] = _damage_bars.get(key)
+    if damage_bar is None:
+        damage_bar = pygame.transform.scale(
+            constant_sprites[damage_tier],
+            (width, constant_sprites[damage_tier].get_height()),
+        )
+        _damage_bars[key] = damage_bar
+    return damage_bar
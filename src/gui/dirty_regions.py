@@ -0,0 +1,117 @@
+"""
+Defines DirtyRegionTracker class, finding the parts of a surface that should be drawn again
+from one frame to the next, and the merge_rects function.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, Optional, Sequence
+
+import pygame
+
+# Beyond this number of changed parts, the surface is drawn again entirely
+MAX_DIRTY_RECTS: int = 24
+
+# A region is the rect covered by an element on the surface and the value of everything
+# that decides how the element is drawn
+Region = tuple[pygame.Rect, Hashable]
+
+
+def merge_rects(rects: Sequence[pygame.Rect]) -> list[pygame.Rect]:
+    """
+    Return the given rects with the overlapping ones merged into their union,
+    so that no pixel is drawn twice.
+
+    Keyword arguments:
+    rects -- the rects that should be merged
+    """
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        rect = rect.copy()
+        index: int = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRegionTracker:
+    """
+    A DirtyRegionTracker compares the regions displayed on a surface at each frame
+    with the ones displayed at the previous frame.
+
+    Each region is identified by a key, and is made of the rect covered by an element
+    and a signature describing how the element is drawn.
+    A region is dirty if it appeared, disappeared, moved or if its signature changed,
+    both its previous and its new rect then have to be drawn again.
+
+    Keyword arguments:
+    max_rects -- the number of dirty rects beyond which the whole surface is drawn again
+
+    Attributes:
+    max_rects -- the number of dirty rects beyond which the whole surface is drawn again
+    regions -- the regions displayed at the previous frame by key
+    invalidated_rects -- the rects that should be drawn again at the next frame, whatever happens
+    full_redraw -- whether the whole surface should be drawn again at the next frame
+    """
+
+    def __init__(self, max_rects: int = MAX_DIRTY_RECTS) -> None:
+        self.max_rects: int = max_rects
+        self.regions: dict[Hashable, Region] = {}
+        self.invalidated_rects: list[pygame.Rect] = []
+        self.full_redraw: bool = True
+
+    def invalidate(self, rect: Optional[pygame.Rect] = None) -> None:
+        """
+        Ask for the given rect to be drawn again at the next frame.
+
+        Keyword arguments:
+        rect -- the rect that should be drawn again, the whole surface if it is not given
+        """
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.invalidated_rects.append(pygame.Rect(rect))
+
+    def update(
+        self, regions: dict[Hashable, Region], redraw_all: bool = False
+    ) -> Optional[list[pygame.Rect]]:
+        """
+        Register the regions of the new frame and return the rects that should be drawn again,
+        None if the whole surface should be drawn again.
+
+        The frame following a full drawing requested by redraw_all is drawn entirely too,
+        so that everything that was only displayed during the full drawings is erased.
+
+        Keyword arguments:
+        regions -- the regions of the new frame by key
+        redraw_all -- whether the whole surface should be drawn again,
+        like while an element that is not tracked is displayed
+        """
+        previous_regions: dict[Hashable, Region] = self.regions
+        self.regions = regions
+        invalidated_rects: list[pygame.Rect] = self.invalidated_rects
+        self.invalidated_rects = []
+        if self.full_redraw or redraw_all:
+            self.full_redraw = redraw_all
+            return None
+
+        dirty_rects: list[pygame.Rect] = invalidated_rects
+        for key, region in regions.items():
+            previous_region: Optional[Region] = previous_regions.get(key)
+            if previous_region is None:
+                dirty_rects.append(region[0])
+            elif previous_region != region:
+                dirty_rects.append(previous_region[0])
+                dirty_rects.append(region[0])
+        for key, previous_region in previous_regions.items():
+            if key not in regions:
+                dirty_rects.append(previous_region[0])
+
+        dirty_rects = merge_rects(dirty_rects)
+        if len(dirty_rects) > self.max_rects:
+            return None
+        return dirty_rects
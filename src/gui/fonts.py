@@ -2,13 +2,23 @@
 Defines fonts that will be used all over the application.
 The init_fonts function should be called at the beginning of the application
 after pygame initialization.
+
+Also defines the render_text function, rendering texts with these fonts
+through a cache of the most recently rendered texts.
 """
+from collections import OrderedDict
 from typing import Dict
 from src.services.language import *
 import pygame
 
+# Memory in bytes that the rendered texts kept in the cache can use at most
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
 fonts: Dict[str, pygame.font.Font] = {}
 
+_rendered_texts: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+_rendered_texts_bytes: int = 0
+
 
 def init_fonts() -> None:
     """
@@ -22,3 +32,47 @@ def init_fonts() -> None:
             fonts[font_name] = pygame.font.SysFont("arial", 20, True)
         else:
             fonts[font_name] = pygame.font.Font(font["name"], font["size"])
+    clear_rendered_texts()
+
+
+def render_text(
+    font: pygame.font.Font, text: str, color: pygame.Color, antialias: bool = True
+) -> pygame.Surface:
+    """
+    Return the given text rendered with the given font and color.
+    Rendered texts are kept and shared, the least recently used ones being dropped once
+    they use more than TEXT_CACHE_MAX_BYTES, the returned surface should be copied before being modified.
+
+    Keyword arguments:
+    font -- the font with which the text should be rendered
+    text -- the text that should be rendered
+    color -- the color of the text
+    antialias -- whether the text should have smooth edges
+    """
+    global _rendered_texts_bytes
+    key = (id(font), text, tuple(color), antialias)
+    rendered_text = _rendered_texts.get(key)
+    if rendered_text is not None:
+        _rendered_texts.move_to_end(key)
+        return rendered_text
+
+    rendered_text = font.render(text, antialias, color)
+    _rendered_texts[key] = rendered_text
+    _rendered_texts_bytes += _get_surface_bytes(rendered_text)
+    while _rendered_texts_bytes > TEXT_CACHE_MAX_BYTES and len(_rendered_texts) > 1:
+        _, dropped_text = _rendered_texts.popitem(last=False)
+        _rendered_texts_bytes -= _get_surface_bytes(dropped_text)
+    return rendered_text
+
+
+def clear_rendered_texts() -> None:
+    """
+    Drop all the rendered texts kept in the cache.
+    """
+    global _rendered_texts_bytes
+    _rendered_texts.clear()
+    _rendered_texts_bytes = 0
+
+
+def _get_surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
@@ -0,0 +1,124 @@
+"""
+Defines RangeOverlay class, the translucent layer highlighting tiles of a level
+like the possible moves and attacks of a unit.
+"""
+
+from __future__ import annotations
+
+from typing import Collection, Optional, Sequence
+
+import numpy as np
+import pygame
+
+from src.gui.position import Position
+
+# A group of tiles highlighted the same way: the sprite drawn on each tile, its opacity,
+# the tiles and the tile that should be skipped if there is any
+HighlightedTiles = tuple[pygame.Surface, int, Collection[Position], Optional[Position]]
+
+
+class RangeOverlay:
+    """
+    A RangeOverlay draws the highlighted tiles of a level once on a transparent layer,
+    and then displays this layer with a single blit at each frame.
+
+    The layer is only drawn again when the highlighted tiles change.
+    Changes are detected by comparing the highlighted tiles with the ones drawn on the layer
+    through the identity and the size of each collection of tiles,
+    so that no tile has to be visited as long as the collections are the same.
+
+    The layer holds premultiplied colors, so that it is blended over the screen
+    as if each highlighted tile had been blended one after the other.
+
+    Keyword arguments:
+    size -- the size of the layer, that is the size of the screen on which it is displayed
+
+    Attributes:
+    surface -- the layer on which the highlighted tiles are drawn
+    area -- the rect covering all the highlighted tiles on the layer
+    version -- the number of times the layer has been drawn
+    """
+
+    def __init__(self, size: tuple[int, int]) -> None:
+        self.surface: pygame.Surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.area: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        self.version: int = 0
+        self._drawn_tiles: list[tuple] = []
+        self._tile_sprites: dict[tuple[int, int], tuple[pygame.Surface, pygame.Surface]] = {}
+
+    def update(self, highlighted_tiles: Sequence[HighlightedTiles]) -> None:
+        """
+        Draw the given highlighted tiles on the layer if they changed since the last update.
+
+        Keyword arguments:
+        highlighted_tiles -- the groups of tiles that are highlighted, in their drawing order
+        """
+        # The collections are kept rather than their identity, so that they can't be replaced
+        # by new ones having the same identity
+        drawn_tiles: list[tuple] = [
+            (
+                sprite,
+                tiles,
+                (
+                    opacity,
+                    len(tiles),
+                    tuple(skipped_tile) if skipped_tile is not None else None,
+                ),
+            )
+            for sprite, opacity, tiles, skipped_tile in highlighted_tiles
+        ]
+        if len(drawn_tiles) == len(self._drawn_tiles) and all(
+            sprite is drawn_sprite and tiles is drawn_group and properties == drawn_properties
+            for (sprite, tiles, properties), (drawn_sprite, drawn_group, drawn_properties) in zip(
+                drawn_tiles, self._drawn_tiles
+            )
+        ):
+            return
+        self._drawn_tiles = drawn_tiles
+        self.version += 1
+
+        self.surface.fill((0, 0, 0, 0), self.area)
+        tile_rects: list[pygame.Rect] = []
+        for sprite, opacity, tiles, skipped_tile in highlighted_tiles:
+            if skipped_tile is not None:
+                skipped_tile = tuple(skipped_tile)
+            tile_sprite: pygame.Surface = self._get_tile_sprite(sprite, opacity)
+            for tile in tiles:
+                if skipped_tile is not None and skipped_tile == tuple(tile):
+                    continue
+                tile_rects.append(
+                    self.surface.blit(
+                        tile_sprite, tile, special_flags=pygame.BLEND_PREMULTIPLIED
+                    )
+                )
+        self.area = (
+            tile_rects[0].unionall(tile_rects[1:]) if tile_rects else pygame.Rect(0, 0, 0, 0)
+        )
+
+    def display(self, screen: pygame.Surface) -> None:
+        """
+        Display the highlighted tiles on the given screen.
+
+        Keyword arguments:
+        screen -- the screen on which the highlighted tiles should be drawn
+        """
+        if self.area:
+            screen.blit(
+                self.surface,
+                self.area.topleft,
+                self.area,
+                special_flags=pygame.BLEND_PREMULTIPLIED,
+            )
+
+    def _get_tile_sprite(self, sprite: pygame.Surface, opacity: int) -> pygame.Surface:
+        key: tuple[int, int] = (id(sprite), opacity)
+        if key not in self._tile_sprites or self._tile_sprites[key][0] is not sprite:
+            tile_sprite: pygame.Surface = sprite.copy()
+            alpha: np.ndarray = pygame.surfarray.pixels_alpha(tile_sprite)
+            colors: np.ndarray = pygame.surfarray.pixels3d(tile_sprite)
+            # Apply the opacity like set_alpha would do, then premultiply the colors
+            alpha[:] = alpha.astype(np.uint16) * min(opacity, 255) // 255
+            colors[:] = colors.astype(np.uint16) * alpha[..., np.newaxis] // 255
+            del alpha, colors
+            self._tile_sprites[key] = (sprite, tile_sprite)
+        return self._tile_sprites[key][1]
@@ -2,7 +2,7 @@
 Defines Sidebar class, an element of the GUI that will be display permanently
 at the bottom of the screen.
 """
-from typing import Sequence, Tuple
+from typing import Optional, Sequence, Tuple
 
 import pygame
 
@@ -22,7 +22,7 @@ from src.game_entities.mission import Mission
 from src.game_entities.movable import Movable
 from src.game_entities.player import Player
 from src.gui.constant_sprites import constant_sprites
-from src.gui.fonts import fonts
+from src.gui.fonts import fonts, render_text
 from src.gui.position import Position
 from src.gui.tools import determine_gauge_color
 from src.services.language import *
@@ -51,6 +51,8 @@ class Sidebar:
     sprite -- the pygame Surface representing the background of the sidebar
     missions -- the list of missions that should be accomplished by the players
     level_id -- id of the current level
+    rendered_sidebar -- the last rendering of the sidebar
+    rendered_signature -- the information shown by the last rendering of the sidebar
     """
 
     def __init__(
@@ -67,57 +69,103 @@ class Sidebar:
         )
         self.missions: Sequence[Mission] = missions
         self.level_id: int = level_id
+        self.rendered_sidebar: pygame.Surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.rendered_signature: Optional[tuple] = None
+
+    def get_rect(self) -> pygame.Rect:
+        """
+        Return the pygame Rect covered by the sidebar.
+        """
+        return pygame.Rect(self.position, self.size)
+
+    def get_display_signature(self, number_turns: int, hovered_entity: Entity) -> tuple:
+        """
+        Return everything deciding how the sidebar is drawn, as a comparable value,
+        so that it only has to be drawn again when this value changes.
+
+        Keyword arguments:
+        number_turns -- the current turn of the ongoing level
+        hovered_entity -- the currently hovered entity if there is any
+        """
+        hovered_signature: Optional[tuple] = None
+        if hovered_entity:
+            hovered_signature = (id(hovered_entity), hovered_entity.get_display_signature())
+            if isinstance(hovered_entity, Movable):
+                hovered_signature += (
+                    hovered_entity.lvl,
+                    hovered_entity.get_abbreviated_alterations(),
+                )
+        return (
+            number_turns,
+            tuple(mission.ended for mission in self.missions),
+            hovered_signature,
+        )
 
     def display(
         self, screen: pygame.Surface, number_turns: int, hovered_entity: Entity
     ) -> None:
         """
         Display the sidebar and all the expected information on the screen provided.
+        The sidebar is only rendered again when the information it shows changed.
 
         Keyword arguments:
         screen -- the screen on which the elements should be displayed
         number_turns -- the current turn of the ongoing level
         hovered_entity -- the currently hovered entity if there is any
         """
+        signature: tuple = self.get_display_signature(number_turns, hovered_entity)
+        if signature != self.rendered_signature:
+            self.rendered_sidebar.fill((0, 0, 0, 0))
+            self._render(self.rendered_sidebar, (0, 0), number_turns, hovered_entity)
+            self.rendered_signature = signature
+        screen.blit(self.rendered_sidebar, self.position)
+
+    def _render(
+        self,
+        screen: pygame.Surface,
+        position: Position,
+        number_turns: int,
+        hovered_entity: Entity,
+    ) -> None:
         # Sidebar background
-        screen.blit(self.sprite, self.position)
+        screen.blit(self.sprite, position)
 
         # Turn indication
-        turn_text: pygame.Surface = fonts["MENU_TITLE_FONT"].render(
-            f_TURN_NUMBER_SIDEBAR(number_turns), True, BLACK
+        turn_text: pygame.Surface = render_text(
+            fonts["MENU_TITLE_FONT"], f_TURN_NUMBER_SIDEBAR(number_turns), BLACK
         )
-        screen.blit(turn_text, (self.position[0] + 50, self.position[1] + 15))
+        screen.blit(turn_text, (position[0] + 50, position[1] + 15))
 
         # Level indication
-        turn_text: pygame.Surface = fonts["MENU_TITLE_FONT"].render(
-            f_LEVEL_NUMBER_SIDEBAR(self.level_id), True, BLACK
+        turn_text: pygame.Surface = render_text(
+            fonts["MENU_TITLE_FONT"], f_LEVEL_NUMBER_SIDEBAR(self.level_id), BLACK
         )
-        screen.blit(turn_text, (self.position[0] + 50, self.position[1] + 50))
+        screen.blit(turn_text, (position[0] + 50, position[1] + 50))
 
         # Main mission header
         screen.blit(
             constant_sprites["main_mission_text"],
-            (self.position[0] + self.size[0] - 500, self.position[1] + 10),
+            (position[0] + self.size[0] - 500, position[1] + 10),
         )
         # Secondaries missions header if any
         if len(self.missions) > 1:
             screen.blit(
                 constant_sprites["secondaries_mission_text"],
-                (self.position[0] + self.size[0] - 300, self.position[1] + 10),
+                (position[0] + self.size[0] - 300, position[1] + 10),
             )
         # Missions
         vertical_shift: int = 0
         for mission in self.missions:
             mission_color = DARK_GREEN if mission.ended else BROWN_RED
-            mission_description = fonts["MISSION_FONT"].render(
-                f"> {mission.description}", True, mission_color
+            mission_description = render_text(
+                fonts["MISSION_FONT"], f"> {mission.description}", mission_color
             )
             if mission.main:
                 screen.blit(
                     mission_description,
                     (
-                        self.position[0] + self.size[0] - 480,
-                        self.position[1]
+                        position[0] + self.size[0] - 480,
+                        position[1]
                         + 10
                         + constant_sprites["main_mission_text"].get_height(),
                     ),
@@ -126,8 +174,8 @@ class Sidebar:
                 screen.blit(
                     mission_description,
                     (
-                        self.position[0] + self.size[0] - 280,
-                        self.position[1]
+                        position[0] + self.size[0] - 280,
+                        position[1]
                         + 10
                         + constant_sprites["secondaries_mission_text"].get_height()
                         + vertical_shift * mission_description.get_height(),
@@ -152,21 +200,19 @@ class Sidebar:
                 color = BLACK
 
             # Display the entity nature
-            nature_display: pygame.Surface = fonts["MISSION_FONT"].render(
-                nature, True, color
-            )
+            nature_display: pygame.Surface = render_text(fonts["MISSION_FONT"], nature, color)
             nature_position: Position = (
-                self.position[0]
+                position[0]
                 + self.size[0] / 4
                 + constant_sprites["frame"].get_width() / 2
                 - nature_display.get_width() / 2,
-                self.position[1] + 5,
+                position[1] + 5,
             )
             screen.blit(nature_display, nature_position)
             # Display the entity sprite in a frame
             frame_position: Position = (
-                self.position[0] + self.size[0] // 4,
-                self.position[1] + 5 + nature_display.get_height(),
+                position[0] + self.size[0] // 4,
+                position[1] + 5 + nature_display.get_height(),
             )
             screen.blit(constant_sprites["frame"], frame_position)
             entity_position: Position = (frame_position[0] + 5, frame_position[1] + 5)
@@ -184,12 +230,12 @@ class Sidebar:
             text_position_x: int = (
                 frame_position[0] + constant_sprites["frame"].get_width() + 15
             )
-            name_pre_text: pygame.Surface = fonts["ITEM_FONT_STRONG"].render(
-                STR_NAME_SIDEBAR_, True, color
+            name_pre_text: pygame.Surface = render_text(
+                fonts["ITEM_FONT_STRONG"], STR_NAME_SIDEBAR_, color
             )
             screen.blit(name_pre_text, (text_position_x, frame_position[1]))
-            name_text: pygame.Surface = fonts["ITEM_FONT_STRONG"].render(
-                f"         {hovered_entity}", True, BLACK
+            name_text: pygame.Surface = render_text(
+                fonts["ITEM_FONT_STRONG"], f"         {hovered_entity}", BLACK
             )
             screen.blit(name_text, (text_position_x, frame_position[1]))
 
@@ -197,8 +243,8 @@ class Sidebar:
             if isinstance(hovered_entity, Destroyable):
                 hit_points: int = hovered_entity.hit_points
                 hit_points_max: int = hovered_entity.hit_points_max
-                hit_points_pre_text: pygame.Surface = fonts["ITEM_FONT_STRONG"].render(
-                    STR_HP_, True, color
+                hit_points_pre_text: pygame.Surface = render_text(
+                    fonts["ITEM_FONT_STRONG"], STR_HP_, color
                 )
                 text_position: Position = (
                     text_position_x,
@@ -207,15 +253,15 @@ class Sidebar:
                     - hit_points_pre_text.get_height(),
                 )
                 screen.blit(hit_points_pre_text, text_position)
-                hit_points_text: pygame.Surface = fonts["ITEM_FONT_STRONG"].render(
+                hit_points_text: pygame.Surface = render_text(
+                    fonts["ITEM_FONT_STRONG"],
                     f"      {hit_points}",
-                    True,
                     determine_gauge_color(hit_points, hit_points_max, BLACK),
                 )
                 screen.blit(hit_points_text, text_position)
-                hp_post_text = fonts["ITEM_FONT_STRONG"].render(
+                hp_post_text = render_text(
+                    fonts["ITEM_FONT_STRONG"],
                     f'      {" " * len(str(hit_points))} / {hit_points_max}',
-                    True,
                     BLACK,
                 )
                 screen.blit(hp_post_text, text_position)
@@ -223,8 +269,8 @@ class Sidebar:
                 # Display more information if it is a movable entity
                 if isinstance(hovered_entity, Movable):
                     # Level
-                    level_text: pygame.Surface = fonts["ITEM_FONT_STRONG"].render(
-                        f"LVL : {hovered_entity.lvl}", True, BLACK
+                    level_text: pygame.Surface = render_text(
+                        fonts["ITEM_FONT_STRONG"], f"LVL : {hovered_entity.lvl}", BLACK
                     )
                     lvl_text_position_x: int = (
                         frame_position[0]
@@ -240,8 +286,8 @@ class Sidebar:
                     )
 
                     # Status
-                    status_pre_text: pygame.Surface = fonts["ITEM_FONT_STRONG"].render(
-                        STR_ALTERATIONS_, True, color
+                    status_pre_text: pygame.Surface = render_text(
+                        fonts["ITEM_FONT_STRONG"], STR_ALTERATIONS_, color
                     )
                     screen.blit(
                         status_pre_text,
@@ -250,9 +296,9 @@ class Sidebar:
                             frame_position[1] + constant_sprites["frame"].get_height(),
                         ),
                     )
-                    status_text = fonts["ITEM_FONT_STRONG"].render(
+                    status_text = render_text(
+                        fonts["ITEM_FONT_STRONG"],
                         " " * 18 + hovered_entity.get_abbreviated_alterations(),
-                        True,
                         BLACK,
                     )
                     screen.blit(
@@ -266,9 +312,9 @@ class Sidebar:
                     # Display more information if it is a character
                     if isinstance(hovered_entity, Character):
                         race: str = hovered_entity.get_formatted_race()
-                        race_pre_text: pygame.Surface = fonts[
-                            "ITEM_FONT_STRONG"
-                        ].render(STR_RACE_, True, color)
+                        race_pre_text: pygame.Surface = render_text(
+                            fonts["ITEM_FONT_STRONG"], STR_RACE_, color
+                        )
                         screen.blit(
                             race_pre_text,
                             (
@@ -277,9 +323,7 @@ class Sidebar:
                                 + (fonts["ITEM_FONT_STRONG"].get_height() - SHIFT) * 2,
                             ),
                         )
-                        race_text = fonts["ITEM_FONT_STRONG"].render(
-                            f"        {race}", True, BLACK
-                        )
+                        race_text = render_text(fonts["ITEM_FONT_STRONG"], f"        {race}", BLACK)
                         screen.blit(
                             race_text,
                             (
@@ -292,8 +336,8 @@ class Sidebar:
                         # Display more information if it is a player
                         if isinstance(hovered_entity, Player):
                             classes = hovered_entity.get_formatted_classes()
-                            classes_pre_text = fonts["ITEM_FONT_STRONG"].render(
-                                STR_CLASS_, True, color
+                            classes_pre_text = render_text(
+                                fonts["ITEM_FONT_STRONG"], STR_CLASS_, color
                             )
                             screen.blit(
                                 classes_pre_text,
@@ -304,8 +348,8 @@ class Sidebar:
                                     - SHIFT,
                                 ),
                             )
-                            classes_text = fonts["ITEM_FONT_STRONG"].render(
-                                "         " + classes, True, BLACK
+                            classes_text = render_text(
+                                fonts["ITEM_FONT_STRONG"], "         " + classes, BLACK
                             )
                             screen.blit(
                                 classes_text,
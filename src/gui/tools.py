@@ -5,26 +5,48 @@ Defines utility functions for stuff related to GUI.
 from __future__ import annotations
 
 from math import sqrt
+from typing import Optional
 
 import pygame
 
 from src.constants import TILE_SIZE, DARK_GREEN, YELLOW, ORANGE, RED, LIGHT_YELLOW
+from src.gui.fonts import render_text
 from src.gui.position import Position
 
+_tile_sprites: dict[str, pygame.Surface] = {}
+
 
 def show_fps(
     surface: pygame.Surface, inner_clock: pygame.time.Clock, font: pygame.font.Font
-) -> None:
+) -> pygame.Rect:
     """
     Display in the top left corner of the screen the current frame rate.
+    Return the part of the screen covered by the frame rate.
 
     Keyword arguments:
     screen -- the surface on which the framerate should be drawn
     inner_clock -- the pygame clock running and containing the current frame rate
     font -- the font used to display the frame rate
     """
-    fps_text = font.render(f"FPS: {inner_clock.get_fps():.0f}", True, LIGHT_YELLOW)
-    surface.blit(fps_text, (2, 2))
+    fps_text = render_text(font, f"FPS: {inner_clock.get_fps():.0f}", LIGHT_YELLOW)
+    return surface.blit(fps_text, (2, 2))
+
+
+def load_tile_sprite(path: str) -> pygame.Surface:
+    """
+    Return the image stored at the given path scaled to the size of a tile.
+    Each image is loaded only once and then shared, the returned surface should be copied before being modified.
+
+    Keyword arguments:
+    path -- the relative path to the image
+    """
+    sprite: Optional[pygame.Surface] = _tile_sprites.get(path)
+    if sprite is None:
+        sprite = pygame.transform.scale(
+            pygame.image.load(path).convert_alpha(), (TILE_SIZE, TILE_SIZE)
+        )
+        _tile_sprites[path] = sprite
+    return sprite
 
 
 def blit_alpha(
@@ -8,6 +8,8 @@ import pygame
 from src.game_entities.movable import Movable
 from typing import Sequence
 from src.game_entities.character import Character
+from src.services.action_log import ActionKind
+from src.services.game_speed import toggle_fast_forward
 from src.constants import (
     TILE_SIZE,
 )
@@ -74,7 +76,11 @@ class InputHandlerClass :
                         if pygame.Rect(move, (TILE_SIZE, TILE_SIZE)).collidepoint(
                             position_inside_level
                         ):
-                            path = self.level.determine_path_to(move, self.level.possible_moves)
+                            path = self.level.possible_moves.path_to(move)
+                            self.level.save_undo_point()
+                            self.level.action_log.record(
+                                ActionKind.MOVE, self.level.selected_player.position, path
+                            )
                             self.level.selected_player.set_move(path)
                             self.level.possible_moves = {}
                             self.level.possible_attacks = []
@@ -114,12 +120,7 @@ class InputHandlerClass :
                     if pygame.Rect(tile, (TILE_SIZE, TILE_SIZE)).collidepoint(
                         position_inside_level
                     ):
-                        # Test if a character is on the tile, in this case, characters are swapped
-                        entity = self.level.get_entity_on_tile(tile)
-                        if entity:
-                            entity.set_initial_pos(self.level.selected_player.position)
-
-                        self.level.selected_player.set_initial_pos(tile)
+                        self.level.place_player(self.level.selected_player, tile)
                         return
             return
         for player in self.level.players:
@@ -192,31 +193,7 @@ class InputHandlerClass :
                 # Test if player is on character's main menu, in this case,
                 # current move should be cancelled if possible
                 if self.level.menu_manager.active_menu.identifier == CHARACTER_ACTION_MENU_ID:
-                    if self.level.selected_player.cancel_move():
-                        if self.level.traded_items:
-                            # Return traded items
-                            for item in self.level.traded_items:
-                                if item[1] == self.level.selected_player:
-                                    item[2].remove_item(item[0])
-                                    self.level.selected_player.set_item(item[0])
-                                else:
-                                    self.level.selected_player.remove_item(item[0])
-                                    item[1].set_item(item[0])
-                            self.level.traded_items.clear()
-                        if self.level.traded_gold:
-                            # Return traded gold
-                            for gold in self.level.traded_gold:
-                                if gold[1] == self.level.selected_player:
-                                    self.level.selected_player.gold += gold[0]
-                                    gold[2].gold -= gold[0]
-                                else:
-                                    self.level.selected_player.gold -= gold[0]
-                                    gold[2].gold += gold[0]
-                            self.level.traded_gold.clear()
-                        self.level.selected_player.selected = False
-                        self.level.selected_player = None
-                        self.level.possible_moves = {}
-                        self.level.menu_manager.clear_menus()
+                    self.level.cancel_active_character_move()
                     return
                 self.level.menu_manager.close_active_menu()
             # Want to cancel an interaction (not already performed)
@@ -246,6 +223,15 @@ class InputHandlerClass :
                     and self.level.menu_manager.active_menu.identifier != CHARACTER_ACTION_MENU_ID
                 ):
                     self.level.menu_manager.close_active_menu()
+            elif keyname == pygame.K_u:
+                # The last move can be undone as long as no other menu than the character one is open
+                if not self.level.animation and (
+                    self.level.menu_manager.active_menu is None
+                    or self.level.menu_manager.active_menu.identifier == CHARACTER_ACTION_MENU_ID
+                ):
+                    self.level.undo_last_move()
+            elif keyname == pygame.K_f:
+                toggle_fast_forward()
     def button_down(self, button: int, position: Position,EntityTurn) -> None:
             """
             Handle the triggering of a mouse button down event.
@@ -262,24 +248,22 @@ class InputHandlerClass :
                     and self.level.side_turn is EntityTurn.PLAYER
                 ):
                     position_inside_level = self.level._compute_relative_position(position)
-                    for collection in self.level.entities.values():
-                        for entity in collection:
-                            if isinstance(
-                                entity, Movable
-                            ) and entity.get_rect().collidepoint(position_inside_level):
-                                self.level.watched_entity = entity
-                                self.level.possible_moves = self.level.get_possible_moves(
-                                    tuple(entity.position), entity.max_moves
-                                )
-                                reach: Sequence[int] = self.level.watched_entity.reach
-                                self.level.possible_attacks = {}
-                                if entity.can_attack():
-                                    self.level.possible_attacks = self.level.get_possible_attacks(
-                                        self.level.possible_moves,
-                                        reach,
-                                        isinstance(entity, Character),
-                                    )
-                                return
+                    entity = self.level.get_entity_on_tile(
+                        self._get_tile_at(position_inside_level)
+                    )
+                    if isinstance(entity, Movable):
+                        self.level.watched_entity = entity
+                        self.level.possible_moves = self.level.get_possible_moves(
+                            tuple(entity.position), entity.max_moves
+                        )
+                        reach: Sequence[int] = self.level.watched_entity.reach
+                        self.level.possible_attacks = {}
+                        if entity.can_attack():
+                            self.level.possible_attacks = self.level.get_possible_attacks(
+                                self.level.possible_moves,
+                                reach,
+                                isinstance(entity, Character),
+                            )
     def motion(self, position: Position) -> None:
         """
         Handle the triggering of a motion event.
@@ -291,9 +275,19 @@ class InputHandlerClass :
 
         if not self.level.menu_manager.active_menu:
             position_inside_level = self.level._compute_relative_position(position)
-            self.level.hovered_entity = None
-            for collection in self.level.entities.values():
-                for entity in collection:
-                    if entity.get_rect().collidepoint(position_inside_level):
-                        self.level.hovered_entity = entity
-                        return
\ No newline at end of file
+            self.level.hovered_entity = self.level.get_entity_on_tile(
+                self._get_tile_at(position_inside_level)
+            )
+
+    @staticmethod
+    def _get_tile_at(position: Position) -> tuple[int, int]:
+        """
+        Return the position of the tile containing the given position.
+
+        Keyword arguments:
+        position -- the position relative to the level screen
+        """
+        return (
+            int(position[0] // TILE_SIZE * TILE_SIZE),
+            int(position[1] // TILE_SIZE * TILE_SIZE),
+        )
@@ -8,6 +8,7 @@ from src.services import (
 )
 from src.game_entities.player import Player
 from src.game_entities.equipment import Equipment
+from src.services.action_log import ActionKind, index_by_identity
 from src.services.menu_creator_manager import (
     create_save_dialog,
     create_event_dialog,
@@ -103,6 +104,12 @@ class ItemHandlerClass :
         """
         Unequip the selected item of the active character if possible
         """
+        self.level.action_log.record(
+            ActionKind.UNEQUIP_ITEM,
+            self.level.selected_player.position,
+            "equipments",
+            index_by_identity(self.level.selected_player.equipments, self.level.selected_item),
+        )
         self.level.menu_manager.close_active_menu()
         unequipped = self.level.selected_player.unequip(self.level.selected_item)
         result_message = (
@@ -138,6 +145,12 @@ class ItemHandlerClass :
             """
             Equip the selected item of the active character if possible
             """
+            self.level.action_log.record(
+                ActionKind.EQUIP_ITEM,
+                self.level.selected_player.position,
+                "items",
+                index_by_identity(self.level.selected_player.items, self.level.selected_item),
+            )
             self.level.menu_manager.close_active_menu()
             # Try to equip the item
             return_equipped: int = self.level.selected_player.equip(self.level.selected_item)
@@ -179,6 +192,12 @@ class ItemHandlerClass :
         Handle the use of the selected item if possible.
         Remove it if it can't be used anymore.
         """
+        self.level.action_log.record(
+            ActionKind.USE_ITEM,
+            self.level.selected_player.position,
+            "items",
+            index_by_identity(self.level.selected_player.items, self.level.selected_item),
+        )
         # Try to use the object
         used, result_messages = self.level.selected_player.use_item(self.level.selected_item)
         # Inventory display is update if object has been used
@@ -203,10 +222,20 @@ class ItemHandlerClass :
             Remove the selected item from player inventory/equipment
             """
             self.level.menu_manager.close_active_menu()
-            # Remove item from inventory/equipment according to the index
-            if isinstance(
+            is_equipped: bool = isinstance(
                 self.level.selected_item, Equipment
-            ) and self.level.selected_player.has_exact_equipment(self.level.selected_item):
+            ) and self.level.selected_player.has_exact_equipment(self.level.selected_item)
+            container: str = "equipments" if is_equipped else "items"
+            self.level.action_log.record(
+                ActionKind.THROW_ITEM,
+                self.level.selected_player.position,
+                container,
+                index_by_identity(
+                    getattr(self.level.selected_player, container), self.level.selected_item
+                ),
+            )
+            # Remove item from inventory/equipment according to the index
+            if is_equipped:
                 self.level.selected_player.remove_equipment(self.level.selected_item)
                 equipments = list(self.level.selected_player.equipments)
                 new_items_menu = menu_creator_manager.create_equipment_menu(
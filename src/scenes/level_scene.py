@@ -5,7 +5,6 @@ corresponding to an ongoing level.
 
 from __future__ import annotations
 
-import os
 from enum import IntEnum, auto
 from typing import Sequence, Union, Optional, Set, Type, List
 
@@ -49,7 +48,7 @@ from src.game_entities.gold import Gold
 from src.game_entities.item import Item
 from src.game_entities.key import Key
 from src.game_entities.mission import MissionType, Mission
-from src.game_entities.movable import Movable
+from src.game_entities.movable import Movable, EntityState
 from src.game_entities.objective import Objective
 from src.game_entities.obstacle import Obstacle
 from src.game_entities.player import Player
@@ -58,6 +57,8 @@ from src.game_entities.shop import Shop
 from src.game_entities.skill import Skill
 from src.game_entities.weapon import Weapon
 from src.gui.animation import Animation, Frame
+from src.gui.dirty_regions import DirtyRegionTracker, Region
+from src.gui.range_overlay import HighlightedTiles, RangeOverlay
 from src.gui.constant_sprites import (
     ATTACKABLE_OPACITY,
     LANDING_OPACITY,
@@ -67,7 +68,6 @@ from src.gui.constant_sprites import (
 from src.gui.fonts import fonts
 from src.gui.position import Position
 from src.gui.sidebar import Sidebar
-from src.gui.tools import blit_alpha
 from src.services.language import *
 from src.scenes.scene import Scene
 from src.services import (
@@ -82,8 +82,25 @@ from src.services.menu_creator_manager import (
     SHOP_MENU_ID,
     CHARACTER_ACTION_MENU_ID,
 )
+from src.services.action_log import ActionKind, ActionLog, index_by_identity
 from src.services.menus import CharacterMenu
+from src.services.random_manager import RandomStreams, set_active_streams
+from src.services.distance_field import DistanceField
+from src.services.game_speed import (
+    are_group_moves_enabled,
+    get_animation_delay,
+    is_fast_forward,
+)
+from src.services.influence_map import InfluenceMap
+from src.services.level_snapshot import LevelSnapshot
+from src.services.path_hierarchy import PathHierarchy
+from src.services.reachability import Reachability
+from src.services.reachability_cache import ReachabilityCache
 from src.services.save_state_manager import SaveStateManager
+from src.services.sound_manager import load_sound, play_sound
+from src.services.tile_occupancy import TileOccupancyIndex
+from src.services.turn_planner import PlannedAction, TurnPlanner
+from src.services.walkability_grid import WalkabilityGrid
 
 
 class LevelStatus(IntEnum):
@@ -111,6 +128,9 @@ class LevelEntityCollections:
     def values(self):
         return self.__dict__.values()
 
+    def items(self):
+        return self.__dict__.items()
+
     def update(self, entities: dict[str, Sequence[Entity]]):
         self.__dict__.update(entities)
 
@@ -144,9 +164,14 @@ class LevelScene(Scene):
     turn -- the value of the current turn (0 by default for new game)
     data -- saved data in XML format in case where the game is loaded from a save
     players -- the list of players on the level
+    headless -- whether the level is only simulated, without any display, animation, sound or menu
+    random_streams -- the random generators of the level, seeded randomly if they are not given
 
     Attributes:
     active_screen_part -- the sub part of the screen containing all the elements of the level
+    headless -- whether the level is only simulated, without any display, animation, sound or menu
+    random_streams -- the random generators used by the subsystems of the level while it is being played
+    action_log -- the record of all the actions that changed the state of the level since it has been created
     directory -- the relative path to the directory where all static data
     concerning the level are stored
     number -- the number identifying the level
@@ -162,6 +187,12 @@ class LevelScene(Scene):
     if it should be displayed or not
     players -- the list of players that are still actives on the level
     entities -- the structure containing all the entities of the level by category
+    tile_occupancy -- the index giving the entity standing on each tile of the level
+    walkability_grid -- the grid telling which tiles of the level can be crossed, kept up to date with tile_occupancy
+    reachability_cache -- the movement ranges already computed for the current occupancy of the level
+    path_hierarchy -- the hierarchical path finding layer used to find long routes, built with the level content
+    influence_map -- the threat, support and target proximity maps of the side controlled by AI currently playing
+    turn_planner -- the moves planned for the side controlled by AI currently playing
     passed_players -- the list of players who left the level
     missions -- the list of missions to be done
     main_mission -- the main mission that is the winning condition for players
@@ -181,11 +212,14 @@ class LevelScene(Scene):
     watched_entity -- the entity of the level for which its potential actions should be displayed
     hovered_entity -- the entity of the level which is currently hovered
     sidebar -- the reference to the sidebar displaying various information
+    dirty_regions -- the tracker of the parts of the level that changed since the previous frame
+    range_overlay -- the layer on which the possible moves, attacks, interactions and placements are drawn
     wait_for_teleportation_destination -- a boolean indicating if the level is waiting for player
     to choose for the destination of a teleportation
     diary_entries -- the log of the most recent battles
     traded_items -- the items that have been trade during the current player turn
     traded_gold -- the gold that have been trade during the current player turn
+    undo_history -- the snapshots taken before each move of the players during the current turn
     wait_sfx -- the sound that should be started when a player ends his turn
     inventory_sfx -- the sound that should be started when the inventory screen is opening
     armor_sfx -- the sound that should be started when the equipment screen is opening
@@ -194,6 +228,23 @@ class LevelScene(Scene):
     """
 
     IDS = [0, 1, 2, 3]
+    # Level attributes captured as they are in snapshots
+    SNAPSHOT_ATTRIBUTES: tuple[str, ...] = (
+        "turn",
+        "side_turn",
+        "game_phase",
+        "victory",
+        "defeat",
+        "selected_player",
+        "selected_item",
+        "active_shop",
+        "wait_for_teleportation_destination",
+    )
+    # Collections whose entities never change during a level
+    UNCHANGING_COLLECTIONS: tuple[str, ...] = ("obstacles", "objectives")
+    # Collections whose entities are drawn once into the map image when the level is loaded
+    STATIC_LAYER_COLLECTIONS: tuple[str, ...] = ("obstacles", "buildings")
+    MAX_UNDO_POINTS: int = 20
 
     def __init__(
         self,
@@ -204,11 +255,18 @@ class LevelScene(Scene):
         turn: int = 0,
         data: Optional[etree.Element] = None,
         players: Optional[Sequence[Player]] = None,
+        headless: bool = False,
+        random_streams: Optional[RandomStreams] = None,
     ) -> None:
         if players is None:
             players = []
 
         super().__init__(screen)
+        self.headless: bool = headless
+        self.random_streams: RandomStreams = (
+            random_streams if random_streams is not None else RandomStreams()
+        )
+        self.action_log: ActionLog = ActionLog(number, self.random_streams)
         self.active_screen_part = self._compute_active_screen_part()
 
         Shop.interaction_callback = self.interact_item_shop
@@ -231,8 +289,11 @@ class LevelScene(Scene):
             self.tmx_data.width * TILE_SIZE,
             self.tmx_data.height * TILE_SIZE,
         )
-        map_static_content = tmx_loader.load_ground(
-            self.tmx_data, (map_width, map_height)
+        # The ground is only needed to display the level
+        map_static_content: Optional[pygame.Surface] = (
+            None
+            if headless
+            else tmx_loader.load_ground(self.tmx_data, (map_width, map_height))
         )
 
         self.map: dict[str, any] = {
@@ -258,6 +319,20 @@ class LevelScene(Scene):
         self.escaped_players: list[Player] = []
 
         self.entities: LevelEntityCollections = LevelEntityCollections()
+        self.tile_occupancy: TileOccupancyIndex = TileOccupancyIndex(self.entities)
+        self.walkability_grid: WalkabilityGrid = WalkabilityGrid(
+            (self.map["x"], self.map["y"]),
+            self.tmx_data.width,
+            self.tmx_data.height,
+            self.tile_occupancy,
+        )
+        self.tile_occupancy.listeners.append(self.walkability_grid.notify_change)
+        self.reachability_cache: ReachabilityCache = ReachabilityCache(
+            self.walkability_grid.compute_reachability, self.tile_occupancy
+        )
+        self.path_hierarchy: Optional[PathHierarchy] = None
+        self.influence_map: Optional[InfluenceMap] = None
+        self.turn_planner: Optional[TurnPlanner] = None
 
         self.missions: Optional[List[Mission]] = None
         self.main_mission: Optional[Mission] = None
@@ -270,7 +345,7 @@ class LevelScene(Scene):
         self.defeat: bool = False
 
         # Data structures for possible actions
-        self.possible_moves: dict[tuple[int, int], int] = {}
+        self.possible_moves: Union[Reachability, dict[tuple[int, int], int]] = {}
         self.possible_attacks: list[tuple[int, int]] = []
         self.possible_interactions: list[tuple[int, int]] = []
 
@@ -287,10 +362,13 @@ class LevelScene(Scene):
         self.watched_entity: Optional[Movable] = None
         self.hovered_entity: Optional[Entity] = None
         self.sidebar: Optional[Sidebar] = None
+        self.dirty_regions: DirtyRegionTracker = DirtyRegionTracker()
+        self.range_overlay: Optional[RangeOverlay] = None
         self.wait_for_teleportation_destination: bool = False
-        self.diary_entries: list[list[BoxElement]] = []
+        self.diary_entries: list[str] = []
         self.traded_items: list[list[Union[Item, Player]]] = []
         self.traded_gold: list[list[Union[int, Player]]] = []
+        self.undo_history: list[LevelSnapshot] = []
 
         self.wait_sfx: Optional[pygame.mixer.Sound] = None
         self.inventory_sfx: Optional[pygame.mixer.Sound] = None
@@ -300,21 +378,15 @@ class LevelScene(Scene):
 
 
     @property
-    def diary_entries_text_element_set(self):
+    def diary_entries_text_element_set(self) -> list[list[BoxElement]]:
         """
         Return a list of TextElements being shown in the menu.
+        Elements are only built when the diary is opened, entries being kept as plain messages.
         """
-        default_diary_entries = [
-            [
-                TextElement(
-                    STR_DEFAULT_DIARY_BODY_CONTENT,
-                    font=fonts["ITEM_DESC_FONT"],
-                )
-            ]
+        entries: list[str] = self.diary_entries or [STR_DEFAULT_DIARY_BODY_CONTENT]
+        return [
+            [TextElement(entry, font=fonts["ITEM_DESC_FONT"])] for entry in entries
         ]
-        if self.diary_entries:
-            return self.diary_entries
-        return default_diary_entries
 
     def no_dont_save(self):
         self.menu_manager.close_active_menu()
@@ -327,6 +399,7 @@ class LevelScene(Scene):
         """
         Load all the content of the level
         """
+        set_active_streams(self.random_streams)
 
         self.events = tmx_loader.load_events(
             self.tmx_data, DATA_PATH + self.directory, self.map["x"], self.map["y"]
@@ -345,7 +418,7 @@ class LevelScene(Scene):
             # Game is new
             gap_x, gap_y = (self.map["x"], self.map["y"])
             if "before_init" in self.events:
-                if "dialogs" in self.events["before_init"]:
+                if "dialogs" in self.events["before_init"] and not self.headless:
                     for dialog in self.events["before_init"]["dialogs"]:
                         self.menu_manager.open_menu(create_event_dialog(dialog))
                 if "new_players" in self.events["before_init"]:
@@ -353,12 +426,13 @@ class LevelScene(Scene):
                         player = loader.init_player(player_el["name"])
                         player.position = player_el["position"]
                         self.players.append(player)
-            if self.number != 0:
+            if self.number != 0 and not self.headless:
                 # Level_0 doesn't need save reminder
                 self.menu_manager.open_menu(
                     create_save_dialog({"yes": self.yes_save, "no": self.no_dont_save})
                 )
 
+            self.tile_occupancy.rebuild()
             self._determine_players_initial_position()
 
             self.entities.foes = tmx_loader.load_foes(self.tmx_data, gap_x, gap_y)
@@ -378,7 +452,7 @@ class LevelScene(Scene):
         else:
             # Game is loaded from a save (data)
             gap_x, gap_y = (0, 0)
-            if self.game_phase == LevelStatus.VERY_BEGINNING:
+            if self.game_phase == LevelStatus.VERY_BEGINNING and not self.headless:
                 # If game is in very beginning, show dialogs
                 if "before_init" in self.events:
                     if "dialogs" in self.events["before_init"]:
@@ -402,21 +476,33 @@ class LevelScene(Scene):
             for mission in self.missions
             for objective in mission.objective_tiles
         ]
+        self.tile_occupancy.rebuild()
+        self.path_hierarchy = PathHierarchy(self.walkability_grid)
+        self.tile_occupancy.listeners.append(self.path_hierarchy.notify_change)
 
-        self.sidebar = Sidebar(
-            (MENU_WIDTH, MENU_HEIGHT),
-            pygame.Vector2(0, MAX_MAP_HEIGHT),
-            self.missions,
-            self.number,
-        )
+        if not self.headless:
+            self.map["img"] = tmx_loader.compose_static_layer(
+                self.map["img"],
+                [
+                    entity
+                    for collection_name in self.STATIC_LAYER_COLLECTIONS
+                    for entity in getattr(self.entities, collection_name)
+                ],
+                (self.map["x"], self.map["y"]),
+            )
+            self.range_overlay = RangeOverlay(self.active_screen_part.get_size())
+            self.sidebar = Sidebar(
+                (MENU_WIDTH, MENU_HEIGHT),
+                pygame.Vector2(0, MAX_MAP_HEIGHT),
+                self.missions,
+                self.number,
+            )
 
-        self.wait_sfx = pygame.mixer.Sound(os.path.join("sound_fx", "waiting.ogg"))
-        self.inventory_sfx = pygame.mixer.Sound(
-            os.path.join("sound_fx", "inventory.ogg")
-        )
-        self.armor_sfx = pygame.mixer.Sound(os.path.join("sound_fx", "armor.ogg"))
-        self.talk_sfx = pygame.mixer.Sound(os.path.join("sound_fx", "talking.ogg"))
-        self.gold_sfx = pygame.mixer.Sound(os.path.join("sound_fx", "trade.ogg"))
+        self.wait_sfx = load_sound("waiting.ogg")
+        self.inventory_sfx = load_sound("inventory.ogg")
+        self.armor_sfx = load_sound("armor.ogg")
+        self.talk_sfx = load_sound("talking.ogg")
+        self.gold_sfx = load_sound("trade.ogg")
 
         self.is_loaded = True
 
@@ -444,6 +530,8 @@ class LevelScene(Scene):
         Keyword arguments:
         slot_id -- the id of the slot that should be used to save
         """
+        # Saving seeds the random streams again
+        self.action_log.record(ActionKind.SAVE_GAME)
         save_state_manager = SaveStateManager(self)
         save_state_manager.save_game(slot_id)
         self.menu_manager.open_menu(
@@ -469,23 +557,25 @@ class LevelScene(Scene):
         """
         return self.game_phase is not LevelStatus.INITIALIZATION
 
-    def end_level(self, animation_surface: pygame.Surface, position: Position) -> None:
+    def end_level(self, status: LevelStatus) -> None:
         """
         Process to the end of level.
         In case of victory, verify for each secondary objectives if they have been accomplished.
 
         Keyword arguments:
-        animation_surface -- the surface containing the final animation of the level
-        position -- the position of the final animation
+        status -- the final status of the level, either a victory or a defeat
         """
+        self.action_log.record(ActionKind.END_LEVEL, status)
         self.menu_manager.clear_menus()
+        self.game_phase = status
         # Check if some optional objectives have been completed
         if self.main_mission.ended:
             for mission in self.missions:
                 if not mission.main and mission.ended:
-                    self.menu_manager.open_menu(
-                        menu_creator_manager.create_reward_menu(mission)
-                    )
+                    if not self.headless:
+                        self.menu_manager.open_menu(
+                            menu_creator_manager.create_reward_menu(mission)
+                        )
                     if mission.gold:
                         for player in self.players:
                             player.gold += mission.gold
@@ -493,11 +583,23 @@ class LevelScene(Scene):
                         # TODO : Add items reward of optional objective to players
                         pass
             # Check if there are some post-level events
-            if "at_end" in self.events:
+            if "at_end" in self.events and not self.headless:
                 if "dialogs" in self.events["at_end"]:
                     for dialog in self.events["at_end"]["dialogs"]:
                         self.menu_manager.open_menu(create_event_dialog(dialog))
-        self.animation = Animation([Frame(animation_surface, position)], 180)
+        if not self.headless:
+            sprite_name: str = (
+                "victory" if status is LevelStatus.ENDED_VICTORY else "defeat"
+            )
+            self.animation = Animation(
+                [
+                    Frame(
+                        constant_sprites[sprite_name],
+                        constant_sprites[f"{sprite_name}_pos"],
+                    )
+                ],
+                180,
+            )
 
     def update_state(self) -> bool:
         """
@@ -508,6 +610,7 @@ class LevelScene(Scene):
 
         Return the whether the game should be ended or not.
         """
+        set_active_streams(self.random_streams)
         if self.quit_request:
             return True
 
@@ -542,13 +645,11 @@ class LevelScene(Scene):
                 self.victory = True
 
         if self.victory:
-            self.end_level(constant_sprites["victory"], constant_sprites["victory_pos"])
-            self.game_phase = LevelStatus.ENDED_VICTORY
+            self.end_level(LevelStatus.ENDED_VICTORY)
             self.victory = False
             return False
         if self.defeat:
-            self.end_level(constant_sprites["defeat"], constant_sprites["defeat_pos"])
-            self.game_phase = LevelStatus.ENDED_DEFEAT
+            self.end_level(LevelStatus.ENDED_DEFEAT)
             self.defeat = False
             return False
 
@@ -572,14 +673,18 @@ class LevelScene(Scene):
 
         for entity in entities:
             if not entity.turn_is_finished():
-                if self.side_turn is not EntityTurn.PLAYER:
+                if self.side_turn is not EntityTurn.PLAYER and are_group_moves_enabled():
+                    self.process_group_actions(
+                        entities, (self.side_turn is EntityTurn.ALLIES)
+                    )
+                elif self.side_turn is not EntityTurn.PLAYER:
                     self.process_entity_action(
                         entity, (self.side_turn is EntityTurn.ALLIES)
                     )
                 break
         else:
-            self.side_turn = self.side_turn.get_next()
-            self.begin_turn()
+            self.action_log.record(ActionKind.NEXT_SIDE)
+            self.pass_turn_to_next_side()
 
         return False
 
@@ -621,108 +726,187 @@ class LevelScene(Scene):
             )
         )
 
-    def display(self) -> None:
+    def display(self) -> Optional[list[pygame.Rect]]:
         """
         Display all the elements of the level.
         Display the ongoing animation if there is any.
         Display also all the menus in the background (that should be visible)
         and lastly the active menu.
+
+        Only the parts of the level that changed since the previous frame are drawn again,
+        the whole level is drawn while an animation or a menu is shown.
+
+        Return the parts of the screen that have been drawn, None if the whole level has been drawn.
+        """
+        dirty_rects: Optional[list[pygame.Rect]] = self.dirty_regions.update(
+            self.get_display_regions(),
+            bool(self.animation) or self.menu_manager.active_menu is not None,
+        )
+        if dirty_rects is None:
+            self.draw()
+            return None
+
+        for rect in dirty_rects:
+            self.active_screen_part.set_clip(rect)
+            self.active_screen_part.fill(BLACK)
+            self.draw(rect)
+        self.active_screen_part.set_clip(None)
+        offset: tuple[int, int] = self.active_screen_part.get_abs_offset()
+        return [rect.move(offset) for rect in dirty_rects]
+
+    def draw(self, area: Optional[pygame.Rect] = None) -> None:
+        """
+        Draw the elements of the level overlapping the given area.
+
+        Keyword arguments:
+        area -- the part of the level that should be drawn, the whole level if it is not given
         """
         self.active_screen_part.blit(self.map["img"], (self.map["x"], self.map["y"]))
-        self.sidebar.display(self.active_screen_part, self.turn, self.hovered_entity)
+        if area is None or area.colliderect(self.sidebar.get_rect()):
+            self.sidebar.display(self.active_screen_part, self.turn, self.hovered_entity)
 
         for mission in self.missions:
             mission.display(self.active_screen_part)
 
-        for collection in self.entities.values():
+        for collection in self.get_dynamic_collections():
             for entity in collection:
+                if area is not None and not area.colliderect(entity.get_rect()):
+                    continue
                 entity.display(self.active_screen_part)
                 if isinstance(entity, Destroyable):
                     entity.display_hit_points(self.active_screen_part)
 
-        if self.watched_entity:
-            self.show_possible_actions(self.watched_entity, self.active_screen_part)
-
-        # If the game hasn't yet started
-        if self.game_phase is LevelStatus.INITIALIZATION:
-            self.show_possible_placements(self.active_screen_part)
-        else:
-            if self.selected_player:
-                # If player is waiting to move
-                if self.possible_moves:
-                    self.show_possible_actions(
-                        self.selected_player, self.active_screen_part
-                    )
-                elif self.possible_attacks:
-                    self.show_possible_attacks(
-                        self.selected_player, self.active_screen_part
-                    )
-                elif self.possible_interactions:
-                    self.show_possible_interactions(self.active_screen_part)
+        self.range_overlay.update(self.get_highlighted_tiles())
+        self.range_overlay.display(self.active_screen_part)
 
         if self.animation:
             self.animation.display(self.active_screen_part)
         else:
             self.menu_manager.display()
 
-    def show_possible_actions(self, movable: Movable, screen: pygame.Surface) -> None:
-        """
-        Display all the possible actions of the given movable entity
-
-        Keyword arguments:
-        movable -- the movable entity concerned
-        screen -- the screen on which the possibilities should be drawn
+    def get_dynamic_collections(self) -> list[Sequence[Entity]]:
         """
-        self.show_possible_moves(movable, screen)
-        self.show_possible_attacks(movable, screen)
-
-    def show_possible_attacks(self, movable: Movable, screen: pygame.Surface) -> None:
+        Return the collections of entities that should be drawn at each frame,
+        i.e. all of them except the ones already drawn into the map image.
         """
-        Display all the possible attacks of the given movable entity
+        return [
+            collection
+            for collection_name, collection in self.entities.items()
+            if collection_name not in self.STATIC_LAYER_COLLECTIONS
+        ]
 
-        Keyword arguments:
-        movable -- the movable entity concerned
-        screen -- the screen on which the possibilities should be drawn
-        """
-        for tile in self.possible_attacks:
-            if movable.position != tile:
-                blit_alpha(
-                    screen, constant_sprites["attackable"], tile, ATTACKABLE_OPACITY
+    def get_display_regions(self) -> dict[tuple, Region]:
+        """
+        Return the regions of the level whose changes should be tracked from one frame to the next,
+        relatively to the level screen: the map, the sidebar, every entity and the highlighted tiles.
+        """
+        regions: dict[tuple, Region] = {
+            ("map",): (
+                pygame.Rect(
+                    self.map["x"], self.map["y"], self.map["width"], self.map["height"]
+                ),
+                id(self.map["img"]),
+            ),
+            ("sidebar",): (
+                self.sidebar.get_rect(),
+                self.sidebar.get_display_signature(self.turn, self.hovered_entity),
+            ),
+        }
+        for collection in self.get_dynamic_collections():
+            for entity in collection:
+                regions[("entity", id(entity))] = (
+                    entity.get_rect(),
+                    entity.get_display_signature(),
                 )
 
-    def show_possible_moves(self, movable: Movable, screen: pygame.Surface) -> None:
+        self.range_overlay.update(self.get_highlighted_tiles())
+        regions[("highlighted_tiles",)] = (
+            self.range_overlay.area,
+            self.range_overlay.version,
+        )
+        return regions
+
+    def invalidate(self, rect: pygame.Rect) -> None:
         """
-        Display all the possible moves of the given movable entity
+        Ask for the given part of the screen to be drawn again at the next frame.
 
         Keyword arguments:
-        movable -- the movable entity concerned
-        screen -- the screen on which the possibilities should be drawn
+        rect -- the part of the screen that should be drawn again
         """
-        for tile in self.possible_moves:
-            if movable.position != tile:
-                blit_alpha(screen, constant_sprites["landing"], tile, LANDING_OPACITY)
+        offset_x, offset_y = self.active_screen_part.get_abs_offset()
+        self.dirty_regions.invalidate(pygame.Rect(rect).move(-offset_x, -offset_y))
 
-    def show_possible_interactions(self, screen: pygame.Surface) -> None:
+    def get_highlighted_tiles(self) -> list[HighlightedTiles]:
         """
-        Display all the possible interactions of the active player
-
-        Keyword arguments:
-        screen -- the screen on which the possibilities should be drawn
+        Return the groups of tiles that should be highlighted, in their drawing order:
+        the possible actions of the watched entity, the available initial placements
+        before the game starts, and the possible actions of the active player.
         """
-        for tile in self.possible_interactions:
-            blit_alpha(
-                screen, constant_sprites["interaction"], tile, INTERACTION_OPACITY
+        highlighted_tiles: list[HighlightedTiles] = []
+        if self.watched_entity:
+            highlighted_tiles += self._get_possible_actions_tiles(self.watched_entity)
+
+        # If the game hasn't yet started
+        if self.game_phase is LevelStatus.INITIALIZATION:
+            highlighted_tiles.append(
+                (
+                    constant_sprites["landing"],
+                    LANDING_OPACITY,
+                    self.player_possible_placements,
+                    None,
+                )
             )
+        elif self.selected_player:
+            # If player is waiting to move
+            if self.possible_moves:
+                highlighted_tiles += self._get_possible_actions_tiles(self.selected_player)
+            elif self.possible_attacks:
+                highlighted_tiles.append(
+                    (
+                        constant_sprites["attackable"],
+                        ATTACKABLE_OPACITY,
+                        self.possible_attacks,
+                        self.selected_player.position,
+                    )
+                )
+            elif self.possible_interactions:
+                highlighted_tiles.append(
+                    (
+                        constant_sprites["interaction"],
+                        INTERACTION_OPACITY,
+                        self.possible_interactions,
+                        None,
+                    )
+                )
+        return highlighted_tiles
 
-    def show_possible_placements(self, screen: pygame.Surface) -> None:
+    def _get_possible_actions_tiles(self, movable: Movable) -> list[HighlightedTiles]:
+        return [
+            (constant_sprites["landing"], LANDING_OPACITY, self.possible_moves, movable.position),
+            (
+                constant_sprites["attackable"],
+                ATTACKABLE_OPACITY,
+                self.possible_attacks,
+                movable.position,
+            ),
+        ]
+
+    def place_player(self, player: Player, tile: Position) -> None:
         """
-        Display all the available tiles for initial placement of the player characters
+        Move a player to another initial position during the initialization phase.
+        The player standing on the tile if there is any takes the previous position of the moved player.
 
         Keyword arguments:
-        screen -- the screen on which the possibilities should be drawn
+        player -- the player that should be moved
+        tile -- the new initial position of the player
         """
-        for tile in self.player_possible_placements:
-            blit_alpha(screen, constant_sprites["landing"], tile, LANDING_OPACITY)
+        self.action_log.record(ActionKind.PLACE_PLAYER, player.position, tile)
+        # Test if a character is on the tile, in this case, characters are swapped
+        entity = self.get_entity_on_tile(tile)
+        if entity:
+            entity.set_initial_pos(player.position)
+
+        player.set_initial_pos(tile)
 
     def start_game(self) -> None:
         """
@@ -730,18 +914,19 @@ class LevelScene(Scene):
         Begin a new turn (the first one).
         Trigger the events that should happen after the initialization phase if any.
         """
+        self.action_log.record(ActionKind.START_GAME)
         self.menu_manager.close_active_menu()
         self.game_phase = LevelStatus.IN_PROGRESS
         self.new_turn()
         if "after_init" in self.events:
-            if "dialogs" in self.events["after_init"]:
+            if "dialogs" in self.events["after_init"] and not self.headless:
                 for dialog in self.events["after_init"]["dialogs"]:
                     self.menu_manager.open_menu(create_event_dialog(dialog))
             if "new_players" in self.events["after_init"]:
                 for player_el in self.events["after_init"]["new_players"]:
                     player = loader.init_player(player_el["name"])
                     player.position = player_el["position"]
-                    self.players.append(player)
+                    self.add_entity(player)
 
     def get_next_cases(self, position: Position) -> list[Optional[Entity]]:
         """
@@ -760,35 +945,17 @@ class LevelScene(Scene):
                 tiles_content.append(tile_content)
         return tiles_content
 
-    def get_possible_moves(
-        self, position: Position, max_moves: int
-    ) -> dict[Position, int]:
+    def get_possible_moves(self, position: Position, max_moves: int) -> Reachability:
         """
-        Return all the possible moves with their distance from the starting position
+        Return all the possible moves with their distance from the starting position,
+        along with the predecessor of each tile to be able to rebuild the path to any of them.
+        The result is shared through the reachability cache and should not be modified.
 
         Keyword arguments:
         position -- the starting position
         max_moves -- the maximum number of tiles that could be traveled
         """
-        tiles: dict[Position, int] = {position: 0}
-        previously_computed_tiles: dict[Position, int] = tiles
-        for i in range(1, max_moves + 1):
-            tiles_current_level: dict[Position, int] = {}
-            for tile in previously_computed_tiles:
-                for x_coordinate in range(-1, 2):
-                    for y_coordinate in (1 - abs(x_coordinate), -1 + abs(x_coordinate)):
-                        tile_x: int = tile[0] + (x_coordinate * TILE_SIZE)
-                        tile_y: int = tile[1] + (y_coordinate * TILE_SIZE)
-                        tile_position = (tile_x, tile_y)
-                        if (
-                            self.is_tile_available(tile_position)
-                            and tile_position not in tiles
-                        ):
-                            tiles_current_level[tile_position] = i
-            tiles.update(previously_computed_tiles)
-            previously_computed_tiles = tiles_current_level
-        tiles.update(previously_computed_tiles)
-        return tiles
+        return self.reachability_cache.get(position, max_moves)
 
     def get_possible_attacks(
         self,
@@ -804,25 +971,17 @@ class LevelScene(Scene):
         reach -- the reach of the attacking entity
         from_ally_side -- a boolean indicating whether this is a friendly attack or not
         """
-        tiles: list[tuple[float, float]] = []
-
-        entities = list(self.entities.breakables)
-        if from_ally_side:
-            entities += self.entities.foes
-        else:
-            entities += self.entities.allies + self.players
-
-        for entity in entities:
-            for i in reach:
-                for x_coordinate in range(-i, i + 1):
-                    for y_coordinate in (i - abs(x_coordinate), -i + abs(x_coordinate)):
-                        tile_x: int = entity.position[0] + (x_coordinate * TILE_SIZE)
-                        tile_y: int = entity.position[1] + (y_coordinate * TILE_SIZE)
-                        tile_position = (tile_x, tile_y)
-                        if tile_position in possible_moves:
-                            tiles.append(tuple(entity.position))
-
-        return set(tiles)
+        entities: Sequence[Entity] = (
+            [*self.entities.breakables, *self.entities.foes]
+            if from_ally_side
+            else [*self.entities.breakables, *self.entities.allies, *self.players]
+        )
+        return {
+            tuple(entity.position)
+            for entity in self.walkability_grid.get_attackable_targets(
+                possible_moves, reach, entities
+            )
+        }
 
     def is_tile_available(self, tile: Position) -> bool:
         """
@@ -831,25 +990,7 @@ class LevelScene(Scene):
         Keyword arguments:
         tile -- the position of the tile
         """
-        min_case: Position = pygame.Vector2(self.map["x"], self.map["y"])
-        max_case: Position = pygame.Vector2(
-            self.map["x"] + self.map["width"],
-            self.map["y"] + self.map["height"],
-        )
-        if not (
-            all(
-                minimum <= case < maximum
-                for minimum, case, maximum in zip(min_case, tile, max_case)
-            )
-        ):
-            return False
-
-        entity_on_tile = self.get_entity_on_tile(tile)
-        if isinstance(entity_on_tile, Objective):
-            if entity_on_tile.is_walkable:
-                return True
-
-        return entity_on_tile is None
+        return self.walkability_grid.is_tile_available(tile)
 
     def get_entity_on_tile(self, tile: Position) -> Optional[Entity]:
         """
@@ -858,37 +999,20 @@ class LevelScene(Scene):
         Keyword arguments:
         tile -- the position of the tile
         """
-        # Check all entities
-        for collection in self.entities.values():
-            for entity in collection:
-                if entity.position == tile:
-                    return entity
-        return None
+        return self.tile_occupancy.get(tile)
 
+    @staticmethod
     def determine_path_to(
-        self, destination_tile: Position, distance_for_tile: dict[tuple[int, int], int]
+        destination_tile: Position, possible_moves: Reachability
     ) -> list[Position]:
         """
         Return an ordered list of position that represent the path from one tile to another
 
         Keyword arguments:
         destination_tile -- the position of the destination
-        distance -- the distance between the starting tile and the destination
-        """
-        path: list[Position] = [destination_tile]
-        current_tile: tuple[int, int] = tuple(destination_tile)
-        while distance_for_tile[current_tile] > 1:
-            # Check for neighbour cases
-            available_tiles: dict[tuple[int, int], int] = self.get_possible_moves(
-                tuple(current_tile), 1
-            )
-            for tile in available_tiles:
-                if tile in distance_for_tile:
-                    distance = distance_for_tile[tile]
-                    if distance < distance_for_tile[current_tile]:
-                        current_tile = tile
-                        path.insert(0, pygame.Vector2(current_tile))
-        return path
+        possible_moves -- the result of the movement range computation containing the destination
+        """
+        return possible_moves.path_to(destination_tile)
 
     def distance_between_all(
         self, entity: Entity, all_other_entities: Sequence
@@ -900,22 +1024,60 @@ class LevelScene(Scene):
         entity -- the entity for which the distance from all other entities should be computed
         all_other_entities -- all other entities for which the distance should be computed
         """
-        free_tiles_distance: dict[tuple[int, int], int] = self.get_possible_moves(
-            tuple(entity.position),
-            (self.map["width"] * self.map["height"]) // (TILE_SIZE * TILE_SIZE),
+        # Walking distances are symmetric, a single field around the entity gives all of them
+        distance_field: DistanceField = DistanceField(
+            [entity],
+            self.walkability_grid.is_tile_available,
+            self.map["width"] * self.map["height"],
+            self.walkability_grid,
         )
-        entities_distance: dict[Entity, int] = {
-            entity: self.map["width"] * self.map["height"]
-            for entity in all_other_entities
+        return {
+            other_entity: distance_field.nearest_target(other_entity.position)[1]
+            for other_entity in all_other_entities
         }
-        for tile, distance in free_tiles_distance.items():
-            for neighbour in self.get_next_cases(tile):
-                if (
-                    neighbour in all_other_entities
-                    and distance < entities_distance[neighbour]
-                ):
-                    entities_distance[neighbour] = distance
-        return entities_distance
+
+    def get_turn_planner(
+        self, units: Sequence[Movable], targets: Sequence[Movable]
+    ) -> TurnPlanner:
+        """
+        Return the moves planned for the given units.
+        The moves are planned again from scratch if the units or the targets changed since the last planning.
+        Planning runs in the background, so that the level keeps being displayed while the units are thinking,
+        except for a headless level that has nothing to display.
+
+        Keyword arguments:
+        units -- the ordered sequence of units of the side currently playing
+        targets -- the ordered sequence of entities that could be attacked by the units
+        """
+        if self.turn_planner is None or not self.turn_planner.is_planned_for(units, targets):
+            self.reset_turn_planner()
+            self.turn_planner = TurnPlanner(
+                self.walkability_grid,
+                self.path_hierarchy,
+                units,
+                targets,
+                self.influence_map,
+                in_background=not self.headless,
+            )
+            self.tile_occupancy.listeners.append(self.turn_planner.notify_change)
+        return self.turn_planner
+
+    def reset_influence_map(self) -> None:
+        """
+        Drop the current influence map so that it stops following the level occupancy
+        """
+        if self.influence_map is not None:
+            self.tile_occupancy.listeners.remove(self.influence_map.notify_change)
+            self.influence_map = None
+
+    def reset_turn_planner(self) -> None:
+        """
+        Drop the current turn planner so that it stops following the level occupancy
+        """
+        if self.turn_planner is not None:
+            self.tile_occupancy.listeners.remove(self.turn_planner.notify_change)
+            self.turn_planner.cancel()
+            self.turn_planner = None
 
     def open_chest(self, actor: Character, chest: Chest) -> None:
         """
@@ -968,7 +1130,7 @@ class LevelScene(Scene):
             )
         )
 
-        self.end_active_character_turn(clear_menus=False)
+        self._end_active_character_turn(clear_menus=False)
 
     def open_door(self, door: Door) -> None:
         """
@@ -978,7 +1140,7 @@ class LevelScene(Scene):
         Keyword arguments:
         door -- the door that should be opened
         """
-        self.entities.doors.remove(door)
+        self.remove_entity(door)
 
         # TODO: move the creation of the pop-up in menu_creator_manager
         grid_element = [
@@ -992,7 +1154,7 @@ class LevelScene(Scene):
             )
         )
 
-        self.end_active_character_turn(clear_menus=False)
+        self._end_active_character_turn(clear_menus=False)
 
     def ally_to_player(self, character: Character) -> None:
         """
@@ -1002,7 +1164,7 @@ class LevelScene(Scene):
         Keyword argument:
         character -- the character that should be cast
         """
-        self.entities.allies.remove(character)
+        self.remove_entity(character)
         player = Player(
             name=character.name,
             sprite=character.sprite,
@@ -1018,11 +1180,11 @@ class LevelScene(Scene):
             skills=character.skills,
             alterations=character.alterations,
         )
-        self.entities.players.append(player)
         player.earn_xp(character.experience)
         player.hit_points = character.hit_points
         player.position = character.position
         player.items = character.items
+        self.add_entity(player)
 
     def interact(
         self, actor: Character, target: Entity, target_position: Position
@@ -1035,6 +1197,13 @@ class LevelScene(Scene):
         target -- the target of the interaction
         target_position -- the position of the target
         """
+        self.action_log.record(
+            ActionKind.INTERACT,
+            actor.position,
+            target_position,
+            actor.current_action,
+            self.wait_for_teleportation_destination,
+        )
         # Since player chose his interaction, possible interactions should be reset
         self.possible_interactions = []
 
@@ -1048,7 +1217,7 @@ class LevelScene(Scene):
                 actor.position = target_position
 
                 # Turn is finished
-                self.end_active_character_turn()
+                self._end_active_character_turn()
         # Check if player tries to open a chest
         elif isinstance(target, Chest):
             if actor.has_free_space():
@@ -1075,7 +1244,7 @@ class LevelScene(Scene):
                                 width=ITEM_MENU_WIDTH,
                             )
                         )
-                        self.end_active_character_turn(clear_menus=False)
+                        self._end_active_character_turn(clear_menus=False)
                     else:
                         # Lock picking is finished, get content
                         self.open_chest(actor, target)
@@ -1114,20 +1283,24 @@ class LevelScene(Scene):
                             width=ITEM_MENU_WIDTH,
                         )
                     )
-                    self.end_active_character_turn(clear_menus=False)
+                    self._end_active_character_turn(clear_menus=False)
                 else:
                     # Lock picking is finished, get content
                     self.open_door(target)
         # Check if player tries to use a portal
         elif isinstance(target, Portal):
             new_based_position: Position = target.linked_to.position
-            possible_positions_with_distance: dict[
-                Position, int
-            ] = self.get_possible_moves(tuple(new_based_position), 1)
+            possible_positions_with_distance: Reachability = self.get_possible_moves(
+                tuple(new_based_position), 1
+            )
             # Remove portal pos since player cannot be on the portal
-            del possible_positions_with_distance[new_based_position]
-            if possible_positions_with_distance:
-                self.possible_interactions = possible_positions_with_distance.keys()
+            possible_destinations: list[tuple[int, int]] = [
+                tile
+                for tile in possible_positions_with_distance
+                if tile != possible_positions_with_distance.origin
+            ]
+            if possible_destinations:
+                self.possible_interactions = possible_destinations
                 self.wait_for_teleportation_destination = True
             else:
                 self.menu_manager.open_menu(
@@ -1148,7 +1321,7 @@ class LevelScene(Scene):
                 )
             )
 
-            self.end_active_character_turn(clear_menus=False)
+            self._end_active_character_turn(clear_menus=False)
         # Check if player tries to trade with another player
         elif isinstance(target, Player):
             self.menu_manager.open_menu(
@@ -1163,7 +1336,7 @@ class LevelScene(Scene):
             )
         # Check if player tries to talk to a character
         elif isinstance(target, Character):
-            pygame.mixer.Sound.play(self.talk_sfx)
+            play_sound(self.talk_sfx)
 
             element_grid = target.talk(actor)
             self.menu_manager.open_menu(
@@ -1178,7 +1351,7 @@ class LevelScene(Scene):
             if target.join_team:
                 self.ally_to_player(target)
 
-            self.end_active_character_turn(clear_menus=False)
+            self._end_active_character_turn(clear_menus=False)
         # Check if player tries to visit a building
         elif isinstance(target, Building):
             if isinstance(target, Shop):
@@ -1194,14 +1367,14 @@ class LevelScene(Scene):
                 )
             )
 
-            self.end_active_character_turn(clear_menus=False)
+            self._end_active_character_turn(clear_menus=False)
 
-    def remove_entity(self, entity: Entity) -> None:
+    def _get_collection_of(self, entity: Entity) -> list[Entity]:
         """
-        Remove an entity from the level
+        Return the collection of the level in which the given entity should be stored
 
         Keyword arguments:
-        entity -- the entity that should be removed
+        entity -- the concerned entity
         """
         collection = None
         if isinstance(entity, Foe):
@@ -1212,7 +1385,29 @@ class LevelScene(Scene):
             collection = self.entities.breakables
         elif isinstance(entity, Character):
             collection = self.entities.allies
-        collection.remove(entity)
+        elif isinstance(entity, Door):
+            collection = self.entities.doors
+        return collection
+
+    def add_entity(self, entity: Entity) -> None:
+        """
+        Add an entity to the level
+
+        Keyword arguments:
+        entity -- the entity that should be added
+        """
+        self._get_collection_of(entity).append(entity)
+        self.tile_occupancy.add(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """
+        Remove an entity from the level
+
+        Keyword arguments:
+        entity -- the entity that should be removed
+        """
+        self._get_collection_of(entity).remove(entity)
+        self.tile_occupancy.remove(entity)
 
     def duel(
         self,
@@ -1232,6 +1427,7 @@ class LevelScene(Scene):
         target_allies -- the allies of the target
         kind -- the nature of the damage that would be dealt
         """
+        self.action_log.record(ActionKind.DUEL, attacker.position, target.position, kind)
         nb_attacks: int = 2 if "double_attack" in attacker.skills else 1
         for _ in range(nb_attacks):
             experience: int = 0
@@ -1239,9 +1435,7 @@ class LevelScene(Scene):
             if isinstance(target, Character) and target.parried():
                 # Target parried attack
                 message: str = f_ATTACKER_ATTACKED_TARGET_BUT_PARRIED(attacker, target)
-                self.diary_entries.append(
-                    [TextElement(message, font=fonts["ITEM_DESC_FONT"])]
-                )
+                self.diary_entries.append(message)
                 continue
 
             damage: int = attacker.attack(target)
@@ -1249,14 +1443,7 @@ class LevelScene(Scene):
                 attacker, damage, kind, target_allies
             )
             self.diary_entries.append(
-                [
-                    TextElement(
-                        f_ATTACKER_DEALT_DAMAGE_TO_TARGET(
-                            attacker, target, real_damage
-                        ),
-                        font=fonts["ITEM_DESC_FONT"],
-                    )
-                ]
+                f_ATTACKER_DEALT_DAMAGE_TO_TARGET(attacker, target, real_damage)
             )
             # XP gain for dealt damage
             experience += real_damage // 2
@@ -1266,42 +1453,23 @@ class LevelScene(Scene):
                 if isinstance(attacker, Character) and isinstance(target, Foe):
                     experience += target.xp_gain
 
-                self.diary_entries.append(
-                    [TextElement(f_TARGET_DIED(target), font=fonts["ITEM_DESC_FONT"])]
-                )
+                self.diary_entries.append(f_TARGET_DIED(target))
                 # Loot
                 if isinstance(attacker, Player) and isinstance(target, Foe):
                     # Check if foe dropped an item
                     loot: Sequence[Item] = target.roll_for_loot()
                     for item in loot:
-                        self.diary_entries.append(
-                            [
-                                TextElement(
-                                    f_TARGET_DROPPED_ITEM(target, item),
-                                    font=fonts["ITEM_DESC_FONT"],
-                                )
-                            ]
-                        )
+                        self.diary_entries.append(f_TARGET_DROPPED_ITEM(target, item))
                         if isinstance(item, Gold):
                             attacker.gold += item.amount
                         elif not attacker.set_item(item):
                             self.diary_entries.append(
-                                [
-                                    TextElement(
-                                        STR_BUT_THERE_IS_NOT_ENOUGH_SPACE_IN_INVENTORY_TO_TAKE_IT,
-                                        font=fonts["ITEM_DESC_FONT"],
-                                    )
-                                ]
+                                STR_BUT_THERE_IS_NOT_ENOUGH_SPACE_IN_INVENTORY_TO_TAKE_IT
                             )
                 self.remove_entity(target)
             else:
                 self.diary_entries.append(
-                    [
-                        TextElement(
-                            f_TARGET_HAS_NOW_NUMBER_HP(target, target.hit_points),
-                            font=fonts["ITEM_DESC_FONT"],
-                        )
-                    ]
+                    f_TARGET_HAS_NOW_NUMBER_HP(target, target.hit_points)
                 )
                 # Check if a side effect is applied to target
                 if isinstance(attacker, Character):
@@ -1312,30 +1480,16 @@ class LevelScene(Scene):
                         )
                         for effect in applied_effects:
                             _, message = effect.apply_on_ent(target)
-                            self.diary_entries.append(
-                                [TextElement(message, font=fonts["ITEM_DESC_FONT"])]
-                            )
+                            self.diary_entries.append(message)
 
             # XP gain
             if isinstance(attacker, Player):
                 self.diary_entries.append(
-                    [
-                        TextElement(
-                            f_ATTACKER_EARNED_NUMBER_XP(attacker, experience),
-                            font=fonts["ITEM_DESC_FONT"],
-                        )
-                    ]
+                    f_ATTACKER_EARNED_NUMBER_XP(attacker, experience)
                 )
                 if attacker.earn_xp(experience):
                     # Attacker gained a level
-                    self.diary_entries.append(
-                        [
-                            TextElement(
-                                f_ATTACKER_GAINED_A_LEVEL(attacker),
-                                font=fonts["ITEM_DESC_FONT"],
-                            )
-                        ]
-                    )
+                    self.diary_entries.append(f_ATTACKER_GAINED_A_LEVEL(attacker))
 
             if target.hit_points <= 0:
                 # Target is dead, no more attack needed.
@@ -1343,6 +1497,57 @@ class LevelScene(Scene):
         while len(self.diary_entries) > 10:
             self.diary_entries.pop(0)
 
+    def start_planned_move(self, planned_action: PlannedAction) -> None:
+        """
+        Make the entity of the given planned action start walking along its planned path
+
+        Keyword arguments:
+        planned_action -- the action planned for the entity
+        """
+        entity: Movable = planned_action.entity
+        entity.target = planned_action.target
+        self.hovered_entity = entity
+        self.action_log.record(ActionKind.MOVE, entity.position, planned_action.path)
+        entity.set_move(planned_action.path)
+        if self.headless or is_fast_forward():
+            # Nobody is watching the walk, or nobody wants to,
+            # the entity directly reaches its destination
+            entity.finish_move()
+
+    def process_group_actions(self, entities: Sequence[Movable], is_ally: bool) -> None:
+        """
+        Compute the actions of the non-playable entities (AI) of a side by groups:
+        the entities of a group walk at the same time, then they attack one after the other.
+        The groups are made by the turn planner so that the walks of a group never cross each other.
+
+        Keyword arguments:
+        entities -- the entities of the side that is playing
+        is_ally -- a boolean indicating if the entities are allies or not
+        """
+        walking_entities: list[Movable] = [
+            entity for entity in entities if entity.state is EntityState.ON_MOVE
+        ]
+        if walking_entities:
+            for entity in walking_entities:
+                if is_fast_forward():
+                    entity.finish_move()
+                else:
+                    entity.move()
+            return
+
+        for entity in entities:
+            if entity.state is EntityState.HAVE_TO_ATTACK:
+                # Duels are queued after the walks of the group
+                self.process_entity_action(entity, is_ally)
+                return
+
+        targets: Sequence[Movable] = (
+            self.entities.foes if is_ally else self.players + self.entities.allies
+        )
+        # The group is empty while the move of its first entity is still being computed
+        for planned_action in self.get_turn_planner(entities, targets).get_group_actions():
+            self.start_planned_move(planned_action)
+
     def process_entity_action(self, entity: Movable, is_ally: bool) -> None:
         """
         Compute the action of a non-playable entity (AI)
@@ -1351,30 +1556,44 @@ class LevelScene(Scene):
         entity -- the entity for which the action should be computed
         is_ally -- a boolean indicating if the entity is an ally or not
         """
-        possible_moves: dict[tuple[int, int], int] = self.get_possible_moves(
-            tuple(entity.position), entity.max_moves
-        )
         targets: Sequence[Movable] = (
             self.entities.foes if is_ally else self.players + self.entities.allies
         )
         allies: Sequence[Movable] = (
             self.players + self.entities.allies if is_ally else self.entities.foes
         )
-        tile: Optional[Position] = entity.act(
-            possible_moves, self.distance_between_all(entity, targets)
+        if entity.state is EntityState.HAVE_TO_ACT:
+            # The move has been prepared along with the ones of the whole side
+            units: Sequence[Movable] = self.entities.allies if is_ally else self.entities.foes
+            planned_action: Optional[PlannedAction] = self.get_turn_planner(
+                units, targets
+            ).get_action(entity)
+            if planned_action is None:
+                # The move is still being computed, the screen keeps being refreshed in the meantime
+                return
+            self.start_planned_move(planned_action)
+            return
+        if entity.state is EntityState.ON_MOVE and is_fast_forward():
+            # The game has been fast-forwarded during the walk of the entity
+            entity.finish_move()
+
+        influence_map: Optional[InfluenceMap] = (
+            self.influence_map
+            if self.influence_map is not None and self.influence_map.covers(targets)
+            else None
         )
+        tile: Optional[Position] = entity.act({}, targets, influence_map=influence_map)
+        if entity.turn_is_finished():
+            self.action_log.record(ActionKind.END_CHARACTER_TURN, entity.position)
+            if influence_map is not None:
+                influence_map.update_unit(entity)
 
         if tile:
-            if tuple(tile) in possible_moves:
-                # Entity choose to move to case
-                self.hovered_entity = entity
-                path = self.determine_path_to(tile, possible_moves)
-                entity.set_move(path)
-            else:
-                # Entity choose to attack the entity on the tile
-                entity_attacked = self.get_entity_on_tile(tile)
-                self.duel(entity, entity_attacked, allies, targets, entity.attack_kind)
-                entity.end_turn()
+            # Entity choose to attack the entity on the tile
+            entity_attacked = self.get_entity_on_tile(tile)
+            self.duel(entity, entity_attacked, allies, targets, entity.attack_kind)
+            self.action_log.record(ActionKind.END_CHARACTER_TURN, entity.position)
+            entity.end_turn()
 
     def interact_item_shop(self, item: Item, item_button: Button) -> None:
         """
@@ -1435,15 +1654,29 @@ class LevelScene(Scene):
             )
         )
 
-    def end_turn(self) -> None:
+    def end_turn(self, prepare_ai: bool = True) -> None:
         """
         End the current turn
+
+        Keyword arguments:
+        prepare_ai -- whether the moves of the next side should be prepared if it is controlled by AI
         """
+        self.action_log.record(ActionKind.END_TURN)
         self.menu_manager.clear_menus()
         for player in self.players:
             player.end_turn()
+        self.pass_turn_to_next_side(prepare_ai)
+
+    def pass_turn_to_next_side(self, prepare_ai: bool = True) -> None:
+        """
+        Give the turn to the next side
+
+        Keyword arguments:
+        prepare_ai -- whether the moves of the next side should be prepared if it is controlled by AI
+        """
         self.side_turn = self.side_turn.get_next()
-        self.begin_turn()
+        self.undo_history.clear()
+        self.begin_turn(prepare_ai)
 
     def select_visit(self):
         """
@@ -1463,6 +1696,7 @@ class LevelScene(Scene):
         """
         Verify for each mission if the active player validated it
         """
+        self.action_log.record(ActionKind.TAKE_OBJECTIVE, self.selected_player.position)
         for mission in self.missions:
             if (
                 mission.type is MissionType.POSITION
@@ -1472,12 +1706,12 @@ class LevelScene(Scene):
                 if mission.main or len(self.players) > 1:
                     if mission.is_position_valid(self.selected_player.position):
                         mission.update_state(self.selected_player)
-                        self.players.remove(self.selected_player)
+                        self.remove_entity(self.selected_player)
                         self.escaped_players.append(self.selected_player)
                         if mission.main and mission.ended:
                             self.victory = True
                         # Turn is finished
-                        self.end_active_character_turn()
+                        self._end_active_character_turn()
                         break
 
     def select_talk(self) -> None:
@@ -1576,17 +1810,56 @@ class LevelScene(Scene):
             )
         )
 
+    def cancel_active_character_move(self) -> None:
+        """
+        Cancel the last move of the active character if possible,
+        giving back the items and the gold it traded since then
+        """
+        self.action_log.record(ActionKind.CANCEL_MOVE, self.selected_player.position)
+        if self.selected_player.cancel_move():
+            if self.traded_items:
+                # Return traded items
+                for item in self.traded_items:
+                    if item[1] == self.selected_player:
+                        item[2].remove_item(item[0])
+                        self.selected_player.set_item(item[0])
+                    else:
+                        self.selected_player.remove_item(item[0])
+                        item[1].set_item(item[0])
+                self.traded_items.clear()
+            if self.traded_gold:
+                # Return traded gold
+                for gold in self.traded_gold:
+                    if gold[1] == self.selected_player:
+                        self.selected_player.gold += gold[0]
+                        gold[2].gold -= gold[0]
+                    else:
+                        self.selected_player.gold -= gold[0]
+                        gold[2].gold += gold[0]
+                self.traded_gold.clear()
+            self.selected_player.selected = False
+            self.selected_player = None
+            self.possible_moves = {}
+            self.menu_manager.clear_menus()
+
     def end_active_character_turn(self, clear_menus=True) -> None:
         """
         End the turn of the active character
         """
-        pygame.mixer.Sound.play(self.wait_sfx)
+        self.action_log.record(
+            ActionKind.END_CHARACTER_TURN, self.selected_player.position
+        )
+        self._end_active_character_turn(clear_menus)
+
+    def _end_active_character_turn(self, clear_menus=True) -> None:
+        # The end of the turn is not recorded when it is the consequence of a recorded action
+        play_sound(self.wait_sfx)
         self.selected_item = None
         self.selected_player.end_turn()
         self.selected_player = None
         self.traded_items.clear()
         self.traded_gold.clear()
-        self.possible_moves.clear()
+        self.possible_moves = {}
         self.possible_attacks.clear()
         self.possible_interactions.clear()
         if clear_menus:
@@ -1600,7 +1873,7 @@ class LevelScene(Scene):
         self.menu_manager.open_menu(
             menu_creator_manager.create_equipment_menu(self.intemHandler.interact_item, equipments),
         )
-        pygame.mixer.Sound.play(self.armor_sfx)
+        play_sound(self.armor_sfx)
 
     def open_inventory(self) -> None:
         """
@@ -1618,7 +1891,7 @@ class LevelScene(Scene):
                 self.intemHandler.interact_item, items, self.selected_player.gold
             )
         )
-        pygame.mixer.Sound.play(self.inventory_sfx)
+        play_sound(self.inventory_sfx)
 
     def select_interaction_with(self, entity_kind: Type[Entity]) -> None:
         """
@@ -1647,9 +1920,16 @@ class LevelScene(Scene):
         is_first_player_owner -- a boolean indicating if the player who initiated the trade is the
         owner of the item
         """
-        pygame.mixer.Sound.play(self.inventory_sfx)
         owner: Player = first_player if is_first_player_owner else second_player
         receiver: Player = second_player if is_first_player_owner else first_player
+        self.action_log.record(
+            ActionKind.TRADE_ITEM,
+            first_player.position,
+            second_player.position,
+            is_first_player_owner,
+            index_by_identity(owner.items, self.selected_item),
+        )
+        play_sound(self.inventory_sfx)
         # Add item if possible
         added: bool = receiver.set_item(self.selected_item)
         self.menu_manager.close_active_menu()
@@ -1718,7 +1998,14 @@ class LevelScene(Scene):
         owner of the gold
         value -- the quantity of gold that should be traded
         """
-        pygame.mixer.Sound.play(self.gold_sfx)
+        self.action_log.record(
+            ActionKind.SEND_GOLD,
+            first_player.position,
+            second_player.position,
+            is_first_player_sender,
+            value,
+        )
+        play_sound(self.gold_sfx)
         sender: Player = first_player if is_first_player_sender else second_player
         receiver: Player = second_player if is_first_player_sender else first_player
         Player.trade_gold(sender, receiver, value)
@@ -1742,6 +2029,12 @@ class LevelScene(Scene):
         """
         Handle the sale of the selected item if possible
         """
+        self.action_log.record(
+            ActionKind.SELL_ITEM,
+            self.active_shop.current_visitor.position,
+            self.active_shop.position,
+            index_by_identity(self.active_shop.current_visitor.items, self.selected_item),
+        )
         self.menu_manager.close_active_menu()
         sold, result_message = self.active_shop.sell(self.selected_item)
         popup_title = str(self.selected_item)
@@ -1783,6 +2076,14 @@ class LevelScene(Scene):
         """
         Handle the purchase of the selected item if possible
         """
+        self.action_log.record(
+            ActionKind.BUY_ITEM,
+            self.active_shop.current_visitor.position,
+            self.active_shop.position,
+            index_by_identity(
+                [entry["item"] for entry in self.active_shop.stock], self.selected_item
+            ),
+        )
         result_message = self.active_shop.buy(self.selected_item)
         element_grid = [
             [
@@ -1850,31 +2151,173 @@ class LevelScene(Scene):
             menu_creator_manager.create_alteration_info_menu(alteration)
         )
 
-    def begin_turn(self) -> None:
+    def begin_turn(self, prepare_ai: bool = True) -> None:
         """
         Begin next camp's turn
+
+        Keyword arguments:
+        prepare_ai -- whether the influence map and the moves of the side should be computed
+        right away if it is controlled by AI
         """
-        entities = []
+        self.reset_influence_map()
+        self.reset_turn_planner()
         if self.side_turn is EntityTurn.PLAYER:
             self.new_turn()
-            entities = self.players
-        elif self.side_turn is EntityTurn.ALLIES:
-            entities = self.entities.allies
-        elif self.side_turn is EntityTurn.FOES:
-            entities = self.entities.foes
+        entities, targets = self.get_side_entities()
 
         for entity in entities:
             entity.new_turn()
 
+        if prepare_ai:
+            self.prepare_ai_side(entities, targets)
+
+    def get_side_entities(self) -> tuple[list[Movable], list[Movable]]:
+        """
+        Return the entities of the side that should play and the entities they could attack,
+        no target being given for the players who choose them by themselves.
+        """
+        if self.side_turn is EntityTurn.ALLIES:
+            return self.entities.allies, self.entities.foes
+        if self.side_turn is EntityTurn.FOES:
+            return self.entities.foes, self.players + self.entities.allies
+        return self.players, []
+
+    def prepare_ai_side(self, entities: Sequence[Movable], targets: Sequence[Movable]) -> None:
+        """
+        Compute the influence map and start planning the moves of the side that should play,
+        if it is controlled by AI
+
+        Keyword arguments:
+        entities -- the entities of the side that should play
+        targets -- the entities that could be attacked by the side
+        """
+        if self.side_turn is not EntityTurn.PLAYER and entities:
+            self.influence_map = InfluenceMap(self.walkability_grid, entities, targets)
+            self.tile_occupancy.listeners.append(self.influence_map.notify_change)
+            self.get_turn_planner(entities, targets)
+
+    def take_snapshot(self) -> LevelSnapshot:
+        """
+        Capture the current state of the level, so that it can be restored later on.
+
+        Nothing is changed on the level and only the values that can change are copied,
+        so that it can be done many times per decision, for example by an AI trying different actions.
+        """
+        collections: tuple[tuple[str, tuple[Entity, ...]], ...] = tuple(
+            (name, tuple(collection))
+            for name, collection in self.entities.items()
+            if name not in LevelScene.UNCHANGING_COLLECTIONS
+        )
+        entity_states: list[tuple[Entity, tuple]] = [
+            (entity, entity.snapshot()) for _, members in collections for entity in members
+        ]
+        entity_states += [(player, player.snapshot()) for player in self.escaped_players]
+        return LevelSnapshot(
+            collections,
+            tuple(entity_states),
+            tuple(self.escaped_players),
+            tuple(mission.snapshot() for mission in self.missions),
+            tuple(getattr(self, name) for name in LevelScene.SNAPSHOT_ATTRIBUTES),
+            tuple(self.diary_entries),
+            tuple(tuple(trade) for trade in self.traded_items),
+            tuple(tuple(trade) for trade in self.traded_gold),
+            self.random_streams.snapshot(),
+            len(self.action_log.entries),
+        )
+
+    def restore_snapshot(self, snapshot: LevelSnapshot, prepare_ai: bool = True) -> None:
+        """
+        Set the level back to the state captured by the given snapshot.
+
+        Only the entities that moved, appeared or disappeared since then are reported to
+        the structures following the occupancy of the level,
+        and the actions recorded since then are dropped from the action log.
+        The menus, the ongoing animation and the plans of the AI are dropped.
+
+        Keyword arguments:
+        snapshot -- the snapshot returned by take_snapshot
+        prepare_ai -- whether the influence map and the moves of the side should be computed
+        again right away if it is controlled by AI
+        """
+        self.reset_influence_map()
+        self.reset_turn_planner()
+
+        # Entities that appeared since the snapshot leave the level first
+        present_ids: set[int] = set()
+        for name, _ in snapshot.collections:
+            collection: list[Entity] = getattr(self.entities, name)
+            for entity in [
+                entity for entity in collection if id(entity) not in snapshot.member_ids
+            ]:
+                del collection[index_by_identity(collection, entity)]
+                self.tile_occupancy.remove(entity)
+            present_ids.update(id(entity) for entity in collection)
+        # Entities still on the level are moved back one by one
+        for entity, state in snapshot.entity_states:
+            entity.restore(state)
+        # Entities that disappeared since the snapshot come back
+        for name, members in snapshot.collections:
+            collection: list[Entity] = getattr(self.entities, name)
+            for entity in members:
+                if id(entity) not in present_ids:
+                    collection.append(entity)
+                    self.tile_occupancy.add(entity)
+            # Collections are changed in place since they may be referred to elsewhere
+            collection[:] = members
+
+        self.escaped_players[:] = snapshot.escaped_players
+        for mission, mission_state in zip(self.missions, snapshot.mission_states):
+            mission.restore(mission_state)
+        for name, value in zip(LevelScene.SNAPSHOT_ATTRIBUTES, snapshot.level_values):
+            setattr(self, name, value)
+        self.diary_entries = list(snapshot.diary_entries)
+        self.traded_items = [list(trade) for trade in snapshot.traded_items]
+        self.traded_gold = [list(trade) for trade in snapshot.traded_gold]
+        self.random_streams.restore(snapshot.random_state)
+        self.action_log.rewind(snapshot.action_count)
+
+        self.possible_moves = {}
+        self.possible_attacks = []
+        self.possible_interactions = []
+        self.watched_entity = None
+        self.hovered_entity = None
+        self.animation = None
+        self.menu_manager.clear_menus()
+        if prepare_ai:
+            self.prepare_ai_side(*self.get_side_entities())
+
+    def save_undo_point(self) -> None:
+        """
+        Remember the current state of the level, to which the players can come back with undo_last_move
+        """
+        self.undo_history.append(self.take_snapshot())
+        del self.undo_history[: -LevelScene.MAX_UNDO_POINTS]
+
+    def undo_last_move(self) -> bool:
+        """
+        Set the level back to the state it had right before the last move of a player,
+        if it has been made during the current turn.
+
+        Return whether a move has been undone or not.
+        """
+        if self.side_turn is not EntityTurn.PLAYER or not self.undo_history:
+            return False
+        self.restore_snapshot(self.undo_history.pop())
+        if self.selected_player is not None:
+            self.selected_player.selected = False
+            self.selected_player = None
+        return True
+
     def new_turn(self) -> None:
         """
         Begin of a new turn
         """
         self.turn += 1
-        self.animation = Animation(
-            [Frame(constant_sprites["new_turn"], constant_sprites["new_turn_pos"])],
-            60,
-        )
+        if not self.headless:
+            self.animation = Animation(
+                [Frame(constant_sprites["new_turn"], constant_sprites["new_turn_pos"])],
+                get_animation_delay(60),
+            )
 
 
 
@@ -1887,6 +2330,7 @@ class LevelScene(Scene):
         (1 for left button, 2 for middle button, 3 for right button)
         position -- the position of the mouse
         """
+        set_active_streams(self.random_streams)
         # No event if there is an animation or if it is not player turn
         return self.inputHandler.click(button,position,EntityTurn,LevelStatus)
 
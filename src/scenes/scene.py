@@ -4,6 +4,7 @@ Define Scene class, the abstract base class for any other scene.
 
 from __future__ import annotations
 from enum import IntEnum, auto
+from typing import Optional
 
 import pygame
 
@@ -36,9 +37,21 @@ class Scene:
     def __init__(self, screen: pygame.Surface) -> None:
         self.screen = screen
 
-    def display(self) -> None:
+    def display(self) -> Optional[list[pygame.Rect]]:
         """
         Display all the content of the scene.
+
+        Return the parts of the screen that have been drawn, None if the whole screen has been drawn.
+        """
+        pass
+
+    def invalidate(self, rect: pygame.Rect) -> None:
+        """
+        Ask for the given part of the screen to be drawn again at the next frame,
+        for scenes that only draw the parts of the screen that changed.
+
+        Keyword arguments:
+        rect -- the part of the screen that should be drawn again
         """
         pass
 
@@ -19,7 +19,9 @@ from src.gui.position import Position
 from src.scenes.level_scene import LevelScene, LevelStatus
 from src.scenes.scene import Scene, QuitActionKind
 from src.services import menu_creator_manager
+from src.services.game_speed import set_fast_forward, set_group_moves_enabled
 from src.services.language import *
+from src.services.random_manager import RandomStreams
 
 
 class StartScene(Scene):
@@ -79,10 +81,12 @@ class StartScene(Scene):
         """
         # Load current move speed
         Movable.move_speed = int(StartScene.read_options_file("move_speed"))
+        set_fast_forward(bool(int(StartScene.read_options_file("fast_forward", "0"))))
+        set_group_moves_enabled(bool(int(StartScene.read_options_file("group_moves", "0"))))
         StartScene.screen_size = int(StartScene.read_options_file("screen_size"))
 
     @staticmethod
-    def read_options_file(element_to_read: str) -> str:
+    def read_options_file(element_to_read: str, default: Optional[str] = None) -> str:
         """
         Read and parse a specific option saved in the local configuration file.
 
@@ -90,10 +94,14 @@ class StartScene(Scene):
 
         Keyword arguments:
         element_to_read -- a name corresponding to the option that should be read
+        default -- the value of the option if it is missing from a configuration file
+        written by an older version of the game
         """
         # TODO: Might be interesting to not re-load the file for each different option to parse
         tree = etree.parse("saves/options.xml").getroot()
         element = tree.find(".//" + element_to_read)
+        if element is None and default is not None:
+            return default
         return element.text.strip()
 
     @staticmethod
@@ -107,6 +115,8 @@ class StartScene(Scene):
         """
         tree: etree.ElementTree = etree.parse("saves/options.xml")
         element: etree.Element = tree.find(".//" + element_to_edit)
+        if element is None:
+            element = etree.SubElement(tree.getroot(), element_to_edit)
         element.text = new_value
         tree.write("saves/options.xml")
 
@@ -180,6 +190,7 @@ class StartScene(Scene):
                 level_path = f"maps/level_{level_id}/"
                 game_status = tree_root.find("level/phase").text.strip()
                 turn_nb = int(tree_root.find("level/turn").text.strip())
+                random_element = tree_root.find("level/random")
 
                 self.level = LevelScene(
                     StartScene.generate_level_window(),
@@ -188,6 +199,11 @@ class StartScene(Scene):
                     LevelStatus[game_status],
                     turn_nb,
                     tree_root.find("level/entities"),
+                    random_streams=(
+                        RandomStreams.load(random_element)
+                        if random_element is not None
+                        else None
+                    ),
                 )
 
         except XMLSyntaxError:
@@ -249,6 +265,8 @@ class StartScene(Scene):
                 {
                     "language": str(self.read_options_file("language")),
                     "move_speed": int(self.read_options_file("move_speed")),
+                    "fast_forward": int(self.read_options_file("fast_forward", "0")),
+                    "group_moves": int(self.read_options_file("group_moves", "0")),
                     "screen_size": int(self.read_options_file("screen_size")),
                 },
                 self.modify_option_value,
@@ -282,6 +300,10 @@ class StartScene(Scene):
             return
         elif option_name == "move_speed":
             Movable.move_speed = option_value
+        elif option_name == "fast_forward":
+            set_fast_forward(bool(option_value))
+        elif option_name == "group_moves":
+            set_group_moves_enabled(bool(option_value))
         elif option_name == "screen_size":
             StartScene.screen_size = option_value
         else:
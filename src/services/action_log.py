@@ -0,0 +1,452 @@
+"""
+Defines ActionLog class, the record of every action changing the state of a level,
+and the replay_actions function applying a recorded log again on a level
+as fast as possible, without any animation and without asking the AI to decide anything.
+
+Replaying the log of a session on the level it started from, with the same random streams,
+restores the exact same state, which permits to reproduce a reported bug
+or to measure the performance of the game on a real session.
+"""
+
+from __future__ import annotations
+
+import json
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, TextIO
+
+from src.game_entities.destroyable import DamageKind
+from src.game_entities.entity import Entity
+from src.game_entities.foe import Foe
+from src.game_entities.item import Item
+from src.game_entities.movable import Movable
+from src.game_entities.player import Player
+from src.services.menus import CharacterMenu
+from src.services.random_manager import RandomStreams, set_active_streams
+from src.services.tile_occupancy import tile_key
+
+if TYPE_CHECKING:
+    from src.scenes.level_scene import LevelScene
+
+
+class ActionKind(Enum):
+    """
+    Defines the different kinds of actions that can be recorded.
+    """
+
+    PLACE_PLAYER = auto()
+    START_GAME = auto()
+    MOVE = auto()
+    CANCEL_MOVE = auto()
+    DUEL = auto()
+    INTERACT = auto()
+    TRADE_ITEM = auto()
+    SEND_GOLD = auto()
+    USE_ITEM = auto()
+    EQUIP_ITEM = auto()
+    UNEQUIP_ITEM = auto()
+    THROW_ITEM = auto()
+    BUY_ITEM = auto()
+    SELL_ITEM = auto()
+    TAKE_OBJECTIVE = auto()
+    END_CHARACTER_TURN = auto()
+    END_TURN = auto()
+    NEXT_SIDE = auto()
+    END_LEVEL = auto()
+    SAVE_GAME = auto()
+
+
+class ReplayDivergenceError(Exception):
+    """
+    Raised when a level does not follow the recorded log anymore while it is being replayed,
+    meaning that it has not been replayed from the state the log started from.
+    """
+
+
+class RecordedAction:
+    """
+    A RecordedAction is one entry of an action log.
+
+    Keyword arguments:
+    kind -- the kind of the action
+    checkpoint -- the fingerprint of the random streams of the level right before the action
+    arguments -- the values needed to apply the action again, only made of numbers, strings and lists
+
+    Attributes:
+    kind -- the kind of the action
+    checkpoint -- the fingerprint of the random streams of the level right before the action
+    arguments -- the values needed to apply the action again
+    """
+
+    def __init__(self, kind: ActionKind, checkpoint: int, arguments: list) -> None:
+        self.kind: ActionKind = kind
+        self.checkpoint: int = checkpoint
+        self.arguments: list = arguments
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, RecordedAction)
+            and self.kind is other.kind
+            and self.checkpoint == other.checkpoint
+            and self.arguments == other.arguments
+        )
+
+    def __repr__(self) -> str:
+        return f"RecordedAction({self.kind.name}, {self.checkpoint}, {self.arguments})"
+
+    def dumps(self) -> str:
+        """
+        Return the action as a single line of JSON
+        """
+        return json.dumps([self.kind.name, self.checkpoint, self.arguments], separators=(",", ":"))
+
+    @staticmethod
+    def loads(line: str) -> RecordedAction:
+        """
+        Return the action written in the given line of JSON.
+
+        Keyword arguments:
+        line -- the line produced by the dumps method
+        """
+        kind, checkpoint, arguments = json.loads(line)
+        return RecordedAction(ActionKind[kind], checkpoint, arguments)
+
+
+def _to_recorded_value(value: any) -> any:
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (str, bool, int)) or value is None:
+        return value
+    if isinstance(value, float):
+        return int(value)
+    # Positions and paths
+    return [_to_recorded_value(element) for element in value]
+
+
+class ActionLog:
+    """
+    An ActionLog records every action changing the state of a level, whoever made it,
+    along with a checkpoint of the random streams of the level.
+    Entries are appended, and only dropped when the level is set back to an earlier state.
+    They can be streamed to a file as soon as they are recorded,
+    so that the log of a session is kept even if the game stops unexpectedly.
+
+    Keyword arguments:
+    level_number -- the number identifying the recorded level
+    random_streams -- the random streams of the recorded level
+
+    Attributes:
+    level_number -- the number identifying the recorded level
+    seed -- the seed of the random streams of the recorded level
+    entries -- the recorded actions, in the order in which they have been made
+    output -- the text stream to which each action is written as soon as it is recorded
+    """
+
+    def __init__(self, level_number: int, random_streams: RandomStreams) -> None:
+        self.level_number: int = level_number
+        self.seed: int = random_streams.seed
+        self._random_streams: RandomStreams = random_streams
+        self.entries: list[RecordedAction] = []
+        self.output: Optional[TextIO] = None
+
+    def _header(self) -> str:
+        return json.dumps({"level": self.level_number, "seed": self.seed})
+
+    def stream_to(self, output: TextIO) -> None:
+        """
+        Write the actions recorded so far to the given text stream,
+        then each new action as soon as it is recorded.
+
+        Keyword arguments:
+        output -- the text stream, like a file opened in append mode
+        """
+        output.write(self.dumps() + "\n")
+        self.output = output
+
+    def record(self, kind: ActionKind, *arguments: any) -> None:
+        """
+        Append an action to the log.
+        Should be called right before the action is applied.
+
+        Keyword arguments:
+        kind -- the kind of the action
+        arguments -- the values needed to apply the action again,
+        entities being referred to by the position of their tile
+        """
+        entry: RecordedAction = RecordedAction(
+            kind, self._random_streams.checkpoint(), _to_recorded_value(arguments)
+        )
+        self.entries.append(entry)
+        if self.output is not None:
+            self.output.write(entry.dumps() + "\n")
+
+    def rewind(self, length: int) -> None:
+        """
+        Forget the actions recorded after the first ones, when the level has been set back
+        to the state it had at that time.
+        The output only gets a line telling how many actions are kept, since it cannot be rewritten.
+
+        Keyword arguments:
+        length -- the number of actions that should be kept
+        """
+        del self.entries[length:]
+        if self.output is not None:
+            self.output.write(json.dumps({"rewind": length}) + "\n")
+
+    def dumps(self) -> str:
+        """
+        Return the whole log as text, one line of JSON per action after a header line
+        """
+        return "\n".join([self._header()] + [entry.dumps() for entry in self.entries])
+
+    @staticmethod
+    def loads(text: str) -> ActionLog:
+        """
+        Return the log written in the given text.
+
+        Keyword arguments:
+        text -- the text produced by the dumps method or streamed to the output of a log
+        """
+        lines: list[str] = [line for line in text.splitlines() if line.strip()]
+        header: dict[str, int] = json.loads(lines[0])
+        action_log: ActionLog = ActionLog(header["level"], RandomStreams(header["seed"]))
+        for line in lines[1:]:
+            if line.startswith("{"):
+                action_log.entries = action_log.entries[: json.loads(line)["rewind"]]
+            else:
+                action_log.entries.append(RecordedAction.loads(line))
+        return action_log
+
+
+def index_by_identity(elements: Sequence[any], element: any) -> int:
+    """
+    Return the index of the given element in the sequence, looking for the element itself
+    rather than for an equal one, since several identical items can be owned at once.
+
+    Keyword arguments:
+    elements -- the sequence containing the element
+    element -- the element whose index is needed
+    """
+    return next(index for index, candidate in enumerate(elements) if candidate is element)
+
+
+def _get_movable_on_tile(level: LevelScene, tile: Sequence[int]) -> Movable:
+    for movable in level.players + level.entities.allies + level.entities.foes:
+        if tile_key(movable.position) == tuple(tile):
+            return movable
+    raise ReplayDivergenceError(f"No character stands on the tile {tuple(tile)}")
+
+
+def _get_entity_on_tile(level: LevelScene, tile: Sequence[int]) -> Optional[Entity]:
+    return level.get_entity_on_tile(tuple(tile))
+
+
+def _select(level: LevelScene, tile: Sequence[int]) -> Player:
+    player: Movable = _get_movable_on_tile(level, tile)
+    level.selected_player = player
+    return player
+
+
+def _get_item(owner: Movable, container: str, index: int) -> Item:
+    return (owner.equipments if container == "equipments" else owner.items)[index]
+
+
+def _replay_place_player(level: LevelScene, player_tile: list, tile: list) -> None:
+    level.place_player(_get_movable_on_tile(level, player_tile), tuple(tile))
+
+
+def _replay_start_game(level: LevelScene) -> None:
+    level.start_game()
+
+
+def _replay_move(level: LevelScene, actor_tile: list, path: list) -> None:
+    actor: Movable = _get_movable_on_tile(level, actor_tile)
+    # Moves are recorded by the callers of set_move, the replayed level keeps the same log
+    level.action_log.record(ActionKind.MOVE, actor_tile, path)
+    if isinstance(actor, Player):
+        level.selected_player = actor
+        actor.selected = True
+    actor.set_move([tuple(tile) for tile in path])
+    actor.finish_move()
+
+
+def _replay_cancel_move(level: LevelScene, actor_tile: list) -> None:
+    _select(level, actor_tile)
+    level.cancel_active_character_move()
+
+
+def _replay_duel(
+    level: LevelScene, attacker_tile: list, target_tile: list, kind: str
+) -> None:
+    attacker: Movable = _get_movable_on_tile(level, attacker_tile)
+    allies: list[Movable] = level.players + level.entities.allies
+    attacker_allies, target_allies = (
+        (level.entities.foes, allies)
+        if isinstance(attacker, Foe)
+        else (allies, level.entities.foes)
+    )
+    level.duel(
+        attacker,
+        _get_entity_on_tile(level, target_tile),
+        attacker_allies,
+        target_allies,
+        DamageKind[kind],
+    )
+
+
+def _replay_interact(
+    level: LevelScene,
+    actor_tile: list,
+    target_tile: list,
+    current_action: Optional[str],
+    wait_for_teleportation_destination: bool,
+) -> None:
+    actor: Player = _select(level, actor_tile)
+    actor.current_action = CharacterMenu[current_action] if current_action else None
+    level.wait_for_teleportation_destination = wait_for_teleportation_destination
+    level.interact(actor, _get_entity_on_tile(level, target_tile), tuple(target_tile))
+
+
+def _replay_trade_item(
+    level: LevelScene,
+    first_player_tile: list,
+    second_player_tile: list,
+    is_first_player_owner: bool,
+    index: int,
+) -> None:
+    first_player: Player = _select(level, first_player_tile)
+    second_player: Player = _get_movable_on_tile(level, second_player_tile)
+    owner: Player = first_player if is_first_player_owner else second_player
+    level.selected_item = owner.items[index]
+    level.trade_item(first_player, second_player, is_first_player_owner)
+
+
+def _replay_send_gold(
+    level: LevelScene,
+    first_player_tile: list,
+    second_player_tile: list,
+    is_first_player_sender: bool,
+    value: int,
+) -> None:
+    level.send_gold(
+        _select(level, first_player_tile),
+        _get_movable_on_tile(level, second_player_tile),
+        is_first_player_sender,
+        value,
+    )
+
+
+def _replay_item_action(
+    item_action: Callable[[LevelScene], None]
+) -> Callable[[LevelScene, list, str, int], None]:
+    def replay(level: LevelScene, actor_tile: list, container: str, index: int) -> None:
+        level.selected_item = _get_item(_select(level, actor_tile), container, index)
+        item_action(level)
+
+    return replay
+
+
+def _replay_buy_item(level: LevelScene, actor_tile: list, shop_tile: list, index: int) -> None:
+    _select(level, actor_tile)
+    level.active_shop = _get_entity_on_tile(level, shop_tile)
+    level.selected_item = level.active_shop.stock[index]["item"]
+    level.try_buy_selected_item()
+
+
+def _replay_sell_item(level: LevelScene, actor_tile: list, shop_tile: list, index: int) -> None:
+    actor: Player = _select(level, actor_tile)
+    level.active_shop = _get_entity_on_tile(level, shop_tile)
+    level.selected_item = actor.items[index]
+    level.try_sell_selected_item()
+
+
+def _replay_take_objective(level: LevelScene, actor_tile: list) -> None:
+    _select(level, actor_tile)
+    level.take_objective()
+
+
+def _replay_end_character_turn(level: LevelScene, actor_tile: list) -> None:
+    actor: Movable = _get_movable_on_tile(level, actor_tile)
+    if isinstance(actor, Player):
+        level.selected_player = actor
+        level.end_active_character_turn()
+    else:
+        level.action_log.record(ActionKind.END_CHARACTER_TURN, actor_tile)
+        actor.end_turn()
+
+
+def _replay_end_turn(level: LevelScene) -> None:
+    level.end_turn(prepare_ai=False)
+
+
+def _replay_next_side(level: LevelScene) -> None:
+    level.action_log.record(ActionKind.NEXT_SIDE)
+    level.pass_turn_to_next_side(prepare_ai=False)
+
+
+def _replay_end_level(level: LevelScene, status: str) -> None:
+    # Imported here since the level scene records its actions in a log
+    from src.scenes.level_scene import LevelStatus
+
+    for mission in level.missions:
+        mission.update_state(entities=level.entities, turns=level.turn)
+    level.end_level(LevelStatus[status])
+
+
+def _replay_save_game(level: LevelScene) -> None:
+    # Saving the game seeds the random streams again, the save itself is not needed
+    level.action_log.record(ActionKind.SAVE_GAME)
+    level.random_streams.save("random")
+
+
+_REPLAY_HANDLERS: dict[ActionKind, Callable[..., None]] = {
+    ActionKind.PLACE_PLAYER: _replay_place_player,
+    ActionKind.START_GAME: _replay_start_game,
+    ActionKind.MOVE: _replay_move,
+    ActionKind.CANCEL_MOVE: _replay_cancel_move,
+    ActionKind.DUEL: _replay_duel,
+    ActionKind.INTERACT: _replay_interact,
+    ActionKind.TRADE_ITEM: _replay_trade_item,
+    ActionKind.SEND_GOLD: _replay_send_gold,
+    ActionKind.USE_ITEM: _replay_item_action(lambda level: level.use_selected()),
+    ActionKind.EQUIP_ITEM: _replay_item_action(lambda level: level.equip()),
+    ActionKind.UNEQUIP_ITEM: _replay_item_action(lambda level: level.unequip()),
+    ActionKind.THROW_ITEM: _replay_item_action(lambda level: level.throw_selected()),
+    ActionKind.BUY_ITEM: _replay_buy_item,
+    ActionKind.SELL_ITEM: _replay_sell_item,
+    ActionKind.TAKE_OBJECTIVE: _replay_take_objective,
+    ActionKind.END_CHARACTER_TURN: _replay_end_character_turn,
+    ActionKind.END_TURN: _replay_end_turn,
+    ActionKind.NEXT_SIDE: _replay_next_side,
+    ActionKind.END_LEVEL: _replay_end_level,
+    ActionKind.SAVE_GAME: _replay_save_game,
+}
+
+
+def replay_actions(level: LevelScene, action_log: ActionLog) -> None:
+    """
+    Apply all the actions of the given log on the level, in order.
+    The level should be in the state it was in when the log started, with the same random streams.
+    No animation is played and the AI is never asked to plan anything,
+    the decisions of the sides controlled by AI being replayed like the ones of the players.
+    Pop-ups opened by the actions are closed right away,
+    fonts should be initialized if the log contains interactions or item management.
+
+    Raise a ReplayDivergenceError if the level does not follow the log.
+
+    Keyword arguments:
+    level -- the loaded level on which the actions should be applied
+    action_log -- the recorded actions
+    """
+    if level.number != action_log.level_number:
+        raise ReplayDivergenceError(
+            f"The log has been recorded on level {action_log.level_number}, not on level {level.number}"
+        )
+    for index, entry in enumerate(action_log.entries):
+        if level.random_streams.checkpoint() != entry.checkpoint:
+            raise ReplayDivergenceError(
+                f"Random streams diverged before action {index} ({entry.kind.name})"
+            )
+        set_active_streams(level.random_streams)
+        _REPLAY_HANDLERS[entry.kind](level, *entry.arguments)
+        level.animation = None
+        level.menu_manager.clear_menus()
@@ -0,0 +1,329 @@
+"""
+Defines the battle simulator, playing a level to completion with AI on both sides
+for many random seeds across a pool of processes, and reporting aggregated statistics
+to help balancing the game.
+
+Run it from the root directory of the game, for example:
+python -m src.services.battle_simulator maps/level_1/ --seeds 200 --players raimund,braern --foe-levels 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+from multiprocessing import Pool
+from typing import Optional, Sequence
+
+from src.game_entities.movable import EntityStrategy, Movable
+from src.scenes.level_scene import LevelScene, LevelStatus
+from src.services import load_from_xml_manager as loader
+from src.services.random_manager import RandomStreams, set_active_streams
+from src.services.simulation import (
+    init_headless,
+    is_level_over,
+    load_headless_level,
+    play_ai_turns,
+    play_players_turn,
+)
+
+DEFAULT_MAX_TURNS = 100
+
+
+class BattleSettings:
+    """
+    A BattleSettings gathers the parameters shared by all the simulated battles of a sweep.
+
+    Keyword arguments:
+    level_directory -- the relative path to the directory of the level, like maps/level_1/
+    players -- the names of the player characters that should take part in the battle
+    foe_levels -- the number of levels that should be added to each foe
+    xp_gain_scale -- the factor applied to the experience earned by killing each foe
+    max_turns -- the number of turns after which an unfinished battle is stopped
+    level_id -- the number identifying the level, deduced from the name of its directory
+    if it is like level_1, 0 otherwise, when it is not given
+
+    Attributes:
+    level_directory -- the relative path to the directory of the level
+    level_id -- the number identifying the level
+    players -- the names of the player characters that should take part in the battle
+    foe_levels -- the number of levels that should be added to each foe
+    xp_gain_scale -- the factor applied to the experience earned by killing each foe
+    max_turns -- the number of turns after which an unfinished battle is stopped
+    """
+
+    def __init__(
+        self,
+        level_directory: str,
+        players: Sequence[str] = (),
+        foe_levels: int = 0,
+        xp_gain_scale: float = 1.0,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        level_id: Optional[int] = None,
+    ) -> None:
+        self.level_directory: str = os.path.join(level_directory, "")
+        if level_id is None:
+            # Levels of the game are stored in directories like maps/level_1/,
+            # custom maps may be stored anywhere
+            match: Optional[re.Match] = re.fullmatch(
+                r"level_(\d+)", os.path.basename(os.path.normpath(level_directory))
+            )
+            level_id = int(match.group(1)) if match else 0
+        self.level_id: int = level_id
+        self.players: list[str] = list(players)
+        self.foe_levels: int = foe_levels
+        self.xp_gain_scale: float = xp_gain_scale
+        self.max_turns: int = max_turns
+
+
+class BattleResult:
+    """
+    A BattleResult is the outcome of one simulated battle.
+
+    Keyword arguments:
+    seed -- the seed of the random generator used for the battle
+    outcome -- the final status of the level, IN_PROGRESS if the battle has been stopped
+    turns -- the number of turns played
+    damage_dealt_by_players -- the total of damage dealt to the foes by the players and their allies
+    damage_dealt_by_foes -- the total of damage dealt to the players and their allies by the foes
+    surviving_players -- the number of player characters still alive at the end
+    surviving_foes -- the number of foes still alive at the end
+
+    Attributes:
+    seed -- the seed of the random generator used for the battle
+    outcome -- the final status of the level, IN_PROGRESS if the battle has been stopped
+    turns -- the number of turns played
+    damage_dealt_by_players -- the total of damage dealt to the foes by the players and their allies
+    damage_dealt_by_foes -- the total of damage dealt to the players and their allies by the foes
+    surviving_players -- the number of player characters still alive at the end
+    surviving_foes -- the number of foes still alive at the end
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        outcome: LevelStatus,
+        turns: int,
+        damage_dealt_by_players: int,
+        damage_dealt_by_foes: int,
+        surviving_players: int,
+        surviving_foes: int,
+    ) -> None:
+        self.seed: int = seed
+        self.outcome: LevelStatus = outcome
+        self.turns: int = turns
+        self.damage_dealt_by_players: int = damage_dealt_by_players
+        self.damage_dealt_by_foes: int = damage_dealt_by_foes
+        self.surviving_players: int = surviving_players
+        self.surviving_foes: int = surviving_foes
+
+
+def _get_hit_points(entities: Sequence[Movable]) -> dict[int, int]:
+    return {id(entity): entity.hit_points for entity in entities}
+
+
+def _get_damage_taken(entities: Sequence[Movable], hit_points: dict[int, int]) -> int:
+    # Entities that are not there anymore lost all their remaining hit points
+    current_hit_points: dict[int, int] = _get_hit_points(entities)
+    return sum(
+        max(previous - max(current_hit_points.get(entity_id, 0), 0), 0)
+        for entity_id, previous in hit_points.items()
+    )
+
+
+def create_battle_level(settings: BattleSettings, seed: int) -> LevelScene:
+    """
+    Load the level described by the given settings in headless mode and start its game.
+    The players are given the active strategy, so that they can be controlled by AI.
+
+    Return the started level.
+
+    Keyword arguments:
+    settings -- the parameters of the battle
+    seed -- the seed of the random streams of the level
+    """
+    init_headless()
+    random_streams: RandomStreams = RandomStreams(seed)
+    # The roster is created with the streams of the level, so that the whole battle is reproducible
+    set_active_streams(random_streams)
+    level: LevelScene = load_headless_level(
+        settings.level_id,
+        [loader.init_player(name) for name in settings.players],
+        random_streams=random_streams,
+        directory=settings.level_directory,
+    )
+    for player in level.players:
+        player.strategy = EntityStrategy.ACTIVE
+    for foe in level.entities.foes:
+        if settings.foe_levels > 0:
+            foe.lvl += settings.foe_levels
+            foe.stats_up(settings.foe_levels)
+            foe.hit_points = foe.hit_points_max
+        foe.xp_gain = int(foe.xp_gain * settings.xp_gain_scale)
+    level.start_game()
+    return level
+
+
+def simulate_battle(settings: BattleSettings, seed: int) -> BattleResult:
+    """
+    Play the level described by the given settings until its end or until the maximum number of turns.
+    The players are controlled by AI with the active strategy.
+
+    Return the outcome of the battle.
+
+    Keyword arguments:
+    settings -- the parameters of the battle
+    seed -- the seed of the random streams of the level
+    """
+    level: LevelScene = create_battle_level(settings, seed)
+    damage_dealt_by_players: int = 0
+    damage_dealt_by_foes: int = 0
+    # The battle is also over once all the foes are dead, even if the level has other objectives
+    while (
+        not is_level_over(level)
+        and level.entities.foes
+        and level.turn <= settings.max_turns
+    ):
+        allies: list[Movable] = level.players + level.entities.allies
+        allies_hit_points: dict[int, int] = _get_hit_points(allies)
+        foes_hit_points: dict[int, int] = _get_hit_points(level.entities.foes)
+        play_players_turn(level)
+        play_ai_turns(level)
+        damage_dealt_by_players += _get_damage_taken(level.entities.foes, foes_hit_points)
+        damage_dealt_by_foes += _get_damage_taken(
+            level.players + level.entities.allies, allies_hit_points
+        )
+
+    return BattleResult(
+        seed,
+        level.game_phase if is_level_over(level) else LevelStatus.IN_PROGRESS,
+        level.turn,
+        damage_dealt_by_players,
+        damage_dealt_by_foes,
+        len(level.players),
+        len(level.entities.foes),
+    )
+
+
+def _simulate_battle_task(arguments: tuple[BattleSettings, int]) -> BattleResult:
+    return simulate_battle(*arguments)
+
+
+def run_battles(
+    settings: BattleSettings, seeds: Sequence[int], processes: Optional[int] = None
+) -> list[BattleResult]:
+    """
+    Simulate one battle for each of the given seeds across a pool of processes.
+
+    Return the results ordered by seed.
+
+    Keyword arguments:
+    settings -- the parameters shared by all the battles
+    seeds -- the seeds of the battles that should be simulated
+    processes -- the number of worker processes, the number of CPUs if it is not given
+    """
+    pool = Pool(processes, initializer=init_headless)
+    try:
+        results: list[BattleResult] = pool.map(
+            _simulate_battle_task, [(settings, seed) for seed in seeds]
+        )
+    finally:
+        # Workers are asked to stop rather than terminated,
+        # since SDL may have been set up to ignore termination signals before they were forked
+        pool.close()
+        pool.join()
+    return results
+
+
+def format_report(settings: BattleSettings, results: Sequence[BattleResult]) -> str:
+    """
+    Return the aggregated statistics of the given battles as a human-readable report.
+
+    Keyword arguments:
+    settings -- the parameters shared by all the battles
+    results -- the results of the simulated battles
+    """
+    finished: list[BattleResult] = [
+        result for result in results if result.outcome is not LevelStatus.IN_PROGRESS
+    ]
+    victories: int = sum(result.outcome is LevelStatus.ENDED_VICTORY for result in results)
+    defeats: int = sum(result.outcome is LevelStatus.ENDED_DEFEAT for result in results)
+    lines: list[str] = [
+        f"Level: {settings.level_directory}",
+        f"Players: {', '.join(settings.players) if settings.players else 'default'}",
+        f"Foe levels added: {settings.foe_levels}, "
+        f"XP gain scale: {settings.xp_gain_scale}, max turns: {settings.max_turns}",
+        f"Battles: {len(results)}",
+    ]
+    if not results:
+        return "\n".join(lines)
+    lines += [
+        f"Win rate: {victories / len(results):.1%} "
+        f"({victories} victories, {defeats} defeats, {len(results) - len(finished)} unfinished)",
+    ]
+    if finished:
+        turns: list[int] = [result.turns for result in finished]
+        lines.append(
+            f"Turns to finish: mean {statistics.mean(turns):.1f}, "
+            f"median {statistics.median(turns)}, min {min(turns)}, max {max(turns)}"
+        )
+    lines += [
+        "Damage dealt by players: mean "
+        f"{statistics.mean(result.damage_dealt_by_players for result in results):.1f}",
+        "Damage dealt by foes: mean "
+        f"{statistics.mean(result.damage_dealt_by_foes for result in results):.1f}",
+        "Surviving players: mean "
+        f"{statistics.mean(result.surviving_players for result in results):.2f}",
+        "All foes defeated: "
+        f"{sum(not result.surviving_foes for result in results) / len(results):.1%}",
+    ]
+    return "\n".join(lines)
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    """
+    Parse the command-line arguments, simulate the battles and print the report.
+
+    Keyword arguments:
+    arguments -- the command-line arguments, the ones of the process if not given
+    """
+    parser = argparse.ArgumentParser(
+        description="Play a level many times with AI on both sides and report statistics."
+    )
+    parser.add_argument("level_directory", help="the directory of the level, like maps/level_1/")
+    parser.add_argument("--seeds", type=int, default=100, help="the number of battles")
+    parser.add_argument("--first-seed", type=int, default=0, help="the seed of the first battle")
+    parser.add_argument(
+        "--players",
+        default="",
+        help="comma-separated names of the player characters, from data/characters.xml",
+    )
+    parser.add_argument(
+        "--foe-levels", type=int, default=0, help="the number of levels added to each foe"
+    )
+    parser.add_argument(
+        "--xp-gain-scale",
+        type=float,
+        default=1.0,
+        help="the factor applied to the experience earned by killing a foe",
+    )
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--processes", type=int, default=None)
+    parsed_arguments = parser.parse_args(arguments)
+
+    settings = BattleSettings(
+        parsed_arguments.level_directory,
+        [name for name in parsed_arguments.players.split(",") if name],
+        parsed_arguments.foe_levels,
+        parsed_arguments.xp_gain_scale,
+        parsed_arguments.max_turns,
+    )
+    seeds: range = range(
+        parsed_arguments.first_seed, parsed_arguments.first_seed + parsed_arguments.seeds
+    )
+    print(format_report(settings, run_battles(settings, seeds, parsed_arguments.processes)))
+
+
+if __name__ == "__main__":
+    main()
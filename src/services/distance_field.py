@@ -0,0 +1,280 @@
+"""
+Defines DistanceField class, a multi-source distance map giving for any tile of a level
+the walking distance to the nearest tile from which one of the given targets could be attacked.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Optional, Sequence
+
+from src.game_entities.entity import Entity
+from src.gui.position import Position
+from src.services.reachability import NEIGHBOUR_OFFSETS
+from src.services.tile_occupancy import Tile, tile_key
+from src.services.walkability_grid import WalkabilityGrid
+
+
+def _neighbours(tile: Tile) -> list[Tile]:
+    return [
+        (tile[0] + horizontal_offset, tile[1] + vertical_offset)
+        for horizontal_offset, vertical_offset in NEIGHBOUR_OFFSETS
+    ]
+
+
+class DistanceField:
+    """
+    A DistanceField is computed once by a multi-source breadth-first search starting from all the
+    free tiles next to the targets, so that the nearest target of any entity is a simple lookup
+    instead of a flood fill over the whole map.
+
+    Each reached tile stores its distance and the index of its nearest target, ties being broken by
+    the order of the targets. The field is repaired incrementally when the availability of some tiles
+    changes: tiles that become blocked only invalidate the tiles whose shortest paths were going through them,
+    and tiles that become free only propagate shorter distances around them.
+
+    Keyword arguments:
+    targets -- the ordered sequence of entities that should be reached
+    is_tile_available -- the predicate telling if a tile could be crossed
+    unreachable_distance -- the distance given to a target that cannot be reached at all
+    walkability_grid -- the walkability grid of the level, used to compute the whole field
+    with a vectorized wavefront expansion if it is given
+
+    Attributes:
+    targets -- the ordered sequence of entities that should be reached
+    is_tile_available -- the predicate telling if a tile could be crossed
+    unreachable_distance -- the distance given to a target that cannot be reached at all
+    walkability_grid -- the walkability grid of the level if there is any
+    distances -- the distance from each reached tile to the nearest tile next to a target
+    labels -- the index of the nearest target for each reached tile
+    blocked_tiles -- the tiles known to be unavailable
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[Entity],
+        is_tile_available: Callable[[Tile], bool],
+        unreachable_distance: int,
+        walkability_grid: Optional[WalkabilityGrid] = None,
+    ) -> None:
+        self.targets: list[Entity] = list(targets)
+        self.is_tile_available: Callable[[Tile], bool] = is_tile_available
+        self.unreachable_distance: int = unreachable_distance
+        self.walkability_grid: Optional[WalkabilityGrid] = walkability_grid
+        self.distances: dict[Tile, int] = {}
+        self.labels: dict[Tile, int] = {}
+        self.blocked_tiles: set[Tile] = set()
+        self._target_ids: set[int] = set()
+        self._target_indexes: dict[Tile, int] = {}
+        self._dirty_tiles: set[Tile] = set()
+        self._outdated: bool = True
+
+    def is_computed_for(self, targets: Sequence[Entity]) -> bool:
+        """
+        Return whether the field has been computed for the given ordered sequence of targets
+
+        Keyword arguments:
+        targets -- the sequence of targets that should be compared with the ones of the field
+        """
+        return len(targets) == len(self.targets) and all(
+            target is own_target for target, own_target in zip(targets, self.targets)
+        )
+
+    def notify_change(
+        self, entity: Optional[Entity], previous_tile: Optional[Tile], new_tile: Optional[Tile]
+    ) -> None:
+        """
+        Memorize that the occupancy of some tiles changed, the field will be repaired at next query.
+        The whole field will be computed again if one of the targets is concerned or if entity is None.
+
+        Keyword arguments:
+        entity -- the entity that has been moved, added or removed
+        previous_tile -- the tile previously occupied by the entity if there is any
+        new_tile -- the tile now occupied by the entity if there is any
+        """
+        if entity is None or id(entity) in self._target_ids:
+            self._outdated = True
+            return
+        if previous_tile is not None:
+            self._dirty_tiles.add(previous_tile)
+        if new_tile is not None:
+            self._dirty_tiles.add(new_tile)
+
+    def nearest_target(self, position: Position) -> tuple[Optional[Entity], int]:
+        """
+        Return the nearest target from the given position with its distance.
+        The distance is the number of tiles to cross before being next to the target.
+        The first target is returned with the unreachable distance if no target can be reached.
+
+        Keyword arguments:
+        position -- the position of the tile from which the distance should be computed
+        """
+        self._synchronize()
+        if not self.targets:
+            return None, self.unreachable_distance
+        tile: Tile = tile_key(position)
+        label: Optional[int] = self._get_seed_label(tile)
+        if label is not None:
+            return self.targets[label], 0
+        best_key: Optional[tuple[int, int]] = self._get_best_key_from_neighbours(tile)
+        if best_key is None:
+            return self.targets[0], self.unreachable_distance
+        return self.targets[best_key[1]], best_key[0]
+
+    def _synchronize(self) -> None:
+        if self._outdated:
+            self._compute()
+            return
+        if not self._dirty_tiles:
+            return
+        newly_blocked_tiles: list[Tile] = []
+        newly_freed_tiles: list[Tile] = []
+        for tile in self._dirty_tiles:
+            if self.is_tile_available(tile):
+                self.blocked_tiles.discard(tile)
+                if tile not in self.distances:
+                    newly_freed_tiles.append(tile)
+            else:
+                self.blocked_tiles.add(tile)
+                if tile in self.distances:
+                    newly_blocked_tiles.append(tile)
+        self._dirty_tiles.clear()
+        if newly_blocked_tiles:
+            self._repair_blocked_tiles(newly_blocked_tiles)
+        if newly_freed_tiles:
+            self._repair_freed_tiles(newly_freed_tiles)
+
+    def _compute(self) -> None:
+        self.distances = {}
+        self.labels = {}
+        self.blocked_tiles = set()
+        self._dirty_tiles.clear()
+        self._target_ids = {id(target) for target in self.targets}
+        self._target_indexes = {}
+        for index, target in reversed(list(enumerate(self.targets))):
+            self._target_indexes[tile_key(target.position)] = index
+
+        current_level: dict[Tile, int] = {}
+        for target_tile, index in self._target_indexes.items():
+            for neighbour in _neighbours(target_tile):
+                if neighbour in current_level:
+                    current_level[neighbour] = min(current_level[neighbour], index)
+                elif self._is_free(neighbour):
+                    current_level[neighbour] = index
+        if self.walkability_grid is not None:
+            self.distances, self.labels = self.walkability_grid.compute_labelled_distances(
+                current_level
+            )
+            self._outdated = False
+            return
+
+        distance: int = 0
+        while current_level:
+            for tile, label in current_level.items():
+                self.distances[tile] = distance
+                self.labels[tile] = label
+            next_level: dict[Tile, int] = {}
+            for tile, label in current_level.items():
+                for neighbour in _neighbours(tile):
+                    if neighbour in self.distances:
+                        continue
+                    if neighbour in next_level:
+                        next_level[neighbour] = min(next_level[neighbour], label)
+                    elif self._is_free(neighbour):
+                        next_level[neighbour] = label
+            current_level = next_level
+            distance += 1
+        self._outdated = False
+
+    def _repair_blocked_tiles(self, blocked_tiles: list[Tile]) -> None:
+        # Invalidate every tile that might have a shortest path going through a blocked tile
+        invalidated_tiles: set[Tile] = set(blocked_tiles)
+        stack: list[Tile] = list(blocked_tiles)
+        while stack:
+            tile = stack.pop()
+            next_distance = self.distances[tile] + 1
+            for neighbour in _neighbours(tile):
+                if (
+                    neighbour not in invalidated_tiles
+                    and self.distances.get(neighbour) == next_distance
+                ):
+                    invalidated_tiles.add(neighbour)
+                    stack.append(neighbour)
+        for tile in invalidated_tiles:
+            del self.distances[tile]
+            del self.labels[tile]
+
+        # Recompute the invalidated area from its still valid boundary
+        area_to_recompute: set[Tile] = invalidated_tiles.difference(blocked_tiles)
+        queue: list[tuple[int, int, Tile]] = []
+        for tile in area_to_recompute:
+            best_key = self._get_best_key(tile)
+            if best_key is not None:
+                queue.append((best_key[0], best_key[1], tile))
+        heapq.heapify(queue)
+        while queue:
+            distance, label, tile = heapq.heappop(queue)
+            if tile in self.distances:
+                continue
+            self.distances[tile] = distance
+            self.labels[tile] = label
+            for neighbour in _neighbours(tile):
+                if neighbour in area_to_recompute and neighbour not in self.distances:
+                    heapq.heappush(queue, (distance + 1, label, neighbour))
+
+    def _repair_freed_tiles(self, freed_tiles: list[Tile]) -> None:
+        queue: list[tuple[int, int, Tile]] = []
+        for tile in freed_tiles:
+            best_key = self._get_best_key(tile)
+            if best_key is not None:
+                queue.append((best_key[0], best_key[1], tile))
+        heapq.heapify(queue)
+        while queue:
+            distance, label, tile = heapq.heappop(queue)
+            if tile in self.distances and (self.distances[tile], self.labels[tile]) <= (
+                distance,
+                label,
+            ):
+                continue
+            self.distances[tile] = distance
+            self.labels[tile] = label
+            for neighbour in _neighbours(tile):
+                if neighbour in self.distances:
+                    if (self.distances[neighbour], self.labels[neighbour]) > (
+                        distance + 1,
+                        label,
+                    ):
+                        heapq.heappush(queue, (distance + 1, label, neighbour))
+                elif self._is_free(neighbour):
+                    heapq.heappush(queue, (distance + 1, label, neighbour))
+
+    def _get_best_key(self, tile: Tile) -> Optional[tuple[int, int]]:
+        label: Optional[int] = self._get_seed_label(tile)
+        if label is not None:
+            return 0, label
+        return self._get_best_key_from_neighbours(tile)
+
+    def _get_best_key_from_neighbours(self, tile: Tile) -> Optional[tuple[int, int]]:
+        best_key: Optional[tuple[int, int]] = None
+        for neighbour in _neighbours(tile):
+            if neighbour in self.distances:
+                key = (self.distances[neighbour] + 1, self.labels[neighbour])
+                if best_key is None or key < best_key:
+                    best_key = key
+        return best_key
+
+    def _get_seed_label(self, tile: Tile) -> Optional[int]:
+        labels = [
+            self._target_indexes[neighbour]
+            for neighbour in _neighbours(tile)
+            if neighbour in self._target_indexes
+        ]
+        return min(labels) if labels else None
+
+    def _is_free(self, tile: Tile) -> bool:
+        if tile in self.blocked_tiles:
+            return False
+        if self.is_tile_available(tile):
+            return True
+        self.blocked_tiles.add(tile)
+        return False
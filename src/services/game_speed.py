@@ -0,0 +1,76 @@
+"""
+Defines the functions handling the speed at which the game is played back.
+
+In fast-forward mode, the units controlled by AI do not walk tile by tile anymore:
+each of them reaches its destination at once, and the banners announcing a new turn are shortened.
+The mode can be switched at any time, even in the middle of the turn of a side.
+
+With group moves, the units controlled by AI are played back by groups rather than one after the other:
+all the units of a group walk at the same time, and their duels follow once they all arrived.
+"""
+
+from __future__ import annotations
+
+# Factor by which the banners are shortened in fast-forward mode
+FAST_FORWARD_FACTOR: int = 6
+
+_fast_forward: bool = False
+_group_moves: bool = False
+
+
+def set_fast_forward(enabled: bool) -> None:
+    """
+    Enable or disable the fast-forward mode
+
+    Keyword arguments:
+    enabled -- whether the game should be fast-forwarded or not
+    """
+    global _fast_forward
+    _fast_forward = enabled
+
+
+def is_fast_forward() -> bool:
+    """
+    Return whether the game is fast-forwarded or not
+    """
+    return _fast_forward
+
+
+def toggle_fast_forward() -> bool:
+    """
+    Switch the fast-forward mode.
+
+    Return whether the game is now fast-forwarded or not.
+    """
+    set_fast_forward(not _fast_forward)
+    return _fast_forward
+
+
+def get_animation_delay(delay: int) -> int:
+    """
+    Return the number of game frames an animation frame should last at the current speed
+
+    Keyword arguments:
+    delay -- the number of game frames the animation frame lasts at normal speed
+    """
+    if _fast_forward:
+        return max(delay // FAST_FORWARD_FACTOR, 1)
+    return delay
+
+
+def set_group_moves_enabled(enabled: bool) -> None:
+    """
+    Enable or disable the playback of the moves of the units controlled by AI by groups
+
+    Keyword arguments:
+    enabled -- whether the units should walk by groups or one after the other
+    """
+    global _group_moves
+    _group_moves = enabled
+
+
+def are_group_moves_enabled() -> bool:
+    """
+    Return whether the units controlled by AI walk by groups or one after the other
+    """
+    return _group_moves
@@ -0,0 +1,325 @@
+"""
+Defines InfluenceMap class, the per-tile threat, support and target proximity arrays
+shared by all the AI entities of a side during its turn.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.game_entities.entity import Entity
+from src.game_entities.movable import Movable
+from src.gui.position import Position
+from src.services.tile_occupancy import Tile
+from src.services.walkability_grid import (
+    UNREACHED,
+    WalkabilityGrid,
+    compute_wavefront,
+    dilate,
+    get_attack_kernel,
+)
+
+NO_TARGET: int = -1
+
+Window = tuple[slice, slice]
+Cell = tuple[int, int]
+
+
+class InfluenceMap:
+    """
+    An InfluenceMap is computed once at the beginning of the turn of a side controlled by AI,
+    so that the units of this side share what they would otherwise work out on their own.
+
+    It contains, as arrays indexed by row and column:
+    the threat of each tile, being the total strength of the targets that could hit it at their next turn,
+    the support of each tile, being the number of units of the side that could hit it during this turn,
+    the proximity of each tile, being the walking distance to the nearest tile next to a target,
+    and the index of the target standing on each tile.
+
+    The contribution of each unit and each target is memorized along with the window of tiles
+    it depends on, so that the map is updated incrementally: when a tile changes, only the
+    contributions whose window contains this tile are computed again.
+    Tiles left or taken by a unit are handled when the unit has finished acting,
+    other changes are handled as soon as they happen.
+
+    Keyword arguments:
+    walkability_grid -- the walkability grid of the level
+    units -- the units of the side that is about to play
+    targets -- the ordered sequence of entities that could be attacked by the units
+
+    Attributes:
+    walkability_grid -- the walkability grid of the level
+    units -- the units of the side that is about to play
+    targets -- the ordered sequence of entities that could be attacked by the units
+    threat -- the total strength of the targets that could hit each tile
+    support -- the number of units that could hit each tile
+    proximity -- the walking distance from each tile to the nearest tile next to a target
+    target_indexes -- the index of the target standing on each tile, NO_TARGET for empty tiles
+    """
+
+    def __init__(
+        self,
+        walkability_grid: WalkabilityGrid,
+        units: Sequence[Movable],
+        targets: Sequence[Movable],
+    ) -> None:
+        self.walkability_grid: WalkabilityGrid = walkability_grid
+        self.units: list[Movable] = list(units)
+        self.targets: list[Movable] = list(targets)
+        shape: tuple[int, int] = walkability_grid.walkable.shape
+        self.threat: np.ndarray = np.zeros(shape, dtype=np.int32)
+        self.support: np.ndarray = np.zeros(shape, dtype=np.int32)
+        self.proximity: np.ndarray = np.full(shape, UNREACHED, dtype=np.int32)
+        self.target_indexes: np.ndarray = np.full(shape, NO_TARGET, dtype=np.int32)
+        self._threat_contributions: dict[int, Optional[tuple[Window, np.ndarray]]] = {}
+        self._support_contributions: dict[int, Optional[tuple[Window, np.ndarray]]] = {}
+        self._live_target_ids: dict[int, int] = {}
+        self._unit_ids: set[int] = {id(unit) for unit in self.units}
+        self._entities: dict[int, Movable] = {}
+        self._pending_cells: set[Cell] = set()
+
+        for index, target in enumerate(self.targets):
+            self._live_target_ids[id(target)] = index
+            self._entities[id(target)] = target
+            self._place_target(target, index)
+            self._threat_contributions[id(target)] = self._add_contribution(
+                self.threat, target, target.strength
+            )
+        for unit in self.units:
+            self._entities[id(unit)] = unit
+            self._support_contributions[id(unit)] = self._add_contribution(
+                self.support, unit, 1
+            )
+        self._compute_proximity()
+
+    def covers(self, targets: Sequence[Entity]) -> bool:
+        """
+        Return whether the map is up to date with the given ordered sequence of targets
+
+        Keyword arguments:
+        targets -- the sequence of targets that should be compared with the ones still in the map
+        """
+        if len(targets) != len(self._live_target_ids):
+            return False
+        previous_index: int = NO_TARGET
+        for target in targets:
+            index: Optional[int] = self._live_target_ids.get(id(target))
+            if index is None or index <= previous_index:
+                return False
+            previous_index = index
+        return True
+
+    def copy(self) -> InfluenceMap:
+        """
+        Return a copy of the map that does not follow the level anymore,
+        so that it can be read while the level keeps changing
+        """
+        influence_map: InfluenceMap = copy.copy(self)
+        influence_map.targets = list(self.targets)
+        influence_map.threat = self.threat.copy()
+        influence_map.support = self.support.copy()
+        influence_map.proximity = self.proximity.copy()
+        influence_map.target_indexes = self.target_indexes.copy()
+        influence_map._live_target_ids = dict(self._live_target_ids)
+        return influence_map
+
+    def notify_change(
+        self, entity: Optional[Entity], previous_tile: Optional[Tile], new_tile: Optional[Tile]
+    ) -> None:
+        """
+        Keep the map up to date when an entity is moved, added or removed.
+        Moves of the units are taken into account when they finish acting, through update_unit.
+
+        Keyword arguments:
+        entity -- the entity that has been moved, added or removed
+        previous_tile -- the tile previously occupied by the entity if there is any
+        new_tile -- the tile now occupied by the entity if there is any
+        """
+        if entity is None:
+            return
+        cells: set[Cell] = {
+            cell
+            for cell in (
+                self.walkability_grid.get_index(tile)
+                for tile in (previous_tile, new_tile)
+                if tile is not None
+            )
+            if cell is not None
+        }
+        if id(entity) in self._live_target_ids:
+            index: int = self._live_target_ids[id(entity)]
+            if previous_tile is not None:
+                self._clear_target(previous_tile, index)
+            if new_tile is None:
+                del self._live_target_ids[id(entity)]
+                self._remove_contribution(self.threat, self._threat_contributions.pop(id(entity)))
+            else:
+                self._place_target(entity, index)
+        elif id(entity) in self._unit_ids:
+            if new_tile is not None:
+                self._pending_cells.update(cells)
+                return
+            self._unit_ids.discard(id(entity))
+            self._remove_contribution(self.support, self._support_contributions.pop(id(entity)))
+        self._refresh_around(cells | self._pending_cells)
+
+    def update_unit(self, unit: Movable) -> None:
+        """
+        Refresh the map after a unit of the side has acted
+
+        Keyword arguments:
+        unit -- the unit that has finished acting
+        """
+        if id(unit) in self._unit_ids:
+            self._remove_contribution(self.support, self._support_contributions[id(unit)])
+            self._support_contributions[id(unit)] = self._add_contribution(self.support, unit, 1)
+        self._refresh_around(self._pending_cells)
+
+    def get_targets_in_reach(self, position: Position, reach: Sequence[int]) -> list[Movable]:
+        """
+        Return the targets that could be attacked from the given position.
+        Targets are ordered by the order of the given reach first, then by their own order.
+
+        Keyword arguments:
+        position -- the position of the attacking entity
+        reach -- the distances at which the attacking entity can hit
+        """
+        cell: Optional[tuple[int, int]] = self.walkability_grid.get_index(position)
+        if cell is None:
+            return []
+        targets_in_reach: list[Movable] = []
+        for distance in reach:
+            indexes: np.ndarray = self._gather_target_indexes(
+                np.array([cell], dtype=np.int32), get_attack_kernel([distance])
+            )
+            targets_in_reach.extend(
+                self.targets[index] for index in sorted(indexes[indexes != NO_TARGET].tolist())
+            )
+        return targets_in_reach
+
+    def find_move_next_to_target(
+        self, possible_moves: Sequence[Position], reach: Sequence[int]
+    ) -> Optional[tuple[Position, Movable]]:
+        """
+        Return the first move from which a target could be attacked, along with this target.
+        Moves are ranked by the order of the targets first, then by the order of the given reach
+        and finally by the order of the possible moves.
+
+        Keyword arguments:
+        possible_moves -- the ordered collection of tiles that could be reached by the entity
+        reach -- the distances at which the entity can hit
+        """
+        moves: list[Position] = [
+            move for move in possible_moves if self.walkability_grid.get_index(move) is not None
+        ]
+        if not moves:
+            return None
+        cells: np.ndarray = np.array(
+            [self.walkability_grid.get_index(move) for move in moves], dtype=np.int32
+        )
+        best_rank: Optional[tuple[int, int, int]] = None
+        for reach_rank, distance in enumerate(reach):
+            indexes: np.ndarray = self._gather_target_indexes(
+                cells, get_attack_kernel([distance])
+            )
+            reached_targets: np.ndarray = np.where(
+                indexes == NO_TARGET, len(self.targets), indexes
+            ).min(axis=1)
+            move_rank: int = int(reached_targets.argmin())
+            if reached_targets[move_rank] == len(self.targets):
+                continue
+            rank = (int(reached_targets[move_rank]), reach_rank, move_rank)
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+        if best_rank is None:
+            return None
+        return moves[best_rank[2]], self.targets[best_rank[0]]
+
+    def _gather_target_indexes(self, cells: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+        # Index of the target on each tile around each cell, one row per cell
+        rows: np.ndarray = cells[:, 0:1] + kernel[:, 0]
+        columns: np.ndarray = cells[:, 1:2] + kernel[:, 1]
+        inside_map: np.ndarray = (
+            (rows >= 0)
+            & (rows < self.walkability_grid.rows)
+            & (columns >= 0)
+            & (columns < self.walkability_grid.columns)
+        )
+        indexes: np.ndarray = np.full(rows.shape, NO_TARGET, dtype=np.int32)
+        indexes[inside_map] = self.target_indexes[rows[inside_map], columns[inside_map]]
+        return indexes
+
+    def _add_contribution(
+        self, layer: np.ndarray, entity: Movable, weight: int
+    ) -> Optional[tuple[Window, np.ndarray]]:
+        # Add the weight of the entity on every tile it could hit after moving, and return what was added
+        cell: Optional[tuple[int, int]] = self.walkability_grid.get_index(entity.position)
+        if cell is None:
+            return None
+        radius: int = entity.max_moves + max(entity.reach, default=0)
+        window: Window = (
+            slice(max(cell[0] - radius, 0), min(cell[0] + radius + 1, self.walkability_grid.rows)),
+            slice(
+                max(cell[1] - radius, 0),
+                min(cell[1] + radius + 1, self.walkability_grid.columns),
+            ),
+        )
+        walkable: np.ndarray = self.walkability_grid.walkable[window]
+        sources: np.ndarray = np.zeros(walkable.shape, dtype=bool)
+        sources[cell[0] - window[0].start, cell[1] - window[1].start] = True
+        moves: np.ndarray = compute_wavefront(walkable, sources, entity.max_moves) != UNREACHED
+        contribution: np.ndarray = dilate(moves, entity.reach).astype(np.int32) * weight
+        layer[window] += contribution
+        return window, contribution
+
+    @staticmethod
+    def _remove_contribution(
+        layer: np.ndarray, contribution: Optional[tuple[Window, np.ndarray]]
+    ) -> None:
+        if contribution is not None:
+            window, values = contribution
+            layer[window] -= values
+
+    def _refresh_around(self, cells: set[Cell]) -> None:
+        # Compute again the contributions that may depend on the given tiles
+        if not cells:
+            return
+        for layer, contributions in (
+            (self.threat, self._threat_contributions),
+            (self.support, self._support_contributions),
+        ):
+            for entity_id, contribution in contributions.items():
+                if contribution is None or not any(
+                    contribution[0][0].start <= row < contribution[0][0].stop
+                    and contribution[0][1].start <= column < contribution[0][1].stop
+                    for row, column in cells
+                ):
+                    continue
+                entity: Movable = self._entities[entity_id]
+                self._remove_contribution(layer, contribution)
+                contributions[entity_id] = self._add_contribution(
+                    layer, entity, entity.strength if layer is self.threat else 1
+                )
+        self._pending_cells = set()
+        self._compute_proximity()
+
+    def _place_target(self, target: Entity, index: int) -> None:
+        cell: Optional[tuple[int, int]] = self.walkability_grid.get_index(target.position)
+        if cell is not None and (
+            self.target_indexes[cell] == NO_TARGET or index < self.target_indexes[cell]
+        ):
+            self.target_indexes[cell] = index
+
+    def _clear_target(self, tile: Tile, index: int) -> None:
+        cell: Optional[tuple[int, int]] = self.walkability_grid.get_index(tile)
+        if cell is not None and self.target_indexes[cell] == index:
+            self.target_indexes[cell] = NO_TARGET
+
+    def _compute_proximity(self) -> None:
+        target_tiles: np.ndarray = self.target_indexes != NO_TARGET
+        distances: np.ndarray = compute_wavefront(self.walkability_grid.walkable, target_tiles)
+        # Distances are measured to the tiles next to the targets, not to the targets themselves
+        self.proximity = np.where(distances > 0, distances - 1, UNREACHED)
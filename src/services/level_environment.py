@@ -0,0 +1,435 @@
+"""
+Defines LevelEnvironment class, exposing a headless level through a step / reset / observe API
+so that automated playtesters can be trained against the real rules of the game,
+and VectorLevelEnvironment class, running many of these levels in lockstep,
+either in the calling process or spread across worker processes.
+
+An observation is a NumPy array of shape (len(OBSERVATION_CHANNELS), rows, columns),
+each channel describing one aspect of the board tile by tile.
+
+The agent controls the player characters, one step at a time for the acting player:
+a move step, in which the action is the index (row * columns + column) of the destination tile,
+then an attack step if a foe is in reach, in which the action is the index of the tile of the attacked foe.
+The last action stands for staying in place or not attacking.
+Illegal actions are played as this last action, the legal ones being given by the action mask.
+The allies and the foes play on their own once all the players have acted.
+"""
+
+from __future__ import annotations
+
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from src.constants import TILE_SIZE
+from src.game_entities.movable import Movable
+from src.game_entities.player import Player
+from src.gui.position import Position
+from src.scenes.level_scene import LevelScene, LevelStatus
+from src.services.battle_simulator import BattleSettings, create_battle_level
+from src.services.random_manager import set_active_streams
+from src.services.simulation import (
+    end_player_turn,
+    init_headless,
+    is_level_over,
+    move_player,
+    play_ai_turns,
+)
+
+OBSERVATION_CHANNELS: tuple[str, ...] = (
+    # Whether the tile can be crossed
+    "walkable",
+    # Hit points of the units of each side standing on the tile
+    "players",
+    "allies",
+    "foes",
+    # Statistics of the unit standing on the tile
+    "strength",
+    "defense",
+    "resistance",
+    "max_moves",
+    # 1 on the tile of the player that is about to move, 2 if it is about to attack
+    "acting",
+)
+# Reward given once the level is won, and taken once it is lost
+OUTCOME_REWARD: float = 100.0
+
+
+class LevelEnvironment:
+    """
+    A LevelEnvironment plays a headless level step by step on behalf of an agent controlling the players.
+
+    The reward of a step is the balance of hit points between the two sides after the step minus
+    the one before it, including what happened during the turns of the sides controlled by AI,
+    plus or minus OUTCOME_REWARD when the level ends by a victory or a defeat.
+
+    Keyword arguments:
+    settings -- the parameters of the battles played by the environment
+
+    Attributes:
+    settings -- the parameters of the battles played by the environment
+    level -- the level being played, None before the first reset
+    acting_player -- the player whose action is expected, None once the level is over
+    is_attacking -- whether the acting player already moved and is about to attack
+    nb_actions -- the number of discrete actions, including the end action
+    """
+
+    def __init__(self, settings: BattleSettings) -> None:
+        self.settings: BattleSettings = settings
+        self.level: Optional[LevelScene] = None
+        self.acting_player: Optional[Player] = None
+        self.is_attacking: bool = False
+        self.nb_actions: int = 0
+        self._balance: int = 0
+
+    @property
+    def end_action(self) -> int:
+        """
+        Return the action standing for staying in place or not attacking
+        """
+        return self.nb_actions - 1
+
+    def reset(self, seed: int) -> np.ndarray:
+        """
+        Start a new battle.
+
+        Return the first observation.
+
+        Keyword arguments:
+        seed -- the seed of the random streams of the level
+        """
+        self.level = create_battle_level(self.settings, seed)
+        grid = self.level.walkability_grid
+        self.nb_actions = grid.columns * grid.rows + 1
+        self._balance = self._get_balance()
+        self.is_attacking = False
+        self._select_acting_player()
+        return self.observe()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict[str, Any]]:
+        """
+        Play the given action for the acting player, then let the other sides play
+        if all the players have acted.
+
+        Return the observation, the reward, whether the level is over, whether it has been stopped
+        because of the maximum number of turns, and some information about the level.
+
+        Keyword arguments:
+        action -- the index of the tile to which the player should move or that it should attack,
+        or the end action
+        """
+        # Several levels may be played in turn in the same process
+        set_active_streams(self.level.random_streams)
+        player: Player = self.acting_player
+        if player is not None:
+            tile: Optional[Position] = (
+                self.get_tile(int(action)) if self.action_mask()[action] else None
+            )
+            if self.is_attacking:
+                self.is_attacking = False
+                end_player_turn(self.level, player, tile)
+            else:
+                if tile is not None and tile != tuple(player.position):
+                    move_player(self.level, player, tile)
+                if player.can_attack() and self._get_targets_in_reach():
+                    self.is_attacking = True
+                else:
+                    end_player_turn(self.level, player)
+            if not self.is_attacking:
+                self._select_acting_player()
+
+        balance: int = self._get_balance()
+        reward: float = float(balance - self._balance)
+        self._balance = balance
+        terminated: bool = self.is_over()
+        if terminated and self.level.game_phase is LevelStatus.ENDED_VICTORY:
+            reward += OUTCOME_REWARD
+        elif terminated and self.level.game_phase is LevelStatus.ENDED_DEFEAT:
+            reward -= OUTCOME_REWARD
+        truncated: bool = not terminated and self.level.turn > self.settings.max_turns
+        info: dict[str, Any] = {"turn": self.level.turn, "phase": self.level.game_phase.name}
+        return self.observe(), reward, terminated, truncated, info
+
+    def is_over(self) -> bool:
+        """
+        Return whether the battle is over, by the end of the level or by the death of a whole side
+        """
+        return (
+            is_level_over(self.level) or not self.level.entities.foes or not self.level.players
+        )
+
+    def observe(self) -> np.ndarray:
+        """
+        Return the current observation of the board
+        """
+        grid = self.level.walkability_grid
+        observation: np.ndarray = np.zeros(
+            (len(OBSERVATION_CHANNELS), grid.rows, grid.columns), dtype=np.int32
+        )
+        observation[0] = grid.walkable
+        for channel, units in enumerate(
+            (self.level.players, self.level.entities.allies, self.level.entities.foes), 1
+        ):
+            for unit in units:
+                index: Optional[tuple[int, int]] = grid.get_index(unit.position)
+                if index is None:
+                    continue
+                observation[(channel,) + index] = unit.hit_points
+                observation[(4,) + index] = unit.strength
+                observation[(5,) + index] = unit.defense
+                observation[(6,) + index] = unit.resistance
+                observation[(7,) + index] = unit.max_moves
+        if self.acting_player is not None:
+            index = grid.get_index(self.acting_player.position)
+            observation[(8,) + index] = 2 if self.is_attacking else 1
+        return observation
+
+    def action_mask(self) -> np.ndarray:
+        """
+        Return the boolean array telling which actions are legal for the acting player
+        """
+        mask: np.ndarray = np.zeros(self.nb_actions, dtype=bool)
+        mask[self.end_action] = True
+        if self.acting_player is None:
+            return mask
+        grid = self.level.walkability_grid
+        tiles: Sequence[Position] = (
+            [target.position for target in self._get_targets_in_reach()]
+            if self.is_attacking
+            else list(
+                self.level.get_possible_moves(
+                    tuple(self.acting_player.position), self.acting_player.max_moves
+                )
+            )
+        )
+        for tile in tiles:
+            row, column = grid.get_index(tile)
+            mask[row * grid.columns + column] = True
+        return mask
+
+    def get_tile(self, action: int) -> Optional[Position]:
+        """
+        Return the position of the tile targeted by the given action, None for the end action
+
+        Keyword arguments:
+        action -- the action whose tile should be returned
+        """
+        if action == self.end_action:
+            return None
+        row, column = divmod(action, self.level.walkability_grid.columns)
+        return self.level.walkability_grid.get_tile(row, column)
+
+    def _get_targets_in_reach(self) -> list[Movable]:
+        player: Player = self.acting_player
+        return [
+            foe
+            for foe in self.level.entities.foes
+            if (
+                abs(player.position[0] - foe.position[0])
+                + abs(player.position[1] - foe.position[1])
+            )
+            // TILE_SIZE
+            in player.reach
+        ]
+
+    def _select_acting_player(self) -> None:
+        # The turn is given to the other sides once all the players acted
+        while not self.is_over() and self.level.turn <= self.settings.max_turns:
+            for player in self.level.players:
+                if not player.turn_is_finished():
+                    self.acting_player = player
+                    return
+            self.level.end_turn()
+            play_ai_turns(self.level)
+        self.acting_player = None
+
+    def _get_balance(self) -> int:
+        return sum(
+            unit.hit_points for unit in self.level.players + self.level.entities.allies
+        ) - sum(foe.hit_points for foe in self.level.entities.foes)
+
+
+def _reset_environments(
+    environments: Sequence[LevelEnvironment], seeds: Sequence[int]
+) -> list[np.ndarray]:
+    return [environment.reset(seed) for environment, seed in zip(environments, seeds)]
+
+
+def _step_environments(
+    environments: Sequence[LevelEnvironment], actions: Sequence[int], seeds: Sequence[int]
+) -> list[tuple[np.ndarray, float, bool, bool, dict[str, Any]]]:
+    results: list[tuple[np.ndarray, float, bool, bool, dict[str, Any]]] = []
+    for environment, action, seed in zip(environments, actions, seeds):
+        observation, reward, terminated, truncated, info = environment.step(action)
+        if terminated or truncated:
+            # Finished battles are replaced at once by new ones
+            info["final_observation"] = observation
+            observation = environment.reset(seed)
+        results.append((observation, reward, terminated, truncated, info))
+    return results
+
+
+def _run_worker(connection: Connection, settings: BattleSettings, nb_environments: int) -> None:
+    init_headless()
+    environments: list[LevelEnvironment] = [
+        LevelEnvironment(settings) for _ in range(nb_environments)
+    ]
+    while True:
+        command, arguments = connection.recv()
+        if command == "reset":
+            connection.send(_reset_environments(environments, arguments))
+        elif command == "step":
+            connection.send(_step_environments(environments, *arguments))
+        elif command == "action_masks":
+            connection.send([environment.action_mask() for environment in environments])
+        else:
+            break
+    connection.close()
+
+
+class VectorLevelEnvironment:
+    """
+    A VectorLevelEnvironment runs several independent level environments in lockstep,
+    so that the agent plays one action in each of them at every step.
+    A battle that is over is replaced at once by a new one, its last observation being given
+    in the information of the step under the final_observation key.
+
+    The environments run in the calling process by default. They can also be spread across
+    worker processes, each of them stepping its share of the environments for every request.
+    Battle i is played with the seed first_seed + i, and each new battle of an environment
+    takes the seed of its previous battle plus the number of environments,
+    so that the same battles are played whatever the number of processes.
+
+    Keyword arguments:
+    settings -- the parameters of the battles played by the environments
+    nb_environments -- the number of environments
+    first_seed -- the seed of the first battle of the first environment
+    processes -- the number of worker processes, 0 to run the environments in the calling process
+
+    Attributes:
+    settings -- the parameters of the battles played by the environments
+    nb_environments -- the number of environments
+    processes -- the number of worker processes
+    seeds -- the seed of the current battle of each environment
+    environments -- the environments when they run in the calling process
+    """
+
+    def __init__(
+        self,
+        settings: BattleSettings,
+        nb_environments: int,
+        first_seed: int = 0,
+        processes: int = 0,
+    ) -> None:
+        self.settings: BattleSettings = settings
+        self.nb_environments: int = nb_environments
+        self.processes: int = min(processes, nb_environments)
+        self.seeds: list[int] = [first_seed + index for index in range(nb_environments)]
+        self.environments: list[LevelEnvironment] = []
+        self._connections: list[Connection] = []
+        self._workers: list[Process] = []
+        self._chunks: list[range] = []
+        if self.processes > 0:
+            # Consecutive environments are grouped by worker
+            bounds: list[int] = [
+                nb_environments * worker // self.processes for worker in range(self.processes + 1)
+            ]
+            self._chunks = [
+                range(bounds[worker], bounds[worker + 1]) for worker in range(self.processes)
+            ]
+            for chunk in self._chunks:
+                connection, worker_connection = Pipe()
+                worker: Process = Process(
+                    target=_run_worker, args=(worker_connection, settings, len(chunk)), daemon=True
+                )
+                worker.start()
+                worker_connection.close()
+                self._connections.append(connection)
+                self._workers.append(worker)
+        else:
+            self.environments = [LevelEnvironment(settings) for _ in range(nb_environments)]
+
+    def reset(self) -> np.ndarray:
+        """
+        Start a new battle in every environment.
+
+        Return the stacked observations.
+        """
+        if self.processes > 0:
+            observations: list[np.ndarray] = self._request(
+                "reset", lambda chunk: [self.seeds[index] for index in chunk]
+            )
+        else:
+            init_headless()
+            observations = _reset_environments(self.environments, self.seeds)
+        return np.stack(observations)
+
+    def step(
+        self, actions: Sequence[int]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list[dict[str, Any]]]:
+        """
+        Play one action in every environment.
+
+        Return the stacked observations, rewards, terminations and truncations,
+        and the information of each environment.
+
+        Keyword arguments:
+        actions -- the action of each environment
+        """
+        next_seeds: list[int] = [seed + self.nb_environments for seed in self.seeds]
+        if self.processes > 0:
+            results = self._request(
+                "step",
+                lambda chunk: (
+                    [int(actions[index]) for index in chunk],
+                    [next_seeds[index] for index in chunk],
+                ),
+            )
+        else:
+            results = _step_environments(self.environments, actions, next_seeds)
+        for index, (_, _, terminated, truncated, _) in enumerate(results):
+            if terminated or truncated:
+                self.seeds[index] = next_seeds[index]
+        observations, rewards, terminations, truncations, infos = zip(*results)
+        return (
+            np.stack(observations),
+            np.array(rewards, dtype=np.float32),
+            np.array(terminations, dtype=bool),
+            np.array(truncations, dtype=bool),
+            list(infos),
+        )
+
+    def action_masks(self) -> np.ndarray:
+        """
+        Return the stacked action masks of the environments
+        """
+        if self.processes > 0:
+            masks: list[np.ndarray] = self._request("action_masks", lambda chunk: None)
+        else:
+            masks = [environment.action_mask() for environment in self.environments]
+        return np.stack(masks)
+
+    def close(self) -> None:
+        """
+        Stop the worker processes if there are any
+        """
+        for connection in self._connections:
+            connection.send(("close", None))
+            connection.close()
+        # Workers are asked to stop rather than terminated,
+        # since SDL may have been set up to ignore termination signals before they were forked
+        for worker in self._workers:
+            worker.join()
+        self._connections = []
+        self._workers = []
+
+    def _request(self, command: str, get_arguments) -> list:
+        # Send the request to all the workers first, so that they process it in parallel
+        for connection, chunk in zip(self._connections, self._chunks):
+            connection.send((command, get_arguments(chunk)))
+        results: list = []
+        for connection in self._connections:
+            results += connection.recv()
+        return results
@@ -0,0 +1,73 @@
+"""
+Defines LevelSnapshot class, the in-memory state of a level at a given time,
+taken and restored by the level to branch the game for AI lookahead or to undo a move.
+"""
+
+from __future__ import annotations
+
+from src.game_entities.entity import Entity
+from src.game_entities.player import Player
+
+
+class LevelSnapshot:
+    """
+    A LevelSnapshot gathers everything that can change while a level is being played.
+
+    All the values are immutable and the objects of the level, like the entities, their items
+    and their alterations, are shared instead of being copied: only the values that can change on
+    these objects are captured, so that taking a snapshot is cheap and never invalidated
+    by what happens on the level afterwards.
+    The same snapshot can then be restored any number of times.
+
+    Keyword arguments:
+    collections -- the entities of each collection of the level, by name of the collection
+    entity_states -- each entity of the level or that escaped it, along with its state
+    escaped_players -- the players who left the level
+    mission_states -- the progress of each mission of the level
+    level_values -- the values of the turn, the side playing, the selections and the other level attributes
+    diary_entries -- the log of the most recent battles
+    traded_items -- the items that have been traded during the current player turn
+    traded_gold -- the gold that has been traded during the current player turn
+    random_state -- the state of the random streams of the level
+    action_count -- the number of actions recorded in the action log of the level
+
+    Attributes:
+    collections -- the entities of each collection of the level, by name of the collection
+    entity_states -- each entity of the level or that escaped it, along with its state
+    escaped_players -- the players who left the level
+    mission_states -- the progress of each mission of the level
+    level_values -- the values of the turn, the side playing, the selections and the other level attributes
+    diary_entries -- the log of the most recent battles
+    traded_items -- the items that have been traded during the current player turn
+    traded_gold -- the gold that has been traded during the current player turn
+    random_state -- the state of the random streams of the level
+    action_count -- the number of actions recorded in the action log of the level
+    member_ids -- the ids of the entities that are in a collection of the level
+    """
+
+    def __init__(
+        self,
+        collections: tuple[tuple[str, tuple[Entity, ...]], ...],
+        entity_states: tuple[tuple[Entity, tuple], ...],
+        escaped_players: tuple[Player, ...],
+        mission_states: tuple[tuple, ...],
+        level_values: tuple,
+        diary_entries: tuple[str, ...],
+        traded_items: tuple[tuple, ...],
+        traded_gold: tuple[tuple, ...],
+        random_state: tuple,
+        action_count: int,
+    ) -> None:
+        self.collections: tuple[tuple[str, tuple[Entity, ...]], ...] = collections
+        self.entity_states: tuple[tuple[Entity, tuple], ...] = entity_states
+        self.escaped_players: tuple[Player, ...] = escaped_players
+        self.mission_states: tuple[tuple, ...] = mission_states
+        self.level_values: tuple = level_values
+        self.diary_entries: tuple[str, ...] = diary_entries
+        self.traded_items: tuple[tuple, ...] = traded_items
+        self.traded_gold: tuple[tuple, ...] = traded_gold
+        self.random_state: tuple = random_state
+        self.action_count: int = action_count
+        self.member_ids: frozenset[int] = frozenset(
+            id(entity) for _, members in collections for entity in members
+        )
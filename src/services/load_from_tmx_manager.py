@@ -12,6 +12,7 @@ from src.game_entities.building import Building
 from src.game_entities.character import Character
 from src.game_entities.chest import Chest
 from src.game_entities.door import Door
+from src.game_entities.entity import Entity
 from src.game_entities.foe import Foe
 from src.game_entities.fountain import Fountain
 from src.game_entities.mission import Mission, MissionType
@@ -52,6 +53,33 @@ def load_ground(tmx_data: pytmx.TiledMap, size: tuple[int, int]) -> pygame.Surfa
     return map_ground
 
 
+def compose_static_layer(
+    ground: pygame.Surface, entities: Sequence[Entity], origin: Position
+) -> pygame.Surface:
+    """
+    Draw the given entities on top of a copy of the ground of a map.
+    Entities whose appearance never changes are drawn once this way,
+    so that they don't have to be drawn again at each frame.
+
+    Return the ground with the entities drawn on it.
+
+    Keyword arguments:
+    ground -- the image of the ground of the map, that is left untouched
+    entities -- the entities that should be drawn, in their drawing order
+    origin -- the position of the top left corner of the map on the screen,
+    used to convert the positions of the entities into positions on the ground
+    """
+    static_layer = ground.copy()
+    static_layer.blits(
+        [
+            (entity.sprite, (entity.position[0] - origin[0], entity.position[1] - origin[1]))
+            for entity in entities
+        ],
+        False,
+    )
+    return static_layer
+
+
 def load_obstacles(
     tmx_data: pytmx.TiledMap, horizontal_gap: int, vertical_gap: int
 ) -> list[Obstacle]:
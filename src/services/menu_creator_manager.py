@@ -1358,6 +1358,28 @@ def create_options_menu(
                     lambda value: modify_option_function("move_speed", value),
                 ),
             ],
+            [
+                load_parameter_button(
+                    STR_FAST_FORWARD_,
+                    [
+                        {"label": STR_OFF, "value": 0},
+                        {"label": STR_ON, "value": 1},
+                    ],
+                    parameters["fast_forward"],
+                    lambda value: modify_option_function("fast_forward", value),
+                ),
+            ],
+            [
+                load_parameter_button(
+                    STR_GROUP_MOVES_,
+                    [
+                        {"label": STR_OFF, "value": 0},
+                        {"label": STR_ON, "value": 1},
+                    ],
+                    parameters["group_moves"],
+                    lambda value: modify_option_function("group_moves", value),
+                ),
+            ],
             [
                 load_parameter_button(
                     STR_SCREEN_MODE_,
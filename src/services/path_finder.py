@@ -0,0 +1,92 @@
+"""
+Defines the A* path finding used by AI entities to walk toward a target that is out of their movement range.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Optional, Sequence
+
+from src.constants import TILE_SIZE
+from src.gui.position import Position
+from src.services.reachability import NEIGHBOUR_OFFSETS
+from src.services.tile_occupancy import Tile, tile_key
+
+
+def _tiles_between(tile: Tile, other_tile: Tile) -> int:
+    return (abs(tile[0] - other_tile[0]) + abs(tile[1] - other_tile[1])) // TILE_SIZE
+
+
+def find_path(
+    start: Position,
+    target: Position,
+    reach: Sequence[int],
+    is_tile_available: Callable[[Tile], bool],
+) -> Optional[list[Tile]]:
+    """
+    Search for the shortest path from the start to any tile from which the target could be attacked,
+    with an A* search guided by the Manhattan distance to the target.
+    Among tiles with the same estimated cost, the ones nearest to a goal are explored first,
+    so that the search goes straight toward the target when nothing stands in the way.
+
+    Return the ordered list of tiles to cross, the start excluded, or None if no such tile can be reached.
+
+    Keyword arguments:
+    start -- the position from which the path starts
+    target -- the position of the entity to reach
+    reach -- the distances at which the moving entity can hit
+    is_tile_available -- the predicate telling if a tile could be crossed, called at most once per tile
+    """
+    start_tile: Tile = tile_key(start)
+    target_tile: Tile = tile_key(target)
+    reach_set: set[int] = set(reach)
+    if not reach_set:
+        return None
+    max_reach: int = max(reach_set)
+
+    def estimate(tile: Tile) -> int:
+        return max(0, _tiles_between(tile, target_tile) - max_reach)
+
+    costs: dict[Tile, int] = {start_tile: 0}
+    predecessors: dict[Tile, Tile] = {}
+    explored_tiles: set[Tile] = set()
+    blocked_tiles: set[Tile] = set()
+    insertion_counter: int = 0
+    queue: list[tuple[int, int, int, Tile]] = [
+        (estimate(start_tile), estimate(start_tile), insertion_counter, start_tile)
+    ]
+    while queue:
+        _, _, _, tile = heapq.heappop(queue)
+        if tile in explored_tiles:
+            continue
+        if _tiles_between(tile, target_tile) in reach_set:
+            path: list[Tile] = []
+            while tile != start_tile:
+                path.append(tile)
+                tile = predecessors[tile]
+            path.reverse()
+            return path
+        explored_tiles.add(tile)
+        next_cost: int = costs[tile] + 1
+        for horizontal_offset, vertical_offset in NEIGHBOUR_OFFSETS:
+            neighbour: Tile = (tile[0] + horizontal_offset, tile[1] + vertical_offset)
+            if neighbour in explored_tiles or neighbour in blocked_tiles:
+                continue
+            if neighbour not in costs and not is_tile_available(neighbour):
+                blocked_tiles.add(neighbour)
+                continue
+            if next_cost < costs.get(neighbour, next_cost + 1):
+                costs[neighbour] = next_cost
+                predecessors[neighbour] = tile
+                insertion_counter += 1
+                remaining_estimate: int = estimate(neighbour)
+                heapq.heappush(
+                    queue,
+                    (
+                        next_cost + remaining_estimate,
+                        remaining_estimate,
+                        insertion_counter,
+                        neighbour,
+                    ),
+                )
+    return None
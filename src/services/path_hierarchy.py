@@ -0,0 +1,401 @@
+"""
+Defines PathHierarchy class, the hierarchical path finding layer (HPA*) used to find long routes
+on maps that are too large for a search over every tile.
+"""
+
+from __future__ import annotations
+
+import copy
+import heapq
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from src.game_entities.entity import Entity
+from src.game_entities.movable import Movable
+from src.game_entities.objective import Objective
+from src.gui.position import Position
+from src.services.path_finder import find_path
+from src.services.tile_occupancy import Tile
+from src.services.walkability_grid import WalkabilityGrid
+
+CLUSTER_SIZE: int = 10
+# Entrances longer than this get a transition at each end instead of a single one in the middle
+LONG_ENTRANCE_LENGTH: int = 6
+
+Cell = tuple[int, int]
+Cluster = tuple[int, int]
+Border = tuple[Cluster, Cluster]
+
+
+def _cells_between(cell: Cell, other_cell: Cell) -> int:
+    return abs(cell[0] - other_cell[0]) + abs(cell[1] - other_cell[1])
+
+
+class PathHierarchy:
+    """
+    A PathHierarchy splits the map in square clusters and links them through their entrances,
+    the walkable runs of tiles along the border between two adjacent clusters.
+    Each entrance gives one or two transitions, pairs of facing tiles that become nodes of an abstract graph.
+    Nodes of a same cluster are linked by their walking distance inside the cluster.
+
+    The hierarchy only considers the static content of the map: units are ignored since they move all the time,
+    while obstacles, doors, breakables and other static entities block tiles.
+    When a static entity is added or removed (e.g. a door is opened or a breakable is destroyed),
+    only the entrances and the nodes of the clusters around the concerned tile are computed again.
+
+    A long route is found by searching the abstract graph first, then refined on demand into tiles
+    by local searches between consecutive nodes, up to the requested length.
+
+    Keyword arguments:
+    walkability_grid -- the walkability grid of the level
+    cluster_size -- the width and the height of a cluster in tiles
+
+    Attributes:
+    walkability_grid -- the walkability grid of the level
+    cluster_size -- the width and the height of a cluster in tiles
+    cluster_rows -- the number of clusters on the height of the map
+    cluster_columns -- the number of clusters on the width of the map
+    walkable -- the boolean array indexed by row and column telling if each tile is statically crossable
+    entrances -- the transitions of each border between two adjacent clusters
+    transitions -- the nodes linked to each node through a border
+    cluster_edges -- the walking distance between the nodes of each cluster
+    """
+
+    def __init__(
+        self, walkability_grid: WalkabilityGrid, cluster_size: int = CLUSTER_SIZE
+    ) -> None:
+        self.walkability_grid: WalkabilityGrid = walkability_grid
+        self.cluster_size: int = cluster_size
+        self.cluster_rows: int = -(-walkability_grid.rows // cluster_size)
+        self.cluster_columns: int = -(-walkability_grid.columns // cluster_size)
+        self.walkable: np.ndarray = np.ones(walkability_grid.walkable.shape, dtype=bool)
+        self.entrances: dict[Border, list[tuple[Cell, Cell]]] = {}
+        self.transitions: dict[Cell, set[Cell]] = {}
+        self.cluster_edges: dict[Cluster, dict[Cell, dict[Cell, int]]] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Compute again the whole hierarchy from the content of the level
+        """
+        tile_occupancy = self.walkability_grid.tile_occupancy
+        self.walkable.fill(True)
+        for tile in tile_occupancy.occupied_tiles():
+            self._refresh_cell(tile)
+        self.entrances = {}
+        self.transitions = {}
+        for border in self._get_all_borders():
+            self._compute_entrances(border)
+        self.cluster_edges = {}
+        for cluster_row in range(self.cluster_rows):
+            for cluster_column in range(self.cluster_columns):
+                self._compute_cluster_edges((cluster_row, cluster_column))
+
+    def copy(self) -> PathHierarchy:
+        """
+        Return a copy of the hierarchy that does not follow the level anymore,
+        so that routes can be searched while the level keeps changing
+        """
+        path_hierarchy: PathHierarchy = copy.copy(self)
+        path_hierarchy.walkable = self.walkable.copy()
+        path_hierarchy.entrances = dict(self.entrances)
+        path_hierarchy.transitions = {
+            cell: set(cells) for cell, cells in self.transitions.items()
+        }
+        path_hierarchy.cluster_edges = dict(self.cluster_edges)
+        return path_hierarchy
+
+    def notify_change(
+        self, entity: Optional[Entity], previous_tile: Optional[Tile], new_tile: Optional[Tile]
+    ) -> None:
+        """
+        Update the clusters around the tiles whose static content changed.
+        Changes concerning units are ignored and the whole hierarchy is built again if entity is None.
+
+        Keyword arguments:
+        entity -- the entity that has been moved, added or removed
+        previous_tile -- the tile previously occupied by the entity if there is any
+        new_tile -- the tile now occupied by the entity if there is any
+        """
+        if entity is None:
+            self.rebuild()
+            return
+        if isinstance(entity, Movable):
+            return
+        for tile in (previous_tile, new_tile):
+            if tile is not None:
+                cell: Optional[Cell] = self._refresh_cell(tile)
+                if cell is not None:
+                    self._update_around(self._get_cluster(cell))
+
+    def find_route(
+        self,
+        start: Position,
+        target: Position,
+        reach: Sequence[int],
+        is_tile_available: Callable[[Tile], bool],
+        max_length: Optional[int] = None,
+    ) -> Optional[list[Tile]]:
+        """
+        Search for a path from the start to any tile from which the target could be attacked.
+        Close targets are directly reached by a search over the tiles, far ones through the abstract graph.
+        The path is only refined until it is at least max_length tiles long.
+
+        Return the ordered list of tiles to cross, the start excluded, or None if the target cannot be reached.
+
+        Keyword arguments:
+        start -- the position from which the path starts
+        target -- the position of the entity to reach
+        reach -- the distances at which the moving entity can hit
+        is_tile_available -- the predicate telling if a tile could be crossed, including units
+        max_length -- the number of tiles that are needed, the whole path is refined if None
+        """
+        start_cell: Optional[Cell] = self.walkability_grid.get_index(start)
+        target_cell: Optional[Cell] = self.walkability_grid.get_index(target)
+        if (
+            start_cell is None
+            or target_cell is None
+            or _cells_between(start_cell, target_cell) <= 2 * self.cluster_size
+        ):
+            return find_path(start, target, reach, is_tile_available)
+
+        waypoints: Optional[list[Cell]] = self._find_abstract_path(start_cell, target_cell)
+        if waypoints is None:
+            return find_path(start, target, reach, is_tile_available)
+
+        route: list[Tile] = []
+        current_tile: Position = start
+        for waypoint in waypoints[1:-1]:
+            waypoint_tile: Tile = self.walkability_grid.get_tile(*waypoint)
+            segment: Optional[list[Tile]] = find_path(
+                current_tile, waypoint_tile, [0], is_tile_available
+            )
+            if segment is None:
+                # A unit is standing in the way, fall back on a search over the tiles
+                return find_path(start, target, reach, is_tile_available)
+            route.extend(segment)
+            current_tile = waypoint_tile
+            if max_length is not None and len(route) >= max_length:
+                return route
+        segment = find_path(current_tile, target, reach, is_tile_available)
+        if segment is None:
+            return find_path(start, target, reach, is_tile_available)
+        route.extend(segment)
+        return route
+
+    def _find_abstract_path(self, start: Cell, goal: Cell) -> Optional[list[Cell]]:
+        start_edges: dict[Cell, int] = self._get_distances_to_nodes(start)
+        goal_edges: dict[Cell, int] = self._get_distances_to_nodes(goal)
+        if goal in start_edges:
+            return [start, goal]
+
+        costs: dict[Cell, int] = {start: 0}
+        predecessors: dict[Cell, Cell] = {}
+        explored_cells: set[Cell] = set()
+        insertion_counter: int = 0
+        queue: list[tuple[int, int, Cell]] = [(_cells_between(start, goal), 0, start)]
+        while queue:
+            _, _, cell = heapq.heappop(queue)
+            if cell in explored_cells:
+                continue
+            if cell == goal:
+                path: list[Cell] = [cell]
+                while cell != start:
+                    cell = predecessors[cell]
+                    path.append(cell)
+                path.reverse()
+                return path
+            explored_cells.add(cell)
+            edges: dict[Cell, int] = self._get_node_edges(
+                cell, start_edges if cell == start else None
+            )
+            if cell in goal_edges:
+                edges[goal] = goal_edges[cell]
+            for neighbour, cost in edges.items():
+                next_cost: int = costs[cell] + cost
+                if neighbour not in explored_cells and next_cost < costs.get(
+                    neighbour, next_cost + 1
+                ):
+                    costs[neighbour] = next_cost
+                    predecessors[neighbour] = cell
+                    insertion_counter += 1
+                    heapq.heappush(
+                        queue,
+                        (
+                            next_cost + _cells_between(neighbour, goal),
+                            insertion_counter,
+                            neighbour,
+                        ),
+                    )
+        return None
+
+    def _get_node_edges(
+        self, cell: Cell, cluster_edges: Optional[dict[Cell, int]] = None
+    ) -> dict[Cell, int]:
+        if cluster_edges is None:
+            cluster_edges = self.cluster_edges[self._get_cluster(cell)].get(cell, {})
+        edges: dict[Cell, int] = dict(cluster_edges)
+        for other_cell in self.transitions.get(cell, ()):
+            edges[other_cell] = 1
+        return edges
+
+    def _get_distances_to_nodes(
+        self,
+        cell: Cell,
+        nodes: Optional[set[Cell]] = None,
+        walkable_cells: Optional[list[list[bool]]] = None,
+    ) -> dict[Cell, int]:
+        # Distances from a cell to the nodes of its cluster, and to the cell itself,
+        # with a breadth-first search that does not leave the cluster
+        cluster: Cluster = self._get_cluster(cell)
+        rows, columns = self._get_cluster_slices(cluster)
+        if nodes is None:
+            nodes = self._get_cluster_nodes(cluster)
+        if walkable_cells is None:
+            walkable_cells = self.walkable[rows, columns].tolist()
+        distances: dict[Cell, int] = {cell: 0}
+        frontier: list[Cell] = [cell]
+        distance: int = 0
+        while frontier:
+            distance += 1
+            next_frontier: list[Cell] = []
+            for row, column in frontier:
+                for neighbour in (
+                    (row, column - 1),
+                    (row + 1, column),
+                    (row - 1, column),
+                    (row, column + 1),
+                ):
+                    if (
+                        neighbour not in distances
+                        and rows.start <= neighbour[0] < rows.stop
+                        and columns.start <= neighbour[1] < columns.stop
+                        and walkable_cells[neighbour[0] - rows.start][
+                            neighbour[1] - columns.start
+                        ]
+                    ):
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return {node: distances[node] for node in nodes | {cell} if node in distances}
+
+    def _update_around(self, cluster: Cluster) -> None:
+        neighbour_clusters: list[Cluster] = [cluster]
+        for row_offset, column_offset in ((-1, 0), (0, -1), (0, 1), (1, 0)):
+            neighbour: Cluster = (cluster[0] + row_offset, cluster[1] + column_offset)
+            if 0 <= neighbour[0] < self.cluster_rows and 0 <= neighbour[1] < self.cluster_columns:
+                neighbour_clusters.append(neighbour)
+                border: Border = (min(cluster, neighbour), max(cluster, neighbour))
+                for cell, other_cell in self.entrances.pop(border, []):
+                    self.transitions[cell].discard(other_cell)
+                    self.transitions[other_cell].discard(cell)
+                self._compute_entrances(border)
+        for neighbour in neighbour_clusters:
+            self._compute_cluster_edges(neighbour)
+
+    def _compute_entrances(self, border: Border) -> None:
+        first_cluster, second_cluster = border
+        rows, columns = self._get_cluster_slices(first_cluster)
+        if first_cluster[0] == second_cluster[0]:
+            # Vertical border, the second cluster is on the right
+            facing_cells: list[tuple[Cell, Cell]] = [
+                ((row, columns.stop - 1), (row, columns.stop))
+                for row in range(rows.start, rows.stop)
+            ]
+        else:
+            # Horizontal border, the second cluster is below
+            facing_cells = [
+                ((rows.stop - 1, column), (rows.stop, column))
+                for column in range(columns.start, columns.stop)
+            ]
+
+        transitions: list[tuple[Cell, Cell]] = []
+        run: list[tuple[Cell, Cell]] = []
+        for cell, other_cell in [*facing_cells, (None, None)]:
+            if cell is not None and self.walkable[cell] and self.walkable[other_cell]:
+                run.append((cell, other_cell))
+                continue
+            if len(run) >= LONG_ENTRANCE_LENGTH:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        self.entrances[border] = transitions
+        for cell, other_cell in transitions:
+            self.transitions.setdefault(cell, set()).add(other_cell)
+            self.transitions.setdefault(other_cell, set()).add(cell)
+
+    def _compute_cluster_edges(self, cluster: Cluster) -> None:
+        rows, columns = self._get_cluster_slices(cluster)
+        walkable_cells: list[list[bool]] = self.walkable[rows, columns].tolist()
+        nodes: set[Cell] = self._get_cluster_nodes(cluster)
+        edges: dict[Cell, dict[Cell, int]] = {}
+        for node in nodes:
+            edges[node] = self._get_distances_to_nodes(node, nodes, walkable_cells)
+            del edges[node][node]
+        self.cluster_edges[cluster] = edges
+
+    def _get_cluster_nodes(self, cluster: Cluster) -> set[Cell]:
+        nodes: set[Cell] = set()
+        for border in self._get_borders_of(cluster):
+            for transition in self.entrances.get(border, ()):
+                nodes.update(cell for cell in transition if self._get_cluster(cell) == cluster)
+        return nodes
+
+    def _get_borders_of(self, cluster: Cluster) -> list[Border]:
+        return [
+            border
+            for border in (
+                ((cluster[0] - 1, cluster[1]), cluster),
+                ((cluster[0], cluster[1] - 1), cluster),
+                (cluster, (cluster[0], cluster[1] + 1)),
+                (cluster, (cluster[0] + 1, cluster[1])),
+            )
+            if border in self.entrances
+        ]
+
+    def _get_all_borders(self) -> list[Border]:
+        borders: list[Border] = []
+        for cluster_row in range(self.cluster_rows):
+            for cluster_column in range(self.cluster_columns):
+                if cluster_column + 1 < self.cluster_columns:
+                    borders.append(
+                        ((cluster_row, cluster_column), (cluster_row, cluster_column + 1))
+                    )
+                if cluster_row + 1 < self.cluster_rows:
+                    borders.append(
+                        ((cluster_row, cluster_column), (cluster_row + 1, cluster_column))
+                    )
+        return borders
+
+    def _get_cluster(self, cell: Cell) -> Cluster:
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def _get_cluster_slices(self, cluster: Cluster) -> tuple[slice, slice]:
+        return (
+            slice(
+                cluster[0] * self.cluster_size,
+                min((cluster[0] + 1) * self.cluster_size, self.walkable.shape[0]),
+            ),
+            slice(
+                cluster[1] * self.cluster_size,
+                min((cluster[1] + 1) * self.cluster_size, self.walkable.shape[1]),
+            ),
+        )
+
+    def _refresh_cell(self, tile: Tile) -> Optional[Cell]:
+        # Return the cell of the tile if its static walkability changed
+        cell: Optional[Cell] = self.walkability_grid.get_index(tile)
+        if cell is None:
+            return None
+        entity_on_tile: Optional[Entity] = self.walkability_grid.tile_occupancy.get(tile)
+        is_walkable: bool = (
+            entity_on_tile is None
+            or isinstance(entity_on_tile, Movable)
+            or (isinstance(entity_on_tile, Objective) and entity_on_tile.is_walkable)
+        )
+        if self.walkable[cell] == is_walkable:
+            return None
+        self.walkable[cell] = is_walkable
+        return cell
@@ -0,0 +1,181 @@
+"""
+Defines RandomStreams class, the seeded random generators of a level,
+and the functions giving access to the streams of the level being played.
+
+Each subsystem of the game drawing random numbers has its own stream, derived from the seed of the level,
+so that the draws of a subsystem never shift the ones of another subsystem,
+and two levels with the same seed play the same way.
+"""
+
+from __future__ import annotations
+
+import random
+from enum import Enum, auto
+from typing import Optional
+
+from lxml import etree
+
+
+class RandomSubsystem(Enum):
+    """
+    Defines the different subsystems of the game having their own stream of random numbers.
+    """
+
+    COMBAT = auto()
+    EFFECTS = auto()
+    LOOT = auto()
+    GROWTH = auto()
+    CHESTS = auto()
+
+
+class RandomStreams:
+    """
+    A RandomStreams holds one random generator per subsystem, all derived from a single seed.
+    Generators are created the first time they are requested.
+
+    Keyword arguments:
+    seed -- the seed from which all the streams are derived, a random one is picked if it is not given
+
+    Attributes:
+    seed -- the seed from which all the streams are derived
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed: int = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self._generators: dict[RandomSubsystem, random.Random] = {}
+
+    def get(self, subsystem: RandomSubsystem) -> random.Random:
+        """
+        Return the random generator dedicated to the given subsystem
+
+        Keyword arguments:
+        subsystem -- the subsystem that is about to draw random numbers
+        """
+        generator: Optional[random.Random] = self._generators.get(subsystem)
+        if generator is None:
+            generator = random.Random(f"{self.seed}/{subsystem.name}")
+            self._generators[subsystem] = generator
+        return generator
+
+    def spawn(self, index: int) -> RandomStreams:
+        """
+        Return independent streams derived from these ones,
+        for example to give each of several parallel simulations its own reproducible streams.
+
+        Keyword arguments:
+        index -- the index of the derived streams, different indexes giving different streams
+        """
+        return RandomStreams(random.Random(f"{self.seed}/spawn/{index}").getrandbits(64))
+
+    def checkpoint(self) -> int:
+        """
+        Return a fingerprint of the current state of all the streams,
+        equal for two streams that will keep drawing the same numbers.
+        """
+        # The hash of a tuple of integers does not change from a run to another
+        return hash(
+            (
+                self.seed,
+                tuple(
+                    (subsystem.value, generator.getstate()[1])
+                    for subsystem, generator in sorted(
+                        self._generators.items(), key=lambda item: item[0].value
+                    )
+                ),
+            )
+        )
+
+    def snapshot(self) -> tuple:
+        """
+        Return the current state of all the streams, as an immutable value.
+        Contrary to save, taking a snapshot does not change the state of the streams.
+        """
+        return tuple(
+            (subsystem, generator.getstate())
+            for subsystem, generator in self._generators.items()
+        )
+
+    def restore(self, state: tuple) -> None:
+        """
+        Set the streams back to the state returned by snapshot.
+        The streams that were not used yet at that time start again from their beginning.
+
+        Keyword arguments:
+        state -- the state that should be restored
+        """
+        generators: dict[RandomSubsystem, random.Random] = {}
+        for subsystem, generator_state in state:
+            generator: random.Random = self.get(subsystem)
+            generator.setstate(generator_state)
+            generators[subsystem] = generator
+        self._generators = generators
+
+    def save(self, tree_name: str) -> etree.Element:
+        """
+        Save the current state of the streams in XML format.
+        Each stream that has been used is seeded again with a value drawn from itself and saved,
+        so that the game goes on exactly the same way whether it is continued or loaded from the save.
+
+        Return the result of this generation.
+
+        Keyword arguments:
+        tree_name -- the name that should be given to the root element of the generated XML.
+        """
+        tree: etree.Element = etree.Element(tree_name)
+        seed: etree.SubElement = etree.SubElement(tree, "seed")
+        seed.text = str(self.seed)
+        for subsystem, generator in self._generators.items():
+            generator_seed: int = generator.getrandbits(64)
+            generator.seed(generator_seed)
+            stream: etree.SubElement = etree.SubElement(tree, subsystem.name.lower())
+            stream.text = str(generator_seed)
+        return tree
+
+    @staticmethod
+    def load(tree: etree.Element) -> RandomStreams:
+        """
+        Load streams saved in XML format.
+
+        Return the loaded streams.
+
+        Keyword arguments:
+        tree -- the XML element produced by the save method
+        """
+        streams: RandomStreams = RandomStreams(int(tree.find("seed").text.strip()))
+        for subsystem in RandomSubsystem:
+            stream: Optional[etree.Element] = tree.find(subsystem.name.lower())
+            if stream is not None:
+                streams._generators[subsystem] = random.Random(int(stream.text.strip()))
+        return streams
+
+
+_active_streams: RandomStreams = RandomStreams()
+
+
+def set_active_streams(streams: RandomStreams) -> None:
+    """
+    Make the given streams the ones used by default by all the subsystems,
+    which is done by a level when it is being played.
+
+    Keyword arguments:
+    streams -- the streams that should be used
+    """
+    global _active_streams
+    _active_streams = streams
+
+
+def get_active_streams() -> RandomStreams:
+    """
+    Return the streams used by default by all the subsystems
+    """
+    return _active_streams
+
+
+def get_random_generator(subsystem: RandomSubsystem) -> random.Random:
+    """
+    Return the random generator of the given subsystem from the active streams
+
+    Keyword arguments:
+    subsystem -- the subsystem that is about to draw random numbers
+    """
+    return _active_streams.get(subsystem)
@@ -0,0 +1,94 @@
+"""
+Defines Reachability class and the movement range engine computing
+which tiles can be reached by a movable entity and through which path.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.gui.position import Position
+from src.services.tile_occupancy import Tile, tile_key
+
+# Ordered offsets of the four neighbours of a tile: left, bottom, top and right
+NEIGHBOUR_OFFSETS: tuple[Tile, ...] = (
+    (-TILE_SIZE, 0),
+    (0, TILE_SIZE),
+    (0, -TILE_SIZE),
+    (TILE_SIZE, 0),
+)
+
+
+class Reachability(dict):
+    """
+    A Reachability is the result of a movement range computation.
+    It maps each reachable tile to its distance from the origin, like the dictionaries of
+    possible moves used before, and also memorizes the predecessor of each tile so that
+    the path to any reachable tile can be rebuilt without any new search.
+
+    Keyword arguments:
+    origin -- the position of the tile from which the computation started
+
+    Attributes:
+    origin -- the tile from which the computation started
+    predecessors -- the previous tile on the shortest path for each reachable tile except the origin
+    """
+
+    def __init__(self, origin: Position) -> None:
+        self.origin: Tile = tile_key(origin)
+        super().__init__({self.origin: 0})
+        self.predecessors: dict[Tile, Tile] = {}
+
+    def path_to(self, destination_tile: Position) -> list[Position]:
+        """
+        Return an ordered list of positions that represent the path from the origin to the given tile.
+        The origin is not part of the path.
+
+        Keyword arguments:
+        destination_tile -- the position of the destination, it should be reachable
+        """
+        reversed_path: list[Position] = [destination_tile]
+        current_tile: Tile = tile_key(destination_tile)
+        while self[current_tile] > 1:
+            current_tile = self.predecessors[current_tile]
+            reversed_path.append(pygame.Vector2(current_tile))
+        reversed_path.reverse()
+        return reversed_path
+
+
+def compute_reachability(
+    origin: Position, max_moves: int, is_tile_available: Callable[[Tile], bool]
+) -> Reachability:
+    """
+    Compute all the tiles that can be reached from the origin in a single breadth-first search.
+
+    Return the reachability result with the distance and the predecessor of each reached tile.
+
+    Keyword arguments:
+    origin -- the starting position
+    max_moves -- the maximum number of tiles that could be traveled
+    is_tile_available -- the predicate telling if a tile could be crossed, called at most once per tile
+    """
+    reachability = Reachability(origin)
+    blocked_tiles: set[Tile] = set()
+    frontier: list[Tile] = [reachability.origin]
+    for distance in range(1, max_moves + 1):
+        next_frontier: list[Tile] = []
+        for tile in frontier:
+            for horizontal_offset, vertical_offset in NEIGHBOUR_OFFSETS:
+                neighbour: Tile = (tile[0] + horizontal_offset, tile[1] + vertical_offset)
+                if neighbour in reachability or neighbour in blocked_tiles:
+                    continue
+                if not is_tile_available(neighbour):
+                    blocked_tiles.add(neighbour)
+                    continue
+                reachability[neighbour] = distance
+                reachability.predecessors[neighbour] = tile
+                next_frontier.append(neighbour)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return reachability
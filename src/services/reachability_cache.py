@@ -0,0 +1,89 @@
+"""
+Defines ReachabilityCache class, memorizing the movement ranges computed for the current occupancy of a level.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from src.gui.position import Position
+from src.services.reachability import Reachability
+from src.services.tile_occupancy import Tile, TileOccupancyIndex, tile_key
+
+
+class ReachabilityCache:
+    """
+    A ReachabilityCache stores the movement ranges computed for a level, keyed by their starting tile,
+    their move budget and the occupancy version of the level at the time of the computation.
+
+    Any movement, addition or removal of an entity increments the occupancy version,
+    so every memorized range becomes outdated and is dropped at the next query.
+    As long as nothing moves on the board, the same range is shared between hovering,
+    selection and AI evaluation.
+    The returned ranges are shared between callers and should never be modified.
+
+    Keyword arguments:
+    compute -- the function computing the movement range from a starting position and a move budget
+    tile_occupancy -- the index of the entities standing on the level tiles, giving the occupancy version
+
+    Attributes:
+    compute -- the function computing the movement range from a starting position and a move budget
+    tile_occupancy -- the index of the entities standing on the level tiles, giving the occupancy version
+    version -- the occupancy version for which the memorized ranges have been computed
+    hits -- the number of queries answered with a memorized range
+    misses -- the number of queries that required a computation
+    invalidations -- the number of memorized ranges dropped because the occupancy changed
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[Position, int], Reachability],
+        tile_occupancy: TileOccupancyIndex,
+    ) -> None:
+        self.compute: Callable[[Position, int], Reachability] = compute
+        self.tile_occupancy: TileOccupancyIndex = tile_occupancy
+        self.version: int = tile_occupancy.version
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+        self._entries: dict[tuple[Tile, int], Reachability] = {}
+
+    def get(self, origin: Position, max_moves: int) -> Reachability:
+        """
+        Return the movement range from the given position for the given budget,
+        computing it only if it is not already known for the current occupancy of the level.
+
+        Keyword arguments:
+        origin -- the starting position
+        max_moves -- the maximum number of tiles that could be traveled
+        """
+        if self.version != self.tile_occupancy.version:
+            self.invalidate()
+            self.version = self.tile_occupancy.version
+        key: tuple[Tile, int] = (tile_key(origin), max_moves)
+        reachability = self._entries.get(key)
+        if reachability is not None:
+            self.hits += 1
+            return reachability
+        self.misses += 1
+        reachability = self.compute(origin, max_moves)
+        self._entries[key] = reachability
+        return reachability
+
+    def invalidate(self) -> None:
+        """
+        Drop all the memorized ranges
+        """
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Return the counters of the cache along with the number of ranges currently memorized
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+        }
@@ -54,6 +54,9 @@ class SaveStateManager:
         entities = self._save_entities()
         level.append(entities)
 
+        # Save the state of the random generators
+        level.append(self.level.random_streams.save("random"))
+
         return level
 
     def _save_entities(self):
@@ -4,6 +4,8 @@ Define SceneManager class, the orchestrator of the communication between every d
 
 from __future__ import annotations
 
+from typing import Optional
+
 import pygame
 
 from src.constants import MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT
@@ -24,16 +26,20 @@ class SceneManager:
 
     Attributes:
     active_scene -- the current active scene that should handle all incoming events
+    dirty_rects -- the parts of the screen drawn at the last iteration,
+    None if the whole screen has been drawn
     """
 
     def __init__(self, screen: pygame.Surface) -> None:
         self.active_scene: Scene = StartScene(screen)
+        self.dirty_rects: Optional[list[pygame.Rect]] = None
 
     def process_game_iteration(self) -> QuitActionKind:
         """
         Handle a single game iteration.
         Extract every ongoing event and delegate them to the active scene.
         Update the state of the active scene.
+        Display the active scene and keep the parts of the screen that have been drawn.
 
         Return whether the game should be ended or not.
         """
@@ -53,10 +59,20 @@ class SceneManager:
                 self.active_scene.key_down(event.key)
         if self.active_scene.update_state():
             self.start_new_scene()
+            self.dirty_rects = None
             return QuitActionKind.CONTINUE
-        self.active_scene.display()
+        self.dirty_rects = self.active_scene.display()
         return quit_game
 
+    def invalidate(self, rect: pygame.Rect) -> None:
+        """
+        Ask the active scene to draw again the given part of the screen at the next iteration.
+
+        Keyword arguments:
+        rect -- the part of the screen that should be drawn again
+        """
+        self.active_scene.invalidate(rect)
+
     def start_new_scene(self) -> None:
         """
         Switch to a new scene.
@@ -0,0 +1,231 @@
+"""
+Defines the functions running levels in headless mode:
+levels are loaded and played turn by turn without any window, sound, font or menu,
+so that battles between AI-controlled sides can be simulated as fast as possible.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional, Sequence
+
+import pygame
+from lxml import etree
+
+import src.services.load_from_xml_manager as loader
+from src.constants import MAIN_WIN_HEIGHT, MAIN_WIN_WIDTH
+from src.game_entities.character import Character
+from src.game_entities.movable import Movable
+from src.game_entities.player import Player
+from src.gui.position import Position
+from src.scenes.level_scene import EntityTurn, LevelScene, LevelStatus
+from src.services.action_log import ActionKind
+from src.services.distance_field import DistanceField
+from src.services.random_manager import RandomStreams
+from src.services.reachability import Reachability
+from src.services.sound_manager import set_sounds_enabled
+from src.services.walkability_grid import WalkabilityGrid
+
+_initialized: bool = False
+
+
+def init_headless() -> None:
+    """
+    Prepare pygame and the generic data of the game to run levels in headless mode.
+    A dummy display is still opened since images have to be converted when they are loaded,
+    but nothing is ever drawn on it.
+    Fonts and the mixer are not initialized and sound effects are disabled.
+    """
+    global _initialized
+    if _initialized:
+        return
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    # Let a simulation running in a worker process be terminated like any other process
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+    pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    set_sounds_enabled(False)
+    Character.init_data(loader.load_races(), loader.load_classes())
+    _initialized = True
+
+
+def load_headless_level(
+    level_id: int,
+    players: Optional[Sequence[Player]] = None,
+    status: LevelStatus = LevelStatus.VERY_BEGINNING,
+    turn: int = 0,
+    data: Optional[etree.Element] = None,
+    random_streams: Optional[RandomStreams] = None,
+    directory: Optional[str] = None,
+) -> LevelScene:
+    """
+    Load a level in headless mode and return it.
+
+    Keyword arguments:
+    level_id -- the number identifying the level
+    players -- the list of players on the level for a new game
+    status -- the status of the game for this level
+    turn -- the value of the current turn
+    data -- saved data in XML format in case where the level is loaded from a save
+    random_streams -- the random generators of the level, seeded randomly if they are not given
+    directory -- the relative path to the directory of the level,
+    the one of the level identified by level_id in maps/ if it is not given
+    """
+    init_headless()
+    if directory is None:
+        directory = f"maps/level_{level_id}/"
+    level: LevelScene = LevelScene(
+        pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT)),
+        directory,
+        level_id,
+        status,
+        turn,
+        data,
+        players,
+        headless=True,
+        random_streams=random_streams,
+    )
+    level.load_level_content()
+    return level
+
+
+def load_headless_level_from_save(
+    save_path: str, random_streams: Optional[RandomStreams] = None
+) -> LevelScene:
+    """
+    Load the level stored in the given save file in headless mode and return it.
+
+    Keyword arguments:
+    save_path -- the path to the save file
+    random_streams -- the random generators of the level,
+    the ones stored in the save are restored if they are not given
+    """
+    with open(save_path, "r", encoding="utf-8") as save:
+        tree_root: etree.Element = etree.parse(save).getroot()
+    random_element: Optional[etree.Element] = tree_root.find("level/random")
+    if random_streams is None and random_element is not None:
+        random_streams = RandomStreams.load(random_element)
+    return load_headless_level(
+        int(tree_root.find("level/index").text.strip()),
+        status=LevelStatus[tree_root.find("level/phase").text.strip()],
+        turn=int(tree_root.find("level/turn").text.strip()),
+        data=tree_root.find("level/entities"),
+        random_streams=random_streams,
+    )
+
+
+def play_ai_turns(level: LevelScene, max_steps: int = 100000) -> bool:
+    """
+    Let the sides controlled by AI play until it is the turn of the players again.
+
+    Return whether the level is over.
+
+    Keyword arguments:
+    level -- the headless level that should be played
+    max_steps -- the maximum number of updates of the level before giving up
+    """
+    for _ in range(max_steps):
+        if level.update_state():
+            return True
+        if level.side_turn is EntityTurn.PLAYER:
+            return is_level_over(level)
+    return is_level_over(level)
+
+
+def play_players_turn(level: LevelScene) -> None:
+    """
+    Let the AI play the turn of the players, then end it.
+    Each player character follows its own strategy like an entity controlled by AI,
+    so the players should have been given an AI strategy beforehand.
+
+    Keyword arguments:
+    level -- the headless level that should be played
+    """
+    targets: list[Movable] = level.entities.foes
+    grid: WalkabilityGrid = level.walkability_grid
+    distance_field: Optional[DistanceField] = None
+    for player in level.players:
+        if player.turn_is_finished():
+            continue
+        if distance_field is None or not distance_field.is_computed_for(targets):
+            if distance_field is not None:
+                level.tile_occupancy.listeners.remove(distance_field.notify_change)
+            distance_field = DistanceField(
+                targets, grid.is_tile_available, grid.columns * grid.rows, grid
+            )
+            level.tile_occupancy.listeners.append(distance_field.notify_change)
+
+        possible_moves: Reachability = level.get_possible_moves(
+            tuple(player.position), player.max_moves
+        )
+        nearest_target, distance = distance_field.nearest_target(player.position)
+        route: Optional[list[Position]] = None
+        if distance < distance_field.unreachable_distance:
+            route = level.path_hierarchy.find_route(
+                player.position,
+                nearest_target.position,
+                player.reach,
+                grid.is_tile_available,
+                player.max_moves,
+            )
+        else:
+            nearest_target = None
+        move: Position = player.determine_move(
+            possible_moves, targets, nearest_target, route
+        )
+        if tuple(move) in possible_moves:
+            move_player(level, player, move)
+
+        attacked_tile: Optional[Position] = player.determine_attack(targets)
+        end_player_turn(level, player, attacked_tile if player.can_attack() else None)
+
+    if distance_field is not None:
+        level.tile_occupancy.listeners.remove(distance_field.notify_change)
+    level.end_turn()
+
+
+def move_player(level: LevelScene, player: Player, destination: Position) -> None:
+    """
+    Move the given player to the given tile at once, without any animation.
+
+    Keyword arguments:
+    level -- the headless level on which the player is
+    player -- the player that should be moved
+    destination -- the position of the tile that should be reached, it should be reachable
+    """
+    level.action_log.record(ActionKind.MOVE, player.position, [destination])
+    player.position = destination
+
+
+def end_player_turn(
+    level: LevelScene, player: Player, attacked_tile: Optional[Position] = None
+) -> None:
+    """
+    Let the given player attack the foe standing on the given tile if there is any, then end its turn.
+
+    Keyword arguments:
+    level -- the headless level on which the player is
+    player -- the player whose turn should be ended
+    attacked_tile -- the position of the foe that should be attacked if there is any
+    """
+    if attacked_tile is not None:
+        level.duel(
+            player,
+            level.get_entity_on_tile(attacked_tile),
+            level.players + level.entities.allies,
+            level.entities.foes,
+            player.attack_kind,
+        )
+    level.action_log.record(ActionKind.END_CHARACTER_TURN, player.position)
+    player.end_turn()
+
+
+def is_level_over(level: LevelScene) -> bool:
+    """
+    Return whether the level ended, by a victory or a defeat
+
+    Keyword arguments:
+    level -- the level that should be checked
+    """
+    return level.game_phase in (LevelStatus.ENDED_VICTORY, LevelStatus.ENDED_DEFEAT)
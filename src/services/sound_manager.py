@@ -0,0 +1,67 @@
+"""
+Defines the functions loading and playing the sound effects of the game.
+
+Sounds are loaded once per file and shared by every entity using them.
+They can be disabled as a whole, for example to run a level without any audio device:
+no sound is loaded anymore and playing a sound does nothing.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import pygame
+
+SOUND_DIRECTORY = "sound_fx"
+
+_sounds: dict[str, pygame.mixer.Sound] = {}
+_enabled: bool = True
+
+
+def set_sounds_enabled(enabled: bool) -> None:
+    """
+    Enable or disable the loading and the playing of all the sound effects
+
+    Keyword arguments:
+    enabled -- whether sounds should be loaded and played or not
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def are_sounds_enabled() -> bool:
+    """
+    Return whether sound effects are loaded and played or not
+    """
+    return _enabled
+
+
+def load_sound(file_name: str) -> Optional[pygame.mixer.Sound]:
+    """
+    Return the sound effect stored in the given file of the sound directory,
+    the file being loaded only the first time it is requested.
+
+    Return None if sounds are disabled.
+
+    Keyword arguments:
+    file_name -- the name of the sound file in the sound directory
+    """
+    if not _enabled:
+        return None
+    sound: Optional[pygame.mixer.Sound] = _sounds.get(file_name)
+    if sound is None:
+        sound = pygame.mixer.Sound(os.path.join(SOUND_DIRECTORY, file_name))
+        _sounds[file_name] = sound
+    return sound
+
+
+def play_sound(sound: Optional[pygame.mixer.Sound]) -> None:
+    """
+    Play the given sound effect if sounds are enabled
+
+    Keyword arguments:
+    sound -- the sound that should be played, nothing is done if it is None
+    """
+    if _enabled and sound is not None:
+        sound.play()
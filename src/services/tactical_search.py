@@ -0,0 +1,474 @@
+"""
+Defines TacticalSearch class, deciding the action of the units following the tactical strategy
+by looking several actions ahead over a lightweight model of the board, within a strict time budget,
+and the Board and BoardUnit classes composing this model.
+
+The search is anytime: the possible actions of the unit are first evaluated on their own,
+from the closest tiles to the furthest ones while the deadline allows it, then the most promising ones are followed further, one action of the next unit to play at a time,
+until the deadline expires or the maximum number of actions has been looked at.
+The units of both sides play greedily during the lookahead, and since nothing is drawn at random,
+the same board always leads to the same decision as long as the search is not cut by the deadline.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Optional, Sequence
+
+import numpy as np
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.character import Character
+from src.game_entities.destroyable import DamageKind
+from src.game_entities.movable import EntityState, Movable
+from src.gui.position import Position
+from src.services.reachability import Reachability, compute_reachability
+from src.services.tile_occupancy import Tile, tile_key
+from src.services.walkability_grid import WalkabilityGrid
+
+DEFAULT_BUDGET_MS: int = 40
+DEFAULT_MAX_PLIES: int = 12
+BEAM_WIDTH: int = 8
+# Value of a unit being alive, on top of its hit points
+ALIVE_VALUE: int = 10
+
+# The tiles and the hit points of all the units of the board
+BoardState = tuple[tuple[Tile, ...], tuple[int, ...]]
+# The destination of the deciding unit and the index of the unit it attacks if there is any
+Candidate = tuple[Tile, Optional[int]]
+
+_search_executors: dict[int, ProcessPoolExecutor] = {}
+
+
+def _get_search_executor(processes: int) -> ProcessPoolExecutor:
+    # Workers are kept from a decision to another since starting them takes much longer than a decision
+    executor: Optional[ProcessPoolExecutor] = _search_executors.get(processes)
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=processes)
+        # Workers are only started by the first task, which should not be a decision
+        wait([executor.submit(int) for _ in range(processes)])
+        _search_executors[processes] = executor
+    return executor
+
+
+def get_open_tiles(grid: WalkabilityGrid, entities: Sequence[Movable]) -> frozenset[Tile]:
+    """
+    Return the tiles that could be crossed if no unit is standing on them,
+    that is the walkable tiles of the grid and the tiles of the given entities.
+
+    Keyword arguments:
+    grid -- the walkability grid in which the tiles of the entities are blocked
+    entities -- the entities standing on the grid
+    """
+    rows, columns = np.nonzero(grid.walkable)
+    open_tiles: set[Tile] = set(
+        zip(
+            (grid.origin[0] + columns * TILE_SIZE).tolist(),
+            (grid.origin[1] + rows * TILE_SIZE).tolist(),
+        )
+    )
+    open_tiles.update(tile_key(entity.position) for entity in entities)
+    return frozenset(open_tiles)
+
+
+class BoardUnit:
+    """
+    A BoardUnit holds the statistics of a movable entity needed to simulate its actions,
+    without any reference to the entity itself so that it can be sent to another process.
+
+    Keyword arguments:
+    entity -- the movable entity represented by the unit
+    is_friend -- whether the entity is on the side of the unit deciding its action or not
+
+    Attributes:
+    is_friend -- whether the entity is on the side of the unit deciding its action or not
+    max_moves -- the max number of tiles that could be crossed by the entity during one movement
+    reach -- the distances in tiles at which the entity can attack
+    damage -- the damage dealt by each attack of the entity before the protection of the target
+    spiritual -- whether the entity deals spiritual damage rather than physical damage
+    defense -- the protection of the entity from physical attacks
+    resistance -- the protection of the entity from spiritual attacks
+    nb_attacks -- the number of attacks made by the entity each time it attacks
+    can_attack -- whether the entity is able to attack or not
+    """
+
+    def __init__(self, entity: Movable, is_friend: bool) -> None:
+        self.is_friend: bool = is_friend
+        self.max_moves: int = entity.max_moves
+        self.reach: tuple[int, ...] = tuple(entity.reach)
+        self.damage: int = entity.strength + entity.get_stat_change("strength")
+        self.spiritual: bool = entity.attack_kind is DamageKind.SPIRITUAL
+        self.defense: int = entity.defense + entity.get_stat_change("defense")
+        self.resistance: int = entity.resistance + entity.get_stat_change("resistance")
+        if isinstance(entity, Character):
+            weapon = entity.get_weapon()
+            if weapon is not None:
+                self.damage += weapon.attack
+            for equipment in entity.equipments:
+                self.defense += equipment.defense
+                self.resistance += equipment.resistance
+        self.nb_attacks: int = 2 if "double_attack" in entity.skills else 1
+        self.can_attack: bool = entity.can_attack()
+
+
+class Board:
+    """
+    A Board is the model of a level on which the tactical search simulates actions.
+    Its units are referred to by their index, and their tiles and hit points are kept apart
+    in immutable board states, so that trying an action only creates a new state.
+
+    Keyword arguments:
+    open_tiles -- the tiles that could be crossed if no unit is standing on them
+    units -- the units of the board
+    turn_order -- the indexes of the units in the order in which they play after the deciding unit,
+    a unit appearing once for each of its turns
+
+    Attributes:
+    open_tiles -- the tiles that could be crossed if no unit is standing on them
+    units -- the units of the board
+    turn_order -- the indexes of the units in the order in which they play after the deciding unit
+    """
+
+    def __init__(
+        self, open_tiles: frozenset[Tile], units: Sequence[BoardUnit], turn_order: Sequence[int]
+    ) -> None:
+        self.open_tiles: frozenset[Tile] = open_tiles
+        self.units: list[BoardUnit] = list(units)
+        self.turn_order: list[int] = list(turn_order)
+
+    def get_moves(self, state: BoardState, index: int) -> Reachability:
+        """
+        Return the tiles that could be reached by the given unit.
+
+        Keyword arguments:
+        state -- the current state of the board
+        index -- the index of the unit
+        """
+        tiles, hit_points = state
+        occupied_tiles: set[Tile] = {
+            tile for tile, unit_hit_points in zip(tiles, hit_points) if unit_hit_points > 0
+        }
+        return compute_reachability(
+            tiles[index],
+            self.units[index].max_moves,
+            lambda tile: tile in self.open_tiles and tile not in occupied_tiles,
+        )
+
+    def get_targets_in_reach(self, state: BoardState, index: int, tile: Tile) -> list[int]:
+        """
+        Return the indexes of the living opponents that the given unit could attack from the given tile.
+
+        Keyword arguments:
+        state -- the current state of the board
+        index -- the index of the unit
+        tile -- the tile from which the unit would attack
+        """
+        unit: BoardUnit = self.units[index]
+        if not unit.can_attack:
+            return []
+        tiles, hit_points = state
+        return [
+            other_index
+            for other_index, other in enumerate(self.units)
+            if other.is_friend is not unit.is_friend
+            and hit_points[other_index] > 0
+            and (
+                abs(tile[0] - tiles[other_index][0]) + abs(tile[1] - tiles[other_index][1])
+            )
+            // TILE_SIZE
+            in unit.reach
+        ]
+
+    def get_damage(self, attacker_index: int, target_index: int, target_hit_points: int) -> int:
+        """
+        Return the hit points that the given attacker would take from the given target.
+
+        Keyword arguments:
+        attacker_index -- the index of the attacking unit
+        target_index -- the index of the attacked unit
+        target_hit_points -- the current hit points of the attacked unit
+        """
+        attacker: BoardUnit = self.units[attacker_index]
+        target: BoardUnit = self.units[target_index]
+        protection: int = target.resistance if attacker.spiritual else target.defense
+        damage: int = max(attacker.damage - protection, 0) * attacker.nb_attacks
+        return min(damage, target_hit_points)
+
+    def play(
+        self, state: BoardState, index: int, destination: Tile, target_index: Optional[int]
+    ) -> BoardState:
+        """
+        Return the state of the board once the given unit moved and attacked.
+
+        Keyword arguments:
+        state -- the current state of the board
+        index -- the index of the acting unit
+        destination -- the tile to which the unit moves
+        target_index -- the index of the unit that is attacked if there is any
+        """
+        tiles, hit_points = state
+        tiles = tiles[:index] + (destination,) + tiles[index + 1 :]
+        if target_index is not None:
+            new_hit_points: int = hit_points[target_index] - self.get_damage(
+                index, target_index, hit_points[target_index]
+            )
+            hit_points = (
+                hit_points[:target_index] + (new_hit_points,) + hit_points[target_index + 1 :]
+            )
+        return tiles, hit_points
+
+    def play_greedily(self, state: BoardState, index: int) -> BoardState:
+        """
+        Return the state of the board once the given unit played the action dealing the most damage,
+        a kill being worth more than any damage.
+        A unit that cannot attack anyone gets as close as possible to its nearest opponent.
+
+        Keyword arguments:
+        state -- the current state of the board
+        index -- the index of the acting unit
+        """
+        tiles, hit_points = state
+        if hit_points[index] <= 0:
+            return state
+        moves: Reachability = self.get_moves(state, index)
+        best_action: Optional[Candidate] = None
+        best_gain: int = 0
+        for destination in moves:
+            for target_index in self.get_targets_in_reach(state, index, destination):
+                damage: int = self.get_damage(index, target_index, hit_points[target_index])
+                gain: int = damage + (ALIVE_VALUE if damage == hit_points[target_index] else 0)
+                if best_action is None or gain > best_gain:
+                    best_action, best_gain = (destination, target_index), gain
+        if best_action is not None:
+            return self.play(state, index, *best_action)
+
+        opponent_tiles: list[Tile] = [
+            tiles[other_index]
+            for other_index, other in enumerate(self.units)
+            if other.is_friend is not self.units[index].is_friend and hit_points[other_index] > 0
+        ]
+        if not opponent_tiles:
+            return state
+        destination: Tile = min(
+            moves,
+            key=lambda tile: min(
+                abs(tile[0] - opponent_tile[0]) + abs(tile[1] - opponent_tile[1])
+                for opponent_tile in opponent_tiles
+            ),
+        )
+        return self.play(state, index, destination, None)
+
+    def evaluate(self, state: BoardState) -> int:
+        """
+        Return how good the given state is for the side of the deciding unit
+
+        Keyword arguments:
+        state -- the state of the board that should be evaluated
+        """
+        score: int = 0
+        for unit, hit_points in zip(self.units, state[1]):
+            value: int = hit_points + ALIVE_VALUE if hit_points > 0 else 0
+            score += value if unit.is_friend else -value
+        return score
+
+
+def explore_candidates(
+    board: Board,
+    state: BoardState,
+    index: int,
+    candidates: Sequence[Candidate],
+    deadline: float,
+    max_plies: int,
+) -> list[list[int]]:
+    """
+    Follow each of the given candidate actions of the deciding unit, one ply at a time for all of them,
+    the next units playing greedily, until the deadline expires or max_plies actions have been played.
+
+    Return for each candidate the evaluation of the board after each ply that has been completed
+    for all the candidates, the first ply being the candidate action itself.
+
+    Keyword arguments:
+    board -- the model of the level
+    state -- the state of the board before the action of the deciding unit
+    index -- the index of the deciding unit
+    candidates -- the actions of the deciding unit that should be followed
+    deadline -- the value of time.monotonic at which the search should stop
+    max_plies -- the maximum number of actions that should be played for each candidate
+    """
+    states: list[BoardState] = [board.play(state, index, *candidate) for candidate in candidates]
+    scores: list[list[int]] = [[board.evaluate(candidate_state)] for candidate_state in states]
+    for unit_index in board.turn_order[: max_plies - 1]:
+        next_states: list[BoardState] = []
+        for candidate_state in states:
+            if time.monotonic() >= deadline:
+                # The ply could not be completed for all the candidates
+                return scores
+            next_states.append(board.play_greedily(candidate_state, unit_index))
+        states = next_states
+        for candidate_scores, candidate_state in zip(scores, states):
+            candidate_scores.append(board.evaluate(candidate_state))
+    return scores
+
+
+class TacticalSearch:
+    """
+    A TacticalSearch decides the move and the target of a unit following the tactical strategy.
+
+    Keyword arguments:
+    budget -- the maximum time given to each decision in milliseconds
+    max_plies -- the maximum number of actions looked at after each possible action of the unit,
+    including this one
+    processes -- the number of worker processes across which the most promising actions are explored,
+    0 to explore them in the calling thread
+
+    Attributes:
+    budget -- the maximum time given to each decision in milliseconds
+    max_plies -- the maximum number of actions looked at after each possible action of the unit
+    processes -- the number of worker processes across which the most promising actions are explored
+    """
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_BUDGET_MS,
+        max_plies: int = DEFAULT_MAX_PLIES,
+        processes: int = 0,
+    ) -> None:
+        self.budget: int = budget
+        self.max_plies: int = max_plies
+        self.processes: int = processes
+        if processes >= 2:
+            # Start the workers now rather than during the budget of the first decision
+            _get_search_executor(processes)
+
+    def decide(
+        self,
+        unit: Movable,
+        units: Sequence[Movable],
+        targets: Sequence[Movable],
+        planning_grid: WalkabilityGrid,
+        possible_moves: Reachability,
+        positions: Optional[dict[int, Position]] = None,
+        open_tiles: Optional[frozenset[Tile]] = None,
+    ) -> tuple[Position, Optional[Movable]]:
+        """
+        Search for the best action of the given unit before the deadline.
+
+        Return the destination of the unit and the entity it should attack if there is any.
+
+        Keyword arguments:
+        unit -- the unit deciding its action
+        units -- the ordered sequence of units of the side of the unit, including it
+        targets -- the ordered sequence of entities that could be attacked by the side
+        planning_grid -- the walkability grid in which the tiles of all the units are blocked
+        possible_moves -- the tiles that could be reached by the unit
+        positions -- the positions the units will have when the unit acts, by unit id,
+        for the ones that are not there yet
+        open_tiles -- the tiles that could be crossed if no unit is standing on them,
+        computed from the planning grid if not given
+        """
+        deadline: float = time.monotonic() + self.budget / 1000
+        if positions is None:
+            positions = {}
+        entities: list[Movable] = list(units) + list(targets)
+        index: int = next(
+            entity_index for entity_index, entity in enumerate(entities) if entity is unit
+        )
+        tiles: tuple[Tile, ...] = tuple(
+            tile_key(positions.get(id(entity), entity.position)) for entity in entities
+        )
+        if open_tiles is None:
+            open_tiles = get_open_tiles(planning_grid, entities).union(tiles)
+        friends_to_act: list[int] = [
+            entity_index
+            for entity_index, entity in enumerate(units)
+            if entity_index != index and entity.state is EntityState.HAVE_TO_ACT
+        ]
+        opponents: list[int] = list(range(len(units), len(entities)))
+        turn_order: list[int] = friends_to_act + opponents
+        while len(turn_order) < self.max_plies:
+            turn_order += list(range(len(units))) + opponents
+        board: Board = Board(
+            open_tiles,
+            [
+                BoardUnit(entity, entity_index < len(units))
+                for entity_index, entity in enumerate(entities)
+            ],
+            turn_order,
+        )
+        state: BoardState = (tiles, tuple(entity.hit_points for entity in entities))
+
+        # Like any other unit, the deciding unit attacks as soon as a target is in reach
+        candidates: list[Candidate] = []
+        first_scores: list[int] = []
+        for destination in possible_moves:
+            if candidates and time.monotonic() >= deadline:
+                # The tiles are ordered by distance, only the furthest ones are left aside
+                break
+            targets_in_reach: list[int] = board.get_targets_in_reach(state, index, destination)
+            for target_index in targets_in_reach or [None]:
+                candidates.append((destination, target_index))
+                first_scores.append(
+                    board.evaluate(board.play(state, index, destination, target_index))
+                )
+        # Sorting is stable: on equal scores, the unit prefers the closest tiles
+        ranked_candidates: list[Candidate] = [
+            candidates[candidate_index]
+            for candidate_index in sorted(
+                range(len(candidates)), key=lambda candidate_index: -first_scores[candidate_index]
+            )[:BEAM_WIDTH]
+        ]
+        scores: list[list[int]] = self._explore(board, state, index, ranked_candidates, deadline)
+        completed_plies: int = min(len(candidate_scores) for candidate_scores in scores)
+        best_index: int = max(
+            range(len(ranked_candidates)),
+            key=lambda candidate_index: (
+                scores[candidate_index][completed_plies - 1],
+                -candidate_index,
+            ),
+        )
+        destination, target_index = ranked_candidates[best_index]
+        return pygame.Vector2(destination), (
+            entities[target_index] if target_index is not None else None
+        )
+
+    def _explore(
+        self,
+        board: Board,
+        state: BoardState,
+        index: int,
+        candidates: list[Candidate],
+        deadline: float,
+    ) -> list[list[int]]:
+        if self.processes < 2 or len(candidates) < 2:
+            return explore_candidates(board, state, index, candidates, deadline, self.max_plies)
+        executor: ProcessPoolExecutor = _get_search_executor(self.processes)
+        chunks: list[list[Candidate]] = [
+            candidates[worker::self.processes]
+            for worker in range(self.processes)
+            if candidates[worker::self.processes]
+        ]
+        futures: list[Future] = [
+            executor.submit(
+                explore_candidates, board, state, index, chunk, deadline, self.max_plies
+            )
+            for chunk in chunks
+        ]
+        wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        for future in futures:
+            # A running worker stops by itself at the deadline, a pending one should not start
+            future.cancel()
+        chunk_scores: list[list[list[int]]] = [
+            future.result()
+            if future.done() and not future.cancelled() and future.exception() is None
+            # Candidates of a late worker are only evaluated by their own action
+            else [[board.evaluate(board.play(state, index, *candidate))] for candidate in chunk]
+            for future, chunk in zip(futures, chunks)
+        ]
+        # Give back the scores in the order of the candidates
+        scores: list[list[int]] = [[] for _ in candidates]
+        for worker, worker_scores in enumerate(chunk_scores):
+            scores[worker :: self.processes] = worker_scores
+        return scores
+
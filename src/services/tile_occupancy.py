@@ -0,0 +1,220 @@
+"""
+Defines TileOccupancyIndex class, the structure keeping track of which entity is standing on which tile of a level.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Callable
+
+from src.game_entities.entity import Entity
+from src.gui.position import Position
+
+if TYPE_CHECKING:
+    from src.scenes.level_scene import LevelEntityCollections
+
+Tile = tuple[int, int]
+OccupancyListener = Callable[[Optional[Entity], Optional[Tile], Optional[Tile]], None]
+
+
+def tile_key(position: Position) -> Tile:
+    """
+    Return the hashable key corresponding to the given position.
+
+    Keyword arguments:
+    position -- the position that should be converted, either a tuple or a pygame Vector2
+    """
+    return int(position[0]), int(position[1])
+
+
+class TileOccupancyIndex:
+    """
+    A TileOccupancyIndex maps each tile of a level to the entities standing on it, so that
+    the entity on a given tile can be retrieved without scanning every entity collection.
+
+    When several entities share the same tile (e.g. a player standing on a walkable objective),
+    the one belonging to the collection coming first in the level entity collections is returned,
+    exactly as a linear scan over the collections would do.
+
+    The index is kept up to date by observing the position of every indexed entity,
+    additions and removals should be notified through add and remove.
+    Listeners are notified of every change with the concerned entity, its previous tile and its new tile
+    (None for an addition or a removal), or with None values only when the whole index has been rebuilt.
+
+    Keyword arguments:
+    entities -- the collections of entities of the level that should be indexed
+
+    Attributes:
+    entities -- the collections of entities of the level that are indexed
+    version -- a counter incremented each time the occupancy of a tile changes
+    listeners -- the callbacks that should be notified of each occupancy change
+    _occupants -- the entities on each occupied tile, associated to the rank of their collection
+    _tiles -- the tile on which each indexed entity is standing, by entity id
+    """
+
+    consistency_checks_enabled: bool = False
+
+    def __init__(self, entities: LevelEntityCollections) -> None:
+        self.entities: LevelEntityCollections = entities
+        self.version: int = 0
+        self.listeners: list[OccupancyListener] = []
+        self._occupants: dict[Tile, list[tuple[int, Entity]]] = {}
+        self._tiles: dict[int, Tile] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Index again all the entities of the level collections from scratch
+        """
+        for occupants in self._occupants.values():
+            for _, entity in occupants:
+                entity.position_observer = None
+        self._occupants = {}
+        self._tiles = {}
+        for rank, collection in enumerate(self.entities.values()):
+            for entity in collection:
+                self._insert(entity, rank)
+        self.version += 1
+        self._notify(None, None, None)
+        self._check_if_enabled()
+
+    def add(self, entity: Entity) -> None:
+        """
+        Index an entity that has just been added to one of the level collections
+
+        Keyword arguments:
+        entity -- the added entity
+        """
+        if id(entity) in self._tiles:
+            return
+        self._insert(entity, self._find_collection_rank(entity))
+        self.version += 1
+        self._notify(entity, None, tile_key(entity.position))
+        self._check_if_enabled()
+
+    def remove(self, entity: Entity) -> None:
+        """
+        Stop indexing an entity that has just been removed from the level collections
+
+        Keyword arguments:
+        entity -- the removed entity
+        """
+        tile: Optional[Tile] = self._tiles.pop(id(entity), None)
+        if tile is None:
+            return
+        self._detach(entity, tile)
+        entity.position_observer = None
+        self.version += 1
+        self._notify(entity, tile, None)
+        self._check_if_enabled()
+
+    def get(self, position: Position) -> Optional[Entity]:
+        """
+        Return the entity that is on the given tile if there is any
+
+        Keyword arguments:
+        position -- the position of the tile
+        """
+        occupants = self._occupants.get(tile_key(position))
+        if TileOccupancyIndex.consistency_checks_enabled:
+            self.check_consistency()
+        if not occupants:
+            return None
+        return min(occupants, key=lambda occupant: occupant[0])[1]
+
+    def is_occupied(self, position: Position) -> bool:
+        """
+        Return whether at least one entity is standing on the given tile
+
+        Keyword arguments:
+        position -- the position of the tile
+        """
+        return tile_key(position) in self._occupants
+
+    def occupied_tiles(self) -> list[Tile]:
+        """
+        Return all the tiles on which at least one entity is standing
+        """
+        return list(self._occupants)
+
+    def check_consistency(self) -> None:
+        """
+        Compare the content of the index with a linear scan of all the level collections.
+
+        Raise a RuntimeError describing the first mismatch found if the index is out of sync.
+        """
+        expected_tiles: dict[int, Tile] = {}
+        for collection in self.entities.values():
+            for entity in collection:
+                expected_tiles[id(entity)] = tile_key(entity.position)
+                indexed_tile: Optional[Tile] = self._tiles.get(id(entity))
+                if indexed_tile != tile_key(entity.position):
+                    raise RuntimeError(
+                        f"Occupancy index out of sync: {entity} is on {tile_key(entity.position)} "
+                        f"but indexed on {indexed_tile}"
+                    )
+        if len(expected_tiles) != len(self._tiles):
+            raise RuntimeError(
+                f"Occupancy index out of sync: {len(self._tiles)} entities indexed "
+                f"instead of {len(expected_tiles)}"
+            )
+        for tile, occupants in self._occupants.items():
+            linear_scan_result: Optional[Entity] = None
+            for collection in self.entities.values():
+                linear_scan_result = next(
+                    (entity for entity in collection if tile_key(entity.position) == tile),
+                    None,
+                )
+                if linear_scan_result is not None:
+                    break
+            indexed_result = min(occupants, key=lambda occupant: occupant[0])[1]
+            if indexed_result is not linear_scan_result:
+                raise RuntimeError(
+                    f"Occupancy index out of sync on tile {tile}: {indexed_result} found "
+                    f"instead of {linear_scan_result}"
+                )
+
+    def _insert(self, entity: Entity, rank: int) -> None:
+        tile: Tile = tile_key(entity.position)
+        self._tiles[id(entity)] = tile
+        self._occupants.setdefault(tile, []).append((rank, entity))
+        entity.position_observer = self._on_entity_moved
+
+    def _detach(self, entity: Entity, tile: Tile) -> tuple[int, Entity]:
+        occupants = self._occupants[tile]
+        for index, occupant in enumerate(occupants):
+            if occupant[1] is entity:
+                del occupants[index]
+                break
+        else:
+            raise RuntimeError(f"Occupancy index out of sync: {entity} not on {tile}")
+        if not occupants:
+            del self._occupants[tile]
+        return occupant
+
+    def _on_entity_moved(self, entity: Entity, previous_position: Position) -> None:
+        previous_tile: Optional[Tile] = self._tiles.get(id(entity))
+        new_tile: Tile = tile_key(entity.position)
+        if previous_tile is None or previous_tile == new_tile:
+            return
+        rank, _ = self._detach(entity, previous_tile)
+        self._tiles[id(entity)] = new_tile
+        self._occupants.setdefault(new_tile, []).append((rank, entity))
+        self.version += 1
+        self._notify(entity, previous_tile, new_tile)
+        self._check_if_enabled()
+
+    def _notify(
+        self, entity: Optional[Entity], previous_tile: Optional[Tile], new_tile: Optional[Tile]
+    ) -> None:
+        for listener in self.listeners:
+            listener(entity, previous_tile, new_tile)
+
+    def _find_collection_rank(self, entity: Entity) -> int:
+        for rank, collection in enumerate(self.entities.values()):
+            if any(member is entity for member in collection):
+                return rank
+        raise RuntimeError(f"{entity} should be added to a collection before being indexed")
+
+    def _check_if_enabled(self) -> None:
+        if TileOccupancyIndex.consistency_checks_enabled:
+            self.check_consistency()
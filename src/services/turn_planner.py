@@ -0,0 +1,398 @@
+"""
+Defines TurnPlanner class, planning at once the moves of all the units of a side controlled by AI,
+and PlannedAction class, the move prepared for one of these units.
+"""
+
+from __future__ import annotations
+
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Sequence
+
+import pygame
+
+from src.game_entities.entity import Entity
+from src.game_entities.movable import EntityState, EntityStrategy, Movable
+from src.gui.position import Position
+from src.services.distance_field import DistanceField
+from src.services.influence_map import InfluenceMap
+from src.services.path_hierarchy import PathHierarchy
+from src.services.reachability import Reachability
+from src.services.tactical_search import TacticalSearch, get_open_tiles
+from src.services.tile_occupancy import Tile, tile_key
+from src.services.walkability_grid import WalkabilityGrid
+
+_planning_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_planning_executor() -> ThreadPoolExecutor:
+    # A single worker is shared by all the planners, only one side is playing at a time
+    global _planning_executor
+    if _planning_executor is None:
+        _planning_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="turn_planner")
+    return _planning_executor
+
+
+def _snapshot(entity: Movable) -> Movable:
+    # A copy of the entity not affected by the changes of the level, its mutable attributes being copied too
+    snapshot: Movable = copy.copy(entity)
+    for name, value in vars(entity).items():
+        if isinstance(value, (list, dict, set, pygame.Vector2)):
+            setattr(snapshot, name, copy.copy(value))
+    return snapshot
+
+
+class PlannedAction:
+    """
+    A PlannedAction is the move prepared for a unit by the turn planner,
+    that only has to be played back when the unit acts.
+
+    Keyword arguments:
+    entity -- the unit for which the move has been planned
+    path -- the ordered sequence of tiles that should be crossed by the unit,
+    ending with its destination
+    target -- the entity targeted by the unit if there is any
+
+    Attributes:
+    entity -- the unit for which the move has been planned
+    path -- the ordered sequence of tiles that should be crossed by the unit
+    target -- the entity targeted by the unit if there is any
+    """
+
+    def __init__(
+        self, entity: Movable, path: Sequence[Position], target: Optional[Entity]
+    ) -> None:
+        self.entity: Movable = entity
+        self.path: list[Position] = list(path)
+        self.target: Optional[Entity] = target
+
+    @property
+    def destination(self) -> Position:
+        """
+        Return the tile on which the unit will stand at the end of its move
+        """
+        return self.path[-1]
+
+
+class TurnPlanner:
+    """
+    A TurnPlanner decides the moves of all the units of a side at once, at the beginning of its turn.
+
+    Units are planned in their playing order over a copy of the walkability grid:
+    once the move of a unit is decided, the tile it leaves is freed and its destination is reserved,
+    so that the next units plan exactly as if the previous ones had already moved,
+    and two units can never choose the same tile.
+    The movement range, the nearest target and the route of each unit are computed during planning,
+    the level only has to play back the prepared paths.
+    Units following the tactical strategy are decided by the tactical search,
+    which sees the units planned before them already standing on their destinations.
+
+    The plan is kept as long as the level evolves as expected, that is as long as the only
+    occupancy changes are the planned units walking along their paths.
+    Any other change, like a target being killed, makes the plan outdated,
+    and the units that have not acted yet are planned again at the next request.
+
+    Planning can run in a background thread so that the game keeps being refreshed while
+    the units are thinking. The worker only uses a snapshot of the level taken by the main thread
+    when the planning starts: copies of the walkability grid, of the path hierarchy,
+    of the influence map, of the units and of the targets.
+    Planning never modifies the entities of the level, the target chosen for each unit
+    being given by its planned action.
+    Actions are published as soon as each of them is ready, so the first units can be played back
+    while the next ones are still being planned, and the results of a planning started before
+    the plan became outdated are simply dropped.
+
+    Keyword arguments:
+    walkability_grid -- the walkability grid of the level
+    path_hierarchy -- the abstract graph of the level used to find routes toward far targets
+    units -- the ordered sequence of units of the side that is about to play
+    targets -- the ordered sequence of entities that could be attacked by the units
+    influence_map -- the influence map of the side if there is any
+    in_background -- whether the planning should run in a background thread
+    tactical_search -- the search deciding the units following the tactical strategy,
+    a search with the default time budget is used if it is not given
+
+    Attributes:
+    walkability_grid -- the walkability grid of the level
+    path_hierarchy -- the abstract graph of the level used to find routes toward far targets
+    units -- the ordered sequence of units of the side that is about to play
+    targets -- the ordered sequence of entities that could be attacked by the units
+    influence_map -- the influence map of the side if there is any
+    in_background -- whether the planning runs in a background thread
+    tactical_search -- the search deciding the units following the tactical strategy
+    actions -- the planned action of each unit that has not played it yet, by unit id
+    outdated -- whether the level changed in a way that was not planned
+    """
+
+    def __init__(
+        self,
+        walkability_grid: WalkabilityGrid,
+        path_hierarchy: PathHierarchy,
+        units: Sequence[Movable],
+        targets: Sequence[Movable],
+        influence_map: Optional[InfluenceMap] = None,
+        in_background: bool = False,
+        tactical_search: Optional[TacticalSearch] = None,
+    ) -> None:
+        self.walkability_grid: WalkabilityGrid = walkability_grid
+        self.path_hierarchy: PathHierarchy = path_hierarchy
+        self.units: list[Movable] = list(units)
+        self.targets: list[Movable] = list(targets)
+        self.influence_map: Optional[InfluenceMap] = influence_map
+        self.in_background: bool = in_background
+        self.tactical_search: TacticalSearch = (
+            tactical_search if tactical_search is not None else TacticalSearch()
+        )
+        self.actions: dict[int, PlannedAction] = {}
+        self.outdated: bool = False
+        self._planned_tiles: dict[int, set[Tile]] = {}
+        self._generation: int = 0
+        self._planning: Optional[Future] = None
+        self.plan()
+
+    def is_planned_for(self, units: Sequence[Entity], targets: Sequence[Entity]) -> bool:
+        """
+        Return whether the plan has been made for the given ordered sequences of units and targets
+
+        Keyword arguments:
+        units -- the sequence of units that should be compared with the ones of the plan
+        targets -- the sequence of targets that should be compared with the ones of the plan
+        """
+        return all(
+            len(entities) == len(own_entities)
+            and all(entity is own_entity for entity, own_entity in zip(entities, own_entities))
+            for entities, own_entities in ((units, self.units), (targets, self.targets))
+        )
+
+    def notify_change(
+        self, entity: Optional[Entity], previous_tile: Optional[Tile], new_tile: Optional[Tile]
+    ) -> None:
+        """
+        Mark the plan as outdated if the occupancy change is not a unit walking along its planned path
+
+        Keyword arguments:
+        entity -- the entity that has been moved, added or removed
+        previous_tile -- the tile previously occupied by the entity if there is any
+        new_tile -- the tile now occupied by the entity if there is any
+        """
+        planned_tiles: Optional[set[Tile]] = (
+            self._planned_tiles.get(id(entity)) if entity is not None else None
+        )
+        if planned_tiles is None or new_tile not in planned_tiles:
+            self.outdated = True
+
+    def get_action(self, unit: Movable) -> Optional[PlannedAction]:
+        """
+        Return the action planned for the given unit and forget it, the remaining units being
+        planned again first if the plan is outdated.
+        None is returned while the action of the unit is still being computed in the background,
+        the unit stays in place if it has not been planned at all.
+
+        Keyword arguments:
+        unit -- the unit that is about to act
+        """
+        if self.outdated:
+            self.plan()
+        # Check the end of the planning first, so that an action published in between is not missed
+        is_finished: bool = not self.is_planning()
+        action: Optional[PlannedAction] = self.actions.pop(id(unit), None)
+        if action is None and is_finished:
+            if self._planning is not None:
+                # Raise the errors that occurred in the background
+                self._planning.result()
+            return PlannedAction(unit, [pygame.Vector2(unit.position)], None)
+        return action
+
+    def get_group_actions(self) -> list[PlannedAction]:
+        """
+        Return the actions planned for the next units that can walk at the same time and forget them,
+        the remaining units being planned again first if the plan is outdated.
+
+        The group is made of the next units that have to act in their playing order, and stops
+        before the first unit whose origin or path shares a tile with the origin or the path
+        of a unit of the group: the walks of the group never cross each other,
+        so they can be played back at once.
+        The group also stops before the first unit whose action is still being computed
+        in the background, an empty list being returned if it is the first unit.
+        """
+        if self.outdated:
+            self.plan()
+        is_finished: bool = not self.is_planning()
+        group: list[PlannedAction] = []
+        group_tiles: set[Tile] = set()
+        for unit in self.units:
+            if unit.state is not EntityState.HAVE_TO_ACT:
+                continue
+            action: Optional[PlannedAction] = self.actions.get(id(unit))
+            if action is None and not is_finished:
+                break
+            unit_tiles: set[Tile] = {tile_key(unit.position)}
+            if action is not None:
+                unit_tiles.update(tile_key(tile) for tile in action.path)
+            if not unit_tiles.isdisjoint(group_tiles):
+                break
+            group_tiles |= unit_tiles
+            group.append(self.get_action(unit))
+        return group
+
+    def is_planning(self) -> bool:
+        """
+        Return whether some actions are still being computed in the background
+        """
+        return self._planning is not None and not self._planning.done()
+
+    def cancel(self) -> None:
+        """
+        Stop the planning running in the background if there is any, its results being dropped
+        """
+        self._generation += 1
+
+    def plan(self) -> None:
+        """
+        Plan the moves of all the units that still have to act, in their playing order.
+        The planning is only started if it runs in the background.
+        """
+        self._generation += 1
+        self.actions = {}
+        self._planned_tiles = {}
+        self.outdated = False
+        influence_map: Optional[InfluenceMap] = (
+            self.influence_map.copy()
+            if self.influence_map is not None and self.influence_map.covers(self.targets)
+            else None
+        )
+        snapshots: dict[int, Movable] = {
+            id(entity): _snapshot(entity) for entity in self.units + self.targets
+        }
+        arguments = (
+            self._generation,
+            self.walkability_grid.copy(),
+            self.path_hierarchy.copy(),
+            snapshots,
+            influence_map,
+            self.actions,
+            self._planned_tiles,
+        )
+        if self.in_background:
+            self._planning = _get_planning_executor().submit(self._plan_units, *arguments)
+        else:
+            self._planning = None
+            self._plan_units(*arguments)
+
+    def _plan_units(
+        self,
+        generation: int,
+        planning_grid: WalkabilityGrid,
+        path_hierarchy: PathHierarchy,
+        snapshots: dict[int, Movable],
+        influence_map: Optional[InfluenceMap],
+        actions: dict[int, PlannedAction],
+        planned_tiles: dict[int, set[Tile]],
+    ) -> None:
+        units: list[Movable] = [snapshots[id(unit)] for unit in self.units]
+        targets: list[Movable] = [snapshots[id(target)] for target in self.targets]
+        # The entities of the level by the id of their snapshot
+        entities: dict[int, Entity] = {
+            id(snapshot): entity
+            for entity, snapshot in zip(self.units + self.targets, units + targets)
+        }
+        distance_field: Optional[DistanceField] = None
+        # Tiles left and reserved by the units during the turn stay open, so they are computed once
+        open_tiles: Optional[frozenset[Tile]] = None
+        if any(
+            unit.strategy is EntityStrategy.TACTICAL and unit.state is EntityState.HAVE_TO_ACT
+            for unit in units
+        ):
+            open_tiles = get_open_tiles(planning_grid, units + targets)
+        for unit in units:
+            if unit.state is not EntityState.HAVE_TO_ACT:
+                continue
+            if generation != self._generation:
+                # The plan became outdated, a new planning has been started
+                return
+            if unit.strategy is EntityStrategy.ACTIVE and distance_field is None:
+                distance_field = DistanceField(
+                    targets,
+                    planning_grid.is_tile_available,
+                    planning_grid.columns * planning_grid.rows,
+                    planning_grid,
+                )
+            if unit.strategy is EntityStrategy.TACTICAL:
+                path, target = self._plan_tactical_unit(
+                    unit,
+                    units,
+                    targets,
+                    planning_grid,
+                    {
+                        id(snapshots[unit_id]): action.destination
+                        for unit_id, action in actions.items()
+                    },
+                    open_tiles,
+                )
+            else:
+                path, target = self._plan_unit(
+                    unit, targets, planning_grid, path_hierarchy, distance_field, influence_map
+                )
+            entity: Entity = entities[id(unit)]
+            planned_tiles[id(entity)] = {tile_key(tile) for tile in path}
+            actions[id(entity)] = PlannedAction(
+                entity, path, entities.get(id(target), target) if target is not None else None
+            )
+
+            # Free the tile left by the unit and reserve its destination for the next units
+            origin: Tile = tile_key(unit.position)
+            destination: Tile = tile_key(path[-1])
+            if destination != origin:
+                planning_grid.set_tile_walkable(origin, True)
+                planning_grid.set_tile_walkable(destination, False)
+                if distance_field is not None:
+                    distance_field.notify_change(unit, origin, destination)
+
+    @staticmethod
+    def _plan_unit(
+        unit: Movable,
+        targets: Sequence[Movable],
+        planning_grid: WalkabilityGrid,
+        path_hierarchy: PathHierarchy,
+        distance_field: Optional[DistanceField],
+        influence_map: Optional[InfluenceMap],
+    ) -> tuple[list[Position], Optional[Entity]]:
+        possible_moves: Reachability = planning_grid.compute_reachability(
+            unit.position, unit.max_moves
+        )
+        nearest_target: Optional[Movable] = None
+        route: Optional[list[Tile]] = None
+        if unit.strategy is EntityStrategy.ACTIVE and distance_field is not None:
+            nearest_target, distance = distance_field.nearest_target(unit.position)
+            if distance < distance_field.unreachable_distance:
+                route = path_hierarchy.find_route(
+                    unit.position,
+                    nearest_target.position,
+                    unit.reach,
+                    planning_grid.is_tile_available,
+                    unit.max_moves,
+                )
+        # The unit is a snapshot, the target it chooses is only kept by the planned action
+        move: Position = unit.determine_move(
+            possible_moves, targets, nearest_target, route, influence_map
+        )
+        if tuple(move) not in possible_moves:
+            move = unit.position
+        return possible_moves.path_to(move), unit.target
+
+    def _plan_tactical_unit(
+        self,
+        unit: Movable,
+        units: Sequence[Movable],
+        targets: Sequence[Movable],
+        planning_grid: WalkabilityGrid,
+        positions: dict[int, Position],
+        open_tiles: Optional[frozenset[Tile]],
+    ) -> tuple[list[Position], Optional[Entity]]:
+        possible_moves: Reachability = planning_grid.compute_reachability(
+            unit.position, unit.max_moves
+        )
+        move, target = self.tactical_search.decide(
+            unit, units, targets, planning_grid, possible_moves, positions, open_tiles
+        )
+        return possible_moves.path_to(move), target
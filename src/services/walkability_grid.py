@@ -0,0 +1,515 @@
+"""
+Defines WalkabilityGrid class, a NumPy boolean array telling which tiles of a level can be crossed,
+along with the vectorized wavefront expansions computing movement ranges, attack ranges
+and distance maps over it.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from src.constants import TILE_SIZE
+from src.game_entities.entity import Entity
+from src.game_entities.objective import Objective
+from src.gui.position import Position
+from src.services.reachability import NEIGHBOUR_OFFSETS, Reachability
+from src.services.tile_occupancy import Tile, TileOccupancyIndex, tile_key
+
+UNREACHED: int = -1
+NO_LABEL: int = np.iinfo(np.int32).max
+
+_attack_kernels: dict[tuple[int, ...], np.ndarray] = {}
+
+
+def get_attack_kernel(reach: Sequence[int]) -> np.ndarray:
+    """
+    Return the offsets, in rows and columns, of all the tiles that are at one of the given distances from a tile.
+    Kernels are computed once per reach signature and shared between all the entities having the same reach.
+
+    Keyword arguments:
+    reach -- the distances at which the attacking entity can hit
+    """
+    signature: tuple[int, ...] = tuple(sorted(set(reach)))
+    kernel: Optional[np.ndarray] = _attack_kernels.get(signature)
+    if kernel is None:
+        offsets: list[tuple[int, int]] = []
+        for distance in signature:
+            for row_offset in range(-distance, distance + 1):
+                remaining: int = distance - abs(row_offset)
+                for column_offset in sorted({remaining, -remaining}):
+                    offsets.append((row_offset, column_offset))
+        kernel = np.array(offsets, dtype=np.int32).reshape(-1, 2)
+        kernel.setflags(write=False)
+        _attack_kernels[signature] = kernel
+    return kernel
+
+
+def _shift(mask: np.ndarray, row_offset: int, column_offset: int) -> np.ndarray:
+    """
+    Return a copy of the given array translated by the given offsets, with zeros filling the uncovered cells.
+
+    Keyword arguments:
+    mask -- the array that should be translated
+    row_offset -- the number of rows by which the content should be moved down
+    column_offset -- the number of columns by which the content should be moved right
+    """
+    shifted = np.zeros_like(mask)
+    rows, columns = mask.shape
+    if abs(row_offset) >= rows or abs(column_offset) >= columns:
+        return shifted
+    shifted[
+        max(row_offset, 0) : rows + min(row_offset, 0),
+        max(column_offset, 0) : columns + min(column_offset, 0),
+    ] = mask[
+        max(-row_offset, 0) : rows + min(-row_offset, 0),
+        max(-column_offset, 0) : columns + min(-column_offset, 0),
+    ]
+    return shifted
+
+
+def _expand(frontier: np.ndarray) -> np.ndarray:
+    """
+    Return the mask of the cells that are next to at least one cell of the frontier.
+
+    Keyword arguments:
+    frontier -- the boolean mask of the cells from which the expansion is done
+    """
+    expanded = np.zeros_like(frontier)
+    expanded[1:, :] |= frontier[:-1, :]
+    expanded[:-1, :] |= frontier[1:, :]
+    expanded[:, 1:] |= frontier[:, :-1]
+    expanded[:, :-1] |= frontier[:, 1:]
+    return expanded
+
+
+def _expand_labels(frontier_labels: np.ndarray) -> np.ndarray:
+    """
+    Return for each cell the lowest label found among its neighbours.
+
+    Keyword arguments:
+    frontier_labels -- the label of each cell of the frontier, NO_LABEL for the other cells
+    """
+    expanded = np.full_like(frontier_labels, NO_LABEL)
+    np.minimum(expanded[1:, :], frontier_labels[:-1, :], out=expanded[1:, :])
+    np.minimum(expanded[:-1, :], frontier_labels[1:, :], out=expanded[:-1, :])
+    np.minimum(expanded[:, 1:], frontier_labels[:, :-1], out=expanded[:, 1:])
+    np.minimum(expanded[:, :-1], frontier_labels[:, 1:], out=expanded[:, :-1])
+    return expanded
+
+
+def dilate(mask: np.ndarray, reach: Sequence[int]) -> np.ndarray:
+    """
+    Return the mask of the cells that are at one of the given distances from at least one cell of the given mask.
+
+    Keyword arguments:
+    mask -- the boolean mask of the cells from which the distances are measured
+    reach -- the distances at which the cells should be marked
+    """
+    dilated: np.ndarray = np.zeros_like(mask)
+    for row_offset, column_offset in get_attack_kernel(reach).tolist():
+        dilated |= _shift(mask, row_offset, column_offset)
+    return dilated
+
+
+def compute_wavefront(
+    walkable: np.ndarray, sources: np.ndarray, max_distance: Optional[int] = None
+) -> np.ndarray:
+    """
+    Compute the walking distance from the nearest source to every cell of the given array.
+    The sources are always at distance 0, even if they are not walkable.
+
+    Return an array of distances with the same shape, UNREACHED for the cells that cannot be reached.
+
+    Keyword arguments:
+    walkable -- the boolean array telling which cells can be crossed
+    sources -- the boolean mask of the cells from which the expansion starts
+    max_distance -- the maximum distance that should be computed, unlimited if None
+    """
+    frontier: np.ndarray = sources
+    reached: np.ndarray = sources.copy()
+    distances: np.ndarray = np.full(walkable.shape, UNREACHED, dtype=np.int32)
+    distances[sources] = 0
+    distance: int = 0
+    while max_distance is None or distance < max_distance:
+        frontier = _expand(frontier) & walkable & ~reached
+        if not frontier.any():
+            break
+        distance += 1
+        reached |= frontier
+        distances[frontier] = distance
+    return distances
+
+
+class WalkabilityGrid:
+    """
+    A WalkabilityGrid stores in a NumPy boolean array whether each tile of a level can be crossed,
+    according to the obstacles and the dynamic entities standing on the map.
+    A tile occupied by a walkable objective is the only occupied tile that remains walkable.
+
+    The grid is built from the tile occupancy index and kept up to date by listening to it.
+    Distances are computed by vectorized wavefront expansions over the array:
+    each step dilates the frontier to its four neighbours and masks out blocked or already reached tiles,
+    which keeps the cost low even for maps far larger than the screen.
+
+    Keyword arguments:
+    origin -- the position of the top left tile of the map on screen
+    columns -- the width of the map in tiles
+    rows -- the height of the map in tiles
+    tile_occupancy -- the index of the entities standing on the level tiles
+
+    Attributes:
+    origin -- the position of the top left tile of the map on screen
+    columns -- the width of the map in tiles
+    rows -- the height of the map in tiles
+    tile_occupancy -- the index of the entities standing on the level tiles
+    walkable -- the boolean array indexed by row and column telling if each tile can be crossed
+    """
+
+    def __init__(
+        self,
+        origin: Position,
+        columns: int,
+        rows: int,
+        tile_occupancy: TileOccupancyIndex,
+    ) -> None:
+        self.origin: Tile = tile_key(origin)
+        self.columns: int = columns
+        self.rows: int = rows
+        self.tile_occupancy: TileOccupancyIndex = tile_occupancy
+        self.walkable: np.ndarray = np.ones((rows, columns), dtype=bool)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Compute again the walkability of every tile from the content of the tile occupancy index
+        """
+        self.walkable.fill(True)
+        for tile in self.tile_occupancy.occupied_tiles():
+            self._refresh_tile(tile)
+
+    def notify_change(
+        self, entity: Optional[Entity], previous_tile: Optional[Tile], new_tile: Optional[Tile]
+    ) -> None:
+        """
+        Update the walkability of the tiles whose occupancy changed.
+        The whole grid is built again if entity is None.
+
+        Keyword arguments:
+        entity -- the entity that has been moved, added or removed
+        previous_tile -- the tile previously occupied by the entity if there is any
+        new_tile -- the tile now occupied by the entity if there is any
+        """
+        if entity is None:
+            self.rebuild()
+            return
+        if previous_tile is not None:
+            self._refresh_tile(previous_tile)
+        if new_tile is not None:
+            self._refresh_tile(new_tile)
+
+    def copy(self) -> WalkabilityGrid:
+        """
+        Return a copy of the grid that does not follow the level occupancy,
+        so that its walkability can be freely modified to simulate moves without affecting the level
+        """
+        grid: WalkabilityGrid = copy.copy(self)
+        grid.walkable = self.walkable.copy()
+        return grid
+
+    def set_tile_walkable(self, tile: Position, walkable: bool) -> None:
+        """
+        Force the walkability of the given tile, tiles outside the map being ignored
+
+        Keyword arguments:
+        tile -- the position of the tile
+        walkable -- whether the tile can be crossed or not
+        """
+        index: Optional[tuple[int, int]] = self.get_index(tile)
+        if index is not None:
+            self.walkable[index] = walkable
+
+    def get_index(self, position: Position) -> Optional[tuple[int, int]]:
+        """
+        Return the row and the column of the given tile in the grid, or None if it is outside the map.
+
+        Keyword arguments:
+        position -- the position of the tile on screen
+        """
+        column: int = (int(position[0]) - self.origin[0]) // TILE_SIZE
+        row: int = (int(position[1]) - self.origin[1]) // TILE_SIZE
+        if 0 <= row < self.rows and 0 <= column < self.columns:
+            return row, column
+        return None
+
+    def get_tile(self, row: int, column: int) -> Tile:
+        """
+        Return the position on screen of the tile at the given row and column
+
+        Keyword arguments:
+        row -- the row of the tile in the grid
+        column -- the column of the tile in the grid
+        """
+        return self.origin[0] + column * TILE_SIZE, self.origin[1] + row * TILE_SIZE
+
+    def is_tile_available(self, tile: Position) -> bool:
+        """
+        Return whether the given tile is inside the map and can be crossed
+
+        Keyword arguments:
+        tile -- the position of the tile
+        """
+        index: Optional[tuple[int, int]] = self.get_index(tile)
+        return index is not None and bool(self.walkable[index])
+
+    def get_mask(self, tiles: Iterable[Position]) -> np.ndarray:
+        """
+        Return the boolean mask of the grid containing the given tiles, the tiles outside the map being ignored
+
+        Keyword arguments:
+        tiles -- the positions of the tiles that should be set in the mask
+        """
+        mask: np.ndarray = np.zeros((self.rows, self.columns), dtype=bool)
+        for tile in tiles:
+            index: Optional[tuple[int, int]] = self.get_index(tile)
+            if index is not None:
+                mask[index] = True
+        return mask
+
+    def get_distance(self, distances: np.ndarray, tile: Position) -> int:
+        """
+        Return the distance stored for the given tile, UNREACHED if it is outside the map or not reached
+
+        Keyword arguments:
+        distances -- the array of distances computed by compute_distances
+        tile -- the position of the tile
+        """
+        index: Optional[tuple[int, int]] = self.get_index(tile)
+        if index is None:
+            return UNREACHED
+        return int(distances[index])
+
+    def compute_distances(
+        self, sources: Iterable[Position], max_distance: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Compute the walking distance from the nearest source to every tile of the map.
+        The sources are always at distance 0, even if an entity is standing on them.
+
+        Return an array of distances indexed by row and column, UNREACHED for the tiles that cannot be reached.
+
+        Keyword arguments:
+        sources -- the positions from which the expansion starts
+        max_distance -- the maximum distance that should be computed, unlimited if None
+        """
+        return compute_wavefront(self.walkable, self.get_mask(sources), max_distance)
+
+    def compute_labelled_distances(
+        self, seeds: dict[Tile, int]
+    ) -> tuple[dict[Tile, int], dict[Tile, int]]:
+        """
+        Compute the distance from the nearest seed to every walkable tile, along with the label of this seed.
+        When several seeds are at the same distance, the lowest label is kept.
+
+        Return the distance and the label of each reached tile.
+
+        Keyword arguments:
+        seeds -- the walkable tiles from which the expansion starts with their labels
+        """
+        labels: np.ndarray = np.full((self.rows, self.columns), NO_LABEL, dtype=np.int32)
+        for tile, label in seeds.items():
+            index: Optional[tuple[int, int]] = self.get_index(tile)
+            if index is not None:
+                labels[index] = min(labels[index], label)
+        frontier: np.ndarray = labels != NO_LABEL
+        reached: np.ndarray = frontier.copy()
+        distances: np.ndarray = np.full((self.rows, self.columns), UNREACHED, dtype=np.int32)
+        distances[frontier] = 0
+        distance: int = 0
+        while True:
+            candidate_labels = _expand_labels(np.where(frontier, labels, NO_LABEL))
+            frontier = (candidate_labels != NO_LABEL) & self.walkable & ~reached
+            if not frontier.any():
+                break
+            distance += 1
+            reached |= frontier
+            distances[frontier] = distance
+            labels[frontier] = candidate_labels[frontier]
+
+        rows, columns = np.nonzero(reached)
+        tiles: list[Tile] = [
+            self.get_tile(row, column) for row, column in zip(rows.tolist(), columns.tolist())
+        ]
+        return (
+            dict(zip(tiles, distances[rows, columns].tolist())),
+            dict(zip(tiles, labels[rows, columns].tolist())),
+        )
+
+    def compute_reachability(self, origin: Position, max_moves: int) -> Reachability:
+        """
+        Compute all the tiles that can be reached from the origin with a wavefront expansion
+        over the part of the grid that is within max_moves tiles of the origin.
+        The result is ordered and linked exactly as a breadth-first search exploring
+        the neighbours in the NEIGHBOUR_OFFSETS order would do: the tiles of each distance layer
+        are sorted by the rank of their first predecessor in the previous layer,
+        then by the rank of the offset leading to them.
+
+        Return the reachability result with the distance and the predecessor of each reached tile.
+
+        Keyword arguments:
+        origin -- the starting position
+        max_moves -- the maximum number of tiles that could be traveled
+        """
+        reachability = Reachability(origin)
+        origin_index: Optional[tuple[int, int]] = self.get_index(origin)
+        if origin_index is None or max_moves <= 0:
+            return reachability
+        top: int = max(origin_index[0] - max_moves, 0)
+        left: int = max(origin_index[1] - max_moves, 0)
+        window: tuple[slice, slice] = (
+            slice(top, min(origin_index[0] + max_moves + 1, self.rows)),
+            slice(left, min(origin_index[1] + max_moves + 1, self.columns)),
+        )
+        walkable: np.ndarray = self.walkable[window]
+        sources: np.ndarray = np.zeros(walkable.shape, dtype=bool)
+        sources[origin_index[0] - top, origin_index[1] - left] = True
+        distances: np.ndarray = compute_wavefront(walkable, sources, max_moves)
+
+        cells: np.ndarray = np.argwhere(distances > 0)
+        if not len(cells):
+            return reachability
+        cell_distances: np.ndarray = distances[cells[:, 0], cells[:, 1]]
+        by_distance: np.ndarray = np.argsort(cell_distances, kind="stable")
+        cells = cells[by_distance]
+        cell_distances = cell_distances[by_distance]
+
+        # Flat index of the neighbour of each cell through each offset of NEIGHBOUR_OFFSETS,
+        # kept only if this neighbour is one step closer to the origin
+        offsets: np.ndarray = np.array(
+            [
+                (vertical_offset // TILE_SIZE, horizontal_offset // TILE_SIZE)
+                for horizontal_offset, vertical_offset in NEIGHBOUR_OFFSETS
+            ],
+            dtype=np.int64,
+        )
+        neighbours: np.ndarray = cells[:, np.newaxis, :] - offsets
+        inside: np.ndarray = (
+            (neighbours[..., 0] >= 0)
+            & (neighbours[..., 0] < walkable.shape[0])
+            & (neighbours[..., 1] >= 0)
+            & (neighbours[..., 1] < walkable.shape[1])
+        )
+        neighbours[~inside] = 0
+        neighbour_indexes: np.ndarray = neighbours[..., 0] * walkable.shape[1] + neighbours[..., 1]
+        is_predecessor: np.ndarray = inside & (
+            distances.ravel()[neighbour_indexes] == cell_distances[:, np.newaxis] - 1
+        )
+
+        # The tiles of a layer are sorted by the rank of their first predecessor in the previous layer,
+        # then by the rank of the offset leading to them, as a breadth-first search would find them
+        unranked: int = np.iinfo(np.int64).max
+        ranks: np.ndarray = np.zeros(walkable.size, dtype=np.int64)
+        offset_ranks: np.ndarray = np.arange(len(offsets))
+        layer_bounds: list[int] = np.searchsorted(
+            cell_distances, np.arange(1, int(cell_distances[-1]) + 2)
+        ).tolist()
+        chosen_neighbours: np.ndarray = np.empty(len(cells), dtype=np.int64)
+        for layer_start, layer_end in zip(layer_bounds, layer_bounds[1:]):
+            layer: slice = slice(layer_start, layer_end)
+            keys: np.ndarray = np.where(
+                is_predecessor[layer],
+                ranks[neighbour_indexes[layer]] * len(offsets) + offset_ranks,
+                unranked,
+            )
+            chosen_offsets: np.ndarray = keys.argmin(axis=1)
+            layer_rows: np.ndarray = np.arange(layer_end - layer_start)
+            order: np.ndarray = np.argsort(keys[layer_rows, chosen_offsets], kind="stable")
+            cells[layer] = cells[layer][order]
+            chosen_neighbours[layer] = neighbour_indexes[layer][order, chosen_offsets[order]]
+            ranks[cells[layer, 0] * walkable.shape[1] + cells[layer, 1]] = layer_rows
+
+        tiles: list[Tile] = list(
+            zip(
+                (self.origin[0] + (cells[:, 1] + left) * TILE_SIZE).tolist(),
+                (self.origin[1] + (cells[:, 0] + top) * TILE_SIZE).tolist(),
+            )
+        )
+        predecessors: list[Tile] = list(
+            zip(
+                (
+                    self.origin[0] + (chosen_neighbours % walkable.shape[1] + left) * TILE_SIZE
+                ).tolist(),
+                (
+                    self.origin[1] + (chosen_neighbours // walkable.shape[1] + top) * TILE_SIZE
+                ).tolist(),
+            )
+        )
+        reachability.update(zip(tiles, cell_distances.tolist()))
+        reachability.predecessors.update(zip(tiles, predecessors))
+        return reachability
+
+    def compute_attack_range(
+        self, possible_moves: Iterable[Position], reach: Sequence[int]
+    ) -> np.ndarray:
+        """
+        Compute all the tiles that could be attacked from at least one of the possible moves,
+        by dilating the mask of the moves with the attack kernel of the reach.
+
+        Return the boolean mask of the tiles that could be attacked.
+
+        Keyword arguments:
+        possible_moves -- the tiles from which an attack could be done
+        reach -- the distances at which the attacking entity can hit
+        """
+        return dilate(self.get_mask(possible_moves), reach)
+
+    def get_attackable_targets(
+        self,
+        possible_moves: Iterable[Position],
+        reach: Sequence[int],
+        targets: Sequence[Entity],
+    ) -> list[Entity]:
+        """
+        Return the targets that could be attacked from at least one of the possible moves.
+        The attack kernel is applied to the target tiles, and the resulting tiles are intersected
+        with the mask of the moves in a single vectorized lookup.
+
+        Keyword arguments:
+        possible_moves -- the tiles from which an attack could be done
+        reach -- the distances at which the attacking entity can hit
+        targets -- the entities that could be attacked
+        """
+        if not targets:
+            return []
+        moves: np.ndarray = self.get_mask(possible_moves)
+        kernel: np.ndarray = get_attack_kernel(reach)
+        target_indexes: np.ndarray = np.array(
+            [
+                (
+                    (int(target.position[1]) - self.origin[1]) // TILE_SIZE,
+                    (int(target.position[0]) - self.origin[0]) // TILE_SIZE,
+                )
+                for target in targets
+            ],
+            dtype=np.int32,
+        )
+        # Tiles from which each target could be hit, one row per target
+        rows: np.ndarray = target_indexes[:, 0:1] + kernel[:, 0]
+        columns: np.ndarray = target_indexes[:, 1:2] + kernel[:, 1]
+        inside_map: np.ndarray = (
+            (rows >= 0) & (rows < self.rows) & (columns >= 0) & (columns < self.columns)
+        )
+        hits: np.ndarray = np.zeros(rows.shape, dtype=bool)
+        hits[inside_map] = moves[rows[inside_map], columns[inside_map]]
+        return [target for target, is_attackable in zip(targets, hits.any(axis=1)) if is_attackable]
+
+    def _refresh_tile(self, tile: Tile) -> None:
+        index: Optional[tuple[int, int]] = self.get_index(tile)
+        if index is None:
+            return
+        entity_on_tile: Optional[Entity] = self.tile_occupancy.get(tile)
+        self.walkable[index] = entity_on_tile is None or (
+            isinstance(entity_on_tile, Objective) and entity_on_tile.is_walkable
+        )
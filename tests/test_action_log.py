@@ -0,0 +1,190 @@
+import io
+import unittest
+
+import pygame
+from lxml import etree
+
+from src.constants import MAIN_WIN_HEIGHT, MAIN_WIN_WIDTH, TILE_SIZE
+from src.game_entities.movable import EntityStrategy
+from src.game_entities.player import PlayerState
+from src.scenes.level_scene import EntityTurn, LevelScene, LevelStatus
+from src.services.action_log import (
+    ActionKind,
+    ActionLog,
+    ReplayDivergenceError,
+    replay_actions,
+)
+from src.services.random_manager import RandomStreams
+from src.services.simulation import (
+    load_headless_level_from_save,
+    play_ai_turns,
+    play_players_turn,
+)
+from src.services.sound_manager import set_sounds_enabled
+from tests.tools import minimal_setup_for_game
+
+SAVE_PATH = "tests/test_saves/complete_first_level_save.xml"
+NB_TURNS = 8
+
+
+class TestActionLog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    @staticmethod
+    def load_displayed_level(random_streams):
+        with open(SAVE_PATH, "r", encoding="utf-8") as save:
+            tree_root = etree.parse(save).getroot()
+        level = LevelScene(
+            pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT)),
+            "maps/level_0/",
+            0,
+            LevelStatus[tree_root.find("level/phase").text.strip()],
+            int(tree_root.find("level/turn").text.strip()),
+            tree_root.find("level/entities"),
+            random_streams=random_streams,
+        )
+        level.load_level_content()
+        return level
+
+    @staticmethod
+    def play_battle(random_streams):
+        level = load_headless_level_from_save(SAVE_PATH, random_streams)
+        for player in level.players:
+            player.strategy = EntityStrategy.ACTIVE
+        for _ in range(NB_TURNS):
+            play_players_turn(level)
+            if play_ai_turns(level):
+                break
+        return level
+
+    @staticmethod
+    def get_state(level):
+        return (
+            [
+                (
+                    entity.name,
+                    tuple(entity.position),
+                    entity.hit_points,
+                    entity.gold if hasattr(entity, "gold") else None,
+                    [str(item) for item in getattr(entity, "items", [])],
+                )
+                for entity in level.players
+                + level.entities.allies
+                + level.entities.foes
+            ],
+            level.turn,
+            level.side_turn,
+            level.game_phase,
+        )
+
+    def test_replay_restores_battle(self):
+        level = self.play_battle(RandomStreams(4))
+        recorded_kinds = {entry.kind for entry in level.action_log.entries}
+        self.assertTrue(
+            {
+                ActionKind.MOVE,
+                ActionKind.DUEL,
+                ActionKind.END_CHARACTER_TURN,
+                ActionKind.END_TURN,
+                ActionKind.NEXT_SIDE,
+            }
+            <= recorded_kinds
+        )
+
+        replayed_level = load_headless_level_from_save(SAVE_PATH, RandomStreams(4))
+        replay_actions(replayed_level, level.action_log)
+        self.assertEqual(self.get_state(level), self.get_state(replayed_level))
+        # The replayed level records the same actions
+        self.assertEqual(level.action_log.entries, replayed_level.action_log.entries)
+
+    def test_log_is_streamed_and_loaded(self):
+        output = io.StringIO()
+        level = load_headless_level_from_save(SAVE_PATH, RandomStreams(2))
+        level.action_log.stream_to(output)
+        level.end_turn()
+        snapshot = level.take_snapshot()
+        play_ai_turns(level)
+        # Actions dropped by restoring a snapshot are dropped from the streamed log too
+        level.restore_snapshot(snapshot)
+        play_ai_turns(level)
+
+        streamed_log = ActionLog.loads(output.getvalue())
+        loaded_log = ActionLog.loads(level.action_log.dumps())
+        self.assertEqual(level.action_log.entries, loaded_log.entries)
+        self.assertEqual(level.action_log.entries, streamed_log.entries)
+        self.assertEqual(0, loaded_log.level_number)
+        self.assertEqual(2, loaded_log.seed)
+
+    def test_replay_detects_divergence(self):
+        level = self.play_battle(RandomStreams(4))
+
+        with self.assertRaises(ReplayDivergenceError):
+            replay_actions(
+                load_headless_level_from_save(SAVE_PATH, RandomStreams(5)),
+                level.action_log,
+            )
+
+        other_log = ActionLog(1, level.random_streams)
+        with self.assertRaises(ReplayDivergenceError):
+            replay_actions(
+                load_headless_level_from_save(SAVE_PATH, RandomStreams(4)), other_log
+            )
+
+    def test_replay_player_actions(self):
+        level = self.load_displayed_level(RandomStreams(8))
+        raimund, braern, _ = level.players
+        offset = pygame.Vector2(level.active_screen_part.get_abs_offset())
+
+        # Move a player with the mouse
+        level.click(1, offset + raimund.position + (1, 1))
+        destination = (raimund.position[0] - TILE_SIZE, raimund.position[1])
+        level.click(1, offset + destination + (1, 1))
+        while raimund.state is PlayerState.ON_MOVE:
+            level.update_state()
+        self.assertEqual(destination, tuple(raimund.position))
+
+        # Manage items and gold with the other player, then end the turn of the players
+        level.menu_manager.clear_menus()
+        level.selected_player = braern
+        braern.selected = True
+        level.send_gold(braern, raimund, True, 40)
+        level.selected_item = braern.items[0]
+        level.trade_item(braern, raimund, True)
+        level.selected_item = raimund.items[-1]
+        level.trade_item(braern, raimund, False)
+        level.selected_item = braern.items[-1]
+        level.use_selected()
+        level.end_active_character_turn()
+        level.end_turn()
+        while level.side_turn is not EntityTurn.PLAYER:
+            level.animation = None
+            level.menu_manager.clear_menus()
+            level.update_state()
+        self.assertEqual(
+            [
+                ActionKind.MOVE,
+                ActionKind.SEND_GOLD,
+                ActionKind.TRADE_ITEM,
+                ActionKind.TRADE_ITEM,
+                ActionKind.USE_ITEM,
+                ActionKind.END_CHARACTER_TURN,
+                ActionKind.END_TURN,
+            ],
+            [entry.kind for entry in level.action_log.entries[:7]],
+        )
+
+        replayed_level = self.load_displayed_level(RandomStreams(8))
+        replay_actions(replayed_level, level.action_log)
+        self.assertEqual(self.get_state(level), self.get_state(replayed_level))
+        self.assertEqual(level.action_log.entries, replayed_level.action_log.entries)
+        self.assertIsNone(replayed_level.animation)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.scenes.level_scene import LevelStatus
+from src.services.battle_simulator import (
+    BattleResult,
+    BattleSettings,
+    format_report,
+    run_battles,
+    simulate_battle,
+)
+from src.services.language import DATA_PATH
+from src.services.sound_manager import set_sounds_enabled
+from tests.tools import minimal_setup_for_game
+
+LEVEL_DIRECTORY = "maps/level_1/"
+PLAYERS = ["raimund", "braern", "thokdrum", "doran"]
+
+
+class TestBattleSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    def test_settings_deduce_level_id(self):
+        self.assertEqual(1, BattleSettings(LEVEL_DIRECTORY).level_id)
+        self.assertEqual(2, BattleSettings("maps/level_2").level_id)
+        self.assertEqual(0, BattleSettings("my_maps/boss_arena").level_id)
+        self.assertEqual(3, BattleSettings("my_maps/boss_arena", level_id=3).level_id)
+
+    def test_battle_on_custom_map_directory(self):
+        # A copy of the first level stored outside of maps/ under another name
+        maps_directory = os.path.relpath(tempfile.mkdtemp(dir="."))
+        self.addCleanup(shutil.rmtree, maps_directory)
+        self.addCleanup(shutil.rmtree, DATA_PATH + maps_directory)
+        os.makedirs(DATA_PATH + maps_directory)
+        os.symlink(
+            os.path.abspath(LEVEL_DIRECTORY), os.path.join(maps_directory, "boss_arena")
+        )
+        os.symlink(
+            os.path.abspath(DATA_PATH + LEVEL_DIRECTORY),
+            os.path.join(DATA_PATH + maps_directory, "boss_arena"),
+        )
+
+        settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS[:2], max_turns=5)
+        custom_settings = BattleSettings(
+            os.path.join(maps_directory, "boss_arena"), PLAYERS[:2], max_turns=5
+        )
+        self.assertEqual(
+            vars(simulate_battle(settings, 0)), vars(simulate_battle(custom_settings, 0))
+        )
+
+    def test_battle_is_played_to_completion(self):
+        settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS, max_turns=50)
+        result = simulate_battle(settings, 3)
+        self.assertTrue(
+            result.outcome is not LevelStatus.IN_PROGRESS
+            or result.surviving_foes == 0
+            or result.turns > settings.max_turns
+        )
+        self.assertGreater(result.damage_dealt_by_players, 0)
+        self.assertGreater(result.damage_dealt_by_foes, 0)
+        if result.outcome is LevelStatus.ENDED_DEFEAT:
+            self.assertEqual(0, result.surviving_players)
+
+        # The same seed gives the same battle
+        same_result = simulate_battle(settings, 3)
+        self.assertEqual(vars(result), vars(same_result))
+
+    def test_stronger_foes_survive_more(self):
+        weak_settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS, max_turns=30)
+        strong_settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS, foe_levels=5, max_turns=30)
+        seeds = range(3)
+        weak_survivors = sum(
+            simulate_battle(weak_settings, seed).surviving_foes for seed in seeds
+        )
+        strong_survivors = sum(
+            simulate_battle(strong_settings, seed).surviving_foes for seed in seeds
+        )
+        self.assertGreater(strong_survivors, weak_survivors)
+
+    def test_pool_gives_the_same_results(self):
+        settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS[:2], max_turns=20)
+        results = run_battles(settings, [0, 1], processes=1)
+        self.assertEqual(
+            [vars(simulate_battle(settings, seed)) for seed in (0, 1)],
+            [vars(result) for result in results],
+        )
+
+    def test_report(self):
+        settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS)
+        results = [
+            BattleResult(0, LevelStatus.ENDED_VICTORY, 10, 100, 50, 2, 0),
+            BattleResult(1, LevelStatus.ENDED_DEFEAT, 6, 40, 80, 0, 3),
+            BattleResult(2, LevelStatus.IN_PROGRESS, 101, 60, 60, 1, 1),
+            BattleResult(3, LevelStatus.ENDED_VICTORY, 14, 100, 30, 3, 0),
+        ]
+        report = format_report(settings, results)
+        self.assertIn("Win rate: 50.0% (2 victories, 1 defeats, 1 unfinished)", report)
+        self.assertIn("Turns to finish: mean 10.0, median 10, min 6, max 14", report)
+        self.assertIn("Damage dealt by players: mean 75.0", report)
+        self.assertIn("All foes defeated: 50.0%", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
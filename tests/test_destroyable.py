@@ -2,7 +2,11 @@ import unittest
 
 import random as rd
 
+import pygame
+
+from src.constants import TILE_SIZE
 from src.game_entities.destroyable import Destroyable, DamageKind
+from src.gui.constant_sprites import constant_sprites, get_damage_bar
 from tests.random_data_library import random_destroyable_entity, random_movable_entity
 from tests.tools import minimal_setup_for_game
 
@@ -146,6 +150,31 @@ class TestDestroyable(unittest.TestCase):
         self.assertEqual(destroyable.hit_points_max, destroyable.hit_points)
         self.assertEqual(hp_max_init, destroyable.hit_points_max)
 
+    def test_hit_points_bar(self):
+        destroyable = random_destroyable_entity(min_hp=30)
+        destroyable.position = (0, 0)
+        destroyable.hit_points = destroyable.hit_points_max // 3
+        width = int(TILE_SIZE * destroyable.hit_points / destroyable.hit_points_max)
+        damage_bar = get_damage_bar("heavily_damaged", width)
+        self.assertEqual((width, TILE_SIZE), damage_bar.get_size())
+        # Bars are scaled only once
+        self.assertIs(damage_bar, get_damage_bar("heavily_damaged", width))
+
+        screen = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        destroyable.display_hit_points(screen)
+        expected_screen = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        expected_screen.blit(constant_sprites["hp_bar"], (0, 0))
+        expected_screen.blit(
+            pygame.transform.scale(
+                constant_sprites["heavily_damaged"], (width, TILE_SIZE)
+            ),
+            (0, 0),
+        )
+        self.assertEqual(
+            pygame.image.tobytes(expected_screen, "RGB"),
+            pygame.image.tobytes(screen, "RGB"),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
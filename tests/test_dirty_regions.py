@@ -0,0 +1,175 @@
+import unittest
+
+import pygame
+from lxml import etree
+from pygamepopup.components import InfoBox
+
+from src.constants import MAIN_WIN_HEIGHT, MAIN_WIN_WIDTH, TILE_SIZE
+from main import process_frame
+from src.gui.dirty_regions import DirtyRegionTracker, merge_rects
+from src.scenes.level_scene import LevelScene, LevelStatus
+from src.services import load_from_tmx_manager as tmx_loader
+from src.services.random_manager import RandomStreams
+from src.services.scene_manager import SceneManager
+from src.services.sound_manager import set_sounds_enabled
+from tests.tools import minimal_setup_for_game
+
+SAVE_PATH = "tests/test_saves/complete_first_level_save.xml"
+
+
+class TestDirtyRegions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    @staticmethod
+    def load_displayed_level(screen=None):
+        with open(SAVE_PATH, "r", encoding="utf-8") as save:
+            tree_root = etree.parse(save).getroot()
+        level = LevelScene(
+            screen or pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT)),
+            "maps/level_0/",
+            0,
+            LevelStatus[tree_root.find("level/phase").text.strip()],
+            int(tree_root.find("level/turn").text.strip()),
+            tree_root.find("level/entities"),
+            random_streams=RandomStreams(0),
+        )
+        level.load_level_content()
+        return level
+
+    def assert_drawn(self, rect, dirty_rects):
+        self.assertIsNotNone(dirty_rects)
+        self.assertTrue(
+            any(dirty_rect.contains(rect) for dirty_rect in dirty_rects),
+            f"{rect} is not covered by {dirty_rects}",
+        )
+
+    def test_merge_rects(self):
+        merged = merge_rects(
+            [
+                pygame.Rect(0, 0, 10, 10),
+                pygame.Rect(100, 100, 10, 10),
+                pygame.Rect(5, 5, 10, 10),
+                pygame.Rect(50, 50, 0, 10),
+            ]
+        )
+        self.assertCountEqual(
+            [pygame.Rect(0, 0, 15, 15), pygame.Rect(100, 100, 10, 10)], merged
+        )
+
+    def test_tracker(self):
+        tracker = DirtyRegionTracker(max_rects=2)
+        first_rect = pygame.Rect(0, 0, 10, 10)
+        second_rect = pygame.Rect(50, 0, 10, 10)
+        regions = {"first": (first_rect, 1), "second": (second_rect, 1)}
+        self.assertIsNone(tracker.update(regions))
+        self.assertEqual([], tracker.update(dict(regions)))
+
+        # A moved region is drawn again at its previous and its new place
+        moved_rect = pygame.Rect(0, 50, 10, 10)
+        regions["first"] = (moved_rect, 1)
+        self.assertCountEqual([first_rect, moved_rect], tracker.update(dict(regions)))
+        regions["second"] = (second_rect, 2)
+        self.assertEqual([second_rect], tracker.update(dict(regions)))
+        del regions["second"]
+        self.assertEqual([second_rect], tracker.update(dict(regions)))
+
+        # Beyond the limit, everything is drawn again
+        tracker.invalidate(pygame.Rect(100, 100, 5, 5))
+        tracker.invalidate(pygame.Rect(200, 100, 5, 5))
+        self.assertEqual(2, len(tracker.update(dict(regions))))
+        for index in range(3):
+            tracker.invalidate(pygame.Rect(index * 100, 200, 5, 5))
+        self.assertIsNone(tracker.update(dict(regions)))
+        tracker.invalidate()
+        self.assertIsNone(tracker.update(dict(regions)))
+        self.assertEqual([], tracker.update(dict(regions)))
+
+    def test_only_changes_are_drawn(self):
+        level = self.load_displayed_level()
+        self.assertIsNone(level.display())
+        # Nothing changes while the level is idle
+        self.assertEqual([], level.display())
+        self.assertEqual([], level.display())
+
+        foe = level.entities.foes[0]
+        foe.hit_points -= 1
+        dirty_rects = level.display()
+        self.assert_drawn(foe.get_rect(), dirty_rects)
+        self.assertNotIn(level.sidebar.get_rect(), dirty_rects)
+
+        level.hovered_entity = foe
+        self.assert_drawn(level.sidebar.get_rect(), level.display())
+
+        previous_rect = foe.get_rect()
+        foe.position = foe.position + pygame.Vector2(0, TILE_SIZE)
+        dirty_rects = level.display()
+        self.assert_drawn(previous_rect, dirty_rects)
+        self.assert_drawn(foe.get_rect(), dirty_rects)
+
+        level.invalidate(pygame.Rect(2, 2, 30, 10))
+        self.assert_drawn(pygame.Rect(2, 2, 30, 10), level.display())
+        self.assertEqual([], level.display())
+
+    def test_map_kept_on_the_window_after_a_full_frame(self):
+        screen = pygame.display.get_surface()
+        scene_manager = SceneManager(screen)
+        level = self.load_displayed_level(screen)
+        scene_manager.active_scene = level
+        map_pixel = (
+            level.active_screen_part.get_abs_offset()[0] + level.map["width"] // 2,
+            level.active_screen_part.get_abs_offset()[1] + level.map["height"] // 2,
+        )
+        clock = pygame.time.Clock()
+        fps_rect = None
+        for _ in range(4):
+            _, fps_rect = process_frame(scene_manager, screen, clock, fps_rect)
+            self.assertNotEqual((0, 0, 0), tuple(screen.get_at(map_pixel))[:3])
+        # The whole level is drawn again after the full frame, and then only the changes
+        self.assertEqual([], level.display())
+
+    def test_menus_are_drawn_entirely(self):
+        level = self.load_displayed_level()
+        level.display()
+        level.display()
+        level.menu_manager.open_menu(InfoBox("Test", [], width=300))
+        self.assertIsNone(level.display())
+        self.assertIsNone(level.display())
+        level.menu_manager.close_active_menu()
+        # The frame erasing the menu is drawn entirely too
+        self.assertIsNone(level.display())
+        self.assertEqual([], level.display())
+
+    def test_static_entities_are_drawn_into_the_map(self):
+        level = self.load_displayed_level()
+        self.assertTrue(level.entities.obstacles)
+        dynamic_entities = [
+            entity for collection in level.get_dynamic_collections() for entity in collection
+        ]
+        self.assertNotIn(level.entities.obstacles[0], dynamic_entities)
+        self.assertIn(level.entities.foes[0], dynamic_entities)
+        level.screen.fill((0, 0, 0))
+        level.draw()
+        composed_frame = pygame.image.tobytes(level.screen, "RGB")
+
+        # The level looks the same as when all the entities are drawn at each frame
+        level.map["img"] = tmx_loader.load_ground(
+            level.tmx_data, (level.map["width"], level.map["height"])
+        )
+        static_layer_collections = LevelScene.STATIC_LAYER_COLLECTIONS
+        LevelScene.STATIC_LAYER_COLLECTIONS = ()
+        try:
+            level.screen.fill((0, 0, 0))
+            level.draw()
+        finally:
+            LevelScene.STATIC_LAYER_COLLECTIONS = static_layer_collections
+        self.assertEqual(composed_frame, pygame.image.tobytes(level.screen, "RGB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
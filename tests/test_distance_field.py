@@ -0,0 +1,135 @@
+import random
+import unittest
+
+from src.constants import TILE_SIZE
+from src.services.distance_field import DistanceField
+from src.services.reachability import compute_reachability, NEIGHBOUR_OFFSETS
+from tests.random_data_library import random_player_entity
+from tests.tools import minimal_setup_for_game
+
+WIDTH = 12
+HEIGHT = 9
+UNREACHABLE = 10000
+
+
+class TestDistanceField(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        self.blocked_tiles = set()
+
+    def is_tile_available(self, tile):
+        return (
+            0 <= tile[0] < WIDTH * TILE_SIZE
+            and 0 <= tile[1] < HEIGHT * TILE_SIZE
+            and tile not in self.blocked_tiles
+        )
+
+    def random_free_tile(self):
+        while True:
+            tile = (
+                random.randrange(WIDTH) * TILE_SIZE,
+                random.randrange(HEIGHT) * TILE_SIZE,
+            )
+            if tile not in self.blocked_tiles:
+                return tile
+
+    def flood_fill_nearest_target(self, tile, targets):
+        # Reference implementation: a full flood fill from the tile
+        target_tiles = [tuple(target.position) for target in targets]
+        distances = {target: UNREACHABLE for target in targets}
+        reachability = compute_reachability(tile, WIDTH * HEIGHT, self.is_tile_available)
+        for reached_tile, distance in reachability.items():
+            for horizontal_offset, vertical_offset in NEIGHBOUR_OFFSETS:
+                neighbour = (
+                    reached_tile[0] + horizontal_offset,
+                    reached_tile[1] + vertical_offset,
+                )
+                for target, target_tile in zip(targets, target_tiles):
+                    if neighbour == target_tile and distance < distances[target]:
+                        distances[target] = distance
+        nearest = min(targets, key=lambda target: distances[target])
+        return nearest, distances[nearest]
+
+    def build_random_board(self, number_of_walls, number_of_targets):
+        for _ in range(number_of_walls):
+            self.blocked_tiles.add(self.random_free_tile())
+        targets = []
+        for _ in range(number_of_targets):
+            target = random_player_entity()
+            target.position = self.random_free_tile()
+            self.blocked_tiles.add(target.position)
+            targets.append(target)
+        return targets
+
+    def assert_field_matches_flood_fill(self, field, targets):
+        for _ in range(10):
+            # The entity looking for its nearest target is standing on the tile
+            tile = self.random_free_tile()
+            self.blocked_tiles.add(tile)
+            field.notify_change(object(), None, tile)
+            self.assertEqual(
+                self.flood_fill_nearest_target(tile, targets),
+                field.nearest_target(tile),
+            )
+            self.blocked_tiles.remove(tile)
+            field.notify_change(object(), tile, None)
+
+    def test_nearest_target_matches_flood_fill(self):
+        for _ in range(10):
+            self.blocked_tiles = set()
+            targets = self.build_random_board(30, 3)
+            field = DistanceField(targets, self.is_tile_available, UNREACHABLE)
+            self.assert_field_matches_flood_fill(field, targets)
+
+    def test_incremental_repair_matches_flood_fill(self):
+        random.seed(0)
+        for _ in range(5):
+            self.blocked_tiles = set()
+            targets = self.build_random_board(25, 3)
+            field = DistanceField(targets, self.is_tile_available, UNREACHABLE)
+            field.nearest_target(self.random_free_tile())
+            blockers = []
+            for _ in range(8):
+                blocker = self.random_free_tile()
+                self.blocked_tiles.add(blocker)
+                blockers.append(blocker)
+                field.notify_change(object(), None, blocker)
+            for _ in range(15):
+                moved_index = random.randrange(len(blockers))
+                previous_tile = blockers[moved_index]
+                new_tile = self.random_free_tile()
+                self.blocked_tiles.remove(previous_tile)
+                self.blocked_tiles.add(new_tile)
+                blockers[moved_index] = new_tile
+                field.notify_change(object(), previous_tile, new_tile)
+                self.assert_field_matches_flood_fill(field, targets)
+
+    def test_target_change_triggers_full_computation(self):
+        self.blocked_tiles = set()
+        target = random_player_entity()
+        target.position = (0, 0)
+        self.blocked_tiles.add((0, 0))
+        field = DistanceField([target], self.is_tile_available, UNREACHABLE)
+        self.assertEqual((target, 2), field.nearest_target((2 * TILE_SIZE, TILE_SIZE)))
+
+        self.blocked_tiles.remove((0, 0))
+        target.position = (3 * TILE_SIZE, TILE_SIZE)
+        self.blocked_tiles.add(target.position)
+        field.notify_change(target, (0, 0), target.position)
+        self.assertEqual((target, 0), field.nearest_target((2 * TILE_SIZE, TILE_SIZE)))
+
+    def test_unreachable_targets(self):
+        self.blocked_tiles = {(TILE_SIZE, 0), (0, TILE_SIZE), (TILE_SIZE, TILE_SIZE)}
+        target = random_player_entity()
+        target.position = (0, 0)
+        field = DistanceField([target], self.is_tile_available, UNREACHABLE)
+        self.assertEqual(
+            (target, UNREACHABLE), field.nearest_target((5 * TILE_SIZE, 5 * TILE_SIZE))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
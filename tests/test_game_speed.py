@@ -0,0 +1,149 @@
+import unittest
+
+import pygame
+from lxml import etree
+
+from src.constants import MAIN_WIN_HEIGHT, MAIN_WIN_WIDTH
+from src.game_entities.movable import EntityState
+from src.scenes.level_scene import EntityTurn, LevelScene, LevelStatus
+from src.scenes.start_scene import StartScene
+from src.services.game_speed import (
+    are_group_moves_enabled,
+    get_animation_delay,
+    is_fast_forward,
+    set_fast_forward,
+    set_group_moves_enabled,
+    toggle_fast_forward,
+)
+from src.services.random_manager import RandomStreams
+from src.services.sound_manager import set_sounds_enabled
+from src.services.tile_occupancy import TileOccupancyIndex
+from tests.tools import minimal_setup_for_game
+
+SAVE_PATH = "tests/test_saves/complete_first_level_save.xml"
+
+
+class TestGameSpeed(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    def tearDown(self):
+        set_fast_forward(False)
+        set_group_moves_enabled(False)
+        TileOccupancyIndex.consistency_checks_enabled = False
+
+    @staticmethod
+    def load_displayed_level():
+        with open(SAVE_PATH, "r", encoding="utf-8") as save:
+            tree_root = etree.parse(save).getroot()
+        level = LevelScene(
+            pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT)),
+            "maps/level_0/",
+            0,
+            LevelStatus[tree_root.find("level/phase").text.strip()],
+            int(tree_root.find("level/turn").text.strip()),
+            tree_root.find("level/entities"),
+            random_streams=RandomStreams(6),
+        )
+        level.load_level_content()
+        return level
+
+    @staticmethod
+    def play_ai_sides(level, on_frame=None):
+        # Return the number of frames spent on walks and banners before the players can act again,
+        # the frames spent waiting for the planning of the moves are not counted
+        level.end_turn()
+        frames = 0
+        while level.side_turn is not EntityTurn.PLAYER or level.animation:
+            level.menu_manager.clear_menus()
+            if level.animation or any(
+                unit.state is EntityState.ON_MOVE
+                for unit in level.entities.allies + level.entities.foes
+            ):
+                frames += 1
+            level.update_state()
+            if on_frame is not None:
+                on_frame(level)
+        return frames
+
+    @staticmethod
+    def get_positions(level):
+        return [
+            (entity.name, tuple(entity.position), entity.hit_points)
+            for entity in level.players + level.entities.allies + level.entities.foes
+        ]
+
+    def test_toggle(self):
+        self.assertFalse(is_fast_forward())
+        self.assertEqual(60, get_animation_delay(60))
+        self.assertTrue(toggle_fast_forward())
+        self.assertLess(get_animation_delay(60), 60)
+        self.assertEqual(1, get_animation_delay(1))
+        self.assertFalse(toggle_fast_forward())
+
+    def test_fast_forward_plays_the_same_turn_faster(self):
+        level = self.load_displayed_level()
+        normal_frames = self.play_ai_sides(level)
+        normal_positions = self.get_positions(level)
+
+        set_fast_forward(True)
+        level = self.load_displayed_level()
+        fast_frames = self.play_ai_sides(level)
+        self.assertEqual(normal_positions, self.get_positions(level))
+        self.assertLess(fast_frames * 4, normal_frames)
+
+    def test_switch_during_a_walk(self):
+        def switch_on_walk(level):
+            if not is_fast_forward() and any(
+                foe.state is EntityState.ON_MOVE for foe in level.entities.foes
+            ):
+                set_fast_forward(True)
+
+        level = self.load_displayed_level()
+        self.play_ai_sides(level, switch_on_walk)
+        self.assertTrue(is_fast_forward())
+        self.assertTrue(
+            all(not foe.on_move for foe in level.entities.foes + level.entities.allies)
+        )
+
+    def test_playback_modes_disabled_by_default(self):
+        set_fast_forward(True)
+        set_group_moves_enabled(True)
+        StartScene.load_options()
+        self.assertFalse(is_fast_forward())
+        self.assertFalse(are_group_moves_enabled())
+
+    def test_group_moves(self):
+        walkers = []
+
+        def count_walkers(level):
+            walkers.append(
+                sum(
+                    unit.state is EntityState.ON_MOVE
+                    for unit in level.entities.allies + level.entities.foes
+                )
+            )
+
+        level = self.load_displayed_level()
+        sequential_frames = self.play_ai_sides(level)
+        sequential_kinds = sorted(entry.kind.name for entry in level.action_log.entries)
+
+        set_group_moves_enabled(True)
+        TileOccupancyIndex.consistency_checks_enabled = True
+        level = self.load_displayed_level()
+        group_frames = self.play_ai_sides(level, count_walkers)
+        self.assertGreater(max(walkers), 1)
+        self.assertLess(group_frames, sequential_frames)
+        # Every unit moved and ended its turn, only the order of the actions changed
+        self.assertEqual(
+            sequential_kinds, sorted(entry.kind.name for entry in level.action_log.entries)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
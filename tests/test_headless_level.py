@@ -0,0 +1,92 @@
+import unittest
+
+import pygame
+from lxml import etree
+
+from src.constants import MAIN_WIN_HEIGHT, MAIN_WIN_WIDTH
+from src.scenes.level_scene import EntityTurn, LevelScene, LevelStatus
+from src.services.random_manager import RandomStreams
+from src.services.simulation import (
+    is_level_over,
+    load_headless_level_from_save,
+    play_ai_turns,
+)
+from src.services.sound_manager import set_sounds_enabled
+from tests.tools import minimal_setup_for_game
+
+SAVE_PATH = "tests/test_saves/complete_first_level_save.xml"
+NB_TURNS = 5
+
+
+class TestHeadlessLevel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    @staticmethod
+    def load_displayed_level(random_streams):
+        with open(SAVE_PATH, "r", encoding="utf-8") as save:
+            tree_root = etree.parse(save).getroot()
+        level = LevelScene(
+            pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT)),
+            "maps/level_0/",
+            0,
+            LevelStatus[tree_root.find("level/phase").text.strip()],
+            int(tree_root.find("level/turn").text.strip()),
+            tree_root.find("level/entities"),
+            random_streams=random_streams,
+        )
+        level.load_level_content()
+        return level
+
+    @staticmethod
+    def play_displayed_ai_turns(level):
+        while level.side_turn is not EntityTurn.PLAYER:
+            # Skip animations and menus, only the outcome of the turn matters
+            level.animation = None
+            level.menu_manager.clear_menus()
+            if level.update_state():
+                break
+
+    @staticmethod
+    def get_state(level):
+        return [
+            (entity.name, tuple(entity.position), entity.hit_points)
+            for entity in level.players + level.entities.allies + level.entities.foes
+        ]
+
+    def test_load_without_display(self):
+        level = load_headless_level_from_save(SAVE_PATH)
+        self.assertTrue(level.headless)
+        self.assertIsNone(level.map["img"])
+        self.assertIsNone(level.sidebar)
+        self.assertIsNone(level.menu_manager.active_menu)
+        self.assertTrue(level.players)
+        self.assertTrue(level.entities.foes)
+
+    def test_turns_match_displayed_level(self):
+        displayed_level = self.load_displayed_level(RandomStreams(0))
+        expected_states = []
+        for _ in range(NB_TURNS):
+            displayed_level.end_turn()
+            self.play_displayed_ai_turns(displayed_level)
+            expected_states.append(self.get_state(displayed_level))
+
+        level = load_headless_level_from_save(SAVE_PATH, RandomStreams(0))
+        for expected_state in expected_states:
+            level.end_turn()
+            over = play_ai_turns(level)
+            self.assertIsNone(level.animation)
+            self.assertEqual(expected_state, self.get_state(level))
+            if over:
+                self.assertTrue(is_level_over(level))
+                break
+            self.assertIs(EntityTurn.PLAYER, level.side_turn)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import random
+import unittest
+
+import numpy as np
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.movable import EntityStrategy
+from src.game_entities.obstacle import Obstacle
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.influence_map import NO_TARGET, InfluenceMap
+from src.services.tile_occupancy import TileOccupancyIndex
+from src.services.walkability_grid import WalkabilityGrid
+from tests.random_data_library import random_foe_entity, random_player_entity
+from tests.tools import minimal_setup_for_game
+
+COLUMNS = 20
+ROWS = 15
+OBSTACLE_SPRITE = "imgs/dungeon_crawl/dungeon/wall/stone_brick_1.png"
+
+
+class TestInfluenceMap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        random.seed(0)
+        self.entities = LevelEntityCollections()
+        self.entities.obstacles = [
+            Obstacle(
+                (random.randrange(COLUMNS) * TILE_SIZE, random.randrange(ROWS) * TILE_SIZE),
+                OBSTACLE_SPRITE,
+            )
+            for _ in range(40)
+        ]
+        self.tile_occupancy = TileOccupancyIndex(self.entities)
+        self.grid = WalkabilityGrid((0, 0), COLUMNS, ROWS, self.tile_occupancy)
+        self.tile_occupancy.listeners.append(self.grid.notify_change)
+        self.foes = [self.place(random_foe_entity(), self.entities.foes) for _ in range(8)]
+        self.players = [
+            self.place(random_player_entity(), self.entities.players) for _ in range(5)
+        ]
+        self.influence_map = InfluenceMap(self.grid, self.foes, self.players)
+        self.tile_occupancy.listeners.append(self.influence_map.notify_change)
+
+    def place(self, entity, collection):
+        while True:
+            position = (random.randrange(COLUMNS) * TILE_SIZE, random.randrange(ROWS) * TILE_SIZE)
+            if self.grid.is_tile_available(position):
+                entity.position = pygame.Vector2(position)
+                if collection is self.entities.foes:
+                    entity.reach = random.choice([[1], [1, 2], [2, 3]])
+                collection.append(entity)
+                self.tile_occupancy.add(entity)
+                return entity
+
+    def brute_force_layer(self, entities, weight):
+        layer = np.zeros((ROWS, COLUMNS), dtype=np.int32)
+        for entity in entities:
+            moves = self.grid.compute_reachability(entity.position, entity.max_moves)
+            for row in range(ROWS):
+                for column in range(COLUMNS):
+                    tile = self.grid.get_tile(row, column)
+                    if any(
+                        abs(tile[0] - move[0]) + abs(tile[1] - move[1]) == distance * TILE_SIZE
+                        for move in moves
+                        for distance in entity.reach
+                    ):
+                        layer[row, column] += weight(entity)
+        return layer
+
+    def test_layers_match_brute_force(self):
+        np.testing.assert_array_equal(
+            self.brute_force_layer(self.players, lambda player: player.strength),
+            self.influence_map.threat,
+        )
+        np.testing.assert_array_equal(
+            self.brute_force_layer(self.foes, lambda foe: 1), self.influence_map.support
+        )
+        for player in self.players:
+            for horizontal_offset, vertical_offset in ((TILE_SIZE, 0), (0, TILE_SIZE)):
+                tile = (
+                    player.position[0] + horizontal_offset,
+                    player.position[1] + vertical_offset,
+                )
+                if self.grid.is_tile_available(tile):
+                    self.assertEqual(0, self.influence_map.proximity[self.grid.get_index(tile)])
+
+    def test_decisions_match_target_scanning(self):
+        for foe in self.foes:
+            foe.strategy = EntityStrategy.SEMI_ACTIVE
+            possible_moves = self.grid.compute_reachability(foe.position, foe.max_moves)
+            expected_move = foe.determine_move(possible_moves, self.players)
+            expected_target = foe.target
+            self.assertEqual(
+                expected_move,
+                foe.determine_move(possible_moves, self.players, influence_map=self.influence_map),
+            )
+            self.assertIs(expected_target, foe.target)
+            self.assertEqual(
+                foe.determine_attack(self.players),
+                foe.determine_attack(self.players, self.influence_map),
+            )
+
+    def test_incremental_updates(self):
+        copied_map = self.influence_map.copy()
+        target_indexes = self.influence_map.target_indexes.copy()
+        dead_player = self.players.pop(2)
+        self.entities.players.remove(dead_player)
+        self.tile_occupancy.remove(dead_player)
+        self.assertTrue(self.influence_map.covers(self.players))
+        self.assertFalse(self.influence_map.covers(self.players + [dead_player]))
+        # A copy does not follow the changes of the level
+        self.assertTrue(copied_map.covers(self.players[:2] + [dead_player] + self.players[2:]))
+        np.testing.assert_array_equal(target_indexes, copied_map.target_indexes)
+        rebuilt_map = InfluenceMap(self.grid, self.foes, self.players)
+        np.testing.assert_array_equal(rebuilt_map.threat, self.influence_map.threat)
+        np.testing.assert_array_equal(rebuilt_map.proximity, self.influence_map.proximity)
+        # Remaining targets keep their original index
+        np.testing.assert_array_equal(
+            rebuilt_map.target_indexes != NO_TARGET, self.influence_map.target_indexes != NO_TARGET
+        )
+        for player in self.players:
+            index = self.influence_map.target_indexes[self.grid.get_index(player.position)]
+            self.assertIs(player, self.influence_map.targets[index])
+
+        foe = self.foes[0]
+        possible_moves = self.grid.compute_reachability(foe.position, foe.max_moves)
+        foe.position = pygame.Vector2(list(possible_moves)[-1])
+        self.influence_map.update_unit(foe)
+        rebuilt_map = InfluenceMap(self.grid, self.foes, self.players)
+        for layer in ("threat", "support", "proximity"):
+            np.testing.assert_array_equal(
+                getattr(rebuilt_map, layer), getattr(self.influence_map, layer)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
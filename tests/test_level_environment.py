@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from src.services.battle_simulator import BattleSettings
+from src.services.level_environment import (
+    OBSERVATION_CHANNELS,
+    LevelEnvironment,
+    VectorLevelEnvironment,
+)
+from src.services.sound_manager import set_sounds_enabled
+from tests.tools import minimal_setup_for_game
+
+LEVEL_DIRECTORY = "maps/level_1/"
+PLAYERS = ["raimund", "braern", "thokdrum", "doran"]
+NB_STEPS = 40
+
+
+class TestLevelEnvironment(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+        cls.settings = BattleSettings(LEVEL_DIRECTORY, PLAYERS, max_turns=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    @staticmethod
+    def play_randomly(environment, seed):
+        random_generator = np.random.default_rng(seed)
+        rewards = []
+        terminated = truncated = False
+        while not terminated and not truncated:
+            legal_actions = np.flatnonzero(environment.action_mask())
+            _, reward, terminated, truncated, _ = environment.step(
+                random_generator.choice(legal_actions)
+            )
+            rewards.append(reward)
+        return rewards
+
+    def test_steps_follow_the_rules(self):
+        environment = LevelEnvironment(self.settings)
+        observation = environment.reset(3)
+        grid = environment.level.walkability_grid
+        self.assertEqual((len(OBSERVATION_CHANNELS), grid.rows, grid.columns), observation.shape)
+        self.assertEqual(grid.rows * grid.columns + 1, environment.nb_actions)
+        self.assertEqual(len(environment.level.players), np.count_nonzero(observation[1]))
+        self.assertEqual(len(environment.level.entities.foes), np.count_nonzero(observation[3]))
+
+        # An illegal move is played as staying in place
+        player = environment.acting_player
+        position = tuple(player.position)
+        mask = environment.action_mask()
+        self.assertTrue(mask[environment.end_action])
+        illegal_action = int(np.flatnonzero(~mask)[0])
+        environment.step(illegal_action)
+        self.assertEqual(position, tuple(player.position))
+        self.assertTrue(player.turn_is_finished() or environment.is_attacking)
+
+        # The same seed gives the same battle
+        rewards = self.play_randomly(environment, 0)
+        environment.reset(3)
+        environment.step(illegal_action)
+        self.assertEqual(rewards, self.play_randomly(environment, 0))
+
+    def test_workers_give_the_same_results(self):
+        results = []
+        for processes in (0, 2):
+            environments = VectorLevelEnvironment(self.settings, 3, processes=processes)
+            random_generator = np.random.default_rng(0)
+            try:
+                steps = [environments.reset()]
+                for _ in range(NB_STEPS):
+                    actions = [
+                        random_generator.choice(np.flatnonzero(mask))
+                        for mask in environments.action_masks()
+                    ]
+                    steps.append(environments.step(actions)[:4])
+                results.append(steps)
+            finally:
+                environments.close()
+        for in_process_step, worker_step in zip(*results):
+            for in_process_array, worker_array in zip(in_process_step, worker_step):
+                np.testing.assert_array_equal(in_process_array, worker_array)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import time
+import unittest
+
+import numpy as np
+
+from src.constants import TILE_SIZE
+from src.game_entities.movable import EntityStrategy
+from src.scenes.level_scene import EntityTurn
+from src.services.random_manager import RandomStreams
+from src.services.simulation import (
+    load_headless_level_from_save,
+    play_ai_turns,
+    play_players_turn,
+)
+from src.services.sound_manager import set_sounds_enabled
+from src.services.tile_occupancy import TileOccupancyIndex
+from tests.tools import minimal_setup_for_game
+
+SAVE_PATH = "tests/test_saves/complete_first_level_save.xml"
+NB_TURNS = 4
+
+
+class TestLevelSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    def setUp(self):
+        self.level = load_headless_level_from_save(SAVE_PATH, RandomStreams(4))
+        for player in self.level.players:
+            player.strategy = EntityStrategy.ACTIVE
+
+    def play_turns(self):
+        for _ in range(NB_TURNS):
+            play_players_turn(self.level)
+            if play_ai_turns(self.level):
+                break
+
+    def get_state(self):
+        return (
+            [
+                [
+                    (
+                        entity.name,
+                        tuple(entity.position),
+                        getattr(entity, "hit_points", None),
+                        getattr(entity, "gold", None),
+                        [str(item) for item in getattr(entity, "items", [])],
+                        [
+                            (alteration.name, alteration.time)
+                            for alteration in getattr(entity, "alterations", [])
+                        ],
+                    )
+                    for entity in collection
+                ]
+                for collection in self.level.entities.values()
+            ],
+            [player.name for player in self.level.escaped_players],
+            [mission.ended for mission in self.level.missions],
+            self.level.turn,
+            self.level.side_turn,
+            self.level.game_phase,
+            list(self.level.diary_entries),
+            self.level.random_streams.checkpoint(),
+        )
+
+    def assert_occupancy_consistent(self):
+        self.level.tile_occupancy.check_consistency()
+        walkable = self.level.walkability_grid.walkable.copy()
+        self.level.walkability_grid.rebuild()
+        self.assertTrue(np.array_equal(walkable, self.level.walkability_grid.walkable))
+
+    def test_restore_gives_back_the_same_game(self):
+        initial_state = self.get_state()
+        snapshot = self.level.take_snapshot()
+
+        self.play_turns()
+        final_state = self.get_state()
+        final_log = list(self.level.action_log.entries)
+        self.assertNotEqual(initial_state, final_state)
+        # Some foes have been killed
+        self.assertLess(len(self.level.entities.foes), 7)
+
+        self.level.restore_snapshot(snapshot)
+        self.assertEqual(initial_state, self.get_state())
+        self.assertEqual([], self.level.action_log.entries)
+        self.assert_occupancy_consistent()
+
+        # The game goes on exactly the same way, as many times as needed
+        for _ in range(2):
+            self.play_turns()
+            self.assertEqual(final_state, self.get_state())
+            self.assertEqual(final_log, self.level.action_log.entries)
+            self.level.restore_snapshot(snapshot)
+
+    def test_restore_in_the_middle_of_a_turn(self):
+        TileOccupancyIndex.consistency_checks_enabled = True
+        try:
+            play_players_turn(self.level)
+            self.assertIs(EntityTurn.ALLIES, self.level.side_turn)
+            state = self.get_state()
+            snapshot = self.level.take_snapshot()
+
+            play_ai_turns(self.level)
+            self.level.restore_snapshot(snapshot)
+            self.assertEqual(state, self.get_state())
+            self.assertIsNotNone(self.level.influence_map)
+            self.assert_occupancy_consistent()
+        finally:
+            TileOccupancyIndex.consistency_checks_enabled = False
+
+    def test_snapshots_are_cheap(self):
+        snapshot = self.level.take_snapshot()
+        play_players_turn(self.level)
+        start = time.perf_counter()
+        for _ in range(300):
+            branch = self.level.take_snapshot()
+            self.level.restore_snapshot(snapshot, prepare_ai=False)
+            self.level.restore_snapshot(branch, prepare_ai=False)
+        # Hundreds of branches should be explored in a fraction of a second
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_undo_last_move(self):
+        raimund, braern, _ = self.level.players
+        state = self.get_state()
+        self.assertFalse(self.level.undo_last_move())
+
+        # Move a player, then let it give gold to another one
+        self.level.selected_player = raimund
+        raimund.selected = True
+        self.level.save_undo_point()
+        destination = (raimund.position[0] - TILE_SIZE, raimund.position[1])
+        raimund.set_move([destination])
+        raimund.finish_move()
+        self.level.send_gold(raimund, braern, True, 10)
+        self.assertEqual(destination, tuple(raimund.position))
+
+        self.assertTrue(self.level.undo_last_move())
+        self.assertEqual(state, self.get_state())
+        self.assertEqual([], self.level.action_log.entries)
+        self.assertIsNone(self.level.selected_player)
+        self.assertFalse(raimund.selected)
+        self.assertFalse(self.level.undo_last_move())
+
+        # Moves cannot be undone once the turn has been given to the next side
+        self.level.save_undo_point()
+        self.level.end_turn()
+        self.assertFalse(self.level.undo_last_move())
+
+
+if __name__ == "__main__":
+    unittest.main()
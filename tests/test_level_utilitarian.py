@@ -10,6 +10,7 @@ from src.constants import MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT, TILE_SIZE
 from src.scenes.start_scene import StartScene
 from src.services import menu_creator_manager
 from src.services.load_from_xml_manager import parse_item_file
+from src.services.tile_occupancy import TileOccupancyIndex
 from tests.tools import minimal_setup_for_game
 from src.scenes.InputHandler import *
 
@@ -18,6 +19,11 @@ class TestLevel(unittest.TestCase):
     def setUpClass(cls):
         minimal_setup_for_game()
         cls.save_path = "saves/save_0.xml"
+        TileOccupancyIndex.consistency_checks_enabled = True
+
+    @classmethod
+    def tearDownClass(cls):
+        TileOccupancyIndex.consistency_checks_enabled = False
 
     def setUp(self):
         # Window parameters
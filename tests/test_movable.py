@@ -1,6 +1,10 @@
 import unittest
 
 import random as rd
+
+import pygame
+
+from src.constants import TILE_SIZE
 from src.game_entities.movable import Movable, DamageKind, EntityStrategy
 from tests.random_data_library import (
     random_movable_entity,
@@ -77,6 +81,28 @@ class TestMovable(unittest.TestCase):
 
         self.assertTrue(movable_entity.is_on_position(new_pos))
 
+    def test_tactical_move_without_planner(self):
+        movable_entity = random_movable_entity()
+        movable_entity.position = pygame.Vector2(0, 0)
+        movable_entity.reach = [1]
+        near_target = random_movable_entity()
+        near_target.position = pygame.Vector2(4 * TILE_SIZE, 0)
+        far_target = random_movable_entity()
+        far_target.position = pygame.Vector2(0, 8 * TILE_SIZE)
+        possible_moves = {(distance * TILE_SIZE, 0): distance for distance in range(3)}
+        possible_moves.update({(0, distance * TILE_SIZE): distance for distance in range(1, 3)})
+
+        movable_entity.strategy = EntityStrategy.ACTIVE
+        expected_move = movable_entity.determine_move(
+            possible_moves, [far_target, near_target], near_target
+        )
+        movable_entity.strategy = EntityStrategy.TACTICAL
+        move = movable_entity.determine_move(possible_moves, [far_target, near_target])
+
+        self.assertEqual((2 * TILE_SIZE, 0), move)
+        self.assertEqual(expected_move, move)
+        self.assertIs(near_target, movable_entity.target)
+
     def test_new_alteration(self):
         movable_entity = random_movable_entity()
         alteration = random_alteration(name="alt_test")
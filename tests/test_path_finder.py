@@ -0,0 +1,70 @@
+import unittest
+
+from src.constants import TILE_SIZE
+from src.services.path_finder import find_path
+from src.services.reachability import compute_reachability
+from tests.test_reachability import tiles_predicate
+
+
+def tile(x, y):
+    return x * TILE_SIZE, y * TILE_SIZE
+
+
+class TestPathFinder(unittest.TestCase):
+    def assert_valid_path(self, start, path, is_tile_available):
+        previous_tile = start
+        for step in path:
+            self.assertEqual(
+                TILE_SIZE,
+                abs(step[0] - previous_tile[0]) + abs(step[1] - previous_tile[1]),
+            )
+            self.assertTrue(is_tile_available(step))
+            previous_tile = step
+
+    def test_straight_path_in_open_field(self):
+        is_tile_available = tiles_predicate(10, 3, [(9, 1)])
+        path = find_path(tile(0, 1), tile(9, 1), [1], is_tile_available)
+        self.assertEqual([tile(x, 1) for x in range(1, 9)], path)
+
+    def test_path_goes_around_wall(self):
+        # Wall between the start and the target with a single opening at the bottom
+        walls = [(3, 0), (3, 1), (3, 2), (3, 3), (6, 1)]
+        is_tile_available = tiles_predicate(8, 5, walls)
+        start, target = tile(1, 1), tile(6, 1)
+        path = find_path(start, target, [1], is_tile_available)
+
+        reachability = compute_reachability(start, 40, is_tile_available)
+        shortest_distance = min(
+            reachability[neighbour]
+            for neighbour in (tile(5, 1), tile(7, 1), tile(6, 0), tile(6, 2))
+        )
+        self.assertEqual(shortest_distance, len(path))
+        self.assert_valid_path(start, path, is_tile_available)
+        self.assertIn(tile(3, 4), path)
+
+    def test_path_stops_at_reach(self):
+        is_tile_available = tiles_predicate(10, 1, [(9, 0)])
+        path = find_path(tile(0, 0), tile(9, 0), [2, 3], is_tile_available)
+        self.assertEqual(tile(6, 0), path[-1])
+
+        # Already in position to attack
+        self.assertEqual([], find_path(tile(7, 0), tile(9, 0), [2], is_tile_available))
+
+    def test_unreachable_target(self):
+        is_tile_available = tiles_predicate(6, 6, [(2, 0), (2, 1), (2, 2), (1, 2), (0, 2), (5, 5)])
+        self.assertIsNone(find_path(tile(0, 0), tile(5, 5), [1], is_tile_available))
+
+    def test_availability_checked_once_per_tile(self):
+        checked_tiles = []
+        is_tile_available = tiles_predicate(12, 12, [(5, y) for y in range(11)] + [(11, 11)])
+
+        def counting_predicate(checked_tile):
+            checked_tiles.append(checked_tile)
+            return is_tile_available(checked_tile)
+
+        self.assertIsNotNone(find_path(tile(0, 0), tile(11, 11), [1], counting_predicate))
+        self.assertEqual(len(checked_tiles), len(set(checked_tiles)))
+
+
+if __name__ == "__main__":
+    unittest.main()
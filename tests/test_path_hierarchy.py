@@ -0,0 +1,159 @@
+import random
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.obstacle import Obstacle
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.path_finder import find_path
+from src.services.path_hierarchy import PathHierarchy
+from src.services.tile_occupancy import TileOccupancyIndex
+from src.services.walkability_grid import WalkabilityGrid
+from tests.random_data_library import random_foe_entity, random_player_entity
+from tests.tools import minimal_setup_for_game
+
+COLUMNS = 60
+ROWS = 45
+CLUSTER_SIZE = 8
+OBSTACLE_SPRITE = "imgs/dungeon_crawl/dungeon/wall/stone_brick_1.png"
+
+
+def tile(x, y):
+    return x * TILE_SIZE, y * TILE_SIZE
+
+
+class TestPathHierarchy(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        random.seed(0)
+        self.entities = LevelEntityCollections()
+        self.tile_occupancy = TileOccupancyIndex(self.entities)
+        self.grid = WalkabilityGrid((0, 0), COLUMNS, ROWS, self.tile_occupancy)
+        self.tile_occupancy.listeners.append(self.grid.notify_change)
+
+    def build_hierarchy(self):
+        self.tile_occupancy.rebuild()
+        hierarchy = PathHierarchy(self.grid, CLUSTER_SIZE)
+        self.tile_occupancy.listeners.append(hierarchy.notify_change)
+        return hierarchy
+
+    def place_unit(self, unit, collection):
+        while True:
+            position = tile(random.randrange(COLUMNS), random.randrange(ROWS))
+            if self.grid.is_tile_available(position):
+                unit.position = pygame.Vector2(position)
+                collection.append(unit)
+                self.tile_occupancy.add(unit)
+                return
+
+    def assert_valid_route(self, start, target, reach, route):
+        previous_tile = tuple(start)
+        for step in route:
+            self.assertEqual(
+                TILE_SIZE,
+                abs(step[0] - previous_tile[0]) + abs(step[1] - previous_tile[1]),
+            )
+            self.assertTrue(self.grid.is_tile_available(step))
+            previous_tile = step
+        self.assertIn(
+            (abs(previous_tile[0] - target[0]) + abs(previous_tile[1] - target[1]))
+            // TILE_SIZE,
+            reach,
+        )
+
+    def test_routes_on_random_map(self):
+        self.entities.obstacles = [
+            Obstacle(position, OBSTACLE_SPRITE)
+            for position in {
+                tile(random.randrange(COLUMNS), random.randrange(ROWS)) for _ in range(700)
+            }
+        ]
+        hierarchy = self.build_hierarchy()
+        for _ in range(20):
+            foe = random_foe_entity()
+            player = random_player_entity()
+            self.place_unit(foe, self.entities.foes)
+            self.place_unit(player, self.entities.players)
+            reach = random.choice([[1], [1, 2]])
+            expected_route = find_path(
+                foe.position, player.position, reach, self.grid.is_tile_available
+            )
+            route = hierarchy.find_route(
+                foe.position, player.position, reach, self.grid.is_tile_available
+            )
+            if expected_route is None:
+                self.assertIsNone(route)
+                continue
+            self.assert_valid_route(foe.position, player.position, reach, route)
+            self.assertGreaterEqual(len(route), len(expected_route))
+
+            partial_route = hierarchy.find_route(
+                foe.position, player.position, reach, self.grid.is_tile_available, 5
+            )
+            self.assertGreaterEqual(len(partial_route), min(5, len(route)))
+            previous_tile = tuple(foe.position)
+            for step in partial_route:
+                self.assertEqual(
+                    TILE_SIZE,
+                    abs(step[0] - previous_tile[0]) + abs(step[1] - previous_tile[1]),
+                )
+                previous_tile = step
+
+    def test_opened_door_updates_clusters(self):
+        # Vertical wall splitting the map, with a door in the middle
+        door_position = tile(30, 20)
+        door = Obstacle(door_position, OBSTACLE_SPRITE)
+        self.entities.obstacles = [
+            Obstacle(tile(30, y), OBSTACLE_SPRITE) for y in range(ROWS) if y != 20
+        ] + [door]
+        hierarchy = self.build_hierarchy()
+        foe = random_foe_entity()
+        foe.position = pygame.Vector2(tile(2, 3))
+        player = random_player_entity()
+        player.position = pygame.Vector2(tile(55, 40))
+        self.entities.foes = [foe]
+        self.entities.players = [player]
+        self.tile_occupancy.add(foe)
+        self.tile_occupancy.add(player)
+        self.assertIsNone(
+            hierarchy.find_route(foe.position, player.position, [1], self.grid.is_tile_available)
+        )
+
+        copied_hierarchy = hierarchy.copy()
+        cluster_edges = dict(hierarchy.cluster_edges)
+        self.entities.obstacles.remove(door)
+        self.tile_occupancy.remove(door)
+        # A copy does not follow the changes of the level
+        self.assertFalse(copied_hierarchy.walkable[self.grid.get_index(door_position)])
+        self.assertEqual(cluster_edges, copied_hierarchy.cluster_edges)
+        self.assertNotEqual(cluster_edges, hierarchy.cluster_edges)
+        route = hierarchy.find_route(
+            foe.position, player.position, [1], self.grid.is_tile_available
+        )
+        self.assert_valid_route(foe.position, player.position, [1], route)
+        self.assertIn(door_position, route)
+
+        # The incremental update gives the same hierarchy as a full computation
+        rebuilt_hierarchy = PathHierarchy(self.grid, CLUSTER_SIZE)
+        self.assertEqual(rebuilt_hierarchy.entrances, hierarchy.entrances)
+        self.assertEqual(rebuilt_hierarchy.cluster_edges, hierarchy.cluster_edges)
+        self.assertEqual(
+            {cell: others for cell, others in rebuilt_hierarchy.transitions.items() if others},
+            {cell: others for cell, others in hierarchy.transitions.items() if others},
+        )
+
+    def test_units_do_not_change_hierarchy(self):
+        hierarchy = self.build_hierarchy()
+        entrances = dict(hierarchy.entrances)
+        foe = random_foe_entity()
+        self.place_unit(foe, self.entities.foes)
+        foe.position = pygame.Vector2(tile(CLUSTER_SIZE, CLUSTER_SIZE))
+        self.assertEqual(entrances, hierarchy.entrances)
+
+
+if __name__ == "__main__":
+    unittest.main()
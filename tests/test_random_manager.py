@@ -0,0 +1,73 @@
+import unittest
+
+from src.services.random_manager import (
+    RandomStreams,
+    RandomSubsystem,
+    get_active_streams,
+    get_random_generator,
+    set_active_streams,
+)
+
+
+def draw(streams, subsystem, count=10):
+    generator = streams.get(subsystem)
+    return [generator.randint(0, 1000) for _ in range(count)]
+
+
+class TestRandomManager(unittest.TestCase):
+    def test_same_seed_gives_same_draws(self):
+        for subsystem in RandomSubsystem:
+            self.assertEqual(
+                draw(RandomStreams(42), subsystem), draw(RandomStreams(42), subsystem)
+            )
+        self.assertNotEqual(
+            draw(RandomStreams(42), RandomSubsystem.COMBAT),
+            draw(RandomStreams(43), RandomSubsystem.COMBAT),
+        )
+
+    def test_subsystems_are_independent(self):
+        streams = RandomStreams(7)
+        expected_loot = draw(RandomStreams(7), RandomSubsystem.LOOT)
+
+        # Drawing for combat should not shift the draws of loot
+        draw(streams, RandomSubsystem.COMBAT, 50)
+        self.assertEqual(expected_loot, draw(streams, RandomSubsystem.LOOT))
+        self.assertNotEqual(
+            draw(RandomStreams(7), RandomSubsystem.COMBAT),
+            draw(RandomStreams(7), RandomSubsystem.LOOT),
+        )
+
+    def test_save_and_load_continue_the_same_way(self):
+        streams = RandomStreams(5)
+        draw(streams, RandomSubsystem.COMBAT)
+        draw(streams, RandomSubsystem.GROWTH)
+
+        loaded_streams = RandomStreams.load(streams.save("random"))
+
+        self.assertEqual(streams.seed, loaded_streams.seed)
+        for subsystem in RandomSubsystem:
+            self.assertEqual(draw(streams, subsystem), draw(loaded_streams, subsystem))
+
+    def test_spawned_streams(self):
+        streams = RandomStreams(3)
+        self.assertEqual(streams.spawn(1).seed, RandomStreams(3).spawn(1).seed)
+        self.assertNotEqual(
+            draw(streams.spawn(1), RandomSubsystem.COMBAT),
+            draw(streams.spawn(2), RandomSubsystem.COMBAT),
+        )
+
+    def test_active_streams(self):
+        previous_streams = get_active_streams()
+        streams = RandomStreams(11)
+        set_active_streams(streams)
+        try:
+            self.assertIs(
+                streams.get(RandomSubsystem.CHESTS),
+                get_random_generator(RandomSubsystem.CHESTS),
+            )
+        finally:
+            set_active_streams(previous_streams)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+import pygame
+
+from src.constants import TILE_SIZE
+from src.gui.constant_sprites import (
+    ATTACKABLE_OPACITY,
+    INTERACTION_OPACITY,
+    LANDING_OPACITY,
+    constant_sprites,
+)
+from src.gui.range_overlay import RangeOverlay
+from src.gui.tools import blit_alpha
+from tests.tools import minimal_setup_for_game
+
+SCREEN_SIZE = (10 * TILE_SIZE, 6 * TILE_SIZE)
+
+
+class TestRangeOverlay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @staticmethod
+    def get_background():
+        background = pygame.Surface(SCREEN_SIZE)
+        for index in range(SCREEN_SIZE[0] // TILE_SIZE):
+            background.fill(
+                (index * 25, 120, 255 - index * 25),
+                pygame.Rect(index * TILE_SIZE, 0, TILE_SIZE, SCREEN_SIZE[1]),
+            )
+        return background
+
+    def test_same_look_as_blending_each_tile(self):
+        moves = [(x * TILE_SIZE, TILE_SIZE) for x in range(6)]
+        attacks = [(TILE_SIZE, TILE_SIZE), (2 * TILE_SIZE, 2 * TILE_SIZE)]
+        interactions = [(8 * TILE_SIZE, 4 * TILE_SIZE)]
+        highlighted_tiles = [
+            (constant_sprites["landing"], LANDING_OPACITY, moves, (0, TILE_SIZE)),
+            (constant_sprites["attackable"], ATTACKABLE_OPACITY, attacks, None),
+            (constant_sprites["interaction"], INTERACTION_OPACITY, interactions, None),
+        ]
+
+        expected_screen = self.get_background()
+        for sprite, opacity, tiles, skipped_tile in highlighted_tiles:
+            for tile in tiles:
+                if tile != skipped_tile:
+                    blit_alpha(expected_screen, sprite, tile, opacity)
+
+        screen = self.get_background()
+        overlay = RangeOverlay(SCREEN_SIZE)
+        overlay.update(highlighted_tiles)
+        overlay.display(screen)
+        self.assertEqual(
+            pygame.Rect(TILE_SIZE, TILE_SIZE, 8 * TILE_SIZE, 4 * TILE_SIZE), overlay.area
+        )
+        difference = np.abs(
+            pygame.surfarray.array3d(screen).astype(int)
+            - pygame.surfarray.array3d(expected_screen).astype(int)
+        )
+        self.assertLessEqual(difference.max(), 2)
+
+    def test_drawn_again_only_on_changes(self):
+        moves = [(0, 0), (TILE_SIZE, 0)]
+        position = pygame.Vector2(0, 0)
+        overlay = RangeOverlay(SCREEN_SIZE)
+
+        def update():
+            overlay.update([(constant_sprites["landing"], LANDING_OPACITY, moves, position)])
+            return overlay.version
+
+        version = update()
+        self.assertEqual(pygame.Rect(TILE_SIZE, 0, TILE_SIZE, TILE_SIZE), overlay.area)
+        self.assertEqual(version, update())
+
+        moves.append((2 * TILE_SIZE, 0))
+        self.assertNotEqual(version, update())
+        version = overlay.version
+        position.x = TILE_SIZE
+        self.assertNotEqual(version, update())
+        self.assertEqual(pygame.Rect(0, 0, 3 * TILE_SIZE, TILE_SIZE), overlay.area)
+        version = overlay.version
+        moves = list(moves)
+        self.assertNotEqual(version, update())
+
+        overlay.update([])
+        self.assertFalse(overlay.area)
+        screen = self.get_background()
+        overlay.display(screen)
+        self.assertEqual(
+            pygame.image.tobytes(self.get_background(), "RGB"),
+            pygame.image.tobytes(screen, "RGB"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.services.reachability import compute_reachability
+
+
+def tiles_predicate(width, height, walls):
+    walls = {(x * TILE_SIZE, y * TILE_SIZE) for x, y in walls}
+
+    def is_tile_available(tile):
+        return (
+            0 <= tile[0] < width * TILE_SIZE
+            and 0 <= tile[1] < height * TILE_SIZE
+            and tile not in walls
+        )
+
+    return is_tile_available
+
+
+class TestReachability(unittest.TestCase):
+    def test_distances_in_open_field(self):
+        reachability = compute_reachability(
+            (2 * TILE_SIZE, 2 * TILE_SIZE), 2, tiles_predicate(5, 5, [])
+        )
+        self.assertEqual(13, len(reachability))
+        self.assertEqual(0, reachability[(2 * TILE_SIZE, 2 * TILE_SIZE)])
+        self.assertEqual(2, reachability[(3 * TILE_SIZE, 3 * TILE_SIZE)])
+        self.assertNotIn((4 * TILE_SIZE, 3 * TILE_SIZE), reachability)
+
+    def test_path_goes_around_walls(self):
+        # Vertical wall with a single opening at the bottom
+        walls = [(1, 0), (1, 1), (1, 2)]
+        reachability = compute_reachability(
+            pygame.Vector2(0, 0), 10, tiles_predicate(3, 4, walls)
+        )
+        destination = (2 * TILE_SIZE, 0)
+        self.assertEqual(8, reachability[destination])
+
+        path = reachability.path_to(destination)
+        self.assertEqual(8, len(path))
+        self.assertEqual(destination, path[-1])
+        previous_tile = reachability.origin
+        for tile in path:
+            self.assertEqual(
+                TILE_SIZE,
+                abs(tile[0] - previous_tile[0]) + abs(tile[1] - previous_tile[1]),
+            )
+            self.assertNotIn((tile[0] // TILE_SIZE, tile[1] // TILE_SIZE), walls)
+            previous_tile = tile
+
+    def test_availability_checked_once_per_tile(self):
+        checked_tiles = []
+        is_tile_available = tiles_predicate(6, 6, [(2, 2), (3, 3)])
+
+        def counting_predicate(tile):
+            checked_tiles.append(tile)
+            return is_tile_available(tile)
+
+        compute_reachability((0, 0), 20, counting_predicate)
+        self.assertEqual(len(checked_tiles), len(set(checked_tiles)))
+
+    def test_path_to_neighbour_and_origin(self):
+        reachability = compute_reachability((0, 0), 3, tiles_predicate(3, 3, []))
+        self.assertEqual([(TILE_SIZE, 0)], reachability.path_to((TILE_SIZE, 0)))
+        self.assertEqual([(0, 0)], reachability.path_to((0, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
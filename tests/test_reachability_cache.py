@@ -0,0 +1,69 @@
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.reachability import compute_reachability
+from src.services.reachability_cache import ReachabilityCache
+from src.services.tile_occupancy import TileOccupancyIndex
+from tests.random_data_library import random_foe_entity
+from tests.tools import minimal_setup_for_game
+
+
+class TestReachabilityCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        self.entities = LevelEntityCollections()
+        self.foe = random_foe_entity()
+        self.foe.position = pygame.Vector2(2 * TILE_SIZE, 2 * TILE_SIZE)
+        self.entities.foes = [self.foe]
+        self.tile_occupancy = TileOccupancyIndex(self.entities)
+        self.computed_ranges = []
+        self.cache = ReachabilityCache(self.compute, self.tile_occupancy)
+
+    def compute(self, origin, max_moves):
+        self.computed_ranges.append((tuple(origin), max_moves))
+        return compute_reachability(
+            origin,
+            max_moves,
+            lambda tile: 0 <= tile[0] < 5 * TILE_SIZE
+            and 0 <= tile[1] < 5 * TILE_SIZE
+            and not self.tile_occupancy.is_occupied(tile),
+        )
+
+    def test_unchanged_board_reuses_range(self):
+        first_range = self.cache.get(self.foe.position, 2)
+        self.assertIs(first_range, self.cache.get(tuple(self.foe.position), 2))
+        self.assertEqual(1, len(self.computed_ranges))
+        self.assertEqual(
+            {"hits": 1, "misses": 1, "invalidations": 0, "entries": 1},
+            self.cache.get_stats(),
+        )
+
+        # Another budget is another entry
+        self.assertNotEqual(first_range, self.cache.get(self.foe.position, 1))
+        self.assertEqual(2, self.cache.misses)
+
+    def test_occupancy_change_invalidates_ranges(self):
+        self.cache.get((0, 0), 3)
+        self.cache.get(self.foe.position, 3)
+        self.assertIn((3 * TILE_SIZE, 0), self.cache.get((0, 0), 3))
+
+        self.foe.position = pygame.Vector2(2 * TILE_SIZE, 0)
+        self.assertNotIn((3 * TILE_SIZE, 0), self.cache.get((0, 0), 3))
+        self.assertEqual(2, self.cache.invalidations)
+        self.assertEqual(3, self.cache.misses)
+
+        self.entities.foes.remove(self.foe)
+        self.tile_occupancy.remove(self.foe)
+        self.assertIn((3 * TILE_SIZE, 0), self.cache.get((0, 0), 3))
+        self.assertEqual(3, self.cache.invalidations)
+        self.assertEqual(4, len(self.computed_ranges))
+
+
+if __name__ == "__main__":
+    unittest.main()
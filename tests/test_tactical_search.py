@@ -0,0 +1,167 @@
+import random
+import time
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.destroyable import DamageKind
+from src.game_entities.movable import EntityState, EntityStrategy
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.path_hierarchy import PathHierarchy
+from src.services.tactical_search import TacticalSearch, _search_executors, get_open_tiles
+from src.services.tile_occupancy import TileOccupancyIndex
+from src.services.turn_planner import TurnPlanner
+from src.services.walkability_grid import WalkabilityGrid
+from tests.random_data_library import random_foe_entity, random_player_entity
+from tests.tools import minimal_setup_for_game
+
+COLUMNS = 16
+ROWS = 10
+
+
+class TestTacticalSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        random.seed(0)
+        self.entities = LevelEntityCollections()
+        self.tile_occupancy = TileOccupancyIndex(self.entities)
+        self.grid = WalkabilityGrid((0, 0), COLUMNS, ROWS, self.tile_occupancy)
+        self.tile_occupancy.listeners.append(self.grid.notify_change)
+
+    def place(self, entity, collection, column, row, hit_points, strength, max_moves, reach):
+        entity.position = pygame.Vector2(column * TILE_SIZE, row * TILE_SIZE)
+        entity.hit_points = entity.hit_points_max = hit_points
+        entity.strength = strength
+        entity.defense = entity.resistance = 0
+        entity._max_moves = max_moves
+        entity.alterations = []
+        entity.skills = []
+        if hasattr(entity, "equipments"):
+            entity.equipments = []
+            entity.reach_ = reach
+        else:
+            entity.reach = reach
+            entity._attack_kind = DamageKind.PHYSICAL
+        collection.append(entity)
+        self.tile_occupancy.add(entity)
+        return entity
+
+    def add_foe(self, column, row, hit_points, strength, max_moves=3):
+        foe = self.place(
+            random_foe_entity(),
+            self.entities.foes,
+            column,
+            row,
+            hit_points,
+            strength,
+            max_moves,
+            [1],
+        )
+        foe.strategy = EntityStrategy.TACTICAL
+        foe.state = EntityState.HAVE_TO_ACT
+        return foe
+
+    def add_player(self, column, row, hit_points, strength, max_moves=2):
+        return self.place(
+            random_player_entity(),
+            self.entities.players,
+            column,
+            row,
+            hit_points,
+            strength,
+            max_moves,
+            [1],
+        )
+
+    def decide(self, search, foe):
+        possible_moves = self.grid.compute_reachability(foe.position, foe.max_moves)
+        return search.decide(
+            foe, self.entities.foes, self.entities.players, self.grid.copy(), possible_moves
+        )
+
+    def test_planner_kills_weak_target(self):
+        foe = self.add_foe(5, 5, 20, 10)
+        self.add_player(7, 5, 40, 1)
+        weak_player = self.add_player(3, 5, 8, 1)
+        path_hierarchy = PathHierarchy(self.grid, 8)
+
+        planner = TurnPlanner(
+            self.grid, path_hierarchy, self.entities.foes, self.entities.players
+        )
+        action = planner.get_action(foe)
+        self.assertIs(weak_player, action.target)
+        self.assertEqual(
+            TILE_SIZE,
+            abs(action.destination[0] - weak_player.position[0])
+            + abs(action.destination[1] - weak_player.position[1]),
+        )
+
+    def test_avoids_bad_trade(self):
+        # Attacking the player would hurt it, but the player would kill the foe right after
+        foe = self.add_foe(5, 5, 10, 5)
+        player = self.add_player(9, 5, 30, 30)
+
+        # Without looking ahead, the foe goes for the damage
+        self.assertIs(player, self.decide(TacticalSearch(budget=10000, max_plies=1), foe)[1])
+
+        move, target = self.decide(TacticalSearch(budget=10000, max_plies=3), foe)
+        self.assertIsNone(target)
+        # The player cannot reach the foe during its next turn
+        self.assertGreater(
+            abs(move[0] - player.position[0]) + abs(move[1] - player.position[1]),
+            3 * TILE_SIZE,
+        )
+
+    def test_deadline_is_respected(self):
+        foes = [self.add_foe(column, 1, 20, 8, 5) for column in range(0, COLUMNS, 2)]
+        for column in range(1, COLUMNS, 2):
+            self.add_player(column, ROWS - 2, 20, 8, 5)
+
+        search = TacticalSearch(budget=10, max_plies=10000)
+        start = time.perf_counter()
+        move, _ = self.decide(search, foes[3])
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertIn(tuple(move), self.grid.compute_reachability(foes[3].position, 5))
+
+    def test_first_ply_is_cut_by_deadline(self):
+        foe = self.add_foe(5, 5, 20, 8, 6)
+        self.add_player(12, 5, 20, 8)
+
+        move, target = self.decide(TacticalSearch(budget=0), foe)
+        # Only the closest tile could be evaluated
+        self.assertEqual(foe.position, move)
+        self.assertIsNone(target)
+
+    def test_open_tiles_include_blocked_unit_tiles(self):
+        foe = self.add_foe(5, 5, 20, 8)
+        player = self.add_player(7, 5, 20, 8)
+        self.grid.set_tile_walkable((0, 0), False)
+
+        open_tiles = get_open_tiles(self.grid, [foe, player])
+        self.assertEqual(COLUMNS * ROWS - 1, len(open_tiles))
+        self.assertIn(tuple(foe.position), open_tiles)
+        self.assertIn(tuple(player.position), open_tiles)
+        self.assertNotIn((0, 0), open_tiles)
+
+    def test_worker_processes_are_started_with_search(self):
+        TacticalSearch(processes=2)
+        self.assertTrue(_search_executors[2]._processes)
+
+    def test_worker_processes_give_same_decision(self):
+        foes = [self.add_foe(column, 2, 15, 8, 4) for column in range(2, 10, 3)]
+        for column in range(3, 12, 2):
+            self.add_player(column, 6, 12, 7, 3)
+
+        for foe in foes:
+            self.assertEqual(
+                self.decide(TacticalSearch(budget=10000, max_plies=6), foe),
+                self.decide(TacticalSearch(budget=10000, max_plies=6, processes=2), foe),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import pygame
+from lxml import etree
+
+from src.constants import BLACK, MAIN_WIN_HEIGHT, MAIN_WIN_WIDTH, WHITE
+from src.gui import fonts as fonts_module
+from src.gui.fonts import clear_rendered_texts, fonts, render_text
+from src.scenes.level_scene import LevelScene, LevelStatus
+from src.services.random_manager import RandomStreams
+from src.services.sound_manager import set_sounds_enabled
+from tests.tools import minimal_setup_for_game
+
+SAVE_PATH = "tests/test_saves/complete_first_level_save.xml"
+
+
+class TestTextRendering(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    @classmethod
+    def tearDownClass(cls):
+        set_sounds_enabled(True)
+
+    def tearDown(self):
+        fonts_module.TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+        clear_rendered_texts()
+
+    def test_render_text(self):
+        font = fonts["ITEM_FONT"]
+        text = render_text(font, "Some text", BLACK)
+        self.assertIs(text, render_text(font, "Some text", BLACK))
+        self.assertEqual(
+            pygame.image.tobytes(font.render("Some text", True, BLACK), "RGBA"),
+            pygame.image.tobytes(text, "RGBA"),
+        )
+        self.assertIsNot(text, render_text(font, "Some text", WHITE))
+        self.assertIsNot(text, render_text(font, "Some text", BLACK, False))
+        self.assertIsNot(text, render_text(fonts["MISSION_FONT"], "Some text", BLACK))
+
+    def test_least_recently_used_texts_are_dropped(self):
+        font = fonts["ITEM_FONT"]
+        first_text = render_text(font, "First", BLACK)
+        second_text = render_text(font, "Second", BLACK)
+        fonts_module.TEXT_CACHE_MAX_BYTES = (
+            first_text.get_pitch() * first_text.get_height()
+            + second_text.get_pitch() * second_text.get_height()
+        )
+        self.assertIs(first_text, render_text(font, "First", BLACK))
+        render_text(font, "Third", BLACK)
+        # The second text is the least recently used one
+        self.assertIs(first_text, render_text(font, "First", BLACK))
+        self.assertIsNot(second_text, render_text(font, "Second", BLACK))
+
+    def test_sidebar_rendered_only_on_changes(self):
+        with open(SAVE_PATH, "r", encoding="utf-8") as save:
+            tree_root = etree.parse(save).getroot()
+        level = LevelScene(
+            pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT)),
+            "maps/level_0/",
+            0,
+            LevelStatus[tree_root.find("level/phase").text.strip()],
+            int(tree_root.find("level/turn").text.strip()),
+            tree_root.find("level/entities"),
+            random_streams=RandomStreams(0),
+        )
+        level.load_level_content()
+        sidebar = level.sidebar
+        foe = level.entities.foes[0]
+        renderings = []
+        render = sidebar._render
+
+        def count_renderings(*arguments):
+            renderings.append(arguments[2:])
+            render(*arguments)
+
+        sidebar._render = count_renderings
+        screen = pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT))
+        sidebar.display(screen, 1, None)
+        sidebar.display(screen, 1, None)
+        sidebar.display(screen, 2, None)
+        sidebar.display(screen, 2, foe)
+        sidebar.display(screen, 2, foe)
+        foe.hit_points -= 1
+        sidebar.display(screen, 2, foe)
+        self.assertEqual([(1, None), (2, None), (2, foe), (2, foe)], renderings)
+
+        # The sidebar looks the same as when it is rendered directly on the screen
+        expected_screen = pygame.Surface((MAIN_WIN_WIDTH, MAIN_WIN_HEIGHT))
+        render(expected_screen, sidebar.position, 2, foe)
+        self.assertEqual(
+            pygame.image.tobytes(expected_screen, "RGB"), pygame.image.tobytes(screen, "RGB")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
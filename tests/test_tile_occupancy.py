@@ -0,0 +1,89 @@
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.obstacle import Obstacle
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.tile_occupancy import TileOccupancyIndex
+from tests.random_data_library import (
+    random_foe_entity,
+    random_objective,
+    random_player_entity,
+)
+from tests.tools import minimal_setup_for_game
+
+
+class TestTileOccupancyIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+        TileOccupancyIndex.consistency_checks_enabled = True
+
+    @classmethod
+    def tearDownClass(cls):
+        TileOccupancyIndex.consistency_checks_enabled = False
+
+    def setUp(self):
+        self.entities = LevelEntityCollections()
+        self.obstacle = Obstacle(
+            (0, 0), "imgs/dungeon_crawl/dungeon/wall/stone_brick_1.png"
+        )
+        self.foe = random_foe_entity()
+        self.foe.position = pygame.Vector2(TILE_SIZE, 0)
+        self.player = random_player_entity()
+        self.player.position = (2 * TILE_SIZE, 0)
+        self.entities.obstacles = [self.obstacle]
+        self.entities.foes = [self.foe]
+        self.entities.players = [self.player]
+        self.index = TileOccupancyIndex(self.entities)
+
+    def test_get_entity_on_tile(self):
+        self.assertIs(self.obstacle, self.index.get((0, 0)))
+        self.assertIs(self.foe, self.index.get((TILE_SIZE, 0)))
+        self.assertIs(self.player, self.index.get(pygame.Vector2(2 * TILE_SIZE, 0)))
+        self.assertIsNone(self.index.get((3 * TILE_SIZE, 0)))
+
+    def test_move_entity(self):
+        version = self.index.version
+        self.foe.position = pygame.Vector2(TILE_SIZE, TILE_SIZE)
+
+        self.assertIsNone(self.index.get((TILE_SIZE, 0)))
+        self.assertIs(self.foe, self.index.get((TILE_SIZE, TILE_SIZE)))
+        self.assertGreater(self.index.version, version)
+
+    def test_add_and_remove_entity(self):
+        other_foe = random_foe_entity()
+        other_foe.position = (0, TILE_SIZE)
+        self.entities.foes.append(other_foe)
+        self.index.add(other_foe)
+        self.assertIs(other_foe, self.index.get((0, TILE_SIZE)))
+
+        self.entities.foes.remove(self.foe)
+        self.index.remove(self.foe)
+        self.assertIsNone(self.index.get((TILE_SIZE, 0)))
+
+        # A removed entity is not tracked anymore
+        self.foe.position = (3 * TILE_SIZE, 0)
+        self.assertIsNone(self.index.get((3 * TILE_SIZE, 0)))
+
+    def test_shared_tile_follows_collections_order(self):
+        objective = random_objective(position=pygame.Vector2(0, 2 * TILE_SIZE))
+        self.entities.objectives = [objective]
+        self.index.rebuild()
+        self.assertIs(objective, self.index.get((0, 2 * TILE_SIZE)))
+
+        self.player.position = pygame.Vector2(0, 2 * TILE_SIZE)
+        self.assertIs(self.player, self.index.get((0, 2 * TILE_SIZE)))
+
+        self.player.position = pygame.Vector2(0, 3 * TILE_SIZE)
+        self.assertIs(objective, self.index.get((0, 2 * TILE_SIZE)))
+
+    def test_consistency_check_detects_unindexed_change(self):
+        self.entities.foes.append(random_foe_entity())
+        with self.assertRaises(RuntimeError):
+            self.index.check_consistency()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import random
+import time
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.movable import EntityState, EntityStrategy
+from src.game_entities.obstacle import Obstacle
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.distance_field import DistanceField
+from src.services.path_hierarchy import PathHierarchy
+from src.services.tile_occupancy import TileOccupancyIndex, tile_key
+from src.services.turn_planner import TurnPlanner
+from src.services.walkability_grid import WalkabilityGrid
+from tests.random_data_library import random_foe_entity, random_player_entity
+from tests.tools import minimal_setup_for_game
+
+COLUMNS = 30
+ROWS = 20
+OBSTACLE_SPRITE = "imgs/dungeon_crawl/dungeon/wall/stone_brick_1.png"
+
+
+class TestTurnPlanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        random.seed(0)
+        self.entities = LevelEntityCollections()
+        self.entities.obstacles = [
+            Obstacle(
+                (random.randrange(COLUMNS) * TILE_SIZE, random.randrange(ROWS) * TILE_SIZE),
+                OBSTACLE_SPRITE,
+            )
+            for _ in range(80)
+        ]
+        self.tile_occupancy = TileOccupancyIndex(self.entities)
+        self.grid = WalkabilityGrid((0, 0), COLUMNS, ROWS, self.tile_occupancy)
+        self.tile_occupancy.listeners.append(self.grid.notify_change)
+        self.path_hierarchy = PathHierarchy(self.grid, 8)
+        self.foes = [self.place(random_foe_entity(), self.entities.foes) for _ in range(10)]
+        for foe in self.foes:
+            foe.strategy = random.choice(
+                [EntityStrategy.ACTIVE, EntityStrategy.SEMI_ACTIVE, EntityStrategy.STATIC]
+            )
+            foe.state = EntityState.HAVE_TO_ACT
+        self.players = [
+            self.place(random_player_entity(), self.entities.players) for _ in range(3)
+        ]
+
+    def place(self, entity, collection):
+        while True:
+            position = (random.randrange(COLUMNS) * TILE_SIZE, random.randrange(ROWS) * TILE_SIZE)
+            if self.grid.is_tile_available(position):
+                entity.position = pygame.Vector2(position)
+                collection.append(entity)
+                self.tile_occupancy.add(entity)
+                return entity
+
+    def build_planner(self, in_background=False):
+        planner = TurnPlanner(
+            self.grid, self.path_hierarchy, self.foes, self.players, in_background=in_background
+        )
+        self.tile_occupancy.listeners.append(planner.notify_change)
+        return planner
+
+    def decide_alone(self, foe):
+        # Decision taken by the foe without any planning, on the current state of the level
+        possible_moves = self.grid.compute_reachability(foe.position, foe.max_moves)
+        nearest_target, route = None, None
+        if foe.strategy is EntityStrategy.ACTIVE:
+            distance_field = DistanceField(
+                self.players, self.grid.is_tile_available, COLUMNS * ROWS, self.grid
+            )
+            nearest_target, distance = distance_field.nearest_target(foe.position)
+            if distance < distance_field.unreachable_distance:
+                route = self.path_hierarchy.find_route(
+                    foe.position,
+                    nearest_target.position,
+                    foe.reach,
+                    self.grid.is_tile_available,
+                    foe.max_moves,
+                )
+        move = foe.determine_move(possible_moves, self.players, nearest_target, route)
+        return tile_key(move), foe.target
+
+    def test_plan_matches_moves_done_one_after_the_other(self):
+        planner = self.build_planner()
+        destinations = set()
+        for foe in self.foes:
+            action = planner.get_action(foe)
+            destination = tile_key(action.destination)
+            self.assertNotIn(destination, destinations)
+            destinations.add(destination)
+            self.assertEqual((destination, action.target), self.decide_alone(foe))
+
+            for step in action.path:
+                foe.position = pygame.Vector2(step)
+            foe.state = EntityState.FINISHED
+            self.assertFalse(planner.outdated)
+
+    def test_unexpected_change_makes_plan_outdated(self):
+        planner = self.build_planner()
+        first_foe = self.foes[0]
+        planner.get_action(first_foe)
+        first_foe.state = EntityState.FINISHED
+
+        killed_player = self.players.pop(0)
+        self.entities.players.remove(killed_player)
+        self.tile_occupancy.remove(killed_player)
+        self.assertTrue(planner.outdated)
+        # The plan is not made for the remaining targets anymore
+        self.assertFalse(planner.is_planned_for(self.foes, self.players))
+
+        planner = self.build_planner()
+        self.assertNotIn(id(first_foe), planner.actions)
+        for foe in self.foes[1:]:
+            action = planner.get_action(foe)
+            self.assertEqual((tile_key(action.destination), action.target), self.decide_alone(foe))
+            for step in action.path:
+                foe.position = pygame.Vector2(step)
+            foe.state = EntityState.FINISHED
+
+    def test_background_planning_gives_the_same_plan(self):
+        expected_plan = {
+            unit_id: (tile_key(action.destination), action.target)
+            for unit_id, action in TurnPlanner(
+                self.grid, self.path_hierarchy, self.foes, self.players
+            ).actions.items()
+        }
+        planner = self.build_planner(in_background=True)
+        for foe in self.foes:
+            action = planner.get_action(foe)
+            while action is None:
+                time.sleep(0.001)
+                action = planner.get_action(foe)
+            self.assertEqual(expected_plan[id(foe)], (tile_key(action.destination), action.target))
+            for step in action.path:
+                foe.position = pygame.Vector2(step)
+            foe.state = EntityState.FINISHED
+        self.assertFalse(planner.is_planning())
+
+    def test_planning_leaves_entities_unchanged(self):
+        positions = [pygame.Vector2(entity.position) for entity in self.foes + self.players]
+        for foe in self.foes:
+            foe.target = None
+        planner = self.build_planner()
+        self.assertEqual(len(self.foes), len(planner.actions))
+        self.assertTrue(any(action.target is not None for action in planner.actions.values()))
+        for action in planner.actions.values():
+            # Targets are the entities of the level, not the copies used while planning
+            self.assertTrue(
+                action.target is None
+                or any(action.target is player for player in self.players)
+            )
+        self.assertEqual([None] * len(self.foes), [foe.target for foe in self.foes])
+        self.assertEqual(
+            positions, [entity.position for entity in self.foes + self.players]
+        )
+
+    def test_groups_never_cross_each_other(self):
+        planner = self.build_planner()
+        expected_plan = {
+            unit_id: tile_key(action.destination) for unit_id, action in planner.actions.items()
+        }
+        played_units = []
+        while len(played_units) < len(self.foes):
+            group = planner.get_group_actions()
+            self.assertTrue(group)
+            group_tiles = set()
+            for action in group:
+                unit_tiles = {tile_key(action.entity.position)} | {
+                    tile_key(tile) for tile in action.path
+                }
+                self.assertTrue(unit_tiles.isdisjoint(group_tiles))
+                group_tiles |= unit_tiles
+            # The walks of the group are done at the same time, one tile after the other
+            for step in range(max(len(action.path) for action in group)):
+                for action in group:
+                    if step < len(action.path):
+                        action.entity.position = pygame.Vector2(action.path[step])
+            for action in group:
+                self.assertEqual(expected_plan[id(action.entity)], tile_key(action.destination))
+                action.entity.state = EntityState.FINISHED
+                played_units.append(action.entity)
+            self.assertFalse(planner.outdated)
+            self.tile_occupancy.check_consistency()
+        # Groups follow the playing order
+        self.assertEqual(self.foes, played_units)
+        self.assertEqual([], planner.get_group_actions())
+
+
+if __name__ == "__main__":
+    unittest.main()
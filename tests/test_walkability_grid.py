@@ -0,0 +1,173 @@
+import random
+import unittest
+
+import pygame
+
+from src.constants import TILE_SIZE
+from src.game_entities.objective import Objective
+from src.game_entities.obstacle import Obstacle
+from src.scenes.level_scene import LevelEntityCollections
+from src.services.distance_field import DistanceField
+from src.services.reachability import compute_reachability
+from src.services.tile_occupancy import TileOccupancyIndex
+from src.services.walkability_grid import UNREACHED, WalkabilityGrid, get_attack_kernel
+from tests.random_data_library import random_foe_entity, random_player_entity
+from tests.tools import minimal_setup_for_game
+
+ORIGIN = (2 * TILE_SIZE, TILE_SIZE)
+COLUMNS = 30
+ROWS = 20
+OBSTACLE_SPRITE = "imgs/dungeon_crawl/dungeon/wall/stone_brick_1.png"
+
+
+def random_tile():
+    return (
+        ORIGIN[0] + random.randrange(COLUMNS) * TILE_SIZE,
+        ORIGIN[1] + random.randrange(ROWS) * TILE_SIZE,
+    )
+
+
+class TestWalkabilityGrid(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        minimal_setup_for_game()
+
+    def setUp(self):
+        random.seed(0)
+        self.entities = LevelEntityCollections()
+        self.entities.obstacles = [
+            Obstacle(tile, OBSTACLE_SPRITE) for tile in {random_tile() for _ in range(120)}
+        ]
+        self.foe = random_foe_entity()
+        self.foe.position = pygame.Vector2(self.random_free_tile())
+        self.entities.foes = [self.foe]
+        self.tile_occupancy = TileOccupancyIndex(self.entities)
+        self.grid = WalkabilityGrid(ORIGIN, COLUMNS, ROWS, self.tile_occupancy)
+        self.tile_occupancy.listeners.append(self.grid.notify_change)
+
+    def random_free_tile(self):
+        occupied_tiles = {tuple(obstacle.position) for obstacle in self.entities.obstacles}
+        while True:
+            tile = random_tile()
+            if tile not in occupied_tiles:
+                return tile
+
+    def is_tile_available(self, tile):
+        # Reference predicate scanning the map bounds and the occupancy index
+        if not (
+            ORIGIN[0] <= tile[0] < ORIGIN[0] + COLUMNS * TILE_SIZE
+            and ORIGIN[1] <= tile[1] < ORIGIN[1] + ROWS * TILE_SIZE
+        ):
+            return False
+        entity_on_tile = self.tile_occupancy.get(tile)
+        if isinstance(entity_on_tile, Objective) and entity_on_tile.is_walkable:
+            return True
+        return entity_on_tile is None
+
+    def test_walkability_follows_entities(self):
+        obstacle_tile = tuple(self.entities.obstacles[0].position)
+        self.assertFalse(self.grid.is_tile_available(obstacle_tile))
+        self.assertFalse(self.grid.is_tile_available(self.foe.position))
+        self.assertFalse(self.grid.is_tile_available((ORIGIN[0] - TILE_SIZE, ORIGIN[1])))
+        self.assertFalse(self.grid.is_tile_available((ORIGIN[0], ORIGIN[1] + ROWS * TILE_SIZE)))
+
+        previous_tile = tuple(self.foe.position)
+        new_tile = self.random_free_tile()
+        self.foe.position = pygame.Vector2(new_tile)
+        self.assertTrue(self.grid.is_tile_available(previous_tile))
+        self.assertFalse(self.grid.is_tile_available(new_tile))
+
+        walkable_objective = Objective("exit", self.random_free_tile(), OBSTACLE_SPRITE, True)
+        blocking_objective = Objective("gate", self.random_free_tile(), OBSTACLE_SPRITE, False)
+        self.entities.objectives = [walkable_objective, blocking_objective]
+        self.tile_occupancy.rebuild()
+        self.assertTrue(self.grid.is_tile_available(walkable_objective.position))
+        self.assertFalse(self.grid.is_tile_available(blocking_objective.position))
+
+    def test_reachability_matches_breadth_first_search(self):
+        for _ in range(10):
+            self.foe.position = pygame.Vector2(self.random_free_tile())
+            max_moves = random.randint(1, 40)
+            expected = compute_reachability(
+                self.foe.position, max_moves, self.is_tile_available
+            )
+            reachability = self.grid.compute_reachability(self.foe.position, max_moves)
+            # Same tiles in the same order, linked through the same paths
+            self.assertEqual(list(expected.items()), list(reachability.items()))
+            self.assertEqual(expected.predecessors, reachability.predecessors)
+
+    def test_distances_without_limit(self):
+        distances = self.grid.compute_distances([self.foe.position])
+        expected = compute_reachability(
+            self.foe.position, COLUMNS * ROWS, self.is_tile_available
+        )
+        for row in range(ROWS):
+            for column in range(COLUMNS):
+                tile = self.grid.get_tile(row, column)
+                self.assertEqual(expected.get(tile, UNREACHED), distances[row, column])
+
+    def test_attack_range_matches_brute_force(self):
+        possible_moves = self.grid.compute_reachability(self.foe.position, 4)
+        for reach in ([1], [2], [1, 2], [3]):
+            attack_range = self.grid.compute_attack_range(possible_moves, reach)
+            for row in range(ROWS):
+                for column in range(COLUMNS):
+                    tile = self.grid.get_tile(row, column)
+                    expected = any(
+                        abs(tile[0] - move[0]) + abs(tile[1] - move[1]) == distance * TILE_SIZE
+                        for move in possible_moves
+                        for distance in reach
+                    )
+                    self.assertEqual(expected, attack_range[row, column])
+
+    def test_attack_kernel_shared_per_reach_signature(self):
+        self.assertIs(get_attack_kernel([1, 2]), get_attack_kernel((2, 1, 2)))
+        self.assertEqual(12, len(get_attack_kernel([1, 2])))
+        self.assertEqual(
+            {(-1, 0), (0, -1), (0, 1), (1, 0)},
+            {tuple(offset) for offset in get_attack_kernel([1]).tolist()},
+        )
+
+    def test_attackable_targets_match_brute_force(self):
+        targets = []
+        for _ in range(15):
+            target = random_player_entity()
+            target.position = pygame.Vector2(self.random_free_tile())
+            targets.append(target)
+        possible_moves = self.grid.compute_reachability(self.foe.position, 5)
+        for reach in ([1], [1, 2], [2, 3, 4], [6]):
+            expected = [
+                target
+                for target in targets
+                if any(
+                    abs(target.position[0] - move[0]) + abs(target.position[1] - move[1])
+                    == distance * TILE_SIZE
+                    for move in possible_moves
+                    for distance in reach
+                )
+            ]
+            self.assertEqual(
+                expected, self.grid.get_attackable_targets(possible_moves, reach, targets)
+            )
+
+    def test_distance_field_computed_on_grid(self):
+        targets = []
+        for _ in range(4):
+            target = random_player_entity()
+            target.position = pygame.Vector2(self.random_free_tile())
+            targets.append(target)
+        self.entities.players = targets
+        self.tile_occupancy.rebuild()
+        reference_field = DistanceField(targets, self.is_tile_available, COLUMNS * ROWS)
+        grid_field = DistanceField(
+            targets, self.grid.is_tile_available, COLUMNS * ROWS, self.grid
+        )
+        for _ in range(50):
+            tile = random_tile()
+            self.assertEqual(
+                reference_field.nearest_target(tile), grid_field.nearest_target(tile)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()